@@ -10,11 +10,28 @@ and supports both LLM-based and tool-based operations within a single execution
 # core/async_workflow_engine.py
 import asyncio
 import copy  # Import deepcopy
+import inspect
 import re
 import importlib
 from typing import Any, Dict, List, Optional, Callable
 
+from core.item_stream import (
+    ItemStream,
+    find_item_streams,
+    is_item_source,
+    item_streams_needed_by,
+    unfinished_item_stream,
+)
 from core.llm.interface import LLMInterface
+from core.llm.streaming import (
+    attach_stream,
+    contains_stream,
+    materialize,
+    release_streams,
+    streams_needed_by,
+    unmaterialized_stream,
+)
+from core.result_store import IncrementalExecutionContext, ResultStore
 from core.task import Task
 from core.task_execution_strategy import TaskExecutionStrategyFactory
 from core.tools.registry import ToolRegistry
@@ -46,7 +63,8 @@ class AsyncWorkflowEngine:
         workflow: Workflow, 
         llm_interface: LLMInterface, 
         tool_registry: ToolRegistry,
-        handler_registry: Optional[HandlerRegistry] = None
+        handler_registry: Optional[HandlerRegistry] = None,
+        result_store: Optional[ResultStore] = None
     ):
         """Initialize the asynchronous workflow engine.
 
@@ -55,13 +73,24 @@ class AsyncWorkflowEngine:
             llm_interface: An instance of LLMInterface for LLM tasks.
             tool_registry: An instance of ToolRegistry containing available tools.
             handler_registry: An optional HandlerRegistry for direct handler tasks.
+            result_store: An optional ResultStore enabling incremental re-execution.
         """
         self.workflow = workflow
         self.llm_interface = llm_interface
         self.tool_registry = tool_registry
         self.handler_registry = handler_registry
         self.strategy_factory = TaskExecutionStrategyFactory(llm_interface, tool_registry, handler_registry)
+
+        # Incremental execution bookkeeping (None when running every task)
+        self.incremental: Optional[IncrementalExecutionContext] = None
+        if result_store is not None:
+            self.incremental = IncrementalExecutionContext(
+                result_store, llm_interface, tool_registry, handler_registry
+            )
         
+        # Set by async_resume(): completed tasks keep their outputs instead of running again
+        self._resuming = False
+
         # Initialize the condition evaluation helper functions
         self._condition_helper_funcs = {}
         
@@ -97,6 +126,8 @@ class AsyncWorkflowEngine:
             self.tool_registry, 
             handler_registry
         )
+        if self.incremental is not None:
+            self.incremental.handler_registry = handler_registry
         log_info(f"Set HandlerRegistry with handlers: {handler_registry.list_handlers()}")
 
     def _resolve_value(self, ref_task_id: str, path_parts: List[str]) -> Any:
@@ -176,6 +207,8 @@ class AsyncWorkflowEngine:
             return copy.deepcopy(task.input_data or {})
 
         processed_input = copy.deepcopy(task.input_data)
+        # Values resolved into the prompt, so prompt compaction can rebuild it from its template
+        prompt_values: Dict[str, str] = {}
 
         # log_info(f"--- Processing input for task '{task.id}' ---") # Reduce verbosity
 
@@ -197,6 +230,8 @@ class AsyncWorkflowEngine:
                         resolved_value = self._resolve_value(ref_task_id, path_to_value)
                         if resolved_value is not None:
                             processed_input[key] = resolved_value  # Update copy
+                            if key == "prompt" and isinstance(resolved_value, str):
+                                prompt_values[f"${{{match_str}}}"] = resolved_value
                             # log_info(f"  Key '{key}': Replaced exact placeholder with resolved value.") # Optional log
                         # else: Keep original on resolution failure (already in copy)
                         # log_error(f"  Key '{key}': Failed to resolve exact placeholder '{current_value_for_key}'.")
@@ -217,6 +252,8 @@ class AsyncWorkflowEngine:
                                 if replacement_val is not None:
                                     resolved_string = resolved_string.replace(f"${{{match_str}}}", str(replacement_val))
                                     placeholder_substituted = True
+                                    if key == "prompt":
+                                        prompt_values[f"${{{match_str}}}"] = str(replacement_val)
                                 # else: log_error(f"  Key '{key}': Failed partial resolve for '${match_str}'.")
                             # else: log_warning(f"  Key '{key}': Captured content '{match_str}' invalid format.")
                         if placeholder_substituted:
@@ -256,6 +293,7 @@ class AsyncWorkflowEngine:
 
             # else: Keep other types (handled implicitly by using copy)
 
+        task.prompt_values = prompt_values
         # log_info(f"--- Finished processing input for task '{task.id}'. Final: {processed_input} ---") # Reduce verbosity
         return processed_input
 
@@ -263,21 +301,84 @@ class AsyncWorkflowEngine:
         """Executes a single task, handles retries, sets output and status."""
         log_task_start(task.id, task.name, self.workflow.id)
         task.set_status("running")
+        consumed: List[ItemStream] = []
         
         try:
+            # Wait for upstream streams whose full response this task reads
+            if not await self._materialize_streams(streams_needed_by(task, self.workflow.tasks.values())):
+                return await self.async_handle_task_failure(task, {"error": "An upstream response stream failed"})
+            # Wait for upstream producers whose aggregated items this task reads
+            if not await self._finish_item_streams(item_streams_needed_by(task, self.workflow.tasks.values())):
+                return await self.async_handle_task_failure(task, {"error": "An upstream item stream failed"})
+
             # Process the task input data
             processed_input = self.process_task_input(task)
-            
-            # Get the appropriate strategy for the task
-            strategy = self.strategy_factory.get_strategy(task)
-            
-            # Execute the task using the strategy
-            execution_result = await strategy.execute(task, processed_input=processed_input)
+            # Item streams this task consumes live; released when it finishes
+            consumed = find_item_streams(processed_input)
+            for stream in consumed:
+                stream.claim()
+
+            # Look up a stored result when running incrementally (streams are never stored)
+            fingerprint = None
+            execution_result = None
+            cache_hit = False
+            if (self.incremental is not None and not task.stream and not consumed
+                    and not contains_stream(processed_input)):
+                fingerprint = self.incremental.fingerprint(task, processed_input, self.workflow.tasks.keys())
+                execution_result = self.incremental.lookup(task, fingerprint)
+                if execution_result is not None:
+                    cache_hit = True
+                    log_info(f"Task '{task.id}' unchanged since last run, using stored result ({fingerprint[:12]})")
+
+            if execution_result is None:
+                # Get the appropriate strategy for the task
+                strategy = self.strategy_factory.get_strategy(task)
+
+                # Execute the task using the strategy
+                execution_result = await strategy.execute(task, processed_input=processed_input)
+
+                # Async handlers (e.g. stream consumers) return a coroutine to await
+                if inspect.isawaitable(execution_result.get("result")):
+                    awaited = await execution_result["result"]
+                    execution_result = awaited if isinstance(awaited, dict) and "success" in awaited else {
+                        "success": True, "result": awaited
+                    }
+
+                if fingerprint is not None and not is_item_source(execution_result.get("result")):
+                    self.incremental.record(task, fingerprint, execution_result)
+
+            if execution_result.get("suspended"):
+                # Waiting on an external result (e.g. an LLM batch); async_resume() runs it again
+                task.set_output(execution_result)
+                log_info(f"Task '{task.id}' suspended: {execution_result.get('message', '')}")
+                return False
 
             if execution_result.get("success"):
                 task.set_status("completed")
                 output_key = "response" if task.is_llm_task else "result"
-                task.set_output({output_key: execution_result.get(output_key)})
+                item_source = execution_result.get("result") if is_item_source(execution_result.get("result")) else None
+                output = {output_key: None if item_source is not None else execution_result.get(output_key)}
+                if isinstance(execution_result.get("metadata"), dict):
+                    output["metadata"] = dict(execution_result["metadata"])
+                task.set_output(output)
+                if cache_hit:
+                    # Same result shape as the synchronous engine
+                    task.output_data["metadata"]["cache_hit"] = True
+                if item_source is not None:
+                    # The task completes now; its generator is pumped while consumers read the items
+                    stream = ItemStream(item_source, maxsize=task.stream_buffer, aggregate=task.stream_aggregate,
+                                        name=task.id, upstreams=consumed).start()
+                    consumed = []  # Released by the producer when it finishes
+                    task.output_data["item_stream"] = stream
+                    task.output_data["metadata"]["stream_finished"] = False
+                    # Conditions route on the aggregated items
+                    if task.condition and not await self._finish_item_streams([task]):
+                        return False
+                if execution_result.get("response_stream") is not None:
+                    attach_stream(task, execution_result["response_stream"])
+                    # Conditions route on the full response
+                    if task.condition and not await self._materialize_streams([task]):
+                        return False
                 log_task_end(task.id, task.name, "completed", self.workflow.id)
                 return True
             else:
@@ -288,23 +389,82 @@ class AsyncWorkflowEngine:
                 exc_info=True,
             )
             return await self.async_handle_task_failure(task, {"error": f"Unhandled engine error: {str(e)}"})
+        finally:
+            for stream in consumed:
+                stream.release()
+
+    async def _finish_item_streams(self, tasks: List[Task], cancel: bool = False, replay: bool = True) -> bool:
+        """Waits for the producers of tasks to finish and aggregates their items into output_data.
+
+        Newer streams finish first, so consumers that are producers themselves finish
+        before their sources. With replay, a list-aggregated stream is replaced by a
+        replay of its items for consumers that come later.
+
+        Args:
+            tasks: Tasks that may have an unfinished item stream.
+            cancel: Stop the producers instead of waiting for them.
+            replay: Replay list-aggregated items to later consumers.
+
+        Returns:
+            False if any producer failed or was cancelled; its task is marked failed.
+        """
+        producers = [task for task in tasks if unfinished_item_stream(task) is not None]
+        producers.sort(key=lambda task: task.output_data["item_stream"].sequence, reverse=True)
+        succeeded = True
+        for producer in producers:
+            stream = producer.output_data["item_stream"]
+            try:
+                if cancel:
+                    await stream.cancel()
+                result = await stream.finish()
+            except Exception as e:
+                log_error(f"Item stream of task '{producer.id}' failed: {e}")
+                producer.set_output({"success": False, "error": f"Item stream failed: {e}"})
+                succeeded = False
+                continue
+            producer.output_data["result"] = producer.output_data["response"] = result
+            producer.output_data["metadata"].update(stream_finished=True, items=stream.items_produced)
+            if replay and stream.aggregate == "list":
+                producer.output_data["item_stream"] = ItemStream(iter(result), maxsize=0, name=producer.id).start()
+        return succeeded
+
+    async def _materialize_streams(self, tasks: List[Task]) -> bool:
+        """Waits for the response streams of tasks and sets their full responses.
+
+        Returns:
+            False if any stream failed; its task is marked failed.
+        """
+        succeeded = True
+        for streamed_task in tasks:
+            stream = unmaterialized_stream(streamed_task)
+            if stream is None:
+                continue
+            try:
+                materialize(streamed_task, await stream.text())
+            except Exception as e:
+                log_error(f"Response stream of task '{streamed_task.id}' failed: {e}")
+                streamed_task.set_output({"success": False, "error": f"Response stream failed: {e}"})
+                succeeded = False
+        return succeeded
 
     async def async_handle_task_failure(self, task: Task, execution_result: Dict[str, Any]) -> bool:
         """Handle a task failure, including retries and workflow error handling."""
-        retry_count = task.get_retry_count()
-        max_retries = task.get_max_retries()
+        retry_count = task.retry_count
+        max_retries = task.max_retries
 
         if retry_count < max_retries:
-            task.increment_retry_count()
+            task.increment_retry()
             log_task_retry(task.id, task.name, retry_count + 1, max_retries)
-            task.set_status("retrying")
+            task.set_status("pending")
             await asyncio.sleep(1)  # Small delay before retry
             return await self.async_execute_task(task)
         else:
             task.set_status("failed")
             error_message = execution_result.get("error", "Unknown error")
-            task.set_output({"error": error_message})
-            log_task_end(task.id, task.name, "failed", self.workflow.id, error_message)
+            # Keep partial results reported by the strategy (e.g. a map task's item results)
+            failure_output = {key: execution_result[key] for key in ("result", "metadata") if key in execution_result}
+            task.set_output({**failure_output, "error": error_message})
+            log_task_end(task.id, task.name, "failed", self.workflow.id)
             return False
             
     async def find_next_tasks(self, current_task: Task, success: bool = True) -> List[Task]:
@@ -505,6 +665,8 @@ class AsyncWorkflowEngine:
         self.workflow.set_status("running")
         self.workflow.current_task_index = 0
         executed_task_ids = set()
+        if self.incremental is not None:
+            self.incremental.task_fingerprints.clear()
 
         while self.workflow.current_task_index < len(self.workflow.task_order) and self.workflow.status == "running":
             peek_task_id = self.workflow.task_order[self.workflow.current_task_index]
@@ -539,14 +701,18 @@ class AsyncWorkflowEngine:
                 executed_task_ids.update(t.id for t in parallel_tasks_to_run)
 
                 results = await asyncio.gather(
-                    *(self.async_execute_task(task) for task in parallel_tasks_to_run),
+                    *(self._execute_or_reuse(task) for task in parallel_tasks_to_run),
                     return_exceptions=True,
                 )
 
                 block_failed = False
+                block_suspended = False
                 last_task_in_block = parallel_tasks_to_run[-1]
                 for i, gather_result in enumerate(results):
                     task = parallel_tasks_to_run[i]
+                    if task.status == "suspended":
+                        block_suspended = True
+                        continue
                     if isinstance(gather_result, Exception) or not gather_result:
                         if task.status != "failed":  # Ensure status is updated if gather hid failure
                             await self.async_handle_task_failure(
@@ -562,6 +728,9 @@ class AsyncWorkflowEngine:
                     self.workflow.set_status("failed")
                     # Navigate based on last task's failure
                     _ = self.get_next_task_by_condition(last_task_in_block)
+                elif block_suspended:
+                    # The other tasks of the block keep their results for async_resume()
+                    self.workflow.set_status("suspended")
                 else:
                     # log_info(f"Parallel block success.") # Optional log
                     # Navigate based on last task's success/condition
@@ -573,8 +742,11 @@ class AsyncWorkflowEngine:
                     break
 
                 executed_task_ids.add(task_to_execute.id)
-                success = await self.async_execute_task(task_to_execute)
+                success = await self._execute_or_reuse(task_to_execute)
 
+                if task_to_execute.status == "suspended":
+                    self.workflow.set_status("suspended")
+                    break
                 if not success:
                     log_error(f"Sequential task '{task_to_execute.id}' failed.")
                     self.workflow.set_status("failed")
@@ -582,8 +754,18 @@ class AsyncWorkflowEngine:
                 else:
                     _ = self.get_next_task_by_condition(task_to_execute)
 
+        # Producers finish, or stop if the workflow failed, and their items are aggregated
+        if not await self._finish_item_streams(
+            list(self.workflow.tasks.values()), cancel=self.workflow.status == "failed", replay=False
+        ):
+            self.workflow.set_status("failed")
+        # Every streamed response is complete in the final result
+        if not await self._materialize_streams(list(self.workflow.tasks.values())):
+            self.workflow.set_status("failed")
+        release_streams(self.workflow.tasks.values())
+
         # --- Final Status Determination ---
-        if self.workflow.status != "failed":
+        if self.workflow.status not in ("failed", "suspended"):
             if self.workflow.current_task_index >= len(self.workflow.task_order):
                 all_executed_completed = all(
                     self.workflow.tasks[tid].status == "completed" for tid in executed_task_ids
@@ -600,6 +782,8 @@ class AsyncWorkflowEngine:
                 )
                 self.workflow.set_status("failed")
 
+        await self._flush_ltm_buffer()
+
         # Log final status
         log_workflow_end(self.workflow.id, self.workflow.name, self.workflow.status)
 
@@ -608,8 +792,47 @@ class AsyncWorkflowEngine:
             "workflow_name": self.workflow.name,
             "status": self.workflow.status,
             "tasks": {task_id: task.to_dict() for task_id, task in self.workflow.tasks.items()},
+            "suspended_tasks": [task_id for task_id, task in self.workflow.tasks.items() if task.status == "suspended"],
         }
 
+    async def async_resume(self) -> Dict[str, Any]:
+        """Resumes a suspended workflow.
+
+        Suspended tasks are run again; completed tasks are not, their outputs are
+        reused. The workflow may suspend again if a result is still unavailable.
+        """
+        for task in self.workflow.tasks.values():
+            if task.status == "suspended":
+                task.set_status("pending")
+        log_info(f"Resuming workflow '{self.workflow.id}'")
+        self._resuming = True
+        try:
+            return await self.async_run()
+        finally:
+            self._resuming = False
+
+    async def _execute_or_reuse(self, task: Task) -> bool:
+        """Executes a task, unless a resumed run already completed it."""
+        if self._resuming and task.status == "completed":
+            log_info(f"Task '{task.id}' already completed, reusing its output")
+            return True
+        return await self.async_execute_task(task)
+
+    async def _flush_ltm_buffer(self) -> None:
+        """Uploads LTM writes buffered during the workflow, if the buffer is in use."""
+        from core.services import get_services
+
+        services = get_services()
+        if not services.has_service("ltm_buffer"):
+            return
+        try:
+            results = await asyncio.to_thread(services.get_service("ltm_buffer").flush)
+            if results:
+                log_info(f"Flushed buffered LTM writes: {[r.get('file_id') for r in results]}")
+        except Exception as e:
+            # Entries stay journaled and are retried by the buffer
+            log_error(f"Failed to flush buffered LTM writes: {e}")
+
     async def run_workflow(self) -> bool:
         """Runs the entire workflow by executing starting tasks and following transitions."""
         log_workflow_start(self.workflow.id, self.workflow.name)
@@ -639,6 +862,7 @@ class AsyncWorkflowEngine:
         # Set workflow status
         status = "completed" if workflow_success else "failed"
         self.workflow.set_status(status)
+        await self._flush_ltm_buffer()
         log_workflow_end(self.workflow.id, self.workflow.name, status)
         
         return workflow_success
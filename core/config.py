@@ -30,6 +30,11 @@ Usage:
     from core.config import as_dict
     all_config = as_dict()
 
+    # Hot reload when files in ./config change
+    from core.config import watch, subscribe
+    subscribe(lambda changed_keys, snapshot: print(changed_keys))
+    watch(interval=1.0)
+
     # Environment helpers
     from core.config import is_production, is_development, is_test
     if is_production():
@@ -39,10 +44,13 @@ Usage:
 
 import os
 import sys
+import copy
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Type, Callable
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union, Type, Callable
 import yaml
 
 # Module level variables for storing configuration
@@ -51,6 +59,17 @@ _runtime_overrides: Dict[str, Any] = {}
 _schema: Dict[str, Any] = {}
 _logger = logging.getLogger("dawn.config")
 
+# Immutable, flattened view of _config used by get(). Every nested value is
+# reachable by its precomputed dotted key. Replaced wholesale on change, so
+# readers never lock and never observe a half-applied reload.
+_snapshot: Optional[Mapping[str, Any]] = None
+_config_paths: Optional[List[str]] = None
+_write_lock = threading.RLock()
+_subscribers: List[Callable[[Set[str], Mapping[str, Any]], None]] = []
+# Parsed config files keyed by path, reused while (mtime_ns, size) is unchanged
+_file_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_watcher: Optional["_ConfigWatcher"] = None
+
 # Default configuration schema
 DEFAULT_SCHEMA = {
     "environment": {
@@ -113,6 +132,253 @@ DEFAULT_SCHEMA = {
             "max": 2.0
         }
     },
+    "openai_client": {
+        "type": dict,
+        "default": {
+            "max_connections": 100,
+            "max_keepalive_connections": 20,
+            "keepalive_expiry": 30.0,
+            "timeout": 60.0,
+            "connect_timeout": 10.0,
+            "max_retries": 2
+        },
+        "description": "Connection pool and timeouts of the shared OpenAI clients",
+        "schema": {
+            "max_connections": {
+                "type": int,
+                "default": 100,
+                "description": "Maximum open connections in the shared pool",
+                "constraints": {
+                    "min": 1
+                }
+            },
+            "max_keepalive_connections": {
+                "type": int,
+                "default": 20,
+                "description": "Idle connections kept open for reuse",
+                "constraints": {
+                    "min": 0
+                }
+            },
+            "keepalive_expiry": {
+                "type": float,
+                "default": 30.0,
+                "description": "Seconds an idle connection is kept open"
+            },
+            "timeout": {
+                "type": float,
+                "default": 60.0,
+                "description": "Default request timeout in seconds"
+            },
+            "connect_timeout": {
+                "type": float,
+                "default": 10.0,
+                "description": "Connection timeout in seconds"
+            },
+            "max_retries": {
+                "type": int,
+                "default": 2,
+                "description": "Retries performed by the OpenAI clients",
+                "constraints": {
+                    "min": 0,
+                    "max": 10
+                }
+            }
+        }
+    },
+    "semantic_cache": {
+        "type": dict,
+        "default": {
+            "enabled": False,
+            "threshold": 0.92,
+            "max_entries": 1000,
+            "max_bytes": 16777216,
+            "embedding_model": "hashing"
+        },
+        "description": "Semantic cache of LLM responses for similar prompts (requires numpy)",
+        "schema": {
+            "enabled": {
+                "type": bool,
+                "default": False,
+                "description": "Serve cached responses to similar prompts in LLMInterface"
+            },
+            "threshold": {
+                "type": float,
+                "default": 0.92,
+                "description": "Cosine similarity needed for a cache hit; tasks may override it",
+                "constraints": {
+                    "min": 0.0,
+                    "max": 1.0
+                }
+            },
+            "max_entries": {
+                "type": int,
+                "default": 1000,
+                "description": "Maximum number of cached responses",
+                "constraints": {
+                    "min": 1
+                }
+            },
+            "max_bytes": {
+                "type": int,
+                "default": 16777216,
+                "description": "Maximum characters of cached prompts and responses",
+                "constraints": {
+                    "min": 1
+                }
+            },
+            "embedding_model": {
+                "type": str,
+                "default": "hashing",
+                "description": "Embedder for prompts: \"hashing\" or a sentence-transformers model"
+            }
+        }
+    },
+    "llm_batch": {
+        "type": dict,
+        "default": {
+            "enabled": False,
+            "spool_directory": "",
+            "service": "openai",
+            "completion_window": "24h",
+            "max_requests_per_batch": 50000
+        },
+        "description": "Offline batch mode: LLM calls are spooled and submitted in bulk",
+        "schema": {
+            "enabled": {
+                "type": bool,
+                "default": False,
+                "description": "Spool LLMInterface calls and suspend their tasks until the batch results arrive"
+            },
+            "spool_directory": {
+                "type": str,
+                "default": "",
+                "description": "Directory of the request spool; defaults to llm_batch under data_directory"
+            },
+            "service": {
+                "type": str,
+                "default": "openai",
+                "description": "Batch service: \"openai\" or \"local\" (in-process stand-in)",
+                "constraints": {
+                    "allowed_values": ["openai", "local"]
+                }
+            },
+            "completion_window": {
+                "type": str,
+                "default": "24h",
+                "description": "Completion window requested for each batch"
+            },
+            "max_requests_per_batch": {
+                "type": int,
+                "default": 50000,
+                "description": "Maximum number of requests submitted in one batch",
+                "constraints": {
+                    "min": 1,
+                    "max": 50000
+                }
+            }
+        }
+    },
+    "micro_batching": {
+        "type": dict,
+        "default": {
+            "enabled": True,
+            "max_batch_size": 32,
+            "max_wait_ms": 5
+        },
+        "description": "Coalescing of concurrent calls to tools and handlers that expose a batch entry point",
+        "schema": {
+            "enabled": {
+                "type": bool,
+                "default": True,
+                "description": ("Batch concurrent calls in the async engine; "
+                                "tools without a batch entry point are unaffected")
+            },
+            "max_batch_size": {
+                "type": int,
+                "default": 32,
+                "description": "Maximum number of calls in one batch",
+                "constraints": {
+                    "min": 1,
+                    "max": 1000
+                }
+            },
+            "max_wait_ms": {
+                "type": int,
+                "default": 5,
+                "description": "Milliseconds a call waits for others to join its batch",
+                "constraints": {
+                    "min": 0,
+                    "max": 1000
+                }
+            }
+        }
+    },
+    "document_pipeline": {
+        "type": dict,
+        "default": {
+            "chunk_tokens": 2000,
+            "overlap_tokens": 200,
+            "combine_fan_in": 8,
+            "max_concurrency": 4,
+            "cache_directory": ""
+        },
+        "description": "Chunked map-reduce processing of long documents by DocumentTask",
+        "schema": {
+            "chunk_tokens": {
+                "type": int,
+                "default": 2000,
+                "description": "Maximum tokens of a document chunk",
+                "constraints": {
+                    "min": 16
+                }
+            },
+            "overlap_tokens": {
+                "type": int,
+                "default": 200,
+                "description": "Tokens shared by consecutive chunks",
+                "constraints": {
+                    "min": 0
+                }
+            },
+            "combine_fan_in": {
+                "type": int,
+                "default": 8,
+                "description": "Maximum number of chunk results combined by one LLM call",
+                "constraints": {
+                    "min": 2
+                }
+            },
+            "max_concurrency": {
+                "type": int,
+                "default": 4,
+                "description": "Maximum number of LLM calls in flight for one document",
+                "constraints": {
+                    "min": 1,
+                    "max": 64
+                }
+            },
+            "cache_directory": {
+                "type": str,
+                "default": "",
+                "description": "Per-chunk response cache directory; defaults to document_chunks under data_directory"
+            }
+        }
+    },
+    "prompt_compaction": {
+        "type": dict,
+        "default": {
+            "summary_cache_directory": ""
+        },
+        "description": "Shrinking of LLM prompts over a task's prompt_token_budget",
+        "schema": {
+            "summary_cache_directory": {
+                "type": str,
+                "default": "",
+                "description": "Directory of cached value summaries; defaults to prompt_summaries under data_directory"
+            }
+        }
+    },
     "workflow_engine": {
         "type": dict,
         "default": {
@@ -156,14 +422,18 @@ DEFAULT_SCHEMA = {
         "default": {
             "provider": "chroma",
             "path": "./data/vectors",
-            "embedding_model": "all-MiniLM-L6-v2"
+            "embedding_model": "all-MiniLM-L6-v2",
+            "chunk_size": 1000,
+            "chunk_overlap": 200,
+            "ann_min_vectors": 50000
         },
         "description": "Vector database configuration",
         "schema": {
             "provider": {
                 "type": str,
                 "default": "chroma",
-                "description": "Vector store provider to use"
+                "description": ("Vector store provider to use; "
+                                "\"local\" routes the vector store tools to the embedded backend")
             },
             "path": {
                 "type": str,
@@ -173,7 +443,31 @@ DEFAULT_SCHEMA = {
             "embedding_model": {
                 "type": str,
                 "default": "all-MiniLM-L6-v2",
-                "description": "Embedding model to use for vectors"
+                "description": "Embedding model to use for vectors; \"hashing\" needs no model download"
+            },
+            "chunk_size": {
+                "type": int,
+                "default": 1000,
+                "description": "Maximum characters per chunk indexed by the local backend",
+                "constraints": {
+                    "min": 100
+                }
+            },
+            "chunk_overlap": {
+                "type": int,
+                "default": 200,
+                "description": "Characters shared by consecutive chunks",
+                "constraints": {
+                    "min": 0
+                }
+            },
+            "ann_min_vectors": {
+                "type": int,
+                "default": 50000,
+                "description": "Vectors per store from which the local backend uses its approximate index",
+                "constraints": {
+                    "min": 1
+                }
             }
         }
     },
@@ -280,6 +574,8 @@ DEFAULT_SCHEMA = {
             "max_clarifications": 3,
             "enable_plan_validation": True,
             "validation_strictness": "medium",
+            "incremental_execution": False,
+            "incremental_max_workers": 4,
             "planning_system_message": "You are an expert AI assistant for the Dawn workflow framework. Your task is to analyze the user's request and create a detailed execution plan."
         },
         "description": "Chat planner workflow configuration",
@@ -335,6 +631,22 @@ DEFAULT_SCHEMA = {
                     "allowed_values": ["low", "medium", "high"]
                 }
             },
+            "incremental_execution": {
+                "type": bool,
+                "default": False,
+                "env_var": "DAWN_CHAT_PLANNER_INCREMENTAL_EXECUTION",
+                "description": "Stream the plan and execute each step as soon as it is complete"
+            },
+            "incremental_max_workers": {
+                "type": int,
+                "default": 4,
+                "env_var": "DAWN_CHAT_PLANNER_INCREMENTAL_MAX_WORKERS",
+                "description": "Maximum number of plan steps executed concurrently in incremental mode",
+                "constraints": {
+                    "min": 1,
+                    "max": 32
+                }
+            },
             "planning_system_message": {
                 "type": str,
                 "default": "You are an expert AI assistant for the Dawn workflow framework. Your task is to analyze the user's request and create a detailed execution plan.",
@@ -362,6 +674,9 @@ def configure(
 ) -> Dict[str, Any]:
     """Initialize the configuration system.
     
+    The merged configuration is published as an immutable, flattened snapshot
+    that replaces the previous one in a single assignment.
+    
     Args:
         config_paths: List of paths to configuration files, will be merged in order
                      (later files override earlier ones)
@@ -371,52 +686,94 @@ def configure(
     Returns:
         Dict containing the complete configuration
     """
-    global _config, _schema
+    global _config, _schema, _config_paths
     
     # Initialize logging
     logging.basicConfig(level=logging.INFO)
     
-    # Load schema
-    _schema = schema or DEFAULT_SCHEMA
+    with _write_lock:
+        # Load schema
+        _schema = schema or DEFAULT_SCHEMA
+        _config_paths = list(config_paths) if config_paths else None
+        
+        # Build the new configuration off to the side so readers keep seeing
+        # the previous snapshot until it is complete
+        config = {}
+        for key, info in _schema.items():
+            if "default" in info:
+                config[key] = copy.deepcopy(info["default"])
+        
+        # Override with config files
+        for path in _find_base_config_files(_config_paths):
+            _deep_update(config, _read_config_file(path))
+        
+        # Override with environment-specific config if available
+        env = environment or os.environ.get("DAWN_ENVIRONMENT", config.get("environment", "development"))
+        config["environment"] = env
+        
+        env_path = _find_environment_config_file(env)
+        if env_path:
+            _deep_update(config, _read_config_file(env_path))
+        
+        # Override with environment variables
+        env_config = _load_from_env(_schema)
+        _deep_update(config, env_config)
+        
+        # Add runtime overrides
+        _deep_update(config, copy.deepcopy(_runtime_overrides))
+        
+        # Validate configuration
+        _validate_config(config, _schema, strict=config.get("strict_config_validation", False))
+        
+        _config = config
+        _publish(config)
+    
+    # Configure logging based on configuration
+    _configure_logging()
     
-    # Start with default values from schema
-    _config = {}
-    for key, info in _schema.items():
-        if "default" in info:
-            _config[key] = info["default"]
+    _logger.info(f"Configuration initialized for environment: {config.get('environment')}")
+    return config
+
+def _find_base_config_files(config_paths: Optional[List[str]]) -> List[str]:
+    """Find the base configuration files to merge, in order.
     
-    # Override with config files if provided
+    Args:
+        config_paths: Explicit configuration file paths, if any
+        
+    Returns:
+        List of existing base configuration file paths
+    """
     if config_paths:
-        for config_path in config_paths:
-            if config_path and os.path.exists(config_path):
-                file_config = _load_config_file(config_path)
-                _deep_update(_config, file_config)
-    else:
-        # Look for config files in common locations
-        common_paths = [
-            Path("./config/config.json"),
-            Path("./config/config.yaml"),
-            Path("./config/config.yml"),
-            Path("../config/config.json"),
-            Path("../config/config.yaml"),
-            Path("../config/config.yml"),
-            Path("./config.json"),
-            Path("./config.yaml"),
-            Path("./config.yml"),
-        ]
+        return [path for path in config_paths if path and os.path.exists(path)]
+    
+    # Look for config files in common locations
+    common_paths = [
+        Path("./config/config.json"),
+        Path("./config/config.yaml"),
+        Path("./config/config.yml"),
+        Path("../config/config.json"),
+        Path("../config/config.yaml"),
+        Path("../config/config.yml"),
+        Path("./config.json"),
+        Path("./config.yaml"),
+        Path("./config.yml"),
+    ]
+    
+    for path in common_paths:
+        if path.exists():
+            _logger.debug(f"Found config file at {path}")
+            return [str(path)]
+    return []
+
+def _find_environment_config_file(env: str) -> Optional[str]:
+    """Find the environment-specific configuration file.
+    
+    Args:
+        env: Environment name
         
-        for path in common_paths:
-            if path.exists():
-                _logger.info(f"Found config file at {path}")
-                file_config = _load_config_file(str(path))
-                _deep_update(_config, file_config)
-                break
-    
-    # Override with environment-specific config if available
-    env = environment or os.environ.get("DAWN_ENVIRONMENT", _config.get("environment", "development"))
-    _config["environment"] = env
-    
-    # Try to load environment-specific config
+    Returns:
+        Path of the environment-specific config file, or None if there is none
+    """
     for env_path_template in [
         "./config/{env}.json",
         "./config/{env}.yaml",
@@ -430,36 +787,22 @@ def configure(
     ]:
         env_path = Path(env_path_template.format(env=env.lower()))
         if env_path.exists():
-            _logger.info(f"Found environment-specific config at {env_path}")
-            env_config = _load_config_file(str(env_path))
-            _deep_update(_config, env_config)
-            break
-    
-    # Override with environment variables
-    env_config = _load_from_env(_schema)
-    _deep_update(_config, env_config)
-    
-    # Add runtime overrides
-    _deep_update(_config, _runtime_overrides)
-    
-    # Validate configuration
-    _validate_config(_config, _schema)
-    
-    # Configure logging based on configuration
-    _configure_logging()
-    
-    _logger.info(f"Configuration initialized for environment: {_config.get('environment')}")
-    return _config
+            _logger.debug(f"Found environment-specific config at {env_path}")
+            return str(env_path)
+    return None
 
 def reload() -> Dict[str, Any]:
     """Reload the configuration, keeping runtime overrides.
     
+    Files that have not changed since they were last read are not parsed again.
+    
     Returns:
         Dict containing the complete configuration
     """
     _logger.info("Reloading configuration")
-    old_env = _config.get("environment")
-    return configure(environment=old_env)
+    with _write_lock:
+        old_env = _config.get("environment")
+        return configure(config_paths=_config_paths, environment=old_env, schema=_schema or None)
 
 def get(key: str, default: Any = None) -> Any:
     """Get a configuration value by key.
@@ -469,24 +812,215 @@ def get(key: str, default: Any = None) -> Any:
         default: Default value to return if key is not found
         
     Returns:
-        Configuration value or default if not found
+        Configuration value or default if not found. Dictionaries and lists are
+        returned as read-only mappings and tuples; use as_dict() for a mutable copy.
     """
-    # Auto-initialize if not already done
-    if not _config and not _schema:
+    snapshot = _snapshot
+    if snapshot is None:
+        # Auto-initialize if not already done
         configure()
+        snapshot = _snapshot
+    return snapshot.get(key, default)
+
+def snapshot() -> Mapping[str, Any]:
+    """Get the current immutable configuration snapshot.
     
-    # Handle dot notation for nested dicts
-    if "." in key:
-        parts = key.split(".")
-        current = _config
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return default
-        return current
+    The snapshot maps every top-level and dotted nested key to its value. Hot
+    code can hold on to it and read several values consistently, even while a
+    reload publishes a newer snapshot.
+    
+    Returns:
+        Read-only mapping of flattened configuration keys to values
+    """
+    if _snapshot is None:
+        configure()
+    return _snapshot
+
+def subscribe(callback: Callable[[Set[str], Mapping[str, Any]], None]) -> None:
+    """Register a callback invoked whenever a new snapshot is published.
+    
+    Args:
+        callback: Called with the set of changed flattened keys and the new snapshot
+    """
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+def unsubscribe(callback: Callable[[Set[str], Mapping[str, Any]], None]) -> None:
+    """Remove a callback registered with subscribe().
+    
+    Args:
+        callback: The callback to remove
+    """
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+def watch(interval: float = 1.0, directories: Optional[List[str]] = None) -> None:
+    """Start watching configuration files and hot-reload them when they change.
+    
+    The watcher polls the files the current configuration was built from, plus
+    any JSON/YAML file in the watched directories, and calls reload() when one
+    is added, modified or removed. Subscribers are notified of the changed keys.
+    
+    Args:
+        interval: Polling interval in seconds
+        directories: Directories to watch, defaults to ["./config"]
+    """
+    global _watcher
+    stop_watching()
+    _watcher = _ConfigWatcher(interval, directories or ["./config"])
+    _watcher.start()
+
+def stop_watching() -> None:
+    """Stop the configuration file watcher if it is running."""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+def _publish(config: Dict[str, Any]) -> None:
+    """Build a snapshot of config, swap it in and notify subscribers.
+    
+    Args:
+        config: The complete configuration
+    """
+    global _snapshot
+    previous = _snapshot
+    new_snapshot = _build_snapshot(config)
+    _snapshot = new_snapshot
+    
+    if previous is None or not _subscribers:
+        return
     
-    return _config.get(key, default)
+    changed = {
+        key for key in previous.keys() | new_snapshot.keys()
+        if previous.get(key, _MISSING) != new_snapshot.get(key, _MISSING)
+    }
+    if not changed:
+        return
+    for callback in list(_subscribers):
+        try:
+            callback(changed, new_snapshot)
+        except Exception as e:
+            _logger.warning(f"Configuration subscriber {callback!r} failed: {str(e)}")
+
+_MISSING = object()
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of a configuration value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _build_snapshot(config: Dict[str, Any]) -> Mapping[str, Any]:
+    """Flatten a configuration into a read-only mapping of dotted keys.
+    
+    Args:
+        config: The complete configuration
+        
+    Returns:
+        Read-only mapping containing every top-level and nested dotted key
+    """
+    flat: Dict[str, Any] = {}
+    
+    def visit(prefix: str, mapping: Mapping[str, Any]) -> None:
+        for key, value in mapping.items():
+            path = f"{prefix}.{key}"
+            flat[path] = value
+            if isinstance(value, Mapping):
+                visit(path, value)
+    
+    frozen = _freeze(config)
+    # Top-level keys first, so values reached through nested dictionaries win
+    # over top-level keys that merely contain a dot
+    flat.update(frozen)
+    for key, value in frozen.items():
+        if isinstance(value, Mapping):
+            visit(key, value)
+    return MappingProxyType(flat)
+
+class _ConfigWatcher:
+    """Background thread polling configuration files for changes."""  # noqa: D202
+    
+    def __init__(self, interval: float, directories: List[str]):
+        """Initialize a new _ConfigWatcher.
+        
+        Args:
+            interval: Polling interval in seconds
+            directories: Directories whose JSON/YAML files are watched
+        """
+        self.interval = interval
+        self.directories = directories
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dawn-config-watcher", daemon=True)
+        self._signatures = self._scan()
+    
+    def start(self) -> None:
+        """Start polling."""
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 1)
+    
+    def _watched_files(self) -> List[str]:
+        files = _find_base_config_files(_config_paths)
+        env_path = _find_environment_config_file(_config.get("environment", "development"))
+        if env_path:
+            files.append(env_path)
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                for name in sorted(os.listdir(directory)):
+                    if os.path.splitext(name)[1].lower() in (".json", ".yaml", ".yml"):
+                        files.append(os.path.join(directory, name))
+        return files
+    
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        signatures = {}
+        for path in self._watched_files():
+            signature = _file_signature(path)
+            if signature is not None:
+                signatures[os.path.abspath(path)] = signature
+        return signatures
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                signatures = self._scan()
+                if signatures != self._signatures:
+                    self._signatures = signatures
+                    reload()
+            except Exception as e:
+                _logger.warning(f"Configuration reload failed: {str(e)}")
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_config_file(file_path: str) -> Dict[str, Any]:
+    """Load a configuration file, reusing the parsed result while it is unchanged.
+    
+    Args:
+        file_path: Path to configuration file
+        
+    Returns:
+        Dict containing the configuration from the file
+    """
+    key = os.path.abspath(file_path)
+    signature = _file_signature(key)
+    cached = _file_cache.get(key)
+    if cached is None or cached[0] != signature:
+        cached = (signature, _load_config_file(file_path))
+        _file_cache[key] = cached
+    # Callers merge into the result, so never hand out the cached dict itself
+    return copy.deepcopy(cached[1])
 
 def set(key: str, value: Any) -> None:
     """Set a configuration value at runtime.
@@ -596,8 +1130,10 @@ def set(key: str, value: Any) -> None:
                 for error in errors:
                     _logger.warning(error)
     
-    # Update the actual config
-    _update_config_with_overrides()
+    # Update the actual config and publish a new snapshot
+    with _write_lock:
+        _update_config_with_overrides()
+        _publish(_config)
     
     _logger.debug(f"Configuration updated: {key} = {value}")
 
@@ -623,13 +1159,15 @@ def as_dict() -> Dict[str, Any]:
     """Get the complete configuration as a dictionary.
     
     Returns:
-        Dict containing the complete configuration
+        Dict containing a mutable copy of the complete configuration. Changing it
+        does not change the configuration; use set() for that.
     """
     # Auto-initialize if not already done
     if not _config and not _schema:
         configure()
         
-    return _config
+    with _write_lock:
+        return copy.deepcopy(_config)
 
 def is_production() -> bool:
     """Check if running in production environment.
@@ -744,12 +1282,13 @@ def _load_from_env(schema: Dict[str, Any]) -> Dict[str, Any]:
     
     return result
 
-def _validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
+def _validate_config(config: Dict[str, Any], schema: Dict[str, Any], strict: Optional[bool] = None) -> bool:
     """Validate configuration against schema.
     
     Args:
         config: Configuration to validate
         schema: Configuration schema
+        strict: Raise on validation errors, defaults to the strict_config_validation setting
         
     Returns:
         True if validation passed, False otherwise
@@ -784,7 +1323,7 @@ def _validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
                     validation_passed = False
                 elif "schema" in info and isinstance(info["schema"], dict):
                     # Recursively validate nested dictionary
-                    nested_valid = _validate_config(config[key], info["schema"])
+                    nested_valid = _validate_config(config[key], info["schema"], strict)
                     if not nested_valid:
                         validation_passed = False
                         
@@ -854,7 +1393,9 @@ def _validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> bool:
             _logger.warning(error)
         
         # Optional: raise an exception on validation failure
-        if get("strict_config_validation", False):
+        if strict is None:
+            strict = get("strict_config_validation", False)
+        if strict:
             error_summary = "\n".join(validation_errors)
             raise ValueError(f"Configuration validation failed:\n{error_summary}")
     
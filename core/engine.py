@@ -12,7 +12,16 @@ import asyncio
 from typing import Any, Dict, Optional, Callable
 
 # Core imports
+from core.llm.compaction import compact_task_prompt
 from core.llm.interface import LLMInterface
+from core.llm.streaming import (
+    attach_stream,
+    contains_stream,
+    materialize,
+    release_streams,
+    streams_needed_by,
+    unmaterialized_stream,
+)
 # Import specific task types needed for dispatching
 from core.task import Task, DirectHandlerTask, TaskOutput # Ensure TaskOutput is imported
 from core.tools.registry import ToolRegistry
@@ -21,6 +30,7 @@ from core.workflow import Workflow
 from core.errors import ErrorCode # Asegúrate que ErrorCode se importe desde aquí
 # ------------------------------------
 from core.error_propagation import ErrorContext
+from core.result_store import IncrementalExecutionContext, ResultStore
 # Assuming ServiceContainer might be type hinted, import if necessary
 # from core.services import ServiceContainer
 
@@ -54,6 +64,7 @@ class WorkflowEngine:
         llm_interface: "LLMInterface",
         tool_registry: "ToolRegistry",
         services: "ServiceContainer" = None, # Use forward reference if ServiceContainer defined later/elsewhere
+        result_store: Optional[ResultStore] = None,
     ):
         """
         Initializes the WorkflowEngine.
@@ -63,6 +74,8 @@ class WorkflowEngine:
             llm_interface: An instance conforming to LLMInterface for LLM tasks.
             tool_registry: An instance of ToolRegistry containing available tools.
             services: Optional container for shared services (like HandlerRegistry).
+            result_store: Optional ResultStore enabling incremental re-execution. Tasks whose
+                          fingerprint matches a stored result are satisfied without executing.
         """
         if not isinstance(workflow, Workflow):
             raise TypeError("workflow must be an instance of Workflow")
@@ -85,6 +98,13 @@ class WorkflowEngine:
         # Initialize error context for tracking errors across tasks
         self.error_context = ErrorContext(workflow_id=workflow.id)
 
+        # Incremental execution bookkeeping (None when running every task)
+        self.incremental: Optional[IncrementalExecutionContext] = None
+        if result_store is not None:
+            self.incremental = IncrementalExecutionContext(
+                result_store, llm_interface, tool_registry, self.handler_registry
+            )
+
         # Initialize the condition evaluation helper functions
         self._condition_helper_funcs: Dict[str, Callable] = {}
 
@@ -136,6 +156,8 @@ class WorkflowEngine:
         """
         original_input = task.input_data.copy() if isinstance(task.input_data, dict) else {}
         processed_input = {}
+        # Values resolved into the prompt, so prompt compaction can rebuild it from its template
+        prompt_values: Dict[str, str] = {}
         log_info(f"[PROCESS_INPUT:{task.id}] Original input: {original_input}")
 
         # Build the context for resolution
@@ -223,6 +245,8 @@ class WorkflowEngine:
                         # Check if the entire original string was just this placeholder
                         if value == placeholder: # Compare with original 'value' for this key
                             processed_value = resolved_part # Assign the resolved object directly
+                            if key == "prompt" and isinstance(resolved_part, str):
+                                prompt_values[placeholder] = resolved_part
                             resolution_occurred_for_key = True
                             log_info(f"[PROCESS_INPUT:{task.id}] Replaced entire value for key '{key}' with resolved/default object.")
                             # Since the whole value is replaced, no need to check other matches for this key
@@ -233,6 +257,8 @@ class WorkflowEngine:
                                 replacement_str = str(resolved_part)
                             except Exception:
                                 replacement_str = f"<{type(resolved_part).__name__}_obj>" # Fallback representation
+                            if key == "prompt":
+                                prompt_values[placeholder] = replacement_str
                             # Use current_value_str for iterative replacement within the same value string
                             current_value_str = current_value_str.replace(placeholder, replacement_str)
                             processed_value = current_value_str # Update the potential final value
@@ -248,6 +274,7 @@ class WorkflowEngine:
             # --- Assign the final processed value for this key ---
             processed_input[key] = processed_value
 
+        task.prompt_values = prompt_values
         log_info(f"[PROCESS_INPUT:{task.id}] Final processed input: {processed_input}")
         return processed_input
 
@@ -329,6 +356,8 @@ class WorkflowEngine:
         """
         log_workflow_start(self.workflow.id, self.workflow.name)
         self.workflow.set_status("running")
+        if self.incremental is not None:
+            self.incremental.task_fingerprints.clear()
 
         if initial_input is not None:
             if not hasattr(self.workflow, 'variables') or not isinstance(self.workflow.variables, dict):
@@ -374,14 +403,30 @@ class WorkflowEngine:
             log_task_start(current_task.id, current_task.name, self.workflow.id)
             success = False
             output: Optional[Dict] = None # Ensure output is initialized
+            fingerprint: Optional[str] = None
+            stored_output: Optional[Dict] = None
+            stream = None
 
             try:
-                # 1. Resolve Inputs
+                # 1. Resolve Inputs (upstream streams read here are materialized first)
+                if not self._materialize_streams(streams_needed_by(current_task, self.workflow.tasks.values())):
+                    raise RuntimeError("An upstream response stream failed")
                 resolved_input = self.process_task_input(current_task)
                 current_task.set_status("running")
 
+                # 1b. Look up a stored result when running incrementally (streams are never stored)
+                if (self.incremental is not None and not getattr(current_task, "stream", False)
+                        and not contains_stream(resolved_input)):
+                    fingerprint = self.incremental.fingerprint(current_task, resolved_input, self.workflow.tasks.keys())
+                    stored_output = self.incremental.lookup(current_task, fingerprint)
+
                 # 2. Execute based on Type (Dispatch Logic)
-                if isinstance(current_task, DirectHandlerTask):
+                if stored_output is not None:
+                    log_info(f"Engine: Task '{current_task.id}' unchanged since last run, "
+                             f"using stored result ({fingerprint[:12]})")
+                    output = stored_output
+
+                elif isinstance(current_task, DirectHandlerTask):
                     handler_name = current_task.handler_name
                     handler = None
                     if callable(current_task.handler):
@@ -403,16 +448,32 @@ class WorkflowEngine:
                     log_info(f"Engine: Executing LLM task '{current_task.id}'")
                     prompt = resolved_input.get("prompt", "")
                     if not prompt: raise ValueError("Missing 'prompt' for LLM task.")
+                    # Shrink upstream values inlined into the prompt to the task's token budget
+                    prompt, compaction = compact_task_prompt(current_task, prompt, self.llm_interface)
                     
                     # Create a copy of resolved_input without the prompt key to avoid passing it twice
                     other_params = resolved_input.copy()
                     other_params.pop("prompt", None)
+                    # Semantic cache options come from the task definition
+                    if not getattr(current_task, "cacheable", True):
+                        other_params["use_cache"] = False
+                    elif getattr(current_task, "semantic_cache_threshold", None) is not None:
+                        other_params["cache_threshold"] = current_task.semantic_cache_threshold
                     
-                    output = self.llm_interface.execute_llm_call(
-                        prompt=prompt, # Pass required args
-                        **other_params # Pass other resolved inputs as potential kwargs
-                        # TODO: Map specific LLM args if needed, like temperature etc.
-                    )
+                    # In batch mode there is no live response to stream
+                    batch_mode = getattr(self.llm_interface, "batch_spool", None) is not None
+                    if getattr(current_task, "stream", False) and not batch_mode:
+                        # Completes now; the response is materialized when a task reads it
+                        stream = self.llm_interface.stream_llm_call(prompt=prompt, **other_params)
+                        output = {"success": True, "response": None}
+                    else:
+                        output = self.llm_interface.execute_llm_call(
+                            prompt=prompt, # Pass required args
+                            **other_params # Pass other resolved inputs as potential kwargs
+                            # TODO: Map specific LLM args if needed, like temperature etc.
+                        )
+                    if compaction is not None and isinstance(output, dict):
+                        output = {**output, "metadata": {**output.get("metadata", {}), "prompt_compaction": compaction}}
 
                 elif current_task.tool_name:
                     if not self.tool_registry: raise RuntimeError(f"ToolRegistry needed for '{current_task.id}'.")
@@ -429,6 +490,15 @@ class WorkflowEngine:
                 # 3. Process Output (Standardize and set status)
                 current_task.set_output(output) # This now also sets task status internally
                 success = current_task.output_data.get('success', False)
+                if stream is not None:
+                    attach_stream(current_task, stream)
+                    # Conditions route on the full response
+                    if current_task.condition and not self._materialize_streams([current_task]):
+                        success = False
+                if stored_output is not None:
+                    current_task.output_data['metadata']['cache_hit'] = True
+                elif fingerprint is not None and success:
+                    self.incremental.record(current_task, fingerprint, current_task.output_data)
                         # --- DEBUG: Log output of think_analyze_plan ---
                 if current_task.id == 'think_analyze_plan':
                     import pprint
@@ -452,6 +522,12 @@ class WorkflowEngine:
                 success = False # Ensure success is False
 
             # --- Handle Task Outcome ---
+            if current_task.status == "suspended":
+                 # Waiting on an external result (e.g. an LLM batch); resume() picks up from here
+                 message = current_task.output_data['metadata'].get('message', '')
+                 log_info(f"Task '{current_task.id}' suspended: {message}")
+                 self.workflow.set_status("suspended")
+                 break
             if success:
                  log_task_end(current_task.id, current_task.name, "completed", self.workflow.id)
                  next_task_id = self.get_next_task_id(current_task)
@@ -487,7 +563,11 @@ class WorkflowEngine:
                       current_task_id = None # Stop the loop
 
         # --- End of Workflow Loop ---
-        if self.workflow.status != "failed":
+        # Every streamed response is complete in the final result
+        if not self._materialize_streams(self.workflow.tasks.values()):
+             self.workflow.set_status("failed")
+
+        if self.workflow.status not in ("failed", "suspended"):
              # If loop finished because current_task_id is None (natural end)
              if current_task_id is None:
                   self.workflow.set_status("completed")
@@ -495,8 +575,58 @@ class WorkflowEngine:
 
         return self._get_final_result() # Always return final result
 
+    def resume(self) -> Dict[str, Any]:
+        """
+        Resumes a suspended workflow.
+
+        Suspended tasks are run again; completed tasks are not, their outputs are
+        reused. The workflow may suspend again if a result is still unavailable.
+        """
+        for task in self.workflow.tasks.values():
+             if task.status == "suspended":
+                  task.set_status("pending")
+        log_info(f"Resuming workflow '{self.workflow.id}'")
+        return self.run()
+
+    def _materialize_streams(self, tasks) -> bool:
+         """
+         Waits for the response streams of tasks and sets their full responses.
+
+         Returns:
+             False if any stream failed; its task is marked failed.
+         """
+         succeeded = True
+         for streamed_task in list(tasks):
+              stream = unmaterialized_stream(streamed_task)
+              if stream is None:
+                   continue
+              try:
+                   materialize(streamed_task, stream.result())
+              except Exception as e:
+                   log_error(f"Response stream of task '{streamed_task.id}' failed: {e}")
+                   streamed_task.set_output({"success": False, "error": f"Response stream failed: {e}"})
+                   succeeded = False
+         return succeeded
+
+    def _flush_ltm_buffer(self) -> None:
+         """Uploads LTM writes buffered during the workflow, if the buffer is in use."""
+         from core.services import get_services
+
+         services = get_services()
+         if not services.has_service("ltm_buffer"):
+              return
+         try:
+              results = services.get_service("ltm_buffer").flush()
+              if results:
+                   log_info(f"Flushed buffered LTM writes: {[r.get('file_id') for r in results]}")
+         except Exception as e:
+              # Entries stay journaled and are retried by the buffer
+              log_error(f"Failed to flush buffered LTM writes: {e}")
+
     def _get_final_result(self) -> Dict[str, Any]:
          """Constructs the final result dictionary for the workflow execution."""
+         self._flush_ltm_buffer()
+         release_streams(self.workflow.tasks.values())
          log_workflow_end(self.workflow.id, self.workflow.name, self.workflow.status) # Log end here
 
          error_summary = self.error_context.get_error_summary() if self.error_context.task_errors else None
@@ -525,6 +655,9 @@ class WorkflowEngine:
             "error_summary": error_summary,
              "workflow_error": getattr(self.workflow, 'error', None), # Safely get error
              "failed_task_id": getattr(self.workflow, 'failed_task_id', None), # Safely get failed_task_id
+             "suspended_tasks": [
+                 task_id for task_id, task in self.workflow.tasks.items() if task.status == "suspended"
+             ],
         }
 
 
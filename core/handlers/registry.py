@@ -10,6 +10,8 @@ import inspect
 import logging
 from typing import Any, Callable, Dict, List, Optional
 
+from core.utils.lazy_import import LazyCallable
+
 logger = logging.getLogger(__name__)
 
 HandlerType = Callable[[Dict[str, Any]], Dict[str, Any]]
@@ -25,6 +27,7 @@ class HandlerRegistry:
     def __init__(self):
         """Initialize a new HandlerRegistry."""
         self._handlers: Dict[str, HandlerType] = {}
+        self._batch_handlers: Dict[str, Callable[[List[Dict[str, Any]]], List[Any]]] = {}
         logger.debug("Initialized HandlerRegistry")
 
     def register(self, name: Optional[str] = None) -> Callable[[HandlerType], HandlerType]:
@@ -59,7 +62,13 @@ class HandlerRegistry:
         if name in self._handlers:
             logger.warning(f"Handler '{name}' already registered. Overwriting.")
 
-        # Verify that the handler has the correct signature (task, input_data)
+        self._check_signature(name, handler)
+        self._handlers[name] = handler
+        logger.debug(f"Registered handler '{name}'")
+
+    @staticmethod
+    def _check_signature(name: str, handler: HandlerType) -> None:
+        """Warn if a handler does not take (task, input_data) or (input_data)."""
         sig = inspect.signature(handler)
         # Allow for 2 parameters (task, input_data) or potentially 1 (input_data only)
         if len(sig.parameters) not in [1, 2]:
@@ -67,9 +76,59 @@ class HandlerRegistry:
                 f"Handler '{name}' has {len(sig.parameters)} parameters, expected 1 (input_data) or 2 (task, input_data). "
                 "This may cause issues during execution."
             )
-        
-        self._handlers[name] = handler
-        logger.debug(f"Registered handler '{name}'")
+
+    def register_lazy_handler(self, name: str, import_path: str) -> None:
+        """Register a handler declared as an import string, resolved on first use.
+
+        Args:
+            name: The name to register the handler under
+            import_path: Path of the handler function, as "package.module:attribute"
+        """
+        if name in self._handlers:
+            logger.warning(f"Handler '{name}' already registered. Overwriting.")
+
+        # The signature check in register_handler would force an import, so it
+        # is deferred until the handler is first retrieved.
+        self._handlers[name] = LazyCallable(import_path)
+        logger.debug(f"Registered lazy handler '{name}' -> '{import_path}'")
+
+    def register_batch_handler(self, name: str, handler: Callable[[List[Dict[str, Any]]], List[Any]]) -> None:
+        """Register the batch entry point of a handler.
+
+        The async engine coalesces concurrent calls to the handler into one call
+        of the batch handler, which receives the list of inputs and returns one
+        result per input, in order. A result may be an exception instance to
+        fail only that input.
+
+        Args:
+            name: The name of a registered handler
+            handler: The batch function, handler(list_of_inputs) -> list_of_results
+
+        Raises:
+            ValueError: If no handler with this name is registered
+        """
+        if name not in self._handlers:
+            raise ValueError(f"Handler '{name}' must be registered before its batch entry point")
+        self._batch_handlers[name] = handler
+        logger.debug(f"Registered batch entry point of handler '{name}'")
+
+    def get_batch_handler(self, name: str) -> Optional[Callable[[List[Dict[str, Any]]], List[Any]]]:
+        """Get the batch entry point of a handler, if it has one.
+
+        Besides entry points registered with register_batch_handler, a handler
+        exposing an ``execute_batch`` attribute provides one.
+
+        Args:
+            name: The name of the handler
+
+        Returns:
+            The batch function, or None if the handler can only be called once per input
+        """
+        if name in self._batch_handlers:
+            return self._batch_handlers[name]
+        if name not in self._handlers:
+            return None
+        return getattr(self.get_handler(name), "execute_batch", None)
 
     def get_handler(self, name: str) -> Optional[HandlerType]:
         """Get a handler function by name.
@@ -83,6 +142,11 @@ class HandlerRegistry:
         handler = self._handlers.get(name)
         if handler is None:
             logger.warning(f"Handler '{name}' not found in registry")
+        elif isinstance(handler, LazyCallable):
+            # First use of a lazily declared handler: import it, check it and drop the proxy
+            handler = handler.resolve()
+            self._check_signature(name, handler)
+            self._handlers[name] = handler
         return handler
 
     def handler_exists(self, name: str) -> bool:
@@ -127,6 +191,44 @@ class HandlerRegistry:
             logger.error(f"Error executing handler '{name}': {str(e)}")
             raise
 
+    def execute_handler_batch(self, name: str, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute a handler once for a list of inputs.
+
+        Uses the handler's batch entry point when it has one, otherwise calls
+        execute_handler for each input.
+
+        Args:
+            name: The name of the handler to execute
+            inputs: The input data of each call
+
+        Returns:
+            The result of each call, in order
+
+        Raises:
+            ValueError: If the handler is not found or returns the wrong number of results
+            Exception: Any exception raised by the batch entry point
+        """
+        batch_handler = self.get_batch_handler(name)
+        if batch_handler is None:
+            return [self.execute_handler(name, input_data) for input_data in inputs]
+
+        try:
+            results = batch_handler(inputs)
+        except Exception as e:
+            logger.error(f"Error executing batch of handler '{name}': {str(e)}")
+            raise
+        if len(results) != len(inputs):
+            raise ValueError(f"Batch of handler '{name}' returned {len(results)} results for {len(inputs)} inputs")
+
+        converted = []
+        for result in results:
+            if isinstance(result, Exception):
+                result = {"success": False, "error": str(result)}
+            elif not isinstance(result, dict):
+                result = {"result": result}
+            converted.append(result)
+        return converted
+
     def list_handlers(self) -> List[str]:
         """List all registered handler names.
 
@@ -138,4 +240,5 @@ class HandlerRegistry:
     def clear(self) -> None:
         """Clear all registered handlers."""
         self._handlers.clear()
+        self._batch_handlers.clear()
         logger.debug("Cleared all handlers from registry") 
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""
+Streaming of items between tasks.
+
+A tool or handler that returns a generator (sync or async) becomes a
+producer: AsyncWorkflowEngine completes the task at once, with an ItemStream in
+output_data["item_stream"]. It pumps the generator into a bounded queue in the
+background. Tasks created with accepts_stream=True that reference
+${task.output_data.item_stream} consume the items while they are produced. A
+consumer may itself return a generator, so read, chunk, summarize and write
+stages run as a pipeline. The producer only advances when its queue has room,
+which keeps memory bounded.
+
+Tasks that reference any other output of a producer wait until it has finished.
+Its items are then aggregated into output_data["result"], as they are for
+every stream when the workflow ends. Tasks count their items by default;
+stream_aggregate="list" keeps them all, and is needed for the result to hold
+the items or for later consumers to get a replay.
+"""
+
+import asyncio
+import inspect
+import itertools
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional
+
+from core.llm.streaming import referenced_fields
+
+AGGREGATE_MODES = ("list", "count", "none")
+
+_END = object()
+_sequence = itertools.count()
+
+
+class ItemStream:
+    """
+    Bounded, backpressured stream of the items produced by a generator.
+
+    Each item is delivered to one consumer; several consumers of the same
+    stream share its items. Consumers iterate asynchronously on the event loop
+    or synchronously from worker threads. The producer's items are also
+    aggregated according to ``aggregate``: kept as a list, counted, or dropped.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        maxsize: int = 16,
+        aggregate: str = "list",
+        name: str = "items",
+        upstreams: Optional[List["ItemStream"]] = None,
+    ):
+        """
+        Create the stream. Call start() on the event loop to begin producing.
+
+        Args:
+            source: A generator, async generator or other (async) iterable of items.
+            maxsize: Number of produced items buffered before the producer waits.
+            aggregate: "list", "count" or "none".
+            name: Name of the stream, usually its task ID.
+            upstreams: Streams the producer consumes; released when it finishes.
+        """
+        if aggregate not in AGGREGATE_MODES:
+            raise ValueError(f"Invalid aggregate '{aggregate}'. Must be one of {list(AGGREGATE_MODES)}")
+        self.source = source
+        self.maxsize = maxsize
+        self.aggregate = aggregate
+        self.name = name
+        self.upstreams = upstreams or []
+        self.items_produced = 0
+        self.consumers = 0
+        self.error: Optional[BaseException] = None
+        self._collected: List[Any] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pump: Optional[asyncio.Task] = None
+        self._idle: Optional[asyncio.Event] = None
+        self.sequence = -1
+
+    def start(self) -> "ItemStream":
+        """Start pumping the source into the queue in a background task."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.maxsize)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._pump = asyncio.create_task(self._produce(), name=f"item-stream-{self.name}")
+        self.sequence = next(_sequence)
+        return self
+
+    @property
+    def done(self) -> bool:
+        """Whether the producer has finished, failed or been cancelled."""
+        return self._pump is not None and self._pump.done()
+
+    def result(self) -> Any:
+        """The aggregated items of a finished stream."""
+        if self.aggregate == "list":
+            return list(self._collected)
+        if self.aggregate == "count":
+            return self.items_produced
+        return None
+
+    # --- Producer ---
+
+    async def _produce(self) -> None:
+        try:
+            if hasattr(self.source, "__aiter__"):
+                async for item in self.source:
+                    await self._put(item)
+            else:
+                iterator = iter(self.source)
+                while True:
+                    # Blocking generators advance in a worker thread, one item at a time
+                    item = await asyncio.to_thread(next, iterator, _END)
+                    if item is _END:
+                        break
+                    await self._put(item)
+        except asyncio.CancelledError:
+            self.error = RuntimeError(f"Item stream '{self.name}' was cancelled")
+            self._clear()
+            self._queue.put_nowait(_END)
+            raise
+        except Exception as e:
+            self.error = e
+            await self._queue.put(_END)
+        else:
+            await self._queue.put(_END)
+        finally:
+            await self._close_source()
+            for upstream in self.upstreams:
+                upstream.release()
+
+    async def _put(self, item: Any) -> None:
+        self.items_produced += 1
+        if self.aggregate == "list":
+            self._collected.append(item)
+        await self._queue.put(item)
+
+    async def _close_source(self) -> None:
+        try:
+            if inspect.isasyncgen(self.source):
+                await self.source.aclose()
+            elif inspect.isgenerator(self.source):
+                self.source.close()
+        except Exception:
+            pass
+
+    def _clear(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    # --- Consumers ---
+
+    def claim(self) -> None:
+        """Register a consumer; the engine does this when a task's input resolves to the stream."""
+        self.consumers += 1
+        self._idle.clear()
+
+    def release(self) -> None:
+        """Unregister a consumer once it has finished."""
+        self.consumers = max(0, self.consumers - 1)
+        if self.consumers == 0:
+            self._idle.set()
+
+    async def _get(self) -> Any:
+        item = await self._queue.get()
+        if item is _END:
+            # Leave the end marker for other consumers
+            self._queue.put_nowait(_END)
+            if self.error is not None:
+                raise self.error
+        return item
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """Iterate the items as they are produced."""
+        while True:
+            item = await self._get()
+            if item is _END:
+                return
+            yield item
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate the items from a worker thread. Do not use on the event loop thread."""
+        if self._loop is None:
+            raise RuntimeError(f"Item stream '{self.name}' has not been started")
+        try:
+            on_loop_thread = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop_thread = False
+        if on_loop_thread:
+            raise RuntimeError(f"Iterate item stream '{self.name}' with 'async for' on the event loop thread")
+        while True:
+            item = asyncio.run_coroutine_threadsafe(self._get(), self._loop).result()
+            if item is _END:
+                return
+            yield item
+
+    # --- Completion ---
+
+    async def finish(self) -> Any:
+        """
+        Wait for the producer to finish and return the aggregated items.
+
+        Items nobody is left to consume are read and discarded, so an unconsumed
+        producer does not block on its full queue.
+
+        Raises:
+            Exception: The error that ended the producer, if any.
+        """
+        while not self.done:
+            if self.consumers == 0:
+                async for _ in self:
+                    pass
+                break
+            idle = asyncio.ensure_future(self._idle.wait())
+            await asyncio.wait({self._pump, idle}, return_when=asyncio.FIRST_COMPLETED)
+            idle.cancel()
+        await asyncio.wait({self._pump})
+        if self.error is not None:
+            raise self.error
+        return self.result()
+
+    async def cancel(self) -> None:
+        """Stop the producer; consumers still waiting receive an error."""
+        if not self.done:
+            self._pump.cancel()
+            await asyncio.wait({self._pump})
+
+
+def is_item_source(value: Any) -> bool:
+    """Tell whether a task result is a generator to stream rather than a value."""
+    return inspect.isgenerator(value) or inspect.isasyncgen(value)
+
+
+def find_item_streams(value: Any) -> List[ItemStream]:
+    """List the item streams in a resolved task input."""
+    if isinstance(value, ItemStream):
+        return [value]
+    if isinstance(value, dict):
+        return [stream for item in value.values() for stream in find_item_streams(item)]
+    if isinstance(value, (list, tuple)):
+        return [stream for item in value for stream in find_item_streams(item)]
+    return []
+
+
+def unfinished_item_stream(task: Any) -> Optional[ItemStream]:
+    """Return the item stream of a task whose items have not been aggregated yet."""
+    output = getattr(task, "output_data", None)
+    if not isinstance(output, dict) or "item_stream" not in output:
+        return None
+    if output.get("metadata", {}).get("stream_finished"):
+        return None
+    return output["item_stream"]
+
+
+def item_streams_needed_by(task: Any, tasks: Iterable[Any]) -> List[Any]:
+    """
+    List the producer tasks that must finish before task runs.
+
+    A task that accepts streams reads ``item_stream`` references live; any
+    other reference to a producer's output needs its aggregated result.
+
+    Args:
+        task: The task about to run.
+        tasks: All tasks of the workflow.
+
+    Returns:
+        List: The producer tasks to finish first.
+    """
+    accepts_stream = getattr(task, "accepts_stream", False)
+    needed = []
+    for other in tasks:
+        if other is task or unfinished_item_stream(other) is None:
+            continue
+        fields = referenced_fields(task, other.id)
+        if fields and not (accepts_stream and all(field == "item_stream" for field in fields)):
+            needed.append(other)
+    return needed
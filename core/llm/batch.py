@@ -0,0 +1,435 @@
+"""
+Offline batch mode for LLM calls.
+
+In batch mode LLMInterface does not call the model. Each request is appended
+to a local spool (a JSONL file in the OpenAI Batch API input format) and the
+calling task is suspended. Requests spooled by any number of workflow runs are
+submitted together with BatchSpool.submit(); BatchSpool.poll() downloads the
+results of finished batches. Suspended runs are then resumed, with
+engine.resume() in the same process or by re-running the workflow with a
+ResultStore. The LLM task asks for the same request again and now receives
+its result.
+
+Requests are identified by a hash of their body, so identical prompts from
+different runs are submitted and billed once.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from core.utils.logger import log_error, log_info, log_warning
+
+_spool_lock = threading.Lock()
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def request_id(body: Dict[str, Any]) -> str:
+    """Derive the stable custom_id of a request from its body."""
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"req-{digest[:32]}"
+
+
+class BatchSpool:
+    """
+    File-backed spool of LLM requests awaiting bulk submission.
+
+    The spool directory holds ``requests.jsonl`` (requests not yet submitted),
+    ``outbox/`` (request files being submitted), ``batches.jsonl`` (submitted
+    batches and their status) and ``results.jsonl`` (results by custom_id). The
+    in-memory index is rebuilt from these files, so a spool can be shared by
+    successive processes.
+    """
+
+    def __init__(
+        self,
+        spool_dir: Optional[str] = None,
+        client: Any = None,
+        endpoint: str = "/v1/chat/completions",
+        completion_window: str = "24h",
+        max_requests_per_batch: int = 50000,
+        fsync: bool = True,
+    ):
+        """
+        Initialize the spool.
+
+        Args:
+            spool_dir: Directory of the spool files. Defaults to "llm_batch" under
+                       the configured data_directory.
+            client: Client exposing the OpenAI ``files`` and ``batches`` APIs, such as
+                    an OpenAI client or a LocalBatchService. Required to submit and poll.
+            endpoint: Endpoint the batched requests are sent to.
+            completion_window: Completion window requested for each batch.
+            max_requests_per_batch: Maximum number of requests in one batch.
+            fsync: If True, spooled requests are synced to disk before request() returns.
+        """
+        if not spool_dir:
+            from core.config import get
+
+            spool_dir = os.path.join(get("data_directory", "./data"), "llm_batch")
+        if max_requests_per_batch < 1:
+            raise ValueError("max_requests_per_batch must be at least 1")
+        self.spool_dir = spool_dir
+        self.client = client
+        self.endpoint = endpoint
+        self.completion_window = completion_window
+        self.max_requests_per_batch = max_requests_per_batch
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._requests_path = os.path.join(spool_dir, "requests.jsonl")
+        self._batches_path = os.path.join(spool_dir, "batches.jsonl")
+        self._results_path = os.path.join(spool_dir, "results.jsonl")
+        self._outbox_dir = os.path.join(spool_dir, "outbox")
+        os.makedirs(self._outbox_dir, exist_ok=True)
+
+        self._pending: set = set()
+        self._submitted: Dict[str, str] = {}  # custom_id -> batch_id
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    # --- Persistence ---
+
+    def _read_jsonl(self, path: str) -> List[Dict[str, Any]]:
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted append
+                    log_warning(f"Skipping unreadable line in {path}")
+        return records
+
+    def _append_jsonl(self, path: str, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _load(self) -> None:
+        for record in self._read_jsonl(self._results_path):
+            self._results[record["custom_id"]] = record
+        for record in self._read_jsonl(self._batches_path):
+            # The last record of a batch holds its current status
+            self._batches[record["batch_id"]] = record
+        for batch_id, batch in self._batches.items():
+            if batch["status"] not in _TERMINAL_STATUSES:
+                for custom_id in batch["custom_ids"]:
+                    if custom_id not in self._results:
+                        self._submitted[custom_id] = batch_id
+        queued = self._read_jsonl(self._requests_path)
+        for name in sorted(os.listdir(self._outbox_dir)):
+            queued.extend(self._read_jsonl(os.path.join(self._outbox_dir, name)))
+        for record in queued:
+            custom_id = record["custom_id"]
+            if custom_id not in self._results and custom_id not in self._submitted:
+                self._pending.add(custom_id)
+
+    # --- Requests ---
+
+    def request(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the result of a request, spooling it if it is not known yet.
+
+        Args:
+            body: The request body, e.g. the parameters of a chat completion.
+
+        Returns:
+            Dict: The result in the format of LLMInterface.execute_llm_call when the
+            batch has delivered it; otherwise {"success": False, "suspended": True, ...}
+            with the request's "batch_request_id" and its "batch_status".
+        """
+        custom_id = request_id(body)
+        with self._lock:
+            result = self._results.get(custom_id)
+            if result is not None:
+                if result["success"]:
+                    return {"success": True, "response": result["response"], "annotations": [],
+                            "batch_request_id": custom_id}
+                return {"success": False, "error": result["error"], "batch_request_id": custom_id}
+
+            if custom_id in self._submitted:
+                status = "submitted"
+            else:
+                status = "pending"
+                if custom_id not in self._pending:
+                    self._append_jsonl(self._requests_path, [
+                        {"custom_id": custom_id, "method": "POST", "url": self.endpoint, "body": body}
+                    ])
+                    self._pending.add(custom_id)
+        return {
+            "success": False,
+            "suspended": True,
+            "batch_request_id": custom_id,
+            "batch_status": status,
+            "message": f"LLM request {custom_id} is {status} for batch processing",
+        }
+
+    def pending_count(self) -> int:
+        """Number of spooled requests not yet submitted."""
+        with self._lock:
+            return len(self._pending)
+
+    def outstanding_count(self) -> int:
+        """Number of submitted requests still waiting for their result."""
+        with self._lock:
+            return len(self._submitted)
+
+    # --- Submission and polling ---
+
+    def _require_client(self) -> Any:
+        if self.client is None:
+            raise RuntimeError("BatchSpool needs a client with the files and batches APIs to submit or poll")
+        return self.client
+
+    def submit(self) -> List[str]:
+        """
+        Submit every spooled request, split into batches of max_requests_per_batch.
+
+        Request files are moved to the outbox first; a file whose submission fails
+        stays there and is retried by the next call.
+
+        Returns:
+            List[str]: The IDs of the created batches.
+        """
+        client = self._require_client()
+        with self._lock:
+            if os.path.exists(self._requests_path) and os.path.getsize(self._requests_path):
+                records = self._read_jsonl(self._requests_path)
+                stamp = time.strftime("%Y%m%dT%H%M%S")
+                for start in range(0, len(records), self.max_requests_per_batch):
+                    path = os.path.join(self._outbox_dir, f"{stamp}-{start // self.max_requests_per_batch:04d}.jsonl")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n"
+                                        for r in records[start:start + self.max_requests_per_batch]))
+                os.remove(self._requests_path)
+            outbox = sorted(os.listdir(self._outbox_dir))
+
+        batch_ids = []
+        for name in outbox:
+            path = os.path.join(self._outbox_dir, name)
+            custom_ids = [record["custom_id"] for record in self._read_jsonl(path)]
+            with open(path, "rb") as f:
+                input_file = client.files.create(file=f, purpose="batch")
+            batch = client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=self.endpoint,
+                completion_window=self.completion_window,
+            )
+            with self._lock:
+                record = {"batch_id": batch.id, "input_file_id": input_file.id,
+                          "status": batch.status, "custom_ids": custom_ids}
+                self._append_jsonl(self._batches_path, [record])
+                self._batches[batch.id] = record
+                for custom_id in custom_ids:
+                    self._pending.discard(custom_id)
+                    self._submitted[custom_id] = batch.id
+                os.remove(path)
+            batch_ids.append(batch.id)
+            log_info(f"Submitted LLM batch {batch.id} with {len(custom_ids)} requests")
+        return batch_ids
+
+    def poll(self) -> Dict[str, int]:
+        """
+        Check every unfinished batch and store the results of those that finished.
+
+        Requests of batches that failed, expired or were cancelled without a result
+        are forgotten, so asking for them again spools them for the next batch.
+
+        Returns:
+            Dict: Counts of "completed" results, "failed" results, "requeued" requests
+            and batches still "in_progress".
+        """
+        client = self._require_client()
+        with self._lock:
+            unfinished = [dict(b) for b in self._batches.values() if b["status"] not in _TERMINAL_STATUSES]
+
+        counts = {"completed": 0, "failed": 0, "requeued": 0, "in_progress": 0}
+        for record in unfinished:
+            batch = client.batches.retrieve(record["batch_id"])
+            if batch.status not in _TERMINAL_STATUSES:
+                counts["in_progress"] += 1
+                continue
+
+            results = []
+            for file_id in (getattr(batch, "output_file_id", None), getattr(batch, "error_file_id", None)):
+                if file_id:
+                    results.extend(self._parse_output(client.files.content(file_id).text))
+
+            with self._lock:
+                new_results = [r for r in results if r["custom_id"] not in self._results]
+                self._append_jsonl(self._results_path, new_results)
+                for result in new_results:
+                    self._results[result["custom_id"]] = result
+                    counts["completed" if result["success"] else "failed"] += 1
+                for custom_id in record["custom_ids"]:
+                    self._submitted.pop(custom_id, None)
+                    if custom_id not in self._results:
+                        counts["requeued"] += 1
+                record["status"] = batch.status
+                self._append_jsonl(self._batches_path, [record])
+                self._batches[record["batch_id"]] = record
+            if batch.status != "completed":
+                log_warning(f"LLM batch {record['batch_id']} ended with status '{batch.status}'")
+        log_info(f"Polled LLM batches: {counts}")
+        return counts
+
+    def wait(self, poll_interval: float = 60.0, timeout: Optional[float] = None) -> bool:
+        """
+        Poll until no submitted request is waiting for its result.
+
+        Returns:
+            bool: True if every batch finished, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.poll()
+            if self.outstanding_count() == 0:
+                return True
+            if deadline is not None and time.monotonic() + poll_interval > deadline:
+                return False
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def _parse_output(text: str) -> List[Dict[str, Any]]:
+        """Convert the lines of a batch output or error file into spool results."""
+        results = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                custom_id = item["custom_id"]
+            except (json.JSONDecodeError, KeyError) as e:
+                log_error(f"Unreadable line in LLM batch output: {e}")
+                continue
+            response = item.get("response") or {}
+            body = response.get("body") or {}
+            if response.get("status_code") == 200 and body.get("choices"):
+                content = (body["choices"][0].get("message") or {}).get("content") or ""
+                results.append({"custom_id": custom_id, "success": True, "response": content.strip()})
+            else:
+                error = item.get("error") or body.get("error") or f"HTTP {response.get('status_code')}"
+                message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                results.append({"custom_id": custom_id, "success": False, "error": f"Batch request failed: {message}"})
+        return results
+
+
+class LocalBatchService:
+    """
+    In-process stand-in for the OpenAI Files and Batches APIs.
+
+    Batches stay "in_progress" until process() answers every request with the
+    responder, which receives the request body and returns the reply text. Used
+    to test batch workflows and to dry-run them offline.
+    """
+
+    def __init__(self, responder: Optional[Callable[[Dict[str, Any]], str]] = None):
+        """
+        Initialize the service.
+
+        Args:
+            responder: Function from a request body to its reply. Defaults to
+                       echoing the last message.
+        """
+        self.responder = responder or (lambda body: f"Batch reply to: {body['messages'][-1]['content']}")
+        self._files: Dict[str, str] = {}
+        self._batches: Dict[str, SimpleNamespace] = {}
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def _create_file(self, file: Any, purpose: str) -> SimpleNamespace:
+        data = file.read()
+        file_id = f"file-local-{len(self._files) + 1}"
+        self._files[file_id] = data.decode("utf-8") if isinstance(data, bytes) else data
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    def _file_content(self, file_id: str) -> SimpleNamespace:
+        return SimpleNamespace(text=self._files[file_id])
+
+    def _create_batch(self, input_file_id: str, endpoint: str, completion_window: str,
+                      **kwargs: Any) -> SimpleNamespace:
+        batch = SimpleNamespace(id=f"batch-local-{len(self._batches) + 1}", status="in_progress",
+                                input_file_id=input_file_id, endpoint=endpoint,
+                                output_file_id=None, error_file_id=None)
+        self._batches[batch.id] = batch
+        return batch
+
+    def _retrieve_batch(self, batch_id: str) -> SimpleNamespace:
+        return self._batches[batch_id]
+
+    def process(self) -> int:
+        """
+        Answer every in-progress batch.
+
+        Returns:
+            int: The number of batches completed.
+        """
+        processed = 0
+        for batch in self._batches.values():
+            if batch.status != "in_progress":
+                continue
+            lines = []
+            for line in self._files[batch.input_file_id].splitlines():
+                request = json.loads(line)
+                try:
+                    content = self.responder(request["body"])
+                    response = {"status_code": 200, "body": {"choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": content}}
+                    ]}}
+                    lines.append({"custom_id": request["custom_id"], "response": response, "error": None})
+                except Exception as e:
+                    lines.append({"custom_id": request["custom_id"], "response": None,
+                                  "error": {"code": "local_error", "message": str(e)}})
+            file_id = f"file-local-{len(self._files) + 1}"
+            self._files[file_id] = "".join(json.dumps(line) + "\n" for line in lines)
+            batch.output_file_id = file_id
+            batch.status = "completed"
+            processed += 1
+        return processed
+
+
+def get_batch_spool() -> BatchSpool:
+    """
+    Get the shared batch spool, creating it from the configuration on first use.
+
+    The spool is registered in the services container as "llm_batch_spool" and
+    configured by the llm_batch section. With llm_batch.service "local" it submits
+    to a LocalBatchService instead of the OpenAI Batch API.
+
+    Returns:
+        BatchSpool: The shared spool.
+    """
+    from core.config import get
+    from core.services import get_services
+
+    services = get_services()
+    with _spool_lock:
+        if not services.has_service("llm_batch_spool"):
+            if get("llm_batch.service", "openai") == "local":
+                client = LocalBatchService()
+            else:
+                from core.llm.clients import get_openai_client
+
+                client = get_openai_client()
+            spool = BatchSpool(
+                spool_dir=get("llm_batch.spool_directory", None),
+                client=client,
+                completion_window=get("llm_batch.completion_window", "24h"),
+                max_requests_per_batch=get("llm_batch.max_requests_per_batch", 50000),
+            )
+            services.register_service(spool, BatchSpool, "llm_batch_spool")
+            log_info(f"LLM batch mode enabled (spool {spool.spool_dir})")
+        return services.get_service("llm_batch_spool")
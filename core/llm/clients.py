@@ -0,0 +1,254 @@
+"""
+Shared OpenAI and HTTP clients.
+
+Building an OpenAI client per tool call discards its connection pool, so every
+call pays for a new TCP connection and TLS handshake. OpenAIClientProvider keeps
+one pooled httpx client (sync and async) and hands out OpenAI clients built on
+top of it. The provider is registered in the ServicesContainer as
+"openai_clients"; tools get their clients through get_openai_client() and
+get_http_client().
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+# The OpenAI SDK and httpx are imported when the first client is built, so
+# importing the services container does not pay for them.
+
+
+class OpenAIClientProvider:
+    """
+    Creates and caches OpenAI and httpx clients sharing tuned connection pools.
+
+    Clients are cached per client class, so a subclass (or a test double patched
+    over a module's ``OpenAI`` name) gets its own shared instance.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        max_retries: int = 2,
+    ):
+        """
+        Initialize the provider. No client is created until first requested.
+
+        Args:
+            api_key: OpenAI API key, defaults to the OPENAI_API_KEY environment variable
+            base_url: Optional API base URL
+            max_connections: Maximum open connections per pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Default request timeout in seconds
+            connect_timeout: Connection timeout in seconds
+            max_retries: Retries performed by the OpenAI clients
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._http_client = None
+        self._sync_clients: Dict[Any, Any] = {}
+        # Async pools are bound to the event loop that uses them
+        self._async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Any, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_config(cls) -> "OpenAIClientProvider":
+        """
+        Create a provider from the ``openai_client`` configuration section.
+
+        Returns:
+            A configured OpenAIClientProvider
+        """
+        from core.config import get
+
+        settings = get("openai_client", {}) or {}
+        options = (
+            "base_url", "max_connections", "max_keepalive_connections",
+            "keepalive_expiry", "timeout", "connect_timeout", "max_retries",
+        )
+        return cls(api_key=get("llm_api_key"), **{key: settings[key] for key in options if key in settings})
+
+    def _client_settings(self) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        }
+
+    def _openai_kwargs(self, http_client: Any) -> Dict[str, Any]:
+        kwargs = {
+            "api_key": self.api_key or os.getenv("OPENAI_API_KEY"),
+            "max_retries": self.max_retries,
+            "http_client": http_client,
+        }
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return kwargs
+
+    def http_client(self) -> Any:
+        """
+        Get the shared synchronous httpx client.
+
+        Returns:
+            An httpx.Client with pooled keep-alive connections
+        """
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                import httpx
+
+                self._http_client = httpx.Client(**self._client_settings())
+            return self._http_client
+
+    def async_http_client(self) -> Any:
+        """
+        Get the asynchronous httpx client shared within the running event loop.
+
+        Returns:
+            An httpx.AsyncClient with pooled keep-alive connections
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_http_clients.get(loop)
+            if client is None or client.is_closed:
+                import httpx
+
+                client = self._async_http_clients[loop] = httpx.AsyncClient(**self._client_settings())
+            return client
+
+    def sync_client(self, client_class: Any = None) -> Any:
+        """
+        Get the shared synchronous OpenAI client.
+
+        Args:
+            client_class: OpenAI client class to instantiate, defaults to openai.OpenAI
+
+        Returns:
+            An OpenAI client using the shared connection pool
+        """
+        if client_class is None:
+            from openai import OpenAI as client_class
+
+        client = self._sync_clients.get(client_class)
+        if client is None:
+            http_client = self.http_client()
+            with self._lock:
+                client = self._sync_clients.get(client_class)
+                if client is None:
+                    client = client_class(**self._openai_kwargs(http_client))
+                    self._sync_clients[client_class] = client
+        return client
+
+    def async_client(self, client_class: Any = None) -> Any:
+        """
+        Get the asynchronous OpenAI client shared within the running event loop.
+
+        Must be called from a coroutine.
+
+        Args:
+            client_class: Async OpenAI client class to instantiate, defaults to openai.AsyncOpenAI
+
+        Returns:
+            An AsyncOpenAI client using the shared connection pool
+        """
+        if client_class is None:
+            from openai import AsyncOpenAI as client_class
+
+        http_client = self.async_http_client()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(client_class)
+            if client is None:
+                client = clients[client_class] = client_class(**self._openai_kwargs(http_client))
+            return client
+
+    def close(self) -> None:
+        """Close the synchronous pool and forget every cached client."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._sync_clients.clear()
+
+    async def aclose(self) -> None:
+        """Close the running loop's async pool and the synchronous pool."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            async_http_client = self._async_http_clients.pop(loop, None)
+            self._async_clients.pop(loop, None)
+        if async_http_client is not None:
+            await async_http_client.aclose()
+        self.close()
+
+
+def get_client_provider() -> OpenAIClientProvider:
+    """
+    Get the provider registered in the global services container.
+
+    Returns:
+        The shared OpenAIClientProvider
+    """
+    from core.services import get_services
+
+    return get_services().openai_clients
+
+
+def get_openai_client(client_class: Any = None) -> Any:
+    """
+    Get the shared synchronous OpenAI client.
+
+    Args:
+        client_class: OpenAI client class to instantiate, defaults to openai.OpenAI
+
+    Returns:
+        An OpenAI client using the shared connection pool
+    """
+    return get_client_provider().sync_client(client_class)
+
+
+def get_async_openai_client(client_class: Any = None) -> Any:
+    """
+    Get the shared asynchronous OpenAI client.
+
+    Args:
+        client_class: Async OpenAI client class to instantiate, defaults to openai.AsyncOpenAI
+
+    Returns:
+        An AsyncOpenAI client using the shared connection pool
+    """
+    return get_client_provider().async_client(client_class)
+
+
+def get_http_client() -> Any:
+    """
+    Get the shared synchronous httpx client.
+
+    Returns:
+        An httpx.Client with pooled keep-alive connections
+    """
+    return get_client_provider().http_client()
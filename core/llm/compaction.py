@@ -0,0 +1,261 @@
+"""
+Token-aware compaction of LLM prompts.
+
+Prompts often inline whole upstream outputs, such as search results or
+extracted documents, through ${task.output_data...} placeholders. An LLM task
+with a ``prompt_token_budget`` has its resolved prompt measured before the
+call. When the prompt is over budget, the values inserted into the template
+are shrunk until it fits. The engine records the value resolved for each
+placeholder, and the prompt is rebuilt from the template with the shrunk
+values, so the template's own text is never changed. Values
+smaller than their fair share of the budget are kept whole, and the rest of
+the budget is shared among the larger ones.
+
+Values are shrunk with the task's ``prompt_compaction`` method:
+
+- "truncate": keep the beginning and the end of the value.
+- "extract": keep the sentences that share the most words with the
+  template's own text (the instructions or question), in their original order.
+- "summarize": replace the value with an LLM summary of the allowed size. The
+  summary is cached per value and size. Truncation is the fallback.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.utils.document_chunker import count_tokens, truncate_tokens
+from core.utils.logger import log_info, log_warning
+
+COMPACTION_METHODS = ("truncate", "extract", "summarize")
+
+OMISSION_MARKER = "\n[... {tokens} tokens omitted ...]\n"
+SUMMARY_PROMPT = (
+    "Summarize the following text in at most {max_tokens} tokens. Keep the facts needed for this task: "
+    "{query}\n\n{text}"
+)
+
+_PLACEHOLDER = re.compile(r"\$\{[^}]+\}")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w{3,}")
+
+Summarizer = Callable[[str, int, str], Optional[str]]
+
+
+def split_template(template: str, values: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """
+    Split a prompt template into its own text and the values resolved into it.
+
+    Args:
+        template: The prompt as written in the task, with ${...} placeholders.
+        values: The resolved value of each placeholder, keyed by the placeholder as written.
+
+    Returns:
+        Tuple of (literals, inserted) where the resolved prompt is
+        literals[0] + inserted[0] + literals[1] + ... Placeholders without a value
+        stay in the literals as written.
+    """
+    literals, inserted = [""], []
+    position = 0
+    for match in _PLACEHOLDER.finditer(template):
+        literals[-1] += template[position:match.start()]
+        if match.group(0) in values:
+            inserted.append(values[match.group(0)])
+            literals.append("")
+        else:
+            literals[-1] += match.group(0)
+        position = match.end()
+    literals[-1] += template[position:]
+    return literals, inserted
+
+
+def _allowances(sizes: List[int], available: int) -> List[int]:
+    """Share available tokens among values: small values are kept whole, larger ones get equal shares."""
+    allowances = list(sizes)
+    remaining, count = max(0, available), len(sizes)
+    for index in sorted(range(len(sizes)), key=sizes.__getitem__):
+        allowances[index] = min(sizes[index], remaining // count)
+        remaining -= allowances[index]
+        count -= 1
+    return allowances
+
+
+def truncate_value(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Keep the beginning and the end of a text, marking how many tokens were left out."""
+    size = count_tokens(text, model)
+    if size <= max_tokens:
+        return text
+    keep = max_tokens - count_tokens(OMISSION_MARKER.format(tokens=size), model)
+    if keep <= 0:
+        return truncate_tokens(text, max_tokens, model)
+    head = truncate_tokens(text, keep - keep // 3, model)
+    tail = truncate_tokens(text, keep // 3, model, from_end=True) if keep // 3 else ""
+    return head + OMISSION_MARKER.format(tokens=size - keep) + tail
+
+
+def extract_value(text: str, max_tokens: int, query: str, model: Optional[str] = None) -> str:
+    """Keep the sentences of a text most relevant to the query, in their original order."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    sentences = [sentence for sentence in _SENTENCE.split(text) if sentence.strip()]
+    terms = {word.lower() for word in _WORD.findall(query)}
+
+    def score(index: int) -> Tuple[int, int]:
+        words = {word.lower() for word in _WORD.findall(sentences[index])}
+        return -len(words & terms), index  # Most shared words first, then earliest
+
+    chosen, used = [], 0
+    for index in sorted(range(len(sentences)), key=score):
+        cost = count_tokens(sentences[index], model) + 2  # Room for the separator
+        if used + cost <= max_tokens:
+            chosen.append(index)
+            used += cost
+    if not chosen:
+        return truncate_value(text, max_tokens, model)
+    chosen.sort()
+    parts = [sentences[chosen[0]]]
+    for previous, index in zip(chosen, chosen[1:]):
+        parts.append(" " if index == previous + 1 else " [...] ")
+        parts.append(sentences[index])
+    return "".join(parts)
+
+
+def compact_prompt(
+    template: str,
+    values: Dict[str, str],
+    budget: int,
+    method: str = "truncate",
+    model: Optional[str] = None,
+    summarize: Optional[Summarizer] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Resolve a prompt template, shrinking the values inserted into it until it fits a token budget.
+
+    Each value is compacted on its own before it is substituted, so the
+    template's text stays as written whatever the values contain.
+
+    Args:
+        template: The prompt as written in the task, with ${...} placeholders.
+        values: The resolved value of each placeholder, keyed by the placeholder as written.
+        budget: Maximum tokens of the prompt.
+        method: One of "truncate", "extract" or "summarize".
+        model: Model whose tokenizer counts the tokens.
+        summarize: For "summarize": function (text, max_tokens, query) returning a summary or None.
+
+    Returns:
+        Tuple of the prompt to send and a report with the budget, the method, the
+        original and compacted token counts, "tokens_saved" and "compacted_values".
+    """
+    if method not in COMPACTION_METHODS:
+        raise ValueError(f"Invalid compaction method '{method}'. Must be one of {list(COMPACTION_METHODS)}")
+    literals, inserted = split_template(template, values)
+    prompt = literals[0] + "".join(value + literal for value, literal in zip(inserted, literals[1:]))
+    original_tokens = count_tokens(prompt, model)
+    report = {"budget": budget, "method": method, "original_tokens": original_tokens,
+              "compacted_tokens": original_tokens, "tokens_saved": 0, "compacted_values": 0}
+    if original_tokens <= budget:
+        return prompt, report
+    if not inserted:
+        log_warning(f"Prompt of {original_tokens} tokens exceeds its budget of {budget}, "
+                    "but has no inserted values to shrink; sending it unchanged")
+        return prompt, report
+    query = " ".join(literals)
+    sizes = [count_tokens(value, model) for value in inserted]
+    allowances = _allowances(sizes, budget - count_tokens(query, model))
+
+    compacted = []
+    for value, size, allowance in zip(inserted, sizes, allowances):
+        if allowance >= size:
+            compacted.append(value)
+            continue
+        report["compacted_values"] += 1
+        if method == "extract":
+            compacted.append(extract_value(value, allowance, query, model))
+            continue
+        summary = summarize(value, allowance, query) if method == "summarize" and summarize else None
+        if summary is not None and count_tokens(summary, model) <= allowance:
+            compacted.append(summary)
+        else:
+            compacted.append(truncate_value(value, allowance, model))
+
+    result = literals[0] + "".join(value + literal for value, literal in zip(compacted, literals[1:]))
+    report["compacted_tokens"] = count_tokens(result, model)
+    report["tokens_saved"] = original_tokens - report["compacted_tokens"]
+    return result, report
+
+
+class CachedSummarizer:
+    """
+    Summarizes prompt values with an LLM, caching each summary on disk.
+
+    Summaries are stored in a ResultStore under a fingerprint of the value, the
+    requested size, the query and the model, so a value inserted again into a
+    prompt of the same task is not summarized twice.
+    """  # noqa: D202
+
+    def __init__(self, llm_interface: Any, directory: Optional[str] = None):
+        """
+        Initialize the summarizer.
+
+        Args:
+            llm_interface: The LLMInterface that writes the summaries.
+            directory: Directory of the summary cache; defaults to the configured one.
+        """
+        from core.config import get
+        from core.result_store import ResultStore
+
+        self.llm_interface = llm_interface
+        self.model = getattr(llm_interface, "model", None)
+        directory = directory or get("prompt_compaction.summary_cache_directory", "") or os.path.join(
+            get("data_directory", "./data"), "prompt_summaries")
+        self.store = ResultStore(directory)
+
+    def __call__(self, text: str, max_tokens: int, query: str) -> Optional[str]:
+        """Return a summary of at most max_tokens tokens, or None if the LLM call failed."""
+        payload = json.dumps({"text": text, "max_tokens": max_tokens, "query": query, "model": self.model})
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        cached = self.store.get(key)
+        if cached is not None:
+            return cached["summary"]
+        prompt = SUMMARY_PROMPT.format(max_tokens=max_tokens, query=query.strip(), text=text)
+        result = self.llm_interface.execute_llm_call(prompt, use_cache=False)
+        if not result.get("success"):
+            log_warning(f"Summarizing a prompt value failed, truncating it instead: {result.get('error')}")
+            return None
+        summary = result.get("response") or ""
+        self.store.put(key, "prompt_compaction", {"summary": summary})
+        return summary
+
+
+def compact_task_prompt(task: Any, prompt: Any, llm_interface: Any = None) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Apply a task's prompt token budget to its resolved prompt.
+
+    The prompt is rebuilt from the task's template and the placeholder values
+    the engine recorded in ``task.prompt_values`` while resolving it.
+
+    Args:
+        task: The LLM task; its ``prompt_token_budget`` and ``prompt_compaction`` are used.
+        prompt: The resolved prompt, sent unchanged when it needs no compaction.
+        llm_interface: The LLMInterface of the engine, used for its model and for summaries.
+
+    Returns:
+        Tuple of the prompt to send and the compaction report, or None if the task has no budget.
+    """
+    budget = getattr(task, "prompt_token_budget", None)
+    template = task.input_data.get("prompt") if isinstance(getattr(task, "input_data", None), dict) else None
+    if not budget or not isinstance(prompt, str) or not isinstance(template, str):
+        return prompt, None
+
+    method = getattr(task, "prompt_compaction", "truncate")
+    summarize = CachedSummarizer(llm_interface) if method == "summarize" and llm_interface is not None else None
+    compacted, report = compact_prompt(template, getattr(task, "prompt_values", {}), budget, method,
+                                       getattr(llm_interface, "model", None), summarize)
+    if not report["compacted_values"]:
+        return prompt, report
+    if report["tokens_saved"]:
+        log_info(f"Task '{task.id}': prompt compacted from {report['original_tokens']} to "
+                 f"{report['compacted_tokens']} tokens ({method}, budget {budget})")
+    return compacted, report
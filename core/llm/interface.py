@@ -1,22 +1,27 @@
 import os
 from typing import Any, Dict, List, Optional
 
-from openai import (  # Import necessary OpenAI classes
-    APIConnectionError,
-    APIError,
-    OpenAI,
-    RateLimitError,
-)
-
 from core.utils.logger import log_error, log_info
 
+# The OpenAI SDK is imported when the first interface is constructed rather than
+# at module import, so importing the engines does not pay for it.
+
 
 class LLMInterface:
     """
     Handles interactions with the configured Language Model API (e.g., OpenAI).
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    # Sampling parameters sent with every completion
+    sampling_params: Dict[str, Any] = {"max_tokens": 1500, "temperature": 0.7}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        semantic_cache: Any = None,
+        batch_spool: Any = None,
+    ):
         """
         Initializes the LLM interface client.
 
@@ -24,6 +29,11 @@ class LLMInterface:
             api_key: OpenAI API key. If None, attempts to read from
                      OPENAI_API_KEY environment variable.
             model: The specific model ID to use for completions.
+            semantic_cache: Optional SemanticCache consulted before each call. If None,
+                            the shared cache is used when semantic_cache.enabled is set.
+            batch_spool: Optional BatchSpool. When set, calls are spooled for batch
+                         submission instead of sent to the model. If None, the shared
+                         spool is used when llm_batch.enabled is set.
         """
         resolved_api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not resolved_api_key:
@@ -31,13 +41,113 @@ class LLMInterface:
             # Consider raising a more specific configuration error
             raise ValueError("OpenAI API key not found.")
         try:
+            from openai import OpenAI
+
             self.client = OpenAI(api_key=resolved_api_key)
             self.model = model
+            self.semantic_cache = semantic_cache if semantic_cache is not None else self._configured_cache()
+            self.batch_spool = batch_spool if batch_spool is not None else self._configured_batch_spool()
             log_info(f"LLMInterface initialized with model '{self.model}'.")
         except Exception as e:
             log_error(f"Failed to initialize OpenAI client: {e}", exc_info=True)
             raise ConnectionError(f"Failed to initialize OpenAI client: {e}")
 
+    def stream_llm_call(
+        self,
+        prompt: str,
+        system_message: str = "You are a helpful assistant.",
+        use_file_search: bool = False,
+        file_search_vector_store_ids: Optional[List[str]] = None,
+        file_search_max_results: int = 5,
+        use_cache: bool = True,
+        cache_threshold: Optional[float] = None,
+    ) -> Any:
+        """
+        Starts a streamed completion and returns its ResponseStream immediately.
+
+        Takes the same arguments as execute_llm_call. The completion is read in a
+        background thread; errors end the stream and are raised to its consumers.
+        Semantic cache hits and file search calls, which are not streamed, return
+        a finished stream holding the whole response.
+
+        Returns:
+            ResponseStream: The stream of response text chunks.
+        """
+        from core.llm.streaming import ResponseStream
+
+        if not prompt:
+            raise ValueError("Empty prompt received.")
+
+        if use_file_search:
+            result = self.execute_llm_call(
+                prompt, system_message, use_file_search, file_search_vector_store_ids, file_search_max_results
+            )
+            if not result.get("success"):
+                raise RuntimeError(result.get("error", "LLM call failed"))
+            return ResponseStream.from_text(result["response"])
+
+        cache = getattr(self, "semantic_cache", None) if use_cache else None
+        if cache is not None:
+            cached = cache.lookup(prompt, system_message, self.model, cache_threshold)
+            if cached is not None:
+                log_info(f"Semantic cache hit (similarity {cached['cache_similarity']}) for prompt: {prompt[:100]}...")
+                return ResponseStream.from_text(cached["response"])
+
+        def chunks():
+            log_info(f"Streaming prompt to model '{self.model}' (first 100 chars): {prompt[:100]}...")
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+                **self.sampling_params,
+            )
+            parts = []
+            for event in response:
+                delta = event.choices[0].delta.content if event.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            if cache is not None and parts:
+                cache.store(prompt, system_message, self.model, {"success": True, "response": "".join(parts).strip()})
+
+        return ResponseStream.from_iterable(chunks())
+
+    @staticmethod
+    def _configured_cache() -> Any:
+        """Returns the shared semantic cache if the configuration enables it."""
+        from core.config import get
+
+        if not get("semantic_cache.enabled", False):
+            return None
+        from core.llm.semantic_cache import get_semantic_cache
+
+        return get_semantic_cache()
+
+    @staticmethod
+    def _configured_batch_spool() -> Any:
+        """Returns the shared batch spool if the configuration enables batch mode."""
+        from core.config import get
+
+        if not get("llm_batch.enabled", False):
+            return None
+        from core.llm.batch import get_batch_spool
+
+        return get_batch_spool()
+
+    def _chat_request(self, prompt: str, system_message: str) -> Dict[str, Any]:
+        """Builds the chat completion parameters shared by direct and batched calls."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt},
+            ],
+            **self.sampling_params,
+        }
+
     def execute_llm_call(
         self,
         prompt: str,
@@ -45,38 +155,60 @@ class LLMInterface:
         use_file_search: bool = False,
         file_search_vector_store_ids: Optional[List[str]] = None,
         file_search_max_results: int = 5,
+        use_cache: bool = True,
+        cache_threshold: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Calls the configured OpenAI model with the given prompt and system message.
 
+        When a semantic cache is configured, a response cached for a similar prompt
+        with the same model and system message is returned without calling the model.
+        Calls using file search are never cached.
+
+        In batch mode (a batch_spool is set) the request is spooled instead and the
+        call returns {'success': False, 'suspended': True, 'batch_request_id': str}
+        until the batch holding it has completed; the same call then returns its result.
+        Calls using file search are never batched.
+
         Args:
             prompt: The user prompt for the LLM.
             system_message: The system message to guide the LLM's behavior.
             use_file_search: Whether to use the file_search tool.
             file_search_vector_store_ids: List of vector store IDs to search in.
             file_search_max_results: Maximum number of search results to return.
+            use_cache: Whether the semantic cache may answer and store this call.
+            cache_threshold: Similarity required for a cache hit; defaults to the cache's threshold.
 
         Returns:
             A dictionary containing:
             {'success': True, 'response': str, 'annotations': list} on success, or
-            {'success': False, 'error': str} on failure.
+            {'success': False, 'error': str} on failure. Cached responses also
+            contain 'cached': True and their 'cache_similarity'.
         """
         if not prompt:
             log_error("execute_llm_call received an empty prompt.")
             return {"success": False, "error": "Empty prompt received."}
 
+        cache = getattr(self, "semantic_cache", None) if use_cache and not use_file_search else None
+        if cache is not None:
+            cached = cache.lookup(prompt, system_message, self.model, cache_threshold)
+            if cached is not None:
+                log_info(f"Semantic cache hit (similarity {cached['cache_similarity']}) for prompt: {prompt[:100]}...")
+                return cached
+
+        spool = getattr(self, "batch_spool", None) if not use_file_search else None
+        if spool is not None:
+            result = spool.request(self._chat_request(prompt, system_message))
+            if result.get("success") and cache is not None:
+                cache.store(prompt, system_message, self.model, result)
+            return result
+
+        from openai import APIConnectionError, APIError, RateLimitError
+
         try:
             log_info(f"Sending prompt to model '{self.model}' (first 100 chars): {prompt[:100]}...")
 
-            request_params = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt},
-                ],
-                "max_tokens": 1500,  # Sensible default, make configurable if needed
-                "temperature": 0.7,  # Common default, make configurable if needed
-            }
+            request_params = self._chat_request(prompt, system_message)
 
             if use_file_search and file_search_vector_store_ids:
                 # Updated to match the new OpenAI API requirements for file search tool
@@ -125,7 +257,10 @@ class LLMInterface:
                         annotations = message.annotations
 
                     log_info(f"Received response from model (first 100 chars): {content[:100]}...")
-                    return {"success": True, "response": content, "annotations": annotations}
+                    result = {"success": True, "response": content, "annotations": annotations}
+                    if cache is not None:
+                        cache.store(prompt, system_message, self.model, result)
+                    return result
 
                 # Handle case where message has tool_calls but no content
                 elif hasattr(message, "tool_calls") and message.tool_calls:
@@ -0,0 +1,292 @@
+"""
+Semantic response cache for LLM calls.
+
+Prompts are normalized and embedded; a cached response is served when a
+previous prompt with the same model and system message is similar enough.
+Exact hits are keyed on the prompt with only its whitespace normalized, so
+prompts differing in punctuation or symbols ("x > 5" and "x < 5") never share
+an entry. Requires numpy.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from core.utils.logger import log_info
+
+_cache_lock = threading.Lock()
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s<>=+\-*/%^&|!~]+", re.UNICODE)
+_SYMBOL_RE = re.compile(r"([<>=+\-*/%^&|!~])")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def prompt_key(prompt: str) -> str:
+    """Collapse the whitespace of a prompt; the result keys exact cache hits."""
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Prepare a prompt for embedding.
+
+    Lowercases it and strips punctuation. Operator symbols are kept as words of
+    their own, so "x > 5" and "x < 5" are embedded differently.
+    """
+    text = _SYMBOL_RE.sub(r" \1 ", _PUNCTUATION_RE.sub(" ", prompt.lower()))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class _CacheEntry:
+    """A cached response and the scope and prompt it answers."""
+
+    __slots__ = ("key", "response", "size")
+
+    def __init__(self, key: Tuple[int, str], response: Dict[str, Any], size: int):
+        self.key = key
+        self.response = response
+        self.size = size
+
+
+class SemanticCache:
+    """
+    LRU cache of LLM responses keyed by prompt similarity.
+
+    Entries are partitioned by (model, system message). Their prompt embeddings
+    are rows of one NumPy matrix, so a lookup scores every entry of its
+    partition with a single matrix-vector product. Prompts identical up to
+    whitespace are answered without embedding. A threshold of 1.0 only accepts
+    such exact matches.
+    """
+
+    def __init__(
+        self,
+        embedder: Any = None,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        near_miss_margin: float = 0.05,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Object with ``dimension`` and ``embed(texts)`` returning unit
+                      vectors. Defaults to the embedder named by
+                      semantic_cache.embedding_model.
+            threshold: Default cosine similarity needed to serve a cached response.
+            max_entries: Maximum number of cached responses.
+            max_bytes: Maximum total characters of cached prompts and responses.
+            near_miss_margin: Misses whose best similarity is within this margin
+                              of the threshold are counted as near misses.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("Similarity threshold must be in (0, 1]")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if embedder is None:
+            from core.config import get
+            from tools.local_vs.embedders import create_embedder
+
+            embedder = create_embedder(get("semantic_cache.embedding_model", "hashing"))
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.near_miss_margin = near_miss_margin
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max_entries, embedder.dimension), dtype=np.float32)
+        # Scope of each row; -1 marks a free row
+        self._scopes = np.full(max_entries, -1, dtype=np.int64)
+        self._scope_ids: Dict[Tuple[str, str], int] = {}
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._rows_by_key: Dict[Tuple[int, str], int] = {}
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._bytes = 0
+        # Embeddings of recent missed prompts, reused when their response is stored
+        self._recent: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self._lookups = 0
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._near_misses = 0
+        self._similarity_sum = 0.0
+        self._min_similarity = 1.0
+        self._stores = 0
+        self._evictions = 0
+
+    def _scope(self, model: str, system_message: str, create: bool = False) -> Optional[int]:
+        scope = self._scope_ids.get((model, system_message))
+        if scope is None and create:
+            scope = self._scope_ids[(model, system_message)] = len(self._scope_ids)
+        return scope
+
+    def _embed(self, normalized: str) -> np.ndarray:
+        return np.asarray(self.embedder.embed([normalized])[0], dtype=np.float32)
+
+    def lookup(self, prompt: str, system_message: str, model: str,
+               threshold: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached response for a prompt.
+
+        Args:
+            prompt: The user prompt.
+            system_message: The system message of the call.
+            model: The model of the call.
+            threshold: Similarity needed for this lookup; defaults to the cache threshold.
+
+        Returns:
+            Optional[Dict]: A copy of the cached response with "cached": True and its
+            "cache_similarity", or None on a miss.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        key_text = prompt_key(prompt)
+
+        with self._lock:
+            self._lookups += 1
+            scope = self._scope(model, system_message)
+            if scope is None:
+                return None
+            row = self._rows_by_key.get((scope, key_text))
+            if row is not None:
+                self._exact_hits += 1
+                return self._hit(row, 1.0)
+
+        vector = self._embed(normalize_prompt(prompt))
+
+        with self._lock:
+            rows = np.flatnonzero(self._scopes == scope)
+            best_row, similarity = None, -1.0
+            if len(rows):
+                scores = self._vectors[rows] @ vector
+                best = int(np.argmax(scores))
+                best_row, similarity = int(rows[best]), float(scores[best])
+            # Distinct prompts can embed identically, so a threshold of 1.0 accepts exact keys only
+            if best_row is not None and similarity >= threshold and threshold < 1.0:
+                self._semantic_hits += 1
+                return self._hit(best_row, similarity)
+
+            if similarity >= threshold - self.near_miss_margin:
+                self._near_misses += 1
+            self._recent[key_text] = vector
+            if len(self._recent) > 64:
+                self._recent.popitem(last=False)
+            return None
+
+    def _hit(self, row: int, similarity: float) -> Dict[str, Any]:
+        self._entries.move_to_end(row)
+        self._similarity_sum += similarity
+        self._min_similarity = min(self._min_similarity, similarity)
+        response = dict(self._entries[row].response)
+        response["cached"] = True
+        response["cache_similarity"] = round(similarity, 4)
+        return response
+
+    def store(self, prompt: str, system_message: str, model: str, response: Dict[str, Any]) -> None:
+        """
+        Cache a successful response.
+
+        Args:
+            prompt: The user prompt.
+            system_message: The system message of the call.
+            model: The model of the call.
+            response: The result of the LLM call.
+        """
+        key_text = prompt_key(prompt)
+        size = len(key_text) + len(str(response.get("response", "")))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            vector = self._recent.pop(key_text, None)
+        if vector is None:
+            vector = self._embed(normalize_prompt(prompt))
+
+        with self._lock:
+            scope = self._scope(model, system_message, create=True)
+            key = (scope, key_text)
+            if key in self._rows_by_key:
+                self._remove(self._rows_by_key[key])
+            while not self._free or self._bytes + size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+            row = self._free.pop()
+            self._vectors[row] = vector
+            self._scopes[row] = scope
+            self._entries[row] = _CacheEntry(key, dict(response), size)
+            self._rows_by_key[key] = row
+            self._bytes += size
+            self._stores += 1
+
+    def _remove(self, row: int) -> None:
+        entry = self._entries.pop(row)
+        del self._rows_by_key[entry.key]
+        self._scopes[row] = -1
+        self._bytes -= entry.size
+        self._free.append(row)
+
+    def clear(self) -> None:
+        """Drop every cached response; metrics are kept."""
+        with self._lock:
+            for row in list(self._entries):
+                self._remove(row)
+            self._recent.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness and hit quality.
+
+        Returns:
+            Dict: Lookup, hit and miss counts, the hit rate, the mean and minimum
+            similarity of hits, near misses, stores, evictions and current size.
+        """
+        with self._lock:
+            hits = self._exact_hits + self._semantic_hits
+            return {
+                "lookups": self._lookups,
+                "hits": hits,
+                "exact_hits": self._exact_hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._lookups - hits,
+                "hit_rate": hits / self._lookups if self._lookups else 0.0,
+                "mean_hit_similarity": self._similarity_sum / hits if hits else None,
+                "min_hit_similarity": self._min_similarity if hits else None,
+                "near_misses": self._near_misses,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "threshold": self.threshold,
+            }
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Get the shared semantic cache, creating it from the configuration on first use.
+
+    The cache is registered in the services container as "semantic_cache" and
+    configured by the semantic_cache section.
+
+    Returns:
+        SemanticCache: The shared cache.
+    """
+    from core.config import get
+    from core.services import get_services
+
+    services = get_services()
+    with _cache_lock:
+        if not services.has_service("semantic_cache"):
+            cache = SemanticCache(
+                threshold=get("semantic_cache.threshold", 0.92),
+                max_entries=get("semantic_cache.max_entries", 1000),
+                max_bytes=get("semantic_cache.max_bytes", 16 * 1024 * 1024),
+            )
+            services.register_service(cache, SemanticCache, "semantic_cache")
+            log_info(f"Semantic LLM cache enabled (threshold {cache.threshold}, {cache.max_entries} entries)")
+        return services.get_service("semantic_cache")
@@ -0,0 +1,261 @@
+"""
+Streaming of LLM responses to downstream tasks.
+
+A streaming LLM task completes as soon as its completion starts, with a
+ResponseStream in output_data["response_stream"]. Tasks created with
+accepts_stream=True that reference ${task.output_data.response_stream} read the
+chunks as they arrive. The engines materialize the full "response" before any
+other task reads it, and for every stream when the workflow ends.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+_REFERENCE_RE = r"\$\{{\s*{task_id}\.(?:output_data\.)?(\w+)"
+
+
+class ResponseStream:
+    """
+    Replayable, thread-safe stream of text chunks.
+
+    Any number of consumers can iterate the stream, synchronously from worker
+    threads or asynchronously on an event loop; each consumer sees every chunk
+    from the start. The producer runs in its own thread, so consumers never
+    block it.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.started_at = time.monotonic()
+        self.first_chunk_at: Optional[float] = None
+
+    @classmethod
+    def from_iterable(cls, source: Iterable[str], name: str = "llm-stream") -> "ResponseStream":
+        """
+        Stream the chunks of a (blocking) iterable, consumed in a background thread.
+
+        Args:
+            source: Iterable of text chunks.
+            name: Name of the producer thread.
+
+        Returns:
+            ResponseStream: The started stream.
+        """
+        stream = cls()
+
+        def pump():
+            try:
+                for chunk in source:
+                    stream.put(chunk)
+            except BaseException as e:
+                stream.close(e)
+            else:
+                stream.close()
+
+        threading.Thread(target=pump, name=name, daemon=True).start()
+        return stream
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResponseStream":
+        """Create a finished stream holding one chunk."""
+        stream = cls()
+        stream.put(text)
+        stream.close()
+        return stream
+
+    def put(self, chunk: str) -> None:
+        """Append a chunk and wake up consumers."""
+        with self._condition:
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.monotonic()
+            self._chunks.append(chunk)
+            self._wake()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Mark the stream finished, optionally with the error that ended it."""
+        with self._condition:
+            self._done = True
+            self._error = error
+            self._wake()
+
+    def _wake(self) -> None:
+        self._condition.notify_all()
+        for loop, future in self._waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        self._waiters.clear()
+
+    @property
+    def done(self) -> bool:
+        """Whether the producer has finished."""
+        return self._done
+
+    @property
+    def time_to_first_chunk(self) -> Optional[float]:
+        """Seconds from the start of the stream to its first chunk."""
+        return None if self.first_chunk_at is None else self.first_chunk_at - self.started_at
+
+    def _next(self, index: int) -> Tuple[Optional[str], bool]:
+        """Return (chunk, finished) for position index without waiting; caller holds the lock."""
+        if index < len(self._chunks):
+            return self._chunks[index], False
+        if self._done:
+            if self._error is not None:
+                raise self._error
+            return None, True
+        return None, False
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the chunks, blocking until each arrives. Do not use on the event loop thread."""
+        index = 0
+        while True:
+            with self._condition:
+                chunk, finished = self._next(index)
+                while chunk is None and not finished:
+                    self._condition.wait()
+                    chunk, finished = self._next(index)
+            if finished:
+                return
+            index += 1
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        """Iterate the chunks without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        index = 0
+        while True:
+            with self._condition:
+                chunk, finished = self._next(index)
+                if chunk is None and not finished:
+                    future = loop.create_future()
+                    self._waiters.append((loop, future))
+            if finished:
+                return
+            if chunk is None:
+                await future
+                continue
+            index += 1
+            yield chunk
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        """
+        Wait for the stream to finish and return its full text.
+
+        Args:
+            timeout: Maximum seconds to wait.
+
+        Raises:
+            TimeoutError: If the stream is not finished within timeout.
+            Exception: The error that ended the stream, if any.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._done, timeout):
+                raise TimeoutError("Response stream did not finish in time")
+            if self._error is not None:
+                raise self._error
+            return "".join(self._chunks)
+
+    async def text(self) -> str:
+        """Wait for the stream to finish without blocking the event loop and return its full text."""
+        async for _ in self:
+            pass
+        return self.result()
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def unmaterialized_stream(task: Any) -> Optional[ResponseStream]:
+    """Return the response stream of a task whose full response has not been set yet."""
+    output = getattr(task, "output_data", None)
+    if not isinstance(output, dict) or "response_stream" not in output:
+        return None
+    if output.get("metadata", {}).get("stream_materialized"):
+        return None
+    return output["response_stream"]
+
+
+def attach_stream(task: Any, stream: ResponseStream) -> None:
+    """Publish a response stream in a task's output; its response is set on materialization."""
+    task.output_data["response_stream"] = stream
+    task.output_data.setdefault("metadata", {})["stream_materialized"] = False
+
+
+def materialize(task: Any, text: str) -> None:
+    """Set the full response of a streamed task."""
+    task.output_data["response"] = text
+    task.output_data["result"] = text
+    task.output_data["metadata"]["stream_materialized"] = True
+    task.output_data["metadata"]["time_to_first_chunk"] = task.output_data["response_stream"].time_to_first_chunk
+
+
+def release_streams(tasks: Iterable[Any]) -> None:
+    """Remove response and item streams from task outputs once the workflow no longer needs them."""
+    for task in tasks:
+        output = getattr(task, "output_data", None)
+        if isinstance(output, dict):
+            output.pop("response_stream", None)
+            output.pop("item_stream", None)
+
+
+def contains_stream(value: Any) -> bool:
+    """Tell whether a resolved task input holds a response stream."""
+    if isinstance(value, ResponseStream):
+        return True
+    if isinstance(value, dict):
+        return any(contains_stream(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(contains_stream(item) for item in value)
+    return False
+
+
+def streams_needed_by(task: Any, tasks: Iterable[Any]) -> List[Any]:
+    """
+    List the streamed tasks whose full response must be materialized before task runs.
+
+    A task that accepts streams reads ``response_stream`` references live; any
+    other reference to a streamed task's output needs its full response.
+
+    Args:
+        task: The task about to run.
+        tasks: All tasks of the workflow.
+
+    Returns:
+        List: The streamed tasks to materialize first.
+    """
+    accepts_stream = getattr(task, "accepts_stream", False)
+    needed = []
+    for other in tasks:
+        if other is task or unmaterialized_stream(other) is None:
+            continue
+        fields = referenced_fields(task, other.id)
+        if fields and not (accepts_stream and all(field == "response_stream" for field in fields)):
+            needed.append(other)
+    return needed
+
+
+def referenced_fields(task: Any, task_id: str) -> List[str]:
+    """List the output fields of task_id that a task's input references."""
+    text = _input_text(getattr(task, "input_data", None))
+    if "${" not in text:
+        return []
+    return re.findall(_REFERENCE_RE.format(task_id=re.escape(task_id)), text)
+
+
+def _input_text(value: Any) -> str:
+    """Concatenate the strings of a task input, where references may appear."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "\n".join(_input_text(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return "\n".join(_input_text(item) for item in value)
+    return ""
@@ -10,7 +10,9 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, List, Any, Optional, Callable, Union, Tuple
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Any, Optional, Callable, Union, Tuple
 import os
 from pathlib import Path
 
@@ -29,6 +31,9 @@ from core.mcp.schema import (
     MCPConfig
 )
 
+if TYPE_CHECKING:
+    from core.mcp.stdio_transport import StdioMCPClient
+
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +54,84 @@ class ToolExecutionError(MCPError):
     """Error al ejecutar una herramienta"""
     pass
 
+class _RetryableResponseError(MCPError):
+    """Respuesta de error del servidor que puede reintentarse"""
+    
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self.text = text
+        super().__init__(f"{status} - {text}")
+
+
+# Connector settings shared by every MCP HTTP session
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 20
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# Minimum latency samples for a tool before hedged requests are sent
+HEDGE_MIN_SAMPLES = 20
+
+_shared_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def create_connector(
+    limit: int = DEFAULT_CONNECTION_LIMIT,
+    limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+) -> aiohttp.TCPConnector:
+    """
+    Create a TCP connector tuned for MCP traffic.
+    
+    Args:
+        limit: Maximum number of open connections
+        limit_per_host: Maximum number of open connections per host
+        dns_cache_ttl: Seconds DNS results are cached
+        keepalive_timeout: Seconds idle connections are kept open for reuse
+        
+    Returns:
+        A new connector; must be created inside a running event loop
+    """
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+    )
+
+
+def get_shared_connector(**settings: Any) -> aiohttp.TCPConnector:
+    """
+    Get the connector shared by MCP sessions on the running event loop.
+    
+    Sharing one connector lets clients and gateway sessions reuse keep-alive
+    connections and DNS lookups. Settings only apply when the connector is
+    first created for a loop.
+    
+    Args:
+        **settings: Arguments for create_connector
+        
+    Returns:
+        The shared connector for the current event loop
+    """
+    loop = asyncio.get_running_loop()
+    connector = _shared_connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = create_connector(**settings)
+        _shared_connectors[loop] = connector
+    return connector
+
+
+async def close_shared_connector() -> None:
+    """Close the shared connector of the running event loop, if any."""
+    connector = _shared_connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None and not connector.closed:
+        await connector.close()
+
 
 class MCPClient:
     """
@@ -63,6 +146,10 @@ class MCPClient:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         notification_handler: Optional[Callable] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        hedge_tools: Optional[Iterable[str]] = None,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.05,
     ):
         """
         Initialize an MCP client.
@@ -74,6 +161,11 @@ class MCPClient:
             max_retries: Maximum number of retries for failed requests
             retry_delay: Wait time between retries (seconds)
             notification_handler: Function for handling notifications from the server
+            connector: Connector to use, defaults to the shared MCP connector
+            hedge_tools: Idempotent tools that may be sent a second time when the
+                         first attempt is slower than usual
+            hedge_quantile: Latency quantile after which a hedged attempt is sent
+            hedge_min_delay: Minimum delay (seconds) before sending a hedged attempt
         """
         self.server_url = server_url.rstrip("/")
         self.api_key = api_key
@@ -81,10 +173,17 @@ class MCPClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.notification_handler = notification_handler
+        self.connector = connector
+        self.hedge_tools = set(hedge_tools or [])
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self._latencies: Dict[str, Deque[float]] = {}
         
         self.session = None
         self.connected = False
         self._available_tools = None
+        # None until the server has been asked for /execute_batch
+        self._batch_supported: Optional[bool] = None
     
     async def connect(self) -> bool:
         """
@@ -98,6 +197,8 @@ class MCPClient:
             
         try:
             self.session = aiohttp.ClientSession(
+                connector=self.connector or get_shared_connector(),
+                connector_owner=False,
                 timeout=aiohttp.ClientTimeout(total=self.timeout),
                 headers=self._get_headers()
             )
@@ -185,25 +286,21 @@ class MCPClient:
         retry_count = 0
         while retry_count <= self.max_retries:
             try:
-                async with self.session.post(
-                    f"{self.server_url}/execute",
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    elif response.status == 401:
-                        raise AuthenticationError("Credenciales inválidas")
-                    elif response.status == 404:
-                        raise ToolExecutionError(f"Herramienta no encontrada: {tool_name}")
-                    else:
-                        error_text = await response.text()
-                        logger.warning(f"Error al ejecutar herramienta (intento {retry_count+1}/{self.max_retries+1}): {response.status} - {error_text}")
+                if tool_name in self.hedge_tools:
+                    return await self._execute_hedged(tool_name, payload)
+                return await self._execute_once(tool_name, payload)
                         
-                        if retry_count >= self.max_retries:
-                            raise ToolExecutionError(f"Error al ejecutar herramienta: {response.status} - {error_text}")
-                        
-                        retry_count += 1
-                        await asyncio.sleep(self.retry_delay)
+            except _RetryableResponseError as e:
+                logger.warning(
+                    f"Error al ejecutar herramienta (intento {retry_count+1}/{self.max_retries+1}): "
+                    f"{e.status} - {e.text}"
+                )
+                
+                if retry_count >= self.max_retries:
+                    raise ToolExecutionError(f"Error al ejecutar herramienta: {e.status} - {e.text}")
+                
+                retry_count += 1
+                await asyncio.sleep(self.retry_delay)
                         
             except aiohttp.ClientError as e:
                 logger.warning(f"Error de conexión (intento {retry_count+1}/{self.max_retries+1}): {str(e)}")
@@ -214,6 +311,180 @@ class MCPClient:
                 retry_count += 1
                 await asyncio.sleep(self.retry_delay)
     
+    async def _execute_once(self, tool_name: str, payload: Dict[str, Any], record: bool = True) -> Dict[str, Any]:
+        """
+        Send a single /execute request and, if record is set, record its latency.
+        
+        Raises:
+            AuthenticationError: If the credentials are rejected
+            ToolExecutionError: If the tool does not exist
+            _RetryableResponseError: For other error responses
+        """
+        start = time.monotonic()
+        async with self.session.post(
+            f"{self.server_url}/execute",
+            json=payload
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                if record:
+                    self._record_latency(tool_name, time.monotonic() - start)
+                return result
+            elif response.status == 401:
+                raise AuthenticationError("Credenciales inválidas")
+            elif response.status == 404:
+                raise ToolExecutionError(f"Herramienta no encontrada: {tool_name}")
+            else:
+                raise _RetryableResponseError(response.status, await response.text())
+    
+    async def _execute_hedged(self, tool_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a request and, if it is slower than usual, a second identical one.
+        
+        The first successful response wins and the other attempt is cancelled.
+        Hedging starts once enough latency samples exist for the tool. The
+        latency recorded is the time since the first attempt was sent, so slow
+        attempts that lose to a hedge still raise the quantile.
+        """
+        delay = self.hedge_delay(tool_name)
+        if delay is None:
+            return await self._execute_once(tool_name, payload)
+        
+        start = time.monotonic()
+        attempts = {asyncio.ensure_future(self._execute_once(tool_name, payload, record=False))}
+        done, _ = await asyncio.wait(attempts, timeout=delay)
+        if not done:
+            logger.debug(f"Enviando petición duplicada para {tool_name} tras {delay:.3f}s")
+            attempts.add(asyncio.ensure_future(self._execute_once(tool_name, payload, record=False)))
+        
+        pending = attempts
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        self._record_latency(tool_name, time.monotonic() - start)
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+    
+    def hedge_delay(self, tool_name: str) -> Optional[float]:
+        """
+        Get the delay after which a hedged attempt is sent for a tool.
+        
+        Args:
+            tool_name: Name of the tool
+            
+        Returns:
+            The hedge_quantile latency of recent calls (at least hedge_min_delay),
+            or None if too few calls have been observed
+        """
+        samples = self._latencies.get(tool_name)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return max(self.hedge_min_delay, ordered[int(self.hedge_quantile * (len(ordered) - 1))])
+    
+    def _record_latency(self, tool_name: str, latency: float) -> None:
+        samples = self._latencies.get(tool_name)
+        if samples is None:
+            samples = self._latencies[tool_name] = deque(maxlen=200)
+        samples.append(latency)
+    
+    async def health_check(self) -> bool:
+        """
+        Check whether the server responds to /health.
+        
+        Returns:
+            True if the server is healthy, False otherwise
+        """
+        if not self.connected:
+            return False
+        try:
+            async with self.session.get(f"{self.server_url}/health") as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Error al comprobar el estado de {self.server_url}: {str(e)}")
+            return False
+    
+    async def call_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        max_concurrency: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Call several tools on the MCP server in a single request.
+        
+        Uses the server's /execute_batch endpoint. If the server does not
+        support it, the calls are made concurrently through call_tool instead.
+        
+        Args:
+            calls: List of {"tool": name, "parameters": {...}} dictionaries
+            max_concurrency: Maximum concurrent calls when falling back to call_tool
+            
+        Returns:
+            One result per call, in order. Failed calls have status "error" and a message.
+            
+        Raises:
+            ConnectionError: If not connected to the server
+            AuthenticationError: If the credentials are rejected
+        """
+        if not self.connected:
+            raise ConnectionError("No hay conexión con el servidor")
+        
+        if not calls:
+            return []
+        
+        payload = {
+            "requests": [
+                {"tool": call["tool"], "parameters": call.get("parameters", {})}
+                for call in calls
+            ]
+        }
+        
+        if self._batch_supported is not False:
+            try:
+                async with self.session.post(
+                    f"{self.server_url}/execute_batch",
+                    json=payload
+                ) as response:
+                    if response.status == 200:
+                        self._batch_supported = True
+                        data = await response.json()
+                        results = data.get("results") if isinstance(data, dict) else None
+                        if isinstance(results, list) and len(results) == len(calls):
+                            return results
+                        logger.warning("Respuesta de lote inválida; se usarán llamadas individuales")
+                    elif response.status == 401:
+                        raise AuthenticationError("Credenciales inválidas")
+                    elif response.status in (404, 405):
+                        self._batch_supported = False
+                    else:
+                        error_text = await response.text()
+                        logger.warning(f"Error en /execute_batch: {response.status} - {error_text}")
+            except aiohttp.ClientError as e:
+                logger.warning(f"Error de conexión en /execute_batch: {str(e)}")
+        
+        # Fallback: concurrent single calls
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def call_single(index: int, call: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self.call_tool(call["tool"], call.get("parameters", {}))
+                except MCPError as e:
+                    return {"index": index, "tool": call["tool"], "status": "error", "message": str(e)}
+            item = dict(result) if isinstance(result, dict) else {"status": "success", "result": result}
+            item.setdefault("status", "success")
+            item.update({"index": index, "tool": call["tool"]})
+            return item
+        
+        return list(await asyncio.gather(*(call_single(i, call) for i, call in enumerate(calls))))
+    
     def _get_headers(self) -> Dict[str, str]:
         """
         Genera los encabezados HTTP para las peticiones.
@@ -245,8 +516,9 @@ class MCPService:
             config: Service configuration
         """
         self.config = config
-        self.clients: Dict[str, MCPClient] = {}
+        self.clients: Dict[str, Union[MCPClient, "StdioMCPClient"]] = {}
         self.default_server = config.get("default_server")
+        self.connector: Optional[aiohttp.TCPConnector] = None
         
         # Configurar nivel de log
         log_level = config.get("log_level", "INFO")
@@ -254,15 +526,40 @@ class MCPService:
         
         # Inicializar clientes
         for server_name, server_config in config.get("servers", {}).items():
-            self.clients[server_name] = MCPClient(
-                server_url=server_config["url"],
-                api_key=server_config.get("api_key"),
-                timeout=server_config.get("timeout", 30),
-                max_retries=server_config.get("max_retries", 3),
-                retry_delay=server_config.get("retry_delay", 1.0)
-            )
+            self.clients[server_name] = self._create_client(server_name, server_config)
+    
+    @staticmethod
+    def _create_client(server_name: str, server_config: Dict[str, Any]) -> Union[MCPClient, "StdioMCPClient"]:
+        """
+        Create the client for a configured server.
+        
+        Servers with "type": "stdio" get a StdioMCPClient built from their
+        "stdio_config"; the others are reached over HTTP at their "url".
+        
+        Args:
+            server_name: Name of the server
+            server_config: Configuration of the server
+            
+        Returns:
+            MCP client instance
+        """
+        if server_config.get("type") == "stdio":
+            # Importación diferida: stdio_transport importa este módulo
+            from core.mcp.config import MCPServerConfig as TransportServerConfig
+            from core.mcp.stdio_transport import StdioMCPClient
+            
+            transport_config = {key: value for key, value in server_config.items() if key != "alias"}
+            return StdioMCPClient.from_server_config(TransportServerConfig(alias=server_name, **transport_config))
+        return MCPClient(
+            server_url=server_config["url"],
+            api_key=server_config.get("api_key"),
+            timeout=server_config.get("timeout", 30),
+            max_retries=server_config.get("max_retries", 3),
+            retry_delay=server_config.get("retry_delay", 1.0),
+            hedge_tools=server_config.get("hedge_tools")
+        )
     
-    def get_client(self, server_name: Optional[str] = None) -> MCPClient:
+    def get_client(self, server_name: Optional[str] = None) -> Union[MCPClient, "StdioMCPClient"]:
         """
         Get or create an MCP client for the specified server.
         
@@ -292,21 +589,45 @@ class MCPService:
         Returns:
             Dictionary mapping server names to connection status (True/False)
         """
-        results = {}
+        if self.connector is None or self.connector.closed:
+            # One connector for all servers, sized by max_connections per host
+            self.connector = create_connector(
+                limit_per_host=self.config.get("max_connections", DEFAULT_CONNECTION_LIMIT_PER_HOST)
+            )
         
-        for server_name, client in self.clients.items():
+        async def connect(server_name: str, client: Union[MCPClient, "StdioMCPClient"]) -> bool:
+            # Los clientes stdio no usan HTTP ni el conector compartido
+            if isinstance(client, MCPClient) and client.connector is None:
+                client.connector = self.connector
             try:
-                results[server_name] = await client.connect()
+                return await client.connect()
             except ConnectionError as e:
                 logger.error(f"Error al conectar con {server_name}: {str(e)}")
-                results[server_name] = False
+                return False
         
-        return results
+        # Connect concurrently so one slow server does not delay the others
+        statuses = await asyncio.gather(*(connect(name, client) for name, client in self.clients.items()))
+        return dict(zip(self.clients, statuses))
+    
+    async def health_check_all(self) -> Dict[str, bool]:
+        """
+        Check the health of all connected servers concurrently.
+        
+        Returns:
+            Dictionary mapping server names to health status (True/False)
+        """
+        statuses = await asyncio.gather(*(client.health_check() for client in self.clients.values()))
+        return dict(zip(self.clients, statuses))
     
     async def disconnect_all(self) -> None:
         """Disconnect from all servers."""
-        for client in self.clients.values():
-            await client.disconnect()
+        await asyncio.gather(*(client.disconnect() for client in self.clients.values()))
+        if self.connector is not None:
+            for client in self.clients.values():
+                if getattr(client, "connector", None) is self.connector:
+                    client.connector = None
+            await self.connector.close()
+            self.connector = None
     
     async def list_all_tools(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -25,6 +25,10 @@ class MCPStdioConfig(BaseModel):
     args: List[str] = Field(default_factory=list, description="Arguments for the command.")
     env: Dict[str, str] = Field(default_factory=dict, description="Environment variables for the process.")
     cwd: Optional[str] = None
+    pool_size: int = Field(1, ge=1, description="Number of server processes kept running.")
+    max_in_flight: int = Field(64, ge=1, description="Maximum concurrent requests per server process.")
+    request_timeout: float = Field(30.0, gt=0, description="Seconds to wait for a response.")
+    max_restarts: int = Field(5, ge=0, description="Consecutive failed restarts before giving up.")
 
     @validator('command')
     def command_must_be_executable(cls, v):
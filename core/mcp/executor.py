@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Execution of framework tools for the MCP gateway.
+
+This module runs tools from the ToolRegistry and handlers from the
+HandlerRegistry on behalf of the MCP service. Blocking tools run in a bounded
+thread or process pool, each tool has its own concurrency limit, and requests
+are rejected early when queues are full so the gateway degrades with clear
+429/503 responses instead of unbounded latency.
+"""  # noqa: D202
+
+import asyncio
+import concurrent.futures
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from core.mcp.client import MCPError, ToolExecutionError
+
+
+logger = logging.getLogger("mcp.executor")
+
+
+class AdmissionError(MCPError):
+    """Request rejected because the gateway is at capacity"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int = 1):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class ToolTimeoutError(MCPError):
+    """Tool did not finish within the request timeout"""
+    pass
+
+
+def _execute_in_worker(kind: str, name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a tool or handler with the registries of the current (worker) process."""
+    from core.services import get_services
+
+    services = get_services()
+    if kind == "handler":
+        return _run_handler(services.handler_registry, name, parameters)
+    return services.tool_registry.execute_tool(name, parameters)
+
+
+def _run_handler(handler_registry: Any, name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a handler and convert its result or exception to the standard response format."""
+    from core.tools.response_format import format_tool_response
+
+    try:
+        return format_tool_response(handler_registry.execute_handler(name, parameters))
+    except Exception as e:
+        return {"success": False, "status": "error", "error": str(e), "error_type": type(e).__name__}
+
+
+class ToolExecutor:
+    """
+    Runs registry tools and handlers with bounded concurrency.
+
+    Every admitted call holds a slot until its worker finishes, even after its
+    request timed out, so the limits always reflect the work actually running.
+    """  # noqa: D202
+
+    def __init__(
+        self,
+        tool_registry: Any = None,
+        handler_registry: Any = None,
+        workers: int = 8,
+        mode: str = "thread",
+        tool_concurrency: int = 4,
+        tool_concurrency_limits: Optional[Dict[str, int]] = None,
+        max_queue_depth: int = 64,
+        max_tool_queue_depth: int = 16,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize a new ToolExecutor.
+
+        Args:
+            tool_registry: Registry of tools, defaults to the services container's
+            handler_registry: Registry of handlers, defaults to the services container's
+            workers: Number of worker threads or processes
+            mode: "thread", or "process" to run tools in a process pool using
+                  each worker process's own registries
+            tool_concurrency: Default maximum concurrent executions per tool
+            tool_concurrency_limits: Per-tool overrides of tool_concurrency
+            max_queue_depth: Calls allowed to wait beyond the worker count before
+                             new calls are rejected with 503
+            max_tool_queue_depth: Calls allowed to wait for a busy tool before new
+                                  calls to it are rejected with 429
+            timeout: Seconds a request waits for its result
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Modo de ejecución no válido: {mode}")
+
+        self._tool_registry = tool_registry
+        self._handler_registry = handler_registry
+        self.workers = workers
+        self.mode = mode
+        self.tool_concurrency = tool_concurrency
+        self.tool_concurrency_limits = tool_concurrency_limits or {}
+        self.max_queue_depth = max_queue_depth
+        self.max_tool_queue_depth = max_tool_queue_depth
+        self.timeout = timeout
+
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._tool_slots: Dict[str, asyncio.Semaphore] = {}
+        self._tool_admitted: Dict[str, int] = {}
+        self._admitted = 0
+        self.rejected = 0
+
+    @property
+    def tool_registry(self) -> Any:
+        """The tool registry, taken from the services container if none was given."""
+        if self._tool_registry is None:
+            from core.services import get_services
+            self._tool_registry = get_services().tool_registry
+        return self._tool_registry
+
+    @property
+    def handler_registry(self) -> Any:
+        """The handler registry, taken from the services container if none was given."""
+        if self._handler_registry is None:
+            from core.services import get_services
+            self._handler_registry = get_services().handler_registry
+        return self._handler_registry
+
+    @property
+    def pool(self) -> concurrent.futures.Executor:
+        """The worker pool, created on first use."""
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="mcp-tool"
+                )
+        return self._pool
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Determine whether a name refers to a registry tool or a handler.
+
+        Args:
+            name: Tool or handler name
+
+        Returns:
+            "tool", "handler" or None if neither exists
+        """
+        if self.tool_registry.get_tool(name) is not None:
+            return "tool"
+        if self.handler_registry.handler_exists(name):
+            return "handler"
+        return None
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """
+        Describe every registry tool and handler.
+
+        Returns:
+            List of tool descriptions in the gateway's Tool format
+        """
+        tools = []
+        for metadata in self.tool_registry.get_available_tools():
+            tools.append({
+                "name": metadata["name"],
+                "description": (metadata.get("description") or "").strip(),
+                "parameters": [],
+                "version": str(metadata.get("version", "1.0.0")),
+                "tags": ["tool"],
+            })
+        for name in self.handler_registry.list_handlers():
+            tools.append({"name": name, "description": "", "parameters": [], "version": "1.0.0", "tags": ["handler"]})
+        return tools
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report current load.
+
+        Returns:
+            Admitted and rejected call counts, overall and per tool
+        """
+        return {
+            "admitted": self._admitted,
+            "rejected": self.rejected,
+            "tools": {name: count for name, count in self._tool_admitted.items() if count},
+        }
+
+    async def execute(self, name: str, parameters: Dict[str, Any], kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute a tool or handler.
+
+        Args:
+            name: Tool or handler name
+            parameters: Input data
+            kind: "tool" or "handler", resolved from the registries if omitted
+
+        Returns:
+            The standardized tool response
+
+        Raises:
+            ToolExecutionError: If no tool or handler has this name
+            AdmissionError: If the gateway or the tool is at capacity
+            ToolTimeoutError: If the result is not ready within the timeout
+        """
+        kind = kind or self.resolve(name)
+        if kind is None:
+            raise ToolExecutionError(f"Herramienta no encontrada: {name}")
+
+        # Global admission: workers plus a bounded queue
+        if self._admitted >= self.workers + self.max_queue_depth:
+            self.rejected += 1
+            raise AdmissionError("Servicio saturado, inténtelo más tarde", status_code=503)
+
+        limit = self.tool_concurrency_limits.get(name, self.tool_concurrency)
+        slots = self._tool_slots.get(name)
+        if slots is None:
+            slots = self._tool_slots[name] = asyncio.Semaphore(limit)
+
+        # Per-tool admission: running calls plus a bounded queue
+        if self._tool_admitted.get(name, 0) >= limit + self.max_tool_queue_depth:
+            self.rejected += 1
+            raise AdmissionError(f"Demasiadas peticiones para la herramienta {name}", status_code=429)
+
+        self._admit(name, 1)
+        deadline = time.monotonic() + self.timeout
+        submitted = False
+        try:
+            try:
+                await asyncio.wait_for(slots.acquire(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise ToolTimeoutError(f"Tiempo de espera agotado esperando turno para {name}")
+
+            try:
+                future = self._submit(kind, name, parameters)
+            except BaseException:
+                slots.release()
+                raise
+            submitted = True
+            # The slot is held until the worker finishes, even if the request times out
+            future.add_done_callback(lambda _: self._finish(name, slots))
+        finally:
+            if not submitted:
+                self._admit(name, -1)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise ToolTimeoutError(f"Tiempo de espera agotado ({self.timeout}s) ejecutando {name}")
+
+    def _admit(self, name: str, delta: int) -> None:
+        self._admitted += delta
+        self._tool_admitted[name] = self._tool_admitted.get(name, 0) + delta
+
+    def _finish(self, name: str, slots: asyncio.Semaphore) -> None:
+        slots.release()
+        self._admit(name, -1)
+
+    def _submit(self, kind: str, name: str, parameters: Dict[str, Any]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self.mode == "process":
+            return loop.run_in_executor(self.pool, _execute_in_worker, kind, name, parameters)
+        if kind == "handler":
+            return loop.run_in_executor(self.pool, _run_handler, self.handler_registry, name, parameters)
+        return loop.run_in_executor(self.pool, self.tool_registry.execute_tool, name, parameters)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for running tools."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
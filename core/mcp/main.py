@@ -6,7 +6,7 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from .service import MCPService, load_config, MCPServiceConfig
+from .service import MCPService, load_config, load_config_sync, MCPServiceConfig
 
 # Configurar logging
 logging.basicConfig(
@@ -42,6 +42,48 @@ async def run_service(config_path: Optional[str] = None) -> None:
         logger.error(f"Error al ejecutar el servicio: {str(e)}")
         raise
 
+def run_workers(
+    config_path: Optional[str],
+    workers: int,
+    host: Optional[str],
+    port: Optional[int],
+    api_key: Optional[str] = None,
+    log_level: Optional[str] = None
+) -> None:
+    """
+    Ejecuta el servicio MCP con varios procesos de uvicorn.
+    
+    Los procesos crean el servicio con create_app(), que recibe la configuración
+    y los valores que la sobreescriben mediante variables de entorno.
+    
+    Args:
+        config_path: Ruta al archivo de configuración
+        workers: Número de procesos
+        host: Host para el servidor, si se sobreescribe la configuración
+        port: Puerto para el servidor, si se sobreescribe la configuración
+        api_key: Clave API, si se sobreescribe la configuración
+        log_level: Nivel de log, si se sobreescribe la configuración
+    """
+    import uvicorn
+    
+    config = load_config_sync(config_path) if config_path else MCPServiceConfig()
+    if config_path:
+        os.environ["MCP_CONFIG_PATH"] = os.path.abspath(config_path)
+    if api_key:
+        os.environ["MCP_API_KEY"] = api_key
+    if log_level:
+        os.environ["MCP_LOG_LEVEL"] = log_level
+    
+    logger.info(f"Iniciando MCP Service con {workers} procesos")
+    uvicorn.run(
+        "core.mcp.service:create_app",
+        factory=True,
+        host=host or config.host,
+        port=port or config.port,
+        workers=workers,
+        log_level=(log_level or config.log_level).lower()
+    )
+
 def main() -> None:
     """
     Punto de entrada principal para el servicio MCP.
@@ -68,6 +110,12 @@ def main() -> None:
         type=str, 
         help="Clave API para autenticación (sobreescribe la configuración)"
     )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=1,
+        help="Número de procesos que atienden peticiones"
+    )
     parser.add_argument(
         "--log-level", 
         type=str, 
@@ -99,6 +147,11 @@ def main() -> None:
                 logger.info(f"Usando archivo de configuración encontrado: {config_path}")
                 break
     
+    if args.workers > 1:
+        # Varios procesos: uvicorn crea la aplicación en cada uno con create_app()
+        run_workers(config_path, args.workers, args.host, args.port, args.api_key, args.log_level)
+        return
+    
     try:
         # Ejecutar el servicio de forma asíncrona
         asyncio.run(run_service(config_path))
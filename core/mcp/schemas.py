@@ -6,21 +6,21 @@ for communication between clients and servers.
 """
 
 import json
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from enum import Enum
 from pydantic import BaseModel, Field, root_validator
 
 
 class InitializeRequest(BaseModel):
     """Request to initialize a session with an MCP server."""
-    type: str = Field("initialize", const=True)
+    type: Literal["initialize"] = "initialize"
     message_id: str = Field(..., description="Unique identifier for this message.")
     content: Dict = Field(default_factory=dict, description="Additional initialization parameters.")
 
 
 class InitializeResponse(BaseModel):
     """Response to an initialize request."""
-    type: str = Field("initialize_response", const=True)
+    type: Literal["initialize_response"] = "initialize_response"
     message_id: str = Field(..., description="Unique identifier for this message.")
     request_id: str = Field(..., description="Message ID of the associated request.")
     success: bool = Field(..., description="Whether initialization was successful.")
@@ -30,7 +30,7 @@ class InitializeResponse(BaseModel):
 
 class ListToolsRequest(BaseModel):
     """Request to list available tools from an MCP server."""
-    type: str = Field("list_tools", const=True)
+    type: Literal["list_tools"] = "list_tools"
     message_id: str = Field(..., description="Unique identifier for this message.")
 
 
@@ -43,7 +43,7 @@ class MCPToolInfo(BaseModel):
 
 class ListToolsResponse(BaseModel):
     """Response to a list_tools request."""
-    type: str = Field("list_tools_response", const=True)
+    type: Literal["list_tools_response"] = "list_tools_response"
     message_id: str = Field(..., description="Unique identifier for this message.")
     request_id: str = Field(..., description="Message ID of the associated request.")
     success: bool = Field(..., description="Whether the request was successful.")
@@ -53,7 +53,7 @@ class ListToolsResponse(BaseModel):
 
 class CallToolRequest(BaseModel):
     """Request to call a tool on an MCP server."""
-    type: str = Field("call_tool", const=True)
+    type: Literal["call_tool"] = "call_tool"
     message_id: str = Field(..., description="Unique identifier for this message.")
     content: Dict[str, Any] = Field(..., description="Content for the call_tool request.")
     
@@ -75,7 +75,7 @@ class CallToolRequest(BaseModel):
 
 class CallToolResponse(BaseModel):
     """Response to a call_tool request."""
-    type: str = Field("call_tool_response", const=True)
+    type: Literal["call_tool_response"] = "call_tool_response"
     message_id: str = Field(..., description="Unique identifier for this message.")
     request_id: str = Field(..., description="Message ID of the associated request.")
     success: bool = Field(..., description="Whether the tool call was successful.")
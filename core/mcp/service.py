@@ -1,14 +1,17 @@
 import json
 import logging
+import os
+import time
 import aiohttp
 import asyncio
 from typing import Dict, List, Any, Optional, Callable, Tuple
-from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, BackgroundTasks
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
-from .client import MCPError, ToolExecutionError
+from .client import MCPError, ToolExecutionError, create_connector
+from .executor import AdmissionError, ToolExecutor, ToolTimeoutError
 
 logger = logging.getLogger("mcp.service")
 
@@ -31,6 +34,9 @@ class ToolRequest(BaseModel):
     tool: str
     parameters: Dict[str, Any] = Field(default_factory=dict)
     
+class BatchToolRequest(BaseModel):
+    requests: List[ToolRequest] = Field(default_factory=list)
+    
 class ToolResponse(BaseModel):
     result: Any
     status: str = "success"
@@ -41,6 +47,8 @@ class ServerConfig(BaseModel):
     url: str
     api_key: Optional[str] = None
     tools: List[Tool] = []
+    # Tiempo máximo (segundos) para obtener el catálogo; None usa el valor del servicio
+    tools_timeout: Optional[float] = None
     
 class MCPServiceConfig(BaseModel):
     host: str = "0.0.0.0"
@@ -50,24 +58,87 @@ class MCPServiceConfig(BaseModel):
     log_level: str = "INFO"
     tools: Dict[str, Tool] = Field(default_factory=dict)
     external_servers: Dict[str, ServerConfig] = Field(default_factory=dict)
+    # Caché de catálogos de servidores externos
+    tools_timeout: float = 5.0
+    tools_cache_ttl: float = 60.0
+    tools_stale_ttl: float = 600.0
+    # Número máximo de herramientas ejecutadas a la vez en /execute_batch
+    batch_max_concurrency: int = 16
+    # Conexiones con servidores externos
+    request_timeout: float = 30.0
+    connection_limit: int = 100
+    connection_limit_per_host: int = 20
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+    # Ejecución de herramientas locales del ToolRegistry / HandlerRegistry. Solo se
+    # exponen si se activa explícitamente, y nunca sin api_key
+    expose_registry_tools: bool = False
+    # Herramientas y handlers expuestos; None expone todos
+    registry_tools_allowlist: Optional[List[str]] = None
+    executor_mode: str = "thread"
+    executor_workers: int = 8
+    tool_concurrency: int = 4
+    tool_concurrency_limits: Dict[str, int] = Field(default_factory=dict)
+    max_queue_depth: int = 64
+    max_tool_queue_depth: int = 16
+    tool_timeout: float = 30.0
+
+class _CatalogEntry:
+    """
+    Catálogo de herramientas de un servidor externo guardado en caché.
+    """  # noqa: D202
+    
+    def __init__(self, tools: List[Dict[str, Any]]):
+        self.tools = tools
+        self.fetched_at = time.monotonic()
+        
+    @property
+    def age(self) -> float:
+        """Segundos transcurridos desde que se obtuvo el catálogo."""
+        return time.monotonic() - self.fetched_at
 
 class MCPService:
     """
     Servicio que expone herramientas MCP a través de una API HTTP.
     """  # noqa: D202
     
-    def __init__(self, config: MCPServiceConfig):
+    def __init__(self, config: MCPServiceConfig, tool_registry: Any = None, handler_registry: Any = None):
         """
         Inicializa el servicio MCP.
         
         Args:
             config: Configuración del servicio
+            tool_registry: Registro de herramientas a exponer; por defecto el del contenedor de servicios
+            handler_registry: Registro de handlers a exponer; por defecto el del contenedor de servicios
+            
+        Raises:
+            ValueError: Si se exponen las herramientas del registro sin api_key
         """
+        if config.expose_registry_tools and not config.api_key:
+            # Cualquier cliente podría ejecutar herramientas con efectos (escribir ficheros, borrar stores)
+            raise ValueError("expose_registry_tools requiere api_key: no se exponen herramientas del registro "
+                             "sin autenticación")
         self.config = config
+        self.executor = ToolExecutor(
+            tool_registry=tool_registry,
+            handler_registry=handler_registry,
+            workers=config.executor_workers,
+            mode=config.executor_mode,
+            tool_concurrency=config.tool_concurrency,
+            tool_concurrency_limits=config.tool_concurrency_limits,
+            max_queue_depth=config.max_queue_depth,
+            max_tool_queue_depth=config.max_tool_queue_depth,
+            timeout=config.tool_timeout,
+        )
         self.app = FastAPI(title="MCP Service", description="Model Control Protocol Service")
         self.api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
         self.server_sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.connector: Optional[aiohttp.TCPConnector] = None
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.catalog_cache: Dict[str, _CatalogEntry] = {}
+        self.catalog_refreshes: Dict[str, asyncio.Task] = {}
+        # Servidores externos que han rechazado /execute_batch
+        self.batch_unsupported: set = set()
         
         # Configurar nivel de log
         logging.getLogger("mcp").setLevel(getattr(logging, config.log_level))
@@ -91,28 +162,50 @@ class MCPService:
         @self.app.get("/health")
         async def health_check():
             """Verifica el estado del servicio."""
-            return {"status": "ok"}
+            return {"status": "ok", "executor": self.executor.stats()}
         
         @self.app.get("/tools")
-        async def list_tools(api_key: str = Depends(self._verify_api_key)):
-            """Lista todas las herramientas disponibles."""
+        async def list_tools(
+            refresh: bool = False,
+            include_status: bool = False,
+            api_key: str = Depends(self._verify_api_key)
+        ):
+            """
+            Lista todas las herramientas disponibles.
+            
+            Los servidores externos se consultan en paralelo y sus catálogos se
+            sirven desde caché. Si un servidor falla se devuelven las herramientas
+            del resto; con include_status=true la respuesta incluye el estado de
+            cada servidor.
+            """
             all_tools = []
             
             # Herramientas locales
             for tool in self.config.tools.values():
                 all_tools.append(tool.dict())
             
+            # Herramientas del ToolRegistry / HandlerRegistry
+            if self.config.expose_registry_tools:
+                all_tools.extend(
+                    tool for tool in self.executor.list_tools()
+                    if tool["name"] not in self.config.tools and self._registry_tool_allowed(tool["name"])
+                )
+            
             # Herramientas de servidores externos
-            for server_name, server in self.config.external_servers.items():
-                try:
-                    tools = await self._get_server_tools(server_name)
-                    for tool in tools:
-                        # Agregamos el prefijo del servidor al nombre de la herramienta
-                        tool["name"] = f"{server_name}:{tool['name']}"
-                        all_tools.append(tool)
-                except Exception as e:
-                    logger.error(f"Error al obtener herramientas del servidor {server_name}: {str(e)}")
+            server_names = list(self.config.external_servers)
+            results = await asyncio.gather(
+                *(self._get_cached_server_tools(name, refresh) for name in server_names)
+            )
+            
+            server_status = {}
+            for server_name, (tools, status) in zip(server_names, results):
+                server_status[server_name] = status
+                for tool in tools:
+                    # Agregamos el prefijo del servidor al nombre de la herramienta
+                    all_tools.append({**tool, "name": f"{server_name}:{tool['name']}"})
             
+            if include_status:
+                return {"tools": all_tools, "servers": server_status}
             return all_tools
         
         @self.app.post("/execute")
@@ -122,33 +215,29 @@ class MCPService:
             api_key: str = Depends(self._verify_api_key)
         ):
             """Ejecuta una herramienta."""
-            tool_name = request.tool
-            parameters = request.parameters
-            
-            # Verificar si es una herramienta de un servidor externo
-            if ":" in tool_name:
-                server_name, remote_tool_name = tool_name.split(":", 1)
-                if server_name in self.config.external_servers:
-                    return await self._execute_remote_tool(server_name, remote_tool_name, parameters)
-            
-            # Ejecutar herramienta local
-            if tool_name in self.config.tools:
-                try:
-                    tool = self.config.tools[tool_name]
-                    # Aquí implementarías la lógica para ejecutar la herramienta local
-                    # En este ejemplo, simplemente devolvemos un mensaje
-                    return {
-                        "status": "success", 
-                        "result": f"Herramienta {tool_name} ejecutada con parámetros: {parameters}"
-                    }
-                except Exception as e:
-                    logger.error(f"Error al ejecutar herramienta {tool_name}: {str(e)}")
-                    raise HTTPException(
-                        status_code=500, 
-                        detail=f"Error al ejecutar herramienta: {str(e)}"
-                    )
+            return await self._execute_tool(request.tool, request.parameters)
+        
+        @self.app.post("/execute_batch")
+        async def execute_batch(
+            request: BatchToolRequest,
+            api_key: str = Depends(self._verify_api_key)
+        ):
+            """
+            Ejecuta varias herramientas en paralelo.
             
-            raise HTTPException(status_code=404, detail=f"Herramienta no encontrada: {tool_name}")
+            Cada elemento obtiene su propio resultado o error, en el mismo orden
+            de la petición. Las herramientas de un mismo servidor externo se
+            reenvían como un único lote cuando el servidor lo admite.
+            """
+            results = await self._execute_batch(request.requests)
+            failed = sum(1 for item in results if item["status"] != "success")
+            if not failed:
+                status = "success"
+            elif failed == len(results):
+                status = "error"
+            else:
+                status = "partial"
+            return {"status": status, "results": results}
         
         @self.app.post("/register/tool")
         async def register_tool(
@@ -171,7 +260,192 @@ class MCPService:
             
             raise HTTPException(status_code=404, detail=f"Herramienta no encontrada: {tool_name}")
     
-    async def _verify_api_key(self, authorization: Optional[str] = None) -> str:
+    async def _execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ejecuta una herramienta local o de un servidor externo.
+        
+        Args:
+            tool_name: Nombre de la herramienta, con prefijo "servidor:" si es externa
+            parameters: Parámetros para la herramienta
+            
+        Returns:
+            Resultado de la ejecución
+            
+        Raises:
+            HTTPException: Si la herramienta no existe o falla
+        """
+        # Verificar si es una herramienta de un servidor externo
+        if ":" in tool_name:
+            server_name, remote_tool_name = tool_name.split(":", 1)
+            if server_name in self.config.external_servers:
+                return await self._execute_remote_tool(server_name, remote_tool_name, parameters)
+        
+        # Ejecutar herramienta local del ToolRegistry / HandlerRegistry
+        kind = self.executor.resolve(tool_name) if self._registry_tool_allowed(tool_name) else None
+        if kind is not None:
+            try:
+                return await self.executor.execute(tool_name, parameters, kind=kind)
+            except AdmissionError as e:
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail=str(e),
+                    headers={"Retry-After": str(e.retry_after)}
+                )
+            except ToolTimeoutError as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except Exception as e:
+                logger.error(f"Error al ejecutar herramienta {tool_name}: {str(e)}")
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"Error al ejecutar herramienta: {str(e)}"
+                )
+        
+        if tool_name in self.config.tools:
+            # Herramienta declarada en la configuración sin implementación registrada
+            raise HTTPException(
+                status_code=501,
+                detail=f"Herramienta sin implementación registrada: {tool_name}"
+            )
+        
+        raise HTTPException(status_code=404, detail=f"Herramienta no encontrada: {tool_name}")
+    
+    async def _execute_batch(self, requests: List[ToolRequest]) -> List[Dict[str, Any]]:
+        """
+        Ejecuta un lote de herramientas con concurrencia limitada.
+        
+        Args:
+            requests: Herramientas a ejecutar
+            
+        Returns:
+            Lista de resultados, uno por petición y en el mismo orden
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        semaphore = asyncio.Semaphore(max(1, self.config.batch_max_concurrency))
+        
+        async def run_single(index: int, tool_name: str, parameters: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    response = await self._execute_tool(tool_name, parameters)
+                    results[index] = self._batch_item(index, requests[index].tool, response)
+                except Exception as e:
+                    results[index] = self._batch_error(index, requests[index].tool, e)
+        
+        async def run_remote_group(server_name: str, items: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+            responses = None
+            if server_name not in self.batch_unsupported:
+                async with semaphore:
+                    responses = await self._execute_remote_batch(server_name, items)
+            if responses is None:
+                await asyncio.gather(*(
+                    run_single(index, f"{server_name}:{remote_name}", parameters)
+                    for index, remote_name, parameters in items
+                ))
+                return
+            for (index, _, _), response in zip(items, responses):
+                results[index] = self._batch_item(index, requests[index].tool, response)
+        
+        # Agrupar las herramientas de servidores externos por servidor
+        remote_groups: Dict[str, List[Tuple[int, str, Dict[str, Any]]]] = {}
+        jobs = []
+        for index, request in enumerate(requests):
+            server_name, sep, remote_name = request.tool.partition(":")
+            if sep and server_name in self.config.external_servers:
+                remote_groups.setdefault(server_name, []).append((index, remote_name, request.parameters))
+            else:
+                jobs.append(run_single(index, request.tool, request.parameters))
+        
+        for server_name, items in remote_groups.items():
+            if len(items) == 1:
+                index, remote_name, parameters = items[0]
+                jobs.append(run_single(index, f"{server_name}:{remote_name}", parameters))
+            else:
+                jobs.append(run_remote_group(server_name, items))
+        
+        await asyncio.gather(*jobs)
+        return results
+    
+    async def _execute_remote_batch(
+        self, 
+        server_name: str, 
+        items: List[Tuple[int, str, Dict[str, Any]]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reenvía un lote de herramientas al endpoint /execute_batch de un servidor externo.
+        
+        Args:
+            server_name: Nombre del servidor
+            items: Tuplas (índice, herramienta remota, parámetros)
+            
+        Returns:
+            Resultados por elemento, o None si el servidor no admite lotes
+            o la petición falla y debe repetirse elemento a elemento
+        """
+        server = self.config.external_servers[server_name]
+        session = await self._get_server_session(server_name)
+        payload = {
+            "requests": [
+                {"tool": remote_name, "parameters": parameters}
+                for _, remote_name, parameters in items
+            ]
+        }
+        
+        try:
+            async with session.post(f"{server.url}/execute_batch", json=payload) as response:
+                if response.status in (404, 405):
+                    logger.info(f"El servidor {server_name} no admite /execute_batch; se usarán llamadas individuales")
+                    self.batch_unsupported.add(server_name)
+                    return None
+                if response.status != 200:
+                    logger.warning(f"Error en /execute_batch de {server_name}: {response.status}")
+                    return None
+                data = await response.json()
+        except aiohttp.ClientError as e:
+            logger.warning(f"Error de conexión con el servidor {server_name} en /execute_batch: {str(e)}")
+            return None
+        
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list) or len(results) != len(items):
+            logger.warning(f"Respuesta de lote inválida del servidor {server_name}")
+            return None
+        return results
+    
+    @staticmethod
+    def _batch_item(index: int, tool_name: str, response: Any) -> Dict[str, Any]:
+        """Construye el resultado de un elemento de lote a partir de su respuesta."""
+        item = dict(response) if isinstance(response, dict) else {"status": "success", "result": response}
+        item.setdefault("status", "success")
+        item["index"] = index
+        item["tool"] = tool_name
+        return item
+    
+    def _batch_error(self, index: int, tool_name: str, error: Exception) -> Dict[str, Any]:
+        """Construye el resultado de un elemento de lote que ha fallado."""
+        status_code = error.status_code if isinstance(error, HTTPException) else 500
+        logger.error(f"Error al ejecutar herramienta {tool_name} en lote: {self._error_detail(error)}")
+        return {
+            "index": index,
+            "tool": tool_name,
+            "status": "error",
+            "status_code": status_code,
+            "message": self._error_detail(error),
+        }
+    
+    def _registry_tool_allowed(self, tool_name: str) -> bool:
+        """
+        Indica si una herramienta o handler del registro puede ejecutarse por HTTP.
+        
+        Args:
+            tool_name: Nombre de la herramienta o handler
+            
+        Returns:
+            True si las herramientas del registro están expuestas y la lista permitida la incluye
+        """
+        if not self.config.expose_registry_tools:
+            return False
+        allowlist = self.config.registry_tools_allowlist
+        return allowlist is None or tool_name in allowlist
+    
+    async def _verify_api_key(self, authorization: Optional[str] = Header(None)) -> str:
         """
         Verifica la clave API.
         
@@ -237,7 +511,21 @@ class MCPService:
         if server.api_key:
             headers["Authorization"] = f"Bearer {server.api_key}"
             
-        session = aiohttp.ClientSession(headers=headers)
+        if self.connector is None or self.connector.closed:
+            # Un único conector para todos los servidores: reutiliza conexiones y DNS
+            self.connector = create_connector(
+                limit=self.config.connection_limit,
+                limit_per_host=self.config.connection_limit_per_host,
+                dns_cache_ttl=self.config.dns_cache_ttl,
+                keepalive_timeout=self.config.keepalive_timeout,
+            )
+            
+        session = aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+            headers=headers
+        )
         self.server_sessions[server_name] = session
         
         return session
@@ -275,6 +563,101 @@ class MCPService:
                 detail=f"Error de conexión con el servidor {server_name}: {str(e)}"
             )
     
+    async def _get_cached_server_tools(
+        self, 
+        server_name: str, 
+        force_refresh: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Obtiene el catálogo de un servidor externo usando la caché.
+        
+        Un catálogo más reciente que tools_cache_ttl se sirve directamente. Uno
+        más antiguo pero dentro de tools_stale_ttl se sirve mientras se actualiza
+        en segundo plano. En otro caso se espera la actualización como máximo el
+        tiempo configurado, recurriendo al último catálogo conocido si falla.
+        
+        Args:
+            server_name: Nombre del servidor
+            force_refresh: Si es True, ignora la caché y espera una actualización
+            
+        Returns:
+            Tupla con la lista de herramientas y el estado del servidor
+        """
+        entry = self.catalog_cache.get(server_name)
+        
+        if entry is not None and not force_refresh:
+            if entry.age < self.config.tools_cache_ttl:
+                return entry.tools, {"status": "cached", "age": round(entry.age, 3)}
+            if entry.age < self.config.tools_stale_ttl:
+                self._refresh_server_tools(server_name)
+                return entry.tools, {"status": "stale", "age": round(entry.age, 3)}
+        
+        server = self.config.external_servers[server_name]
+        timeout = server.tools_timeout if server.tools_timeout is not None else self.config.tools_timeout
+        
+        try:
+            # shield: si vence el plazo la actualización continúa y llena la caché
+            entry = await asyncio.wait_for(asyncio.shield(self._refresh_server_tools(server_name)), timeout)
+            return entry.tools, {"status": "ok", "age": 0.0}
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                error = f"Tiempo de espera agotado ({timeout}s)"
+            else:
+                error = self._error_detail(e)
+            logger.error(f"Error al obtener herramientas del servidor {server_name}: {error}")
+            
+            previous = self.catalog_cache.get(server_name)
+            if previous is not None:
+                return previous.tools, {"status": "stale", "age": round(previous.age, 3), "error": error}
+            return [], {"status": "error", "error": error}
+    
+    def _refresh_server_tools(self, server_name: str) -> asyncio.Task:
+        """
+        Inicia (o reutiliza) la actualización en segundo plano de un catálogo.
+        
+        Args:
+            server_name: Nombre del servidor
+            
+        Returns:
+            Tarea que devuelve la nueva entrada de caché
+        """
+        task = self.catalog_refreshes.get(server_name)
+        if task is not None and not task.done():
+            return task
+        
+        async def refresh() -> _CatalogEntry:
+            try:
+                entry = _CatalogEntry(await self._get_server_tools(server_name))
+                self.catalog_cache[server_name] = entry
+                return entry
+            finally:
+                self.catalog_refreshes.pop(server_name, None)
+        
+        task = asyncio.ensure_future(refresh())
+        # Evita avisos de excepciones no recuperadas en actualizaciones en segundo plano
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.catalog_refreshes[server_name] = task
+        return task
+    
+    def invalidate_tools_cache(self, server_name: Optional[str] = None) -> None:
+        """
+        Descarta catálogos guardados en caché.
+        
+        Args:
+            server_name: Servidor a invalidar, o None para todos
+        """
+        if server_name is None:
+            self.catalog_cache.clear()
+        else:
+            self.catalog_cache.pop(server_name, None)
+    
+    @staticmethod
+    def _error_detail(error: Exception) -> str:
+        """Obtiene un mensaje legible de una excepción."""
+        if isinstance(error, HTTPException):
+            return str(error.detail)
+        return str(error)
+    
     async def _execute_remote_tool(
         self, 
         server_name: str, 
@@ -352,6 +735,17 @@ class MCPService:
         
         self.server_sessions.clear()
         
+        if self.connector is not None:
+            await self.connector.close()
+            self.connector = None
+        
+        self.executor.shutdown()
+        
+        # Cancelar actualizaciones de catálogos pendientes
+        for task in list(self.catalog_refreshes.values()):
+            task.cancel()
+        self.catalog_refreshes.clear()
+        
         # Cancelar todas las tareas en ejecución
         for task_id, task in self.running_tasks.items():
             if not task.done():
@@ -366,7 +760,7 @@ class MCPService:
         self.running_tasks.clear()
 
 
-async def load_config(config_path: str) -> MCPServiceConfig:
+def load_config_sync(config_path: str) -> MCPServiceConfig:
     """
     Carga la configuración del servicio desde un archivo JSON.
     
@@ -405,4 +799,44 @@ async def load_config(config_path: str) -> MCPServiceConfig:
     except (json.JSONDecodeError, FileNotFoundError) as e:
         raise ValueError(f"Error al cargar configuración: {str(e)}")
     except Exception as e:
-        raise ValueError(f"Error al procesar configuración: {str(e)}") 
\ No newline at end of file
+        raise ValueError(f"Error al procesar configuración: {str(e)}") 
+
+
+async def load_config(config_path: str) -> MCPServiceConfig:
+    """
+    Carga la configuración del servicio; equivalente asíncrono de load_config_sync.
+    
+    Args:
+        config_path: Ruta al archivo de configuración
+        
+    Returns:
+        Configuración del servicio
+        
+    Raises:
+        ValueError: Si el archivo de configuración no es válido
+    """
+    return load_config_sync(config_path)
+
+
+def create_app() -> FastAPI:
+    """
+    Crea la aplicación FastAPI del servicio para servidores con varios procesos.
+    
+    Cada proceso de uvicorn llama a esta función y obtiene su propio servicio,
+    con sus propios registros y pool de ejecución. La configuración se lee de
+    la ruta indicada en la variable de entorno MCP_CONFIG_PATH, si existe, y
+    MCP_API_KEY y MCP_LOG_LEVEL sobreescriben su clave API y su nivel de log.
+    
+    Returns:
+        Aplicación FastAPI lista para servir
+    """
+    config_path = os.environ.get("MCP_CONFIG_PATH")
+    config = load_config_sync(config_path) if config_path else MCPServiceConfig()
+    if os.environ.get("MCP_API_KEY"):
+        config.api_key = os.environ["MCP_API_KEY"]
+    if os.environ.get("MCP_LOG_LEVEL"):
+        config.log_level = os.environ["MCP_LOG_LEVEL"]
+        logging.getLogger("mcp").setLevel(getattr(logging, config.log_level))
+    service = MCPService(config)
+    service.app.router.add_event_handler("shutdown", service.stop)
+    return service.app
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Persistent stdio transport for MCP servers.
+
+This module keeps long-lived MCP server subprocesses and talks to them over
+stdin/stdout using newline-delimited MCP messages (see core.mcp.schemas).
+Concurrent requests are multiplexed over a single process and matched to
+their responses by message id, so local tools avoid the HTTP stack and the
+cost of a new connection or process per call.
+"""  # noqa: D202
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+from core.mcp.client import MCPError, ToolExecutionError, ConnectionError as MCPConnectionError
+from core.mcp.config import MCPServerConfig, MCPStdioConfig, MCPTransportType
+from core.mcp.schemas import (
+    CallToolRequest,
+    InitializeRequest,
+    ListToolsRequest,
+    MCPResponseMessage,
+    parse_mcp_message,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Largest single message line accepted from a server (bytes)
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class StdioMCPConnection:
+    """
+    A single long-lived MCP server process with multiplexed requests.
+
+    Requests are written as one JSON message per line and may be sent while
+    earlier ones are still pending. A reader task resolves each pending request
+    when the response carrying its message id as request_id arrives. The number
+    of in-flight requests is bounded, and writes wait for the pipe to drain, so
+    a slow server pushes back on callers instead of buffering without limit.
+    If the process exits, pending requests fail and the next request restarts it.
+    """  # noqa: D202
+
+    def __init__(self, config: MCPStdioConfig, name: str = "stdio", restart_backoff: float = 0.5):
+        """
+        Initialize a new StdioMCPConnection.
+
+        Args:
+            config: Command, environment and limits for the server process
+            name: Name used in log messages
+            restart_backoff: Base delay in seconds between restart attempts
+        """
+        self.config = config
+        self.name = name
+        self.restart_backoff = restart_backoff
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.restarts = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._slots = asyncio.Semaphore(config.max_in_flight)
+        self._write_lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._failed_starts = 0
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is alive and its responses are being read."""
+        # Once stdout is closed the process is unusable, even before it has been reaped
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """
+        Start the server process if it is not running and complete the handshake.
+
+        Raises:
+            MCPConnectionError: If the process cannot be started after max_restarts attempts
+        """
+        async with self._start_lock:
+            while not self.running:
+                if self._failed_starts > self.config.max_restarts:
+                    raise MCPConnectionError(
+                        f"El servidor stdio {self.name} no arranca tras {self._failed_starts} intentos"
+                    )
+                if self._failed_starts:
+                    await asyncio.sleep(self.restart_backoff * (2 ** (self._failed_starts - 1)))
+                try:
+                    await self._spawn()
+                    await self._send(InitializeRequest(message_id=self._new_id()))
+                    self._failed_starts = 0
+                except (OSError, MCPError, asyncio.TimeoutError) as e:
+                    self._failed_starts += 1
+                    logger.warning(f"Error al iniciar el servidor stdio {self.name}: {str(e)}")
+                    await self._kill()
+
+    async def request(self, message: Any) -> MCPResponseMessage:
+        """
+        Send a request and wait for its response.
+
+        Args:
+            message: An MCP request model from core.mcp.schemas
+
+        Returns:
+            The parsed response message
+
+        Raises:
+            MCPConnectionError: If the process is unavailable or exits before responding
+            ToolExecutionError: If the server reports the request as unsuccessful
+        """
+        self._closing = False
+        async with self._slots:
+            if not self.running:
+                await self.start()
+            return await self._send(message)
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """
+        List the tools provided by the server.
+
+        Returns:
+            List of tool descriptions
+        """
+        response = await self.request(ListToolsRequest(message_id=self._new_id()))
+        return [tool if isinstance(tool, dict) else tool.dict() for tool in (response.content or [])]
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Call a tool on the server.
+
+        Args:
+            tool_name: Name of the tool
+            arguments: Arguments for the tool
+
+        Returns:
+            The tool result
+        """
+        request = CallToolRequest(
+            message_id=self._new_id(),
+            content={"name": tool_name, "arguments": arguments},
+        )
+        response = await self.request(request)
+        return response.content
+
+    async def close(self) -> None:
+        """Stop the server process and fail any pending requests."""
+        self._closing = True
+        await self._kill()
+        self._fail_pending(MCPConnectionError(f"Conexión stdio {self.name} cerrada"))
+
+    async def _spawn(self) -> None:
+        if self.process is not None:
+            await self._kill()
+            self.restarts += 1
+            logger.info(f"Reiniciando el servidor stdio {self.name} (reinicio {self.restarts})")
+
+        env = {**os.environ, **self.config.env}
+        self.process = await asyncio.create_subprocess_exec(
+            self.config.command,
+            *self.config.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            cwd=self.config.cwd,
+            limit=MAX_MESSAGE_SIZE,
+        )
+        self._reader_task = asyncio.ensure_future(self._read_responses(self.process))
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr(self.process))
+
+    async def _send(self, message: Any) -> MCPResponseMessage:
+        process = self.process
+        if not self.running:
+            raise MCPConnectionError(f"El servidor stdio {self.name} no está en ejecución")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message.message_id] = future
+        try:
+            line = json.dumps(message.dict()).encode("utf-8") + b"\n"
+            async with self._write_lock:
+                process.stdin.write(line)
+                # Waits while the pipe buffer is full, pushing back on senders
+                await process.stdin.drain()
+            response = await asyncio.wait_for(future, self.config.request_timeout)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise MCPConnectionError(f"El servidor stdio {self.name} cerró la entrada: {str(e)}")
+        except asyncio.TimeoutError:
+            raise MCPConnectionError(
+                f"Tiempo de espera agotado ({self.config.request_timeout}s) en el servidor stdio {self.name}"
+            )
+        finally:
+            self._pending.pop(message.message_id, None)
+
+        if not response.success:
+            raise ToolExecutionError(response.error or f"Error en la petición {message.type}")
+        return response
+
+    async def _read_responses(self, process: asyncio.subprocess.Process) -> None:
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = parse_mcp_message(line.decode("utf-8"))
+                except ValueError as e:
+                    logger.warning(f"Mensaje inválido del servidor stdio {self.name}: {str(e)}")
+                    continue
+
+                future = self._pending.get(getattr(message, "request_id", None))
+                if future is not None and not future.done():
+                    future.set_result(message)
+                else:
+                    logger.debug(f"Mensaje sin petición asociada del servidor stdio {self.name}: {message.type}")
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            logger.error(f"Mensaje demasiado grande del servidor stdio {self.name}: {str(e)}")
+            process.kill()
+        finally:
+            if process is self.process:
+                if not self._closing:
+                    logger.warning(
+                        f"El servidor stdio {self.name} ha terminado; se reiniciará en la próxima petición"
+                    )
+                self._fail_pending(MCPConnectionError(f"El servidor stdio {self.name} ha terminado"))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        # Keep the pipe empty so a chatty server never blocks on stderr
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            logger.debug(f"[{self.name}] {line.decode('utf-8', 'replace').rstrip()}")
+
+    async def _kill(self) -> None:
+        process = self.process
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), 2)
+            except (asyncio.TimeoutError, OSError):
+                process.kill()
+                await process.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _new_id() -> str:
+        return uuid.uuid4().hex
+
+
+class StdioMCPPool:
+    """
+    A warm pool of identical stdio MCP server processes.
+
+    Requests go to the process with the fewest in-flight requests, which
+    spreads CPU-bound tools across processes.
+    """  # noqa: D202
+
+    def __init__(self, config: MCPStdioConfig, name: str = "stdio", size: Optional[int] = None):
+        """
+        Initialize a new StdioMCPPool.
+
+        Args:
+            config: Command, environment and limits for the server processes
+            name: Name used in log messages
+            size: Number of processes, defaults to config.pool_size
+        """
+        size = size or config.pool_size
+        self.name = name
+        self.connections = [
+            StdioMCPConnection(config, name=f"{name}#{i}") for i in range(size)
+        ]
+        self._round_robin = itertools.cycle(range(size))
+
+    async def start(self) -> None:
+        """Start every process in the pool concurrently."""
+        await asyncio.gather(*(connection.start() for connection in self.connections))
+
+    def acquire(self) -> StdioMCPConnection:
+        """
+        Pick the connection for the next request.
+
+        Returns:
+            The least loaded connection, rotating between equally loaded ones
+        """
+        start = next(self._round_robin)
+        ordered = self.connections[start:] + self.connections[:start]
+        return min(ordered, key=lambda connection: connection.in_flight)
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """List the tools provided by the server."""
+        return await self.acquire().list_tools()
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool on the least loaded process."""
+        return await self.acquire().call_tool(tool_name, arguments)
+
+    async def close(self) -> None:
+        """Stop every process in the pool."""
+        await asyncio.gather(*(connection.close() for connection in self.connections))
+
+
+class StdioMCPClient:
+    """
+    MCP client for stdio servers, with the same interface as MCPClient.
+    """  # noqa: D202
+
+    def __init__(self, config: MCPStdioConfig, name: str = "stdio", pool_size: Optional[int] = None):
+        """
+        Initialize a stdio MCP client.
+
+        Args:
+            config: Command, environment and limits for the server processes
+            name: Name used in log messages
+            pool_size: Number of server processes, defaults to config.pool_size
+        """
+        self.pool = StdioMCPPool(config, name=name, size=pool_size)
+        self.connected = False
+        self._available_tools = None
+
+    @classmethod
+    def from_server_config(cls, server_config: MCPServerConfig) -> "StdioMCPClient":
+        """
+        Create a client from a configured stdio server.
+
+        Args:
+            server_config: Server configuration with type stdio
+
+        Returns:
+            A new StdioMCPClient
+        """
+        if server_config.type != MCPTransportType.STDIO or server_config.stdio_config is None:
+            raise ValueError(f"El servidor {server_config.alias} no usa el transporte stdio")
+        return cls(server_config.stdio_config, name=server_config.alias)
+
+    async def connect(self) -> bool:
+        """
+        Start the server processes.
+
+        Returns:
+            True once every process has completed the handshake
+        """
+        if not self.connected:
+            await self.pool.start()
+            self.connected = True
+        return True
+
+    async def disconnect(self) -> None:
+        """Stop the server processes."""
+        await self.pool.close()
+        self.connected = False
+
+    async def list_tools(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        List available tools on the server.
+
+        Args:
+            force_refresh: If True, bypass cache and fetch fresh data
+
+        Returns:
+            List of dictionaries with tool information
+        """
+        if not self.connected:
+            raise MCPConnectionError("No hay conexión con el servidor")
+        if self._available_tools is None or force_refresh:
+            self._available_tools = await self.pool.list_tools()
+        return self._available_tools
+
+    async def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call a tool on the server.
+
+        Args:
+            tool_name: Name of the tool to call
+            parameters: Parameters to pass to the tool
+
+        Returns:
+            Tool response with results
+        """
+        if not self.connected:
+            raise MCPConnectionError("No hay conexión con el servidor")
+        return {"status": "success", "result": await self.pool.call_tool(tool_name, parameters)}
+
+    async def health_check(self) -> bool:
+        """
+        Check whether every server process is running.
+
+        Returns:
+            True if the client is connected and no process has exited
+        """
+        return self.connected and all(connection.running for connection in self.pool.connections)
+
+    async def call_tools(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Call several tools concurrently over the pooled processes.
+
+        Args:
+            calls: List of {"tool": name, "parameters": {...}} dictionaries
+
+        Returns:
+            One result per call, in order. Failed calls have status "error" and a message.
+        """
+        async def call_single(index: int, call: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                result = await self.call_tool(call["tool"], call.get("parameters", {}))
+            except MCPError as e:
+                return {"index": index, "tool": call["tool"], "status": "error", "message": str(e)}
+            return {**result, "index": index, "tool": call["tool"]}
+
+        return list(await asyncio.gather(*(call_single(i, call) for i, call in enumerate(calls))))
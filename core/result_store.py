@@ -0,0 +1,349 @@
+"""
+Result store for incremental workflow re-execution.
+
+This module provides a persistent, fingerprint-addressed store of task outputs.
+Each task is fingerprinted from its resolved inputs, the identity and version of
+the tool, handler or LLM model that executes it, and the fingerprints of its
+upstream tasks. When a stored result with the same fingerprint exists, the
+workflow engines can satisfy the task from the store instead of executing it,
+so only the invalidated subgraph of a workflow re-runs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the fingerprint layout changes so old entries are never reused.
+FINGERPRINT_VERSION = "1"
+
+DEFAULT_RESULT_STORE_DIR = os.path.join(".dawn_cache", "results")
+
+_PLACEHOLDER_PATTERN = re.compile(r"\${([^}]+)}")
+
+
+def _stable_json(value: Any) -> str:
+    """Serialize a value deterministically, falling back to repr for unknown types."""
+    return json.dumps(value, sort_keys=True, default=repr, separators=(",", ":"))
+
+
+def callable_fingerprint(func: Optional[Callable]) -> str:
+    """
+    Compute a version fingerprint for a callable from its compiled code.
+
+    Changing the body, constants or default arguments of a function changes its
+    fingerprint, which invalidates every stored result produced by it.
+
+    Args:
+        func: The function, bound method or callable object to fingerprint
+
+    Returns:
+        A hex digest identifying the callable's current implementation
+    """
+    if func is None:
+        return "none"
+
+    target = getattr(func, "__func__", func)  # Unwrap bound methods
+    if not hasattr(target, "__code__") and callable(target):
+        target = getattr(type(target), "__call__", target)
+        target = getattr(target, "__func__", target)
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{getattr(target, '__module__', '')}.{getattr(target, '__qualname__', repr(target))}".encode())
+
+    code = getattr(target, "__code__", None)
+    if code is not None:
+        hasher.update(code.co_code)
+        hasher.update(_stable_json([c for c in code.co_consts if not hasattr(c, "co_code")]).encode())
+        # Nested functions and comprehensions carry their own code objects
+        for const in code.co_consts:
+            if hasattr(const, "co_code"):
+                hasher.update(const.co_code)
+        hasher.update(_stable_json(getattr(target, "__defaults__", None)).encode())
+    return hasher.hexdigest()[:16]
+
+
+def find_upstream_task_ids(task: Any, known_task_ids: Iterable[str]) -> List[str]:
+    """
+    Determine the upstream tasks a task depends on.
+
+    Upstream tasks are those listed in `depends_on` plus every task referenced
+    by a `${task_id...}` placeholder anywhere in the task's input template.
+
+    Args:
+        task: The task to inspect
+        known_task_ids: IDs of all tasks in the workflow
+
+    Returns:
+        Sorted list of upstream task IDs
+    """
+    known = set(known_task_ids)
+    upstream = {dep for dep in (getattr(task, "depends_on", None) or []) if dep in known}
+
+    template = _stable_json(getattr(task, "input_data", None) or {})
+    for expression in _PLACEHOLDER_PATTERN.findall(template):
+        ref = expression.split(":", 1)[0].strip()
+        ref_task_id = re.split(r"[.\[]", ref, maxsplit=1)[0]
+        if ref_task_id in known and ref_task_id != task.id:
+            upstream.add(ref_task_id)
+
+    return sorted(upstream)
+
+
+def compute_task_fingerprint(
+    task: Any,
+    resolved_input: Dict[str, Any],
+    executor_identity: Dict[str, Any],
+    upstream_fingerprints: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Compute the fingerprint of a task execution.
+
+    Args:
+        task: The task about to be executed
+        resolved_input: The task's input after variable resolution
+        executor_identity: Identity and version of the tool, handler or model
+        upstream_fingerprints: Mapping of upstream task ID to its fingerprint
+
+    Returns:
+        A hex digest that changes whenever any execution-relevant input changes
+    """
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "task_id": task.id,
+        "task_class": type(task).__name__,
+        "task_type": getattr(task, "task_type", None),
+        "input": resolved_input,
+        "executor": executor_identity,
+        "upstream": upstream_fingerprints or {},
+    }
+    return hashlib.sha256(_stable_json(payload).encode()).hexdigest()
+
+
+class ResultStore:
+    """
+    Local, file-backed store of task outputs addressed by fingerprint.
+
+    Each entry is written atomically as a small JSON document, so concurrent
+    or interrupted runs never observe partially written results.
+    """  # noqa: D202
+
+    def __init__(self, directory: str = DEFAULT_RESULT_STORE_DIR):
+        """
+        Initialize a new ResultStore.
+
+        Args:
+            directory: Directory in which stored results are kept
+        """
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.json")
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the stored output for a fingerprint.
+
+        Args:
+            fingerprint: The task fingerprint
+
+        Returns:
+            The stored output dictionary, or None if absent or unreadable
+        """
+        path = self._path_for(fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable result store entry '{path}': {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry.get("output")
+
+    def put(self, fingerprint: str, task_id: str, output: Dict[str, Any]) -> bool:
+        """
+        Store the output of a successful task execution.
+
+        Args:
+            fingerprint: The task fingerprint
+            task_id: ID of the task that produced the output
+            output: The standardized task output
+
+        Returns:
+            True if the output was stored, False if it could not be serialized
+        """
+        entry = {
+            "fingerprint": fingerprint,
+            "task_id": task_id,
+            "stored_at": datetime.now().isoformat(),
+            "output": output,
+        }
+        try:
+            serialized = json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Output of task '{task_id}' is not JSON serializable; not storing result: {e}")
+            return False
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(serialized)
+            os.replace(tmp_path, self._path_for(fingerprint))
+        except OSError as e:
+            logger.warning(f"Failed to store result for task '{task_id}': {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+    def invalidate(self, fingerprint: str) -> None:
+        """
+        Remove a stored result.
+
+        Args:
+            fingerprint: The task fingerprint to remove
+        """
+        try:
+            os.remove(self._path_for(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every stored result."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+
+class IncrementalExecutionContext:
+    """
+    Per-run bookkeeping shared by the workflow engines for incremental execution.
+
+    Tracks the fingerprint of each task executed or restored during a run so
+    downstream fingerprints can incorporate them, and decides whether a task
+    can be satisfied from the result store.
+    """  # noqa: D202
+
+    def __init__(self, result_store: ResultStore, llm_interface: Any = None, tool_registry: Any = None,
+                 handler_registry: Any = None):
+        """
+        Initialize a new IncrementalExecutionContext.
+
+        Args:
+            result_store: The store holding previous results
+            llm_interface: LLM interface used for LLM tasks
+            tool_registry: Registry used to resolve tool tasks
+            handler_registry: Registry used to resolve named handlers
+        """
+        self.result_store = result_store
+        self.llm_interface = llm_interface
+        self.tool_registry = tool_registry
+        self.handler_registry = handler_registry
+        self.task_fingerprints: Dict[str, str] = {}
+
+    def describe_executor(self, task: Any, resolved_input: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Describe the identity and version of whatever will execute the task.
+
+        Args:
+            task: The task to describe
+            resolved_input: The task's resolved input, which carries an LLM task's system message
+
+        Returns:
+            A JSON-serializable description of the executor
+        """
+        if getattr(task, "is_direct_handler", False):
+            handler = task.handler if callable(getattr(task, "handler", None)) else None
+            if handler is None and self.handler_registry is not None and task.handler_name:
+                if self.handler_registry.handler_exists(task.handler_name):
+                    handler = self.handler_registry.get_handler(task.handler_name)
+            return {"kind": "handler", "name": task.handler_name, "version": callable_fingerprint(handler)}
+
+        if getattr(task, "is_llm_task", False):
+            sampling_params = getattr(self.llm_interface, "sampling_params", None)
+            return {
+                "kind": "llm",
+                "class": type(self.llm_interface).__name__,
+                "model": getattr(self.llm_interface, "model", None),
+                "system_message": (resolved_input or {}).get("system_message"),
+                "sampling_params": sampling_params if isinstance(sampling_params, dict) else None,
+                "use_file_search": task.use_file_search,
+                "file_search_vector_store_ids": task.file_search_vector_store_ids,
+            }
+
+        if getattr(task, "tool_name", None):
+            tool_func = self.tool_registry.get_tool(task.tool_name) if self.tool_registry is not None else None
+            version = callable_fingerprint(tool_func)
+            plugin_manager = getattr(self.tool_registry, "plugin_manager", None)
+            plugin = plugin_manager.get_plugin(task.tool_name) if plugin_manager is not None else None
+            if plugin is not None:
+                # Plugin tools are wrapped by the registry, so version the plugin itself
+                version = f"{plugin.version}:{callable_fingerprint(plugin.execute)}"
+            return {"kind": "tool", "name": task.tool_name, "version": version}
+
+        execute = getattr(type(task), "execute", None)
+        return {"kind": "custom", "task_type": getattr(task, "task_type", None),
+                "version": callable_fingerprint(execute)}
+
+    def fingerprint(self, task: Any, resolved_input: Dict[str, Any], known_task_ids: Iterable[str]) -> str:
+        """
+        Compute and record the fingerprint for a task about to run.
+
+        Args:
+            task: The task about to run
+            resolved_input: The task's resolved input
+            known_task_ids: IDs of all tasks in the workflow
+
+        Returns:
+            The task fingerprint
+        """
+        upstream = {
+            task_id: self.task_fingerprints.get(task_id, "unknown")
+            for task_id in find_upstream_task_ids(task, known_task_ids)
+        }
+        executor_identity = self.describe_executor(task, resolved_input)
+        fingerprint = compute_task_fingerprint(task, resolved_input, executor_identity, upstream)
+        self.task_fingerprints[task.id] = fingerprint
+        return fingerprint
+
+    def lookup(self, task: Any, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored output for a task, or None if it must execute.
+
+        Args:
+            task: The task about to run
+            fingerprint: The task's fingerprint
+
+        Returns:
+            The stored output or None
+        """
+        if not getattr(task, "cacheable", True):
+            return None
+        return self.result_store.get(fingerprint)
+
+    def record(self, task: Any, fingerprint: str, output: Dict[str, Any]) -> None:
+        """
+        Store the output of a task that completed successfully.
+
+        Args:
+            task: The task that ran
+            fingerprint: The task's fingerprint
+            output: The task's standardized output
+        """
+        if not getattr(task, "cacheable", True) or not output.get("success"):
+            return
+        self.result_store.put(fingerprint, task.id, output)
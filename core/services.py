@@ -3,12 +3,13 @@ Provides a central container for accessing framework-wide singleton services.
 """
 
 import logging
-from typing import Any, Dict, Optional, Type, TypeVar, Generic, Union, cast
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Generic, Union, cast
 
 from .tools.registry import ToolRegistry
 from .tools.registry_access import get_registry as get_tool_registry_singleton
 from .tools.registry_access import reset_registry as reset_tool_registry_singleton
 from .llm.interface import LLMInterface
+from .llm.clients import OpenAIClientProvider
 from .handlers.registry import HandlerRegistry
 
 logger = logging.getLogger(__name__)
@@ -19,12 +20,24 @@ T = TypeVar('T')
 class ServiceEntry(Generic[T]):
     """
     Container for a service instance with metadata.
+
+    An entry may hold a factory instead of an instance, in which case the
+    service is only created the first time it is requested.
     """
-    def __init__(self, instance: T, service_type: Type[T], name: str):
-        self.instance = instance
+    def __init__(self, instance: Optional[T], service_type: Type[T], name: str,
+                 factory: Optional[Callable[[], T]] = None):
+        self._instance = instance
+        self.factory = factory
         self.service_type = service_type
         self.name = name
 
+    @property
+    def instance(self) -> T:
+        """The service instance, created from the factory on first access."""
+        if self._instance is None and self.factory is not None:
+            self._instance = self.factory()
+        return self._instance
+
 
 class ServicesContainer:
     """
@@ -49,13 +62,20 @@ class ServicesContainer:
         if self._initialized:
             return
             
-        # Register the ToolRegistry singleton
-        self.register_service(
-            get_tool_registry_singleton(), 
+        # Register the ToolRegistry singleton; it is only built when first requested
+        self.register_service_factory(
+            get_tool_registry_singleton,
             ToolRegistry,
             "tool_registry"
         )
         
+        # Shared OpenAI/HTTP clients; built from configuration when first requested
+        self.register_service_factory(
+            OpenAIClientProvider.from_config,
+            OpenAIClientProvider,
+            "openai_clients"
+        )
+        
         # Initialize the handler registry if not already initialized
         if self._handler_registry is None:
             self._handler_registry = HandlerRegistry()
@@ -98,6 +118,16 @@ class ServicesContainer:
             )
         return self._handler_registry
 
+    @property
+    def openai_clients(self) -> OpenAIClientProvider:
+        """
+        Provides access to the shared OpenAI client provider.
+        
+        Returns:
+            OpenAIClientProvider: Provider of pooled sync and async clients
+        """
+        return self.get_service("openai_clients")
+
     def register_service(self, instance: T, service_type: Type[T], name: Optional[str] = None) -> None:
         """
         Register a service instance with the container.
@@ -117,6 +147,23 @@ class ServicesContainer:
         self._services[service_name] = entry
         logger.debug(f"Registered service: {service_name}")
 
+    def register_service_factory(self, factory: Callable[[], T], service_type: Type[T],
+                                 name: Optional[str] = None) -> None:
+        """
+        Register a service that is created on first request.
+
+        Args:
+            factory: Zero-argument callable that builds the service instance
+            service_type: The type of the service (used for type-based lookups)
+            name: Optional name for the service (defaults to the class name)
+        """
+        service_name = name or service_type.__name__
+        if service_name in self._services:
+            logger.warning(f"Service '{service_name}' already registered. Overwriting.")
+
+        self._services[service_name] = ServiceEntry(None, service_type, service_name, factory=factory)
+        logger.debug(f"Registered deferred service: {service_name}")
+
     def get_service(self, service_type_or_name: Union[Type[T], str]) -> Any:
         """
         Get a service by its type or name.
@@ -225,6 +272,9 @@ class ServicesContainer:
         Reset the container, clearing all services.
         Primarily used for testing.
         """
+        clients = self._services.get("openai_clients")
+        if clients is not None and clients._instance is not None:
+            clients._instance.close()
         self._services.clear()
         self._tool_registry = None
         self._handler_registry = None
@@ -10,6 +10,7 @@ import json
 # Imports moved into methods where first used to potentially mitigate import cycles
 # import inspect
 # import traceback
+from core.item_stream import AGGREGATE_MODES
 from core.utils.variable_resolver import resolve_path # Assumed utility
 
 # --- TypedDict for Standardized Task Output ---
@@ -19,7 +20,7 @@ class TaskOutput(TypedDict, total=False):
     Uses total=False, so keys are optional.
     """
     success: bool          # REQUIRED for handlers to indicate status cleanly
-    status: str            # e.g., "completed", "failed", "skipped"
+    status: str            # e.g., "completed", "failed", "skipped", "suspended"
     response: Any          # Primary data output, often user-facing or for LLMs
     result: Any            # Alternative/Alias for primary data output, often programmatic
     error: Optional[str]   # Error message if task failed
@@ -83,7 +84,8 @@ class Task:
             file_search_max_results: Maximum number of file search results to inject.
             validate_input: Flag indicating input validation should be performed.
             validate_output: Flag indicating output validation should be performed.
-            **kwargs: Catches extra arguments (like 'description', 'output_key') passed by subclasses or workflow definitions.
+            **kwargs: Catches extra arguments (like 'description', 'output_key', 'cacheable') passed by
+                      subclasses or workflow definitions.
         """
         self.id = task_id
         self.name = name
@@ -127,6 +129,25 @@ class Task:
         self.output_key: Optional[str] = kwargs.get("output_key", None)
         # Store depends_on if provided via kwargs (useful for subclasses like DirectHandlerTask)
         self.depends_on: List[str] = kwargs.get("depends_on", [])
+        # Whether incremental execution or the semantic LLM cache may satisfy this task
+        self.cacheable: bool = kwargs.get("cacheable", True)
+        # Similarity an LLM task needs for a semantic cache hit (None uses the cache default)
+        self.semantic_cache_threshold: Optional[float] = kwargs.get("semantic_cache_threshold", None)
+        # Whether an LLM task streams its response, and whether this task reads upstream streams live
+        self.stream: bool = kwargs.get("stream", False)
+        self.accepts_stream: bool = kwargs.get("accepts_stream", False)
+        # Items a generator task buffers before waiting for consumers, and how its items are kept
+        self.stream_buffer: int = kwargs.get("stream_buffer", 16)
+        # Items are only counted unless "list" is asked for, so streams stay bounded in memory
+        self.stream_aggregate: str = kwargs.get("stream_aggregate", "count")
+        if self.stream_aggregate not in AGGREGATE_MODES:
+            raise ValueError(f"Invalid stream_aggregate '{self.stream_aggregate}' for task '{self.id}'. "
+                             f"Must be one of {list(AGGREGATE_MODES)}")
+        # Maximum tokens of an LLM task's resolved prompt, and how inserted values are shrunk to fit
+        self.prompt_token_budget: Optional[int] = kwargs.get("prompt_token_budget", None)
+        self.prompt_compaction: str = kwargs.get("prompt_compaction", "truncate")
+        # Value resolved for each placeholder of the prompt, recorded by the engine for compaction
+        self.prompt_values: Dict[str, str] = {}
 
         # --- Placeholder for potentially injected dependencies ---
         self.tool_registry = None # Engine might inject this
@@ -138,7 +159,7 @@ class Task:
 
     def set_status(self, status: str) -> None:
         """Sets the task status, ensuring it's a valid predefined value."""
-        valid_statuses = ["pending", "running", "completed", "failed", "skipped"]
+        valid_statuses = ["pending", "running", "completed", "failed", "skipped", "suspended"]
         if status not in valid_statuses:
             # Log error instead of raising? Or raise? Let's raise for now.
             raise ValueError(f"Invalid status '{status}' for task '{self.id}'. Must be one of {valid_statuses}")
@@ -199,6 +220,10 @@ class Task:
         # --- Step 2: Populate standard TaskOutput fields ---
         output_data['success'] = processed_data.get('success', 'error' not in processed_data) # Infer success
         output_data['status'] = 'completed' if output_data['success'] else 'failed'
+        # A suspended task (e.g. waiting for an LLM batch) has not failed; it is resumed later
+        if processed_data.get('suspended'):
+            output_data['success'] = False
+            output_data['status'] = 'suspended'
 
         if 'response' in processed_data:
             output_data['response'] = processed_data['response']
@@ -219,7 +244,7 @@ class Task:
         if 'error' in processed_data:
             output_data['error'] = str(processed_data['error']) # Ensure string
             self.error = output_data['error'] # Store on task too
-        elif not output_data['success'] and 'error' not in output_data:
+        elif not output_data['success'] and output_data['status'] != 'suspended':
              output_data['error'] = "Task failed without specific error message."
              self.error = output_data['error']
 
@@ -585,7 +610,9 @@ class CustomTask(Task):
             'max_retries', 'next_task_id_on_success', 'next_task_id_on_failure',
             'condition', 'parallel', 'use_file_search', 'file_search_vector_store_ids',
             'file_search_max_results', 'validate_input', 'validate_output',
-            'description', 'output_key', 'depends_on' # Include those stored by Task from kwargs
+            'description', 'output_key', 'depends_on', 'cacheable', 'semantic_cache_threshold',
+            # Include those stored by Task from kwargs
+            'stream', 'accepts_stream', 'stream_buffer', 'stream_aggregate', 'prompt_token_budget', 'prompt_compaction'
         }
         for key, value in kwargs.items():
             if key not in base_task_params:
@@ -619,9 +646,16 @@ class CustomTask(Task):
         task_dict['task_type'] = self.task_type
 
         # Add custom attributes stored from kwargs during init
-        base_task_params = set(Task.__init__.__code__.co_varnames[1:Task.__init__.__code__.co_argcount]) | {'description', 'output_key', 'depends_on'} # Get base params programmatically + optional ones
+        # Get base params programmatically + optional ones
+        base_task_params = set(Task.__init__.__code__.co_varnames[1:Task.__init__.__code__.co_argcount]) | {
+            'description', 'output_key', 'depends_on', 'cacheable', 'semantic_cache_threshold', 'stream',
+            'accepts_stream', 'stream_buffer', 'stream_aggregate', 'prompt_token_budget', 'prompt_compaction'
+        }
         # Add known attributes from Task that might not be in __init__ args
-        known_task_attrs = base_task_params | {'status', 'output_data', 'output_annotations', 'retry_count', 'error', 'error_details', 'tool_registry', 'task_type'}
+        known_task_attrs = base_task_params | {
+            'status', 'output_data', 'output_annotations', 'retry_count', 'error', 'error_details', 'tool_registry',
+            'task_type', 'prompt_values'
+        }
 
         for key, value in self.__dict__.items():
             # Include attributes that are not standard Task attributes (or already included)
@@ -633,4 +667,175 @@ class CustomTask(Task):
                  else:
                       print(f"Warning: Skipping callable attribute '{key}' during CustomTask serialization for task '{self.id}'.")
 
-        return task_dict
\ No newline at end of file
+        return task_dict
+
+# --- Map Task ---
+MAP_FAILURE_POLICIES = ("fail_fast", "fail_at_end", "continue")
+
+
+class MapTask(CustomTask):
+    """
+    Applies a tool, a handler or an LLM prompt template to each element of a list input.
+
+    The list is read from the resolved input key ``items_key``. Items run with at
+    most ``max_concurrency`` calls in flight, and results are returned in item
+    order. With ``chunk_size``, consecutive items are sent together to the batch
+    entry point of the tool or handler, if it has one. Each failed item is
+    retried up to ``item_retries`` times. ``failure_policy`` decides how
+    failed items affect the task:
+
+    - "fail_fast": stop starting new items and fail at the first failure.
+    - "fail_at_end": run every item, then fail if any item failed.
+    - "continue": run every item and succeed; failed items have a None result.
+
+    Tool and handler items receive the other resolved inputs plus the item
+    under ``item_key`` (or, if ``item_key`` is None, the item's own keys). LLM
+    prompt templates reference ``${item}``, ``${item.field}`` and ``${index}``.
+    Executed by MapTaskExecutionStrategy in the asynchronous engine.
+    """  # noqa: D202
+
+    def __init__(
+        self,
+        task_id: str,
+        name: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        item_tool: Optional[str] = None,
+        item_handler: Optional[str] = None,
+        item_prompt: Optional[str] = None,
+        items_key: str = "items",
+        item_key: Optional[str] = "item",
+        max_concurrency: int = 4,
+        chunk_size: Optional[int] = None,
+        item_retries: int = 0,
+        failure_policy: str = "fail_at_end",
+        **kwargs
+    ):
+        """
+        Initializes a MapTask instance.
+
+        Args:
+            task_id: Unique task identifier.
+            name: Human-readable task name.
+            input_data: Input data dictionary or template; must provide ``items_key``.
+            item_tool: Name of the tool applied to each item.
+            item_handler: Name of the registered handler applied to each item.
+            item_prompt: LLM prompt template applied to each item.
+            items_key: Input key holding the list of items.
+            item_key: Key under which each item is passed to the tool or handler.
+            max_concurrency: Maximum number of calls (items or chunks) in flight.
+            chunk_size: Number of items sent together in one call, if set.
+            item_retries: Retries of each failed item.
+            failure_policy: One of "fail_fast", "fail_at_end" or "continue".
+            **kwargs: Additional arguments passed to CustomTask.
+        """
+        targets = [target for target in (item_tool, item_handler, item_prompt) if target]
+        if len(targets) != 1:
+            raise ValueError(
+                f"MapTask '{task_id}' requires exactly one of 'item_tool', 'item_handler' or 'item_prompt'."
+            )
+        if failure_policy not in MAP_FAILURE_POLICIES:
+            raise ValueError(f"Invalid failure_policy '{failure_policy}' for MapTask '{task_id}'. "
+                             f"Must be one of {list(MAP_FAILURE_POLICIES)}")
+        if max_concurrency < 1:
+            raise ValueError(f"MapTask '{task_id}' requires max_concurrency >= 1.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"MapTask '{task_id}' requires chunk_size >= 1.")
+
+        super().__init__(
+            task_id=task_id,
+            name=name,
+            task_type="map",
+            input_data=input_data,
+            is_llm_task=item_prompt is not None,
+            **kwargs
+        )
+        self.item_tool: Optional[str] = item_tool
+        self.item_handler: Optional[str] = item_handler
+        self.item_prompt: Optional[str] = item_prompt
+        self.items_key: str = items_key
+        self.item_key: Optional[str] = item_key
+        self.max_concurrency: int = max_concurrency
+        self.chunk_size: Optional[int] = chunk_size
+        self.item_retries: int = item_retries
+        self.failure_policy: str = failure_policy
+
+
+# --- Document Task ---
+DEFAULT_CHUNK_PROMPT = "Summarize the following part of a longer document:\n\n${chunk}"
+DEFAULT_COMBINE_PROMPT = (
+    "The following are summaries of consecutive parts of a document. "
+    "Combine them into one coherent summary:\n\n${summaries}"
+)
+
+
+class DocumentTask(CustomTask):
+    """
+    Processes a long document with map-reduce LLM calls.
+
+    The document is read from the file at the resolved input ``path`` through a
+    memory map (or taken from the input ``text``) and split into overlapping
+    chunks of at most ``chunk_tokens`` tokens. ``chunk_prompt`` is applied to each
+    chunk, with at most ``max_concurrency`` LLM calls in flight. The chunk results
+    are then combined ``combine_fan_in`` at a time with ``combine_prompt``, level
+    after level, until one result is left. Prompts reference ``${chunk}`` and
+    ``${index}``, and ``${summaries}`` respectively.
+
+    With ``cache_chunks``, each LLM call's response is stored under a fingerprint
+    of its prompt, system message and model, so on a re-run only the changed
+    chunks and the combinations that include them call the model. Settings left
+    as None use the ``document_pipeline`` configuration. Executed by
+    DocumentTaskExecutionStrategy in the asynchronous engine.
+    """  # noqa: D202
+
+    def __init__(
+        self,
+        task_id: str,
+        name: str,
+        input_data: Optional[Dict[str, Any]] = None,
+        chunk_prompt: str = DEFAULT_CHUNK_PROMPT,
+        combine_prompt: str = DEFAULT_COMBINE_PROMPT,
+        chunk_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        combine_fan_in: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        cache_chunks: bool = True,
+        **kwargs
+    ):
+        """
+        Initializes a DocumentTask instance.
+
+        Args:
+            task_id: Unique task identifier.
+            name: Human-readable task name.
+            input_data: Input data dictionary or template; must provide ``path`` or ``text``.
+            chunk_prompt: LLM prompt template applied to each chunk.
+            combine_prompt: LLM prompt template combining chunk results.
+            chunk_tokens: Maximum tokens of a chunk.
+            overlap_tokens: Tokens shared by consecutive chunks.
+            combine_fan_in: Maximum number of results combined by one call.
+            max_concurrency: Maximum number of LLM calls in flight.
+            cache_chunks: Whether LLM responses are cached per chunk and combination.
+            **kwargs: Additional arguments passed to CustomTask.
+        """
+        if chunk_tokens is not None and overlap_tokens is not None and overlap_tokens >= chunk_tokens:
+            raise ValueError(f"DocumentTask '{task_id}' requires overlap_tokens < chunk_tokens.")
+        if combine_fan_in is not None and combine_fan_in < 2:
+            raise ValueError(f"DocumentTask '{task_id}' requires combine_fan_in >= 2.")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"DocumentTask '{task_id}' requires max_concurrency >= 1.")
+
+        super().__init__(
+            task_id=task_id,
+            name=name,
+            task_type="document",
+            input_data=input_data,
+            is_llm_task=True,
+            **kwargs
+        )
+        self.chunk_prompt: str = chunk_prompt
+        self.combine_prompt: str = combine_prompt
+        self.chunk_tokens: Optional[int] = chunk_tokens
+        self.overlap_tokens: Optional[int] = overlap_tokens
+        self.combine_fan_in: Optional[int] = combine_fan_in
+        self.max_concurrency: Optional[int] = max_concurrency
+        self.cache_chunks: bool = cache_chunks
@@ -6,9 +6,12 @@ It defines an abstract base class for task execution strategies and concrete
 implementations for different types of tasks (LLM, Tool, Direct Handler).
 """
 
+import json
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Type, Callable, Optional
+from typing import Any, Dict, List, Tuple, Type, Callable, Optional
 
+from core.llm.compaction import compact_task_prompt
 from core.llm.interface import LLMInterface
 from core.task import Task
 from core.tools.registry import ToolRegistry
@@ -17,6 +20,23 @@ from core.utils.logger import log_error, log_info
 from core.errors import ErrorCode, DawnError
 from core.tools.registry_access import execute_tool, get_registry as get_tool_registry
 from core.services import get_services
+from core.utils.micro_batch import MicroBatcher
+
+
+def _get_batcher(batchers: Dict[str, MicroBatcher], name: str, batch_func: Callable) -> Optional[MicroBatcher]:
+    """Return the micro-batcher of a tool or handler with a batch entry point, or None if batching is off."""
+    from core.config import get
+
+    if not get("micro_batching.enabled", True):
+        return None
+    if name not in batchers:
+        batchers[name] = MicroBatcher(
+            batch_func,
+            max_batch_size=get("micro_batching.max_batch_size", 32),
+            max_wait=get("micro_batching.max_wait_ms", 5) / 1000,
+            name=name,
+        )
+    return batchers[name]
 
 
 class TaskExecutionStrategy(ABC):
@@ -65,13 +85,32 @@ class LLMTaskExecutionStrategy(TaskExecutionStrategy):
             log_error(f"No 'prompt' found in processed input for LLM task '{task.id}'.")
             return {"success": False, "error": "No prompt provided for LLM task"}
         try:
-            result = await asyncio.to_thread(self.llm_interface.execute_llm_call, prompt)
+            # Shrink upstream values inlined into the prompt to the task's token budget
+            metadata = {}
+            if getattr(task, "prompt_token_budget", None):
+                prompt, report = await asyncio.to_thread(compact_task_prompt, task, prompt, self.llm_interface)
+                metadata["prompt_compaction"] = report
+            # Semantic cache options come from the task definition
+            cache_options = {}
+            if not getattr(task, "cacheable", True):
+                cache_options["use_cache"] = False
+            elif getattr(task, "semantic_cache_threshold", None) is not None:
+                cache_options["cache_threshold"] = task.semantic_cache_threshold
+            # In batch mode there is no live response to stream
+            if getattr(task, "stream", False) and getattr(self.llm_interface, "batch_spool", None) is None:
+                # The engine publishes the stream and materializes the response later
+                stream = self.llm_interface.stream_llm_call(prompt, **cache_options)
+                return {"success": True, "response": None, "response_stream": stream, "metadata": metadata}
+            result = await asyncio.to_thread(self.llm_interface.execute_llm_call, prompt, **cache_options)
             if result.get("success"):
-                return {"success": True, "response": result.get("response")}
+                return {"success": True, "response": result.get("response"), "metadata": metadata}
+            if result.get("suspended"):
+                # Spooled for batch submission; the engine suspends the task
+                return result
             else:
                 error_msg = result.get("error", "Unknown LLM error")
                 log_error(f"LLM task '{task.id}' failed: {error_msg}")
-                return {"success": False, "error": error_msg}
+                return {"success": False, "error": error_msg, "metadata": metadata}
         except Exception as e:
             log_error(f"Exception during execution of LLM task '{task.id}': {e}", exc_info=True)
             return {"success": False, "error": f"Execution error: {str(e)}"}
@@ -87,6 +126,8 @@ class ToolTaskExecutionStrategy(TaskExecutionStrategy):
             tool_registry: An instance of ToolRegistry containing available tools.
         """
         self.tool_registry = tool_registry
+        # Concurrent calls to tools with a batch entry point are coalesced per tool
+        self._batchers: Dict[str, MicroBatcher] = {}
 
     async def execute(self, task: Task, **kwargs) -> Dict[str, Any]:
         """Execute a tool task using the ToolRegistry.
@@ -105,7 +146,16 @@ class ToolTaskExecutionStrategy(TaskExecutionStrategy):
             log_error(f"No 'tool_name' specified for tool task '{task.id}'.")
             return {"success": False, "error": "Tool name not specified"}
         try:
-            result = await asyncio.to_thread(self.tool_registry.execute_tool, task.tool_name, processed_input)
+            batcher = None
+            if self.tool_registry.get_batch_tool(task.tool_name) is not None:
+                tool_name = task.tool_name
+                batcher = _get_batcher(
+                    self._batchers, tool_name, lambda inputs: self.tool_registry.execute_tool_batch(tool_name, inputs)
+                )
+            if batcher is not None:
+                result = await batcher.submit(processed_input)
+            else:
+                result = await asyncio.to_thread(self.tool_registry.execute_tool, task.tool_name, processed_input)
             if result.get("success"):
                 return {"success": True, "result": result.get("result")}
             else:
@@ -127,6 +177,8 @@ class DirectHandlerTaskExecutionStrategy(TaskExecutionStrategy):
             handler_registry: An optional instance of HandlerRegistry for looking up handler functions.
         """
         self.handler_registry = handler_registry
+        # Concurrent calls to handlers with a batch entry point are coalesced per handler
+        self._batchers: Dict[str, MicroBatcher] = {}
 
     async def execute(self, task: Task, **kwargs) -> Dict[str, Any]:
         """Execute a direct handler task.
@@ -172,12 +224,22 @@ class DirectHandlerTaskExecutionStrategy(TaskExecutionStrategy):
                 handler_name = task.handler_name
                 log_info(f"Executing direct handler task '{task.id}' with registered handler: {handler_name}")
                 
-                # Execute handler via handler registry
-                result = await asyncio.to_thread(
-                    self.handler_registry.execute_handler,
-                    handler_name,
-                    processed_input
-                )
+                # Execute handler via handler registry, batched with concurrent calls when possible
+                batcher = None
+                if self.handler_registry.get_batch_handler(handler_name) is not None:
+                    batcher = _get_batcher(
+                        self._batchers,
+                        handler_name,
+                        lambda inputs: self.handler_registry.execute_handler_batch(handler_name, inputs),
+                    )
+                if batcher is not None:
+                    result = await batcher.submit(processed_input)
+                else:
+                    result = await asyncio.to_thread(
+                        self.handler_registry.execute_handler,
+                        handler_name,
+                        processed_input
+                    )
                 
                 # Update task status based on result
                 if isinstance(result, dict) and result.get("success", True):
@@ -201,6 +263,339 @@ class DirectHandlerTaskExecutionStrategy(TaskExecutionStrategy):
             return {"success": False, "error": "No callable handler found"}
 
 
+class MapTaskExecutionStrategy(TaskExecutionStrategy):
+    """Strategy for executing MapTask tasks: one tool, handler or LLM call per item (or chunk)."""  # noqa: D202
+
+    _TEMPLATE_RE = re.compile(r"\$\{\s*(item|index)((?:\.[^}\s]+)?)\s*\}")
+
+    def __init__(
+        self,
+        llm_interface: LLMInterface,
+        tool_registry: ToolRegistry,
+        handler_registry: Optional[HandlerRegistry] = None,
+    ):
+        """Initialize the map task execution strategy.
+
+        Args:
+            llm_interface: An instance of LLMInterface for prompt templates.
+            tool_registry: An instance of ToolRegistry for item tools.
+            handler_registry: An optional instance of HandlerRegistry for item handlers.
+        """
+        self.llm_interface = llm_interface
+        self.tool_registry = tool_registry
+        self.handler_registry = handler_registry
+
+    async def execute(self, task: Task, **kwargs) -> Dict[str, Any]:
+        """Apply the task's tool, handler or prompt template to each item.
+
+        Args:
+            task: The MapTask to execute.
+            **kwargs: Additional arguments (processed_input from the workflow engine).
+
+        Returns:
+            A dictionary containing the ordered item results and per-item errors in metadata.
+        """
+        import asyncio
+
+        processed_input = dict(kwargs.get("processed_input", {}))
+        items = processed_input.pop(task.items_key, None)
+        if not isinstance(items, (list, tuple)):
+            return {"success": False, "error": f"Input '{task.items_key}' of map task '{task.id}' must be a list, "
+                                               f"got {type(items).__name__}"}
+
+        chunk_size = task.chunk_size or 1
+        chunks = [list(range(start, min(start + chunk_size, len(items)))) for start in range(0, len(items), chunk_size)]
+        results: List[Any] = [None] * len(items)
+        errors: Dict[int, str] = {}
+        completed: set = set()
+        suspended: set = set()
+        stop = asyncio.Event()
+        semaphore = asyncio.Semaphore(task.max_concurrency)
+
+        async def run_chunk(indices: List[int]) -> None:
+            async with semaphore:
+                pending = indices
+                for attempt in range(task.item_retries + 1):
+                    if stop.is_set():
+                        break
+                    if attempt:
+                        log_info(f"Map task '{task.id}': retrying items {pending} (attempt {attempt + 1})")
+                    outcomes = await asyncio.to_thread(
+                        self._call, task, [items[i] for i in pending], pending, processed_input
+                    )
+                    failed = []
+                    for index, (status, value) in zip(pending, outcomes):
+                        if status == "ok":
+                            results[index] = value
+                            completed.add(index)
+                            errors.pop(index, None)
+                        elif status == "suspended":
+                            suspended.add(index)
+                            errors.pop(index, None)
+                        else:
+                            errors[index] = value
+                            failed.append(index)
+                    pending = failed
+                    if not pending:
+                        break
+                if pending and task.failure_policy == "fail_fast":
+                    stop.set()
+                for index in indices:
+                    if index not in completed and index not in errors and index not in suspended:
+                        errors[index] = "Skipped after an earlier item failed"
+
+        log_info(f"Map task '{task.id}': {len(items)} items in {len(chunks)} calls, "
+                 f"up to {task.max_concurrency} at a time")
+        await asyncio.gather(*(run_chunk(indices) for indices in chunks))
+
+        metadata = {
+            "items": len(items),
+            "failed_items": len(errors),
+            "item_errors": [{"index": index, "error": errors[index]} for index in sorted(errors)],
+        }
+        if suspended:
+            # Items are waiting on an LLM batch; the whole task resumes later
+            return {"success": False, "suspended": True, "metadata": metadata,
+                    "message": f"{len(suspended)} items of map task '{task.id}' are waiting for batch results"}
+        if errors and task.failure_policy != "continue":
+            first = min(errors)
+            return {"success": False, "result": results, "metadata": metadata,
+                    "error": f"{len(errors)} of {len(items)} items failed; item {first}: {errors[first]}"}
+        return {"success": True, "result": results, "response": results, "metadata": metadata}
+
+    def _call(
+        self, task: Task, items: List[Any], indices: List[int], shared_input: Dict[str, Any]
+    ) -> List[Tuple[str, Any]]:
+        """Run one call for a chunk of items; returns a (status, result or error) pair per item."""
+        try:
+            if task.item_prompt:
+                return [self._call_llm(task, item, index, shared_input) for item, index in zip(items, indices)]
+
+            inputs = [self._item_input(task, item, shared_input) for item in items]
+            if task.item_tool:
+                responses = self.tool_registry.execute_tool_batch(task.item_tool, inputs)
+            elif self.handler_registry is None:
+                raise ValueError(f"Handler '{task.item_handler}' needs a HandlerRegistry")
+            else:
+                responses = self.handler_registry.execute_handler_batch(task.item_handler, inputs)
+            return [
+                ("ok", response.get("result")) if response.get("success", True)
+                else ("error", str(response.get("error", "Unknown error")))
+                for response in responses
+            ]
+        except Exception as e:
+            log_error(f"Map task '{task.id}' failed on items {indices}: {e}")
+            return [("error", str(e))] * len(items)
+
+    def _call_llm(self, task: Task, item: Any, index: int, shared_input: Dict[str, Any]) -> Tuple[str, Any]:
+        prompt = self._TEMPLATE_RE.sub(lambda match: self._render(match, item, index), task.item_prompt)
+        options = {"system_message": shared_input["system_message"]} if "system_message" in shared_input else {}
+        if not getattr(task, "cacheable", True):
+            options["use_cache"] = False
+        result = self.llm_interface.execute_llm_call(prompt, **options)
+        if result.get("success"):
+            return "ok", result.get("response")
+        if result.get("suspended"):
+            return "suspended", None
+        return "error", result.get("error", "Unknown LLM error")
+
+    @staticmethod
+    def _render(match: "re.Match", item: Any, index: int) -> str:
+        """Render an ${item...} or ${index} reference of a prompt template."""
+        from core.utils.variable_resolver import resolve_path
+
+        if match.group(1) == "index":
+            return str(index)
+        value = resolve_path(item, match.group(2)[1:]) if match.group(2) else item
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def _item_input(task: Task, item: Any, shared_input: Dict[str, Any]) -> Dict[str, Any]:
+        if task.item_key is None and isinstance(item, dict):
+            return {**shared_input, **item}
+        return {**shared_input, task.item_key or "item": item}
+
+
+class DocumentTaskExecutionStrategy(TaskExecutionStrategy):
+    """Strategy for executing DocumentTask tasks: chunk a document, map the chunks, combine results."""  # noqa: D202
+
+    _TEMPLATE_RE = re.compile(r"\$\{\s*(chunk|index|summaries)\s*\}")
+
+    def __init__(self, llm_interface: LLMInterface):
+        """Initialize the document task execution strategy.
+
+        Args:
+            llm_interface: An instance of LLMInterface for the chunk and combine calls.
+        """
+        self.llm_interface = llm_interface
+
+    async def execute(self, task: Task, **kwargs) -> Dict[str, Any]:
+        """Summarize (or otherwise process) a long document chunk by chunk.
+
+        Chunks are read lazily: a chunk is only read when a call slot is free,
+        so at most max_concurrency chunks are held in memory.
+
+        Args:
+            task: The DocumentTask to execute.
+            **kwargs: Additional arguments (processed_input from the workflow engine).
+
+        Returns:
+            A dictionary containing the combined result, and chunk statistics in metadata.
+        """
+        import asyncio
+        from core.config import get
+        from core.utils.document_chunker import chunk_file, chunk_text
+
+        processed_input = kwargs.get("processed_input", {})
+        settings = {
+            name: getattr(task, name) if getattr(task, name) is not None else get(f"document_pipeline.{name}", default)
+            for name, default in (("chunk_tokens", 2000), ("overlap_tokens", 200), ("combine_fan_in", 8),
+                                  ("max_concurrency", 4))
+        }
+        model = getattr(self.llm_interface, "model", None)
+        if processed_input.get("path"):
+            chunks = chunk_file(processed_input["path"], settings["chunk_tokens"], settings["overlap_tokens"], model)
+        elif isinstance(processed_input.get("text"), str):
+            chunks = chunk_text(processed_input["text"], settings["chunk_tokens"], settings["overlap_tokens"], model)
+        else:
+            return {"success": False, "error": f"Document task '{task.id}' requires a 'path' or 'text' input"}
+
+        store = self._response_store() if task.cache_chunks else None
+        options = {"system_message": processed_input["system_message"]} if "system_message" in processed_input else {}
+        stats = {"llm_calls": 0, "cached_calls": 0}
+        semaphore = asyncio.Semaphore(settings["max_concurrency"])
+
+        async def call(prompt: str) -> Tuple[str, Any]:
+            key = self._response_key(prompt, options.get("system_message"), model)
+            cached = store.get(key) if store is not None else None
+            if cached is not None:
+                stats["cached_calls"] += 1
+                return "ok", cached["response"]
+            stats["llm_calls"] += 1
+            result = await asyncio.to_thread(self.llm_interface.execute_llm_call, prompt, **options)
+            if result.get("success"):
+                if store is not None:
+                    store.put(key, task.id, {"response": result.get("response")})
+                return "ok", result.get("response")
+            if result.get("suspended"):
+                return "suspended", None
+            return "error", result.get("error", "Unknown LLM error")
+
+        # Map: one call per chunk, reading the next chunk only when a slot is free
+        summaries: Dict[int, Any] = {}
+        outcomes: List[Tuple[str, Any]] = []
+
+        async def map_chunk(chunk: Dict[str, Any]) -> None:
+            try:
+                status, value = await call(self._render(task.chunk_prompt, chunk=chunk["text"], index=chunk["index"]))
+                outcomes.append((status, value))
+                if status == "ok":
+                    summaries[chunk["index"]] = value
+            finally:
+                semaphore.release()
+
+        running = []
+        iterator = iter(chunks)
+        try:
+            while not any(status == "error" for status, _ in outcomes):
+                await semaphore.acquire()
+                chunk = await asyncio.to_thread(next, iterator, None)
+                if chunk is None:
+                    semaphore.release()
+                    break
+                running.append(asyncio.create_task(map_chunk(chunk)))
+        except (OSError, ValueError) as e:
+            semaphore.release()
+            await asyncio.gather(*running)
+            return {"success": False, "error": f"Could not read document for task '{task.id}': {e}"}
+        finally:
+            getattr(iterator, "close", lambda: None)()
+        await asyncio.gather(*running)
+
+        metadata = {"chunks": len(running), "combine_levels": 0, **stats}
+        failure = self._failure(task, outcomes, "chunks", metadata)
+        if failure:
+            return failure
+        if not summaries:
+            return {"success": False, "error": f"Document of task '{task.id}' is empty", "metadata": metadata}
+
+        # Reduce: combine consecutive results, level by level, until one is left
+        level = [summaries[index] for index in sorted(summaries)]
+        metadata["chunk_results"] = list(level)
+
+        async def combine(group: List[Any]) -> Tuple[str, Any]:
+            async with semaphore:
+                return await call(self._render(task.combine_prompt, summaries="\n\n".join(map(str, group))))
+
+        while len(level) > 1:
+            groups = self._group(level, settings["combine_fan_in"], settings["chunk_tokens"], model)
+            outcomes = await asyncio.gather(*(combine(group) for group in groups))
+            metadata["combine_levels"] += 1
+            metadata.update(stats)
+            failure = self._failure(task, outcomes, "combinations", metadata)
+            if failure:
+                return failure
+            level = [value for _, value in outcomes]
+
+        log_info(f"Document task '{task.id}': {metadata['chunks']} chunks, {stats['llm_calls']} LLM calls, "
+                 f"{stats['cached_calls']} cached")
+        return {"success": True, "result": level[0], "response": level[0], "metadata": metadata}
+
+    @staticmethod
+    def _failure(task: Task, outcomes: List[Tuple[str, Any]], what: str,
+                 metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the task result for failed or suspended calls, or return None if all succeeded."""
+        errors = [value for status, value in outcomes if status == "error"]
+        if errors:
+            return {"success": False, "metadata": metadata,
+                    "error": f"{len(errors)} {what} of document task '{task.id}' failed: {errors[0]}"}
+        if any(status == "suspended" for status, _ in outcomes):
+            # Calls are waiting on an LLM batch; the task resumes later with the cached responses
+            return {"success": False, "suspended": True, "metadata": metadata,
+                    "message": f"{what.capitalize()} of document task '{task.id}' are waiting for batch results"}
+        return None
+
+    @staticmethod
+    def _group(results: List[Any], fan_in: int, max_tokens: int, model: Optional[str]) -> List[List[Any]]:
+        """Split results into consecutive groups of at most fan_in results and (from two results on) max_tokens."""
+        from core.utils.document_chunker import count_tokens
+
+        groups: List[List[Any]] = []
+        group: List[Any] = []
+        tokens = 0
+        for result in results:
+            result_tokens = count_tokens(str(result), model)
+            if len(group) >= fan_in or (len(group) >= 2 and tokens + result_tokens > max_tokens):
+                groups.append(group)
+                group, tokens = [], 0
+            group.append(result)
+            tokens += result_tokens
+        groups.append(group)
+        return groups
+
+    @classmethod
+    def _render(cls, template: str, **values: Any) -> str:
+        return cls._TEMPLATE_RE.sub(lambda match: str(values.get(match.group(1), match.group(0))), template)
+
+    @staticmethod
+    def _response_key(prompt: str, system_message: Optional[str], model: Optional[str]) -> str:
+        import hashlib
+
+        payload = json.dumps({"prompt": prompt, "system_message": system_message, "model": model}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _response_store() -> Any:
+        """Open the per-chunk response cache of the configured directory."""
+        import os
+        from core.config import get
+        from core.result_store import ResultStore
+
+        directory = get("document_pipeline.cache_directory", "") or os.path.join(
+            get("data_directory", "./data"), "document_chunks")
+        return ResultStore(directory)
+
+
 class TaskExecutionStrategyFactory:
     """Factory for creating task execution strategies."""  # noqa: D202
 
@@ -226,8 +621,11 @@ class TaskExecutionStrategyFactory:
         self.tool_strategy = ToolTaskExecutionStrategy(tool_registry)
         self.direct_handler_strategy = DirectHandlerTaskExecutionStrategy(handler_registry)
         
-        # Registry for custom task types and their strategies
-        self.custom_strategies = {}
+        # Registry for custom task types and their strategies (MapTask and DocumentTask are built in)
+        self.custom_strategies = {
+            "map": MapTaskExecutionStrategy(llm_interface, tool_registry, handler_registry),
+            "document": DocumentTaskExecutionStrategy(llm_interface),
+        }
         self.task_type_predicates = {}
 
     def register_strategy(self, task_type: str, strategy: TaskExecutionStrategy) -> None:
@@ -5,26 +5,48 @@ This module provides functionality to discover, load, and manage tool plugins.
 """
 
 import importlib
+import importlib.util
 import inspect
+import json
 import os
 import pkgutil
 import sys
-from typing import Dict, List, Optional, Set, Type
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 from core.tools.plugin import ToolPlugin
 
+# Bump when the manifest layout changes so stale manifests are rebuilt.
+MANIFEST_VERSION = 1
+
 
 class PluginManager:
     """
     Manages the discovery, loading, and registration of tool plugins.
     """  # noqa: D202
 
-    def __init__(self):
-        """Initialize the plugin manager."""
+    def __init__(self, manifest_path: Optional[str] = None):
+        """
+        Initialize the plugin manager.
+
+        Args:
+            manifest_path: Optional path of a persisted discovery manifest. When set,
+                plugin modules are only imported if they changed since the manifest
+                was written, and plugin instances are created on first use.
+        """
         self.plugins: Dict[str, ToolPlugin] = {}
         self.plugin_classes: Dict[str, Type[ToolPlugin]] = {}
         self.registered_namespaces: Set[str] = set()
 
+        # Manifest-backed discovery state
+        self.manifest_path = manifest_path
+        self._manifest: Dict[str, Any] = self._read_manifest()
+        self._manifest_dirty = False
+        # Tool name or alias -> (module name, class attribute) for plugins not yet instantiated
+        self._lazy_plugins: Dict[str, Tuple[str, str]] = {}
+        # Tool name -> metadata recorded in the manifest
+        self._manifest_metadata: Dict[str, Dict[str, Any]] = {}
+
     def discover_plugins(self, package_name: str) -> List[Type[ToolPlugin]]:
         """
         Discover all tool plugin classes in a package.
@@ -85,9 +107,16 @@ class PluginManager:
         """
         Load all plugins from registered namespaces.
         
+        When a manifest path is configured, discovery is served from the
+        manifest and only modules that changed on disk are imported.
+        
         Args:
             reload: Whether to reload already loaded plugins
         """
+        if self.manifest_path is not None:
+            self._load_plugins_from_manifest(reload)
+            return
+
         for namespace in self.registered_namespaces:
             plugin_classes = self.discover_plugins(namespace)
             
@@ -161,16 +190,46 @@ class PluginManager:
         Returns:
             The plugin instance if found, None otherwise
         """
-        return self.plugins.get(name)
+        plugin = self.plugins.get(name)
+        if plugin is None and name in self._lazy_plugins:
+            plugin = self._instantiate_lazy_plugin(name)
+        return plugin
     
     def get_all_plugins(self) -> Dict[str, ToolPlugin]:
         """
         Get all registered plugins.
         
+        Plugins known only from the manifest are instantiated by this call;
+        prefer get_plugin_names() when instances are not needed.
+        
         Returns:
             Dictionary mapping plugin names to plugin instances
         """
+        for name in list(self._lazy_plugins):
+            if name in self._lazy_plugins:
+                self._instantiate_lazy_plugin(name)
         return self.plugins
+
+    def has_plugin(self, name: str) -> bool:
+        """
+        Check whether a plugin is known by name, without instantiating it.
+        
+        Args:
+            name: The name or alias of the plugin
+            
+        Returns:
+            True if the plugin is loaded or known from the manifest
+        """
+        return name in self.plugins or name in self._lazy_plugins
+
+    def get_plugin_names(self) -> List[str]:
+        """
+        Get the names and aliases of all known plugins without instantiating them.
+        
+        Returns:
+            List of plugin tool names and aliases
+        """
+        return list(self.plugins) + [name for name in self._lazy_plugins if name not in self.plugins]
     
     def get_plugin_metadata(self) -> List[Dict]:
         """
@@ -180,4 +239,202 @@ class PluginManager:
             List of dictionaries containing plugin metadata
         """
         unique_plugins = set(self.plugins.values())
-        return [plugin.get_metadata() for plugin in unique_plugins] 
\ No newline at end of file
+        metadata = [plugin.get_metadata() for plugin in unique_plugins]
+        loaded_names = {m["name"] for m in metadata}
+        metadata.extend(
+            m for name, m in self._manifest_metadata.items()
+            if name not in loaded_names and name in self._lazy_plugins
+        )
+        return metadata
+
+    # --- Manifest-backed discovery ---
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """Read the persisted manifest, returning an empty one if absent or stale."""
+        empty = {"version": MANIFEST_VERSION, "namespaces": {}}
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return empty
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable plugin manifest {self.manifest_path}: {e}")
+            return empty
+        if manifest.get("version") != MANIFEST_VERSION:
+            return empty
+        return manifest
+
+    def _write_manifest(self) -> None:
+        """Persist the manifest atomically if it changed."""
+        if not self.manifest_path or not self._manifest_dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f, indent=2, default=str)
+            os.replace(tmp_path, self.manifest_path)
+            self._manifest_dirty = False
+        except OSError as e:
+            print(f"Error writing plugin manifest {self.manifest_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _iter_namespace_modules(self, namespace: str) -> Tuple[List[str], List[Tuple[str, Optional[str]]]]:
+        """
+        List the modules of a namespace package without importing them.
+        
+        Args:
+            namespace: The package namespace to scan
+            
+        Returns:
+            Tuple of (package search locations, list of (module name, file path))
+        """
+        spec = importlib.util.find_spec(namespace)
+        if spec is None or not spec.submodule_search_locations:
+            raise ImportError(f"No package named '{namespace}'")
+
+        locations = list(spec.submodule_search_locations)
+        modules = []
+        for finder, module_name, is_pkg in pkgutil.iter_modules(locations, namespace + "."):
+            # Skip packages, only consider modules
+            if is_pkg:
+                continue
+            module_spec = finder.find_spec(module_name)
+            modules.append((module_name, module_spec.origin if module_spec else None))
+        return locations, modules
+
+    def _scan_module(self, module_name: str, reload: bool) -> List[Dict[str, Any]]:
+        """
+        Import a module and describe the plugin classes it defines.
+        
+        Args:
+            module_name: Fully qualified module name
+            reload: Whether to re-execute an already imported module
+            
+        Returns:
+            List of plugin descriptions (class attribute, tool name, aliases, metadata)
+        """
+        if reload and module_name in sys.modules:
+            module = importlib.reload(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
+
+        descriptions = []
+        for attr_name, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, ToolPlugin) and obj is not ToolPlugin and not inspect.isabstract(obj):
+                instance = obj()
+                descriptions.append({
+                    "class": attr_name,
+                    "tool_name": instance.tool_name,
+                    "aliases": list(instance.tool_aliases),
+                    "metadata": instance.get_metadata(),
+                })
+        return descriptions
+
+    def _scan_namespace(self, namespace: str, reload: bool) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Bring the manifest entry for a namespace up to date.
+        
+        Modules whose modification time and size match the manifest are not
+        imported; all others are (re)imported and re-described.
+        
+        Args:
+            namespace: The package namespace to scan
+            reload: Whether changed modules that were already imported should be reloaded
+            
+        Returns:
+            Tuple of (module name -> manifest entry, set of module names that changed)
+        """
+        locations, modules = self._iter_namespace_modules(namespace)
+        cached = self._manifest["namespaces"].get(namespace, {})
+        cached_modules = cached.get("modules", {}) if cached.get("package_path") == locations else {}
+
+        entries: Dict[str, Any] = {}
+        changed: Set[str] = set()
+        for module_name, origin in modules:
+            try:
+                stat = os.stat(origin) if origin else None
+            except OSError:
+                stat = None
+            fingerprint = [stat.st_mtime_ns, stat.st_size] if stat else None
+
+            previous = cached_modules.get(module_name)
+            if previous is not None and fingerprint is not None and previous.get("fingerprint") == fingerprint:
+                entries[module_name] = previous
+                continue
+
+            try:
+                plugins = self._scan_module(module_name, reload)
+            except Exception as e:
+                print(f"Error processing module {module_name}: {e}")
+                continue
+            entries[module_name] = {"fingerprint": fingerprint, "plugins": plugins}
+            changed.add(module_name)
+
+        if changed or set(entries) != set(cached_modules):
+            self._manifest["namespaces"][namespace] = {"package_path": locations, "modules": entries}
+            self._manifest_dirty = True
+        return entries, changed
+
+    def _load_plugins_from_manifest(self, reload: bool) -> None:
+        """Register plugins from the manifest without instantiating them."""
+        for namespace in self.registered_namespaces:
+            try:
+                entries, changed = self._scan_namespace(namespace, reload)
+            except ImportError as e:
+                print(f"Error importing package {namespace}: {e}")
+                continue
+
+            current: Dict[str, Tuple[str, str]] = {}
+            for module_name, entry in entries.items():
+                refresh = reload and module_name in changed
+                for description in entry["plugins"]:
+                    names = [description["tool_name"]] + description["aliases"]
+                    for name in names:
+                        current[name] = (module_name, description["class"])
+                        if name in self.plugins and not refresh:
+                            continue
+                        # Drop stale instances so the changed class is instantiated on next use
+                        self.plugins.pop(name, None)
+                        self.plugin_classes.pop(name, None)
+                        self._lazy_plugins[name] = (module_name, description["class"])
+                    self._manifest_metadata[description["tool_name"]] = description["metadata"]
+            self._prune_removed_plugins(namespace, current)
+
+        self._write_manifest()
+
+    def _prune_removed_plugins(self, namespace: str, current: Dict[str, Tuple[str, str]]) -> None:
+        """Forget plugins of a namespace whose module or class no longer exists."""
+        prefix = namespace + "."
+        for name, (module_name, class_name) in list(self._lazy_plugins.items()):
+            if module_name.startswith(prefix) and current.get(name) != (module_name, class_name):
+                del self._lazy_plugins[name]
+                if name not in current:
+                    self._manifest_metadata.pop(name, None)
+        for name, plugin in list(self.plugins.items()):
+            if type(plugin).__module__.startswith(prefix) and name not in current:
+                self.plugins.pop(name)
+                self.plugin_classes.pop(name, None)
+                self._manifest_metadata.pop(name, None)
+
+    def _instantiate_lazy_plugin(self, name: str) -> Optional[ToolPlugin]:
+        """Import and instantiate a plugin known only from the manifest."""
+        module_name, class_name = self._lazy_plugins[name]
+        try:
+            plugin_class = getattr(importlib.import_module(module_name), class_name)
+            plugin_instance = plugin_class()
+        except Exception as e:
+            print(f"Error loading plugin '{name}' from {module_name}.{class_name}: {e}")
+            return None
+
+        tool_name = plugin_instance.tool_name
+        self.plugins[tool_name] = plugin_instance
+        self.plugin_classes[tool_name] = plugin_class
+        self._lazy_plugins.pop(tool_name, None)
+        for alias in plugin_instance.tool_aliases:
+            if self._lazy_plugins.get(alias) == (module_name, class_name):
+                self.plugins[alias] = plugin_instance
+                self._lazy_plugins.pop(alias)
+        return self.plugins.get(name, plugin_instance)
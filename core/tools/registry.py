@@ -7,18 +7,15 @@ discovery, and execution in the Dawn framework.
 
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, TypeVar, cast
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, cast
 
 from core.errors import ErrorCode, ToolExecutionError, create_error_response
 from core.tools.plugin_manager import PluginManager
 from core.tools.response_format import format_tool_response
+from core.utils.lazy_import import LazyCallable
 
-# Avoid circular imports by delaying these imports
-from tools.file_read_tool import FileReadTool
-from tools.file_upload_tool import FileUploadTool
-from tools.openai_vs.create_vector_store import CreateVectorStoreTool
-from tools.web_search_tool import WebSearchTool
-from tools.write_markdown_tool import WriteMarkdownTool
+# Tool implementations (and the SDKs they depend on) are imported inside the
+# handlers below, so importing the registry stays cheap.
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +26,21 @@ class ToolRegistry:
     Initializes and provides access to tool handler methods.
     """  # noqa: D202
 
-    def __init__(self):
+    def __init__(self, plugin_manifest_path: Optional[str] = None):
         """
         Initialize the tool registry and register the default tool handlers.
+
+        Args:
+            plugin_manifest_path: Optional path of a persisted plugin discovery manifest.
+                When set, plugin discovery only imports modules that changed and
+                plugins are instantiated on first use.
         """
         self.tools: Dict[str, Callable] = {}
+        # Optional batch entry points, keyed by tool name
+        self.batch_tools: Dict[str, Callable] = {}
         
         # Initialize plugin manager
-        self.plugin_manager = PluginManager()
+        self.plugin_manager = PluginManager(manifest_path=plugin_manifest_path)
         self.plugin_namespaces: Set[str] = set()
         
         # Register legacy tools for backward compatibility
@@ -45,6 +49,7 @@ class ToolRegistry:
         self.register_tool("file_upload", self.file_upload_tool_handler)
         self.register_tool("create_vector_store", self.create_vector_store_handler)
         self.register_tool("upload_file_to_vector_store", self.upload_file_to_vector_store_tool_handler)
+        self.register_tool("bulk_ingest_vector_store", self.bulk_ingest_vector_store_tool_handler)
         self.register_tool("save_to_ltm", self.save_to_ltm_tool_handler)
         self.register_tool("list_vector_stores", self.list_vector_stores_tool_handler)
         self.register_tool("delete_vector_store", self.delete_vector_store_tool_handler)
@@ -68,6 +73,88 @@ class ToolRegistry:
             raise ValueError(f"Tool with name '{name}' already registered.")
         self.tools[name] = func
 
+    def register_batch_tool(self, name: str, func: Callable) -> None:
+        """
+        Register the batch entry point of a tool.
+
+        The async engine coalesces concurrent calls to the tool into one call of
+        func, which receives the list of inputs and returns one result per input,
+        in order. A result may be an exception instance to fail only that input.
+
+        Args:
+            name: The name of a registered tool.
+            func: The batch function, func(list_of_inputs) -> list_of_results.
+
+        Raises:
+            ValueError: If no tool with this name is registered.
+        """
+        if name not in self.tools:
+            raise ValueError(f"Tool '{name}' must be registered before its batch entry point.")
+        self.batch_tools[name] = func
+
+    def get_batch_tool(self, name: str) -> Optional[Callable]:
+        """
+        Retrieve the batch entry point of a tool, if it has one.
+
+        Besides entry points registered with register_batch_tool, a tool callable
+        or plugin exposing an ``execute_batch`` method provides one.
+
+        Args:
+            name: The name of the tool.
+
+        Returns:
+            The batch function, or None if the tool can only be called once per input.
+        """
+        if name in self.batch_tools:
+            return self.batch_tools[name]
+        if name not in self.tools:
+            return None
+        if self.plugin_manager.has_plugin(name):
+            plugin = self.plugin_manager.get_plugin(name)
+            execute_batch = getattr(plugin, "execute_batch", None)
+            if execute_batch is None:
+                return None
+
+            def validated_batch(inputs: List[Dict[str, Any]]) -> List[Any]:
+                # An input that fails validation gets its exception; the others still run as one batch
+                results: List[Any] = []
+                valid: List[Tuple[int, Dict[str, Any]]] = []
+                for data in inputs:
+                    try:
+                        valid.append((len(results), plugin.validate_parameters(**data)))
+                        results.append(None)
+                    except Exception as e:
+                        results.append(e)
+                if valid:
+                    batch_results = execute_batch([params for _, params in valid])
+                    if len(batch_results) != len(valid):
+                        raise ToolExecutionError(
+                            f"Batch entry point returned {len(batch_results)} results for {len(valid)} inputs",
+                            tool_name=name,
+                        )
+                    for (index, _), result in zip(valid, batch_results):
+                        results[index] = result
+                return results
+
+            return validated_batch
+        return getattr(self.get_tool(name), "execute_batch", None)
+
+    def register_lazy_tool(self, name: str, import_path: str) -> None:
+        """
+        Register a tool declared as an import string, resolved on first use.
+
+        The tool module is not imported until the tool is first retrieved or
+        executed, which keeps registry construction and framework startup cheap.
+
+        Args:
+            name: The unique name to identify the tool.
+            import_path: Path of the tool callable, as "package.module:attribute".
+
+        Raises:
+            ValueError: If a tool with the same name is already registered.
+        """
+        self.register_tool(name, LazyCallable(import_path))
+
     def register_plugin_namespace(self, namespace: str) -> None:
         """
         Register a namespace (package) where tool plugins can be found.
@@ -89,11 +176,16 @@ class ToolRegistry:
         # Load plugins through the plugin manager
         self.plugin_manager.load_plugins(reload)
         
-        # Register all plugins as tools
-        for name, plugin in self.plugin_manager.get_all_plugins().items():
+        # Register all plugins as tools. Wrappers look the plugin up by name at
+        # call time, so plugins known only from the discovery manifest are
+        # imported on first use and reloaded plugins are picked up.
+        for name in self.plugin_manager.get_plugin_names():
             if name not in self.tools or reload:
                 # Create a wrapper function to call the plugin's execute method
-                def plugin_wrapper(plugin_instance=plugin, **kwargs):
+                def plugin_wrapper(plugin_name=name, **kwargs):
+                    plugin_instance = self.plugin_manager.get_plugin(plugin_name)
+                    if plugin_instance is None:
+                        raise ToolExecutionError(f"Plugin '{plugin_name}' could not be loaded", tool_name=plugin_name)
                     # Validate parameters before executing
                     validated_params = plugin_instance.validate_parameters(**kwargs)
                     return plugin_instance.execute(**validated_params)
@@ -114,7 +206,12 @@ class ToolRegistry:
         Returns:
             The callable tool function if found, otherwise None.
         """
-        return self.tools.get(name)
+        tool_func = self.tools.get(name)
+        if isinstance(tool_func, LazyCallable):
+            # First use of a lazily declared tool: import it and drop the proxy
+            tool_func = tool_func.resolve()
+            self.tools[name] = tool_func
+        return tool_func
 
     def execute_tool(self, name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -181,6 +278,42 @@ class ToolRegistry:
                 reason=str(e)
             )
     
+    def execute_tool_batch(self, name: str, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute a tool once for a list of inputs.
+
+        Uses the tool's batch entry point when it has one, otherwise calls
+        execute_tool for each input.
+
+        Args:
+            name: The name of the tool to execute.
+            inputs: The input data of each call.
+
+        Returns:
+            A standardized response dictionary per input, in order.
+        """
+        batch_func = self.get_batch_tool(name)
+        if batch_func is None:
+            return [self.execute_tool(name, data) for data in inputs]
+
+        try:
+            results = batch_func(inputs)
+            if len(results) != len(inputs):
+                raise ToolExecutionError(
+                    f"Batch entry point returned {len(results)} results for {len(inputs)} inputs", tool_name=name
+                )
+        except Exception as e:
+            if not isinstance(e, ToolExecutionError):
+                logger.exception(f"Unexpected Error executing batch of tool '{name}': {e}")
+            error = create_error_response(error_code=ErrorCode.EXECUTION_TOOL_FAILED, tool_name=name, reason=str(e))
+            return [dict(error) for _ in inputs]
+
+        return [
+            create_error_response(error_code=ErrorCode.EXECUTION_TOOL_FAILED, tool_name=name, reason=str(result))
+            if isinstance(result, Exception) else format_tool_response(result)
+            for result in results
+        ]
+
     def get_available_tools(self) -> List[Dict[str, Any]]:
         """
         Get metadata about all available tools, both legacy and plugin-based.
@@ -220,6 +353,8 @@ class ToolRegistry:
     def web_search_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handler for the Web Search tool."""
         try:
+            from tools.web_search_tool import WebSearchTool
+
             web_search_tool = WebSearchTool()
             query = input_data.get("query", "")
             if not query:
@@ -240,10 +375,28 @@ class ToolRegistry:
                 reason=str(e)
             )
 
+    def _vector_store_tool(self, input_data: Dict[str, Any], tool_class: Callable[[], Any]) -> Any:
+        """
+        Select the backend of a vector store tool.
+
+        Returns the shared local backend when the input's "provider", or else the
+        vector_store.provider setting, is "local"; otherwise a new tool_class instance.
+        """
+        from core.config import get as get_config
+
+        provider = input_data.get("provider") or get_config("vector_store.provider")
+        if provider == "local":
+            from tools.local_vs.vector_store import get_local_vector_store
+
+            return get_local_vector_store()
+        return tool_class()
+
     def file_read_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handler for the File Read (RAG) tool."""
         try:
-            file_read_tool = FileReadTool()
+            from tools.file_read_tool import FileReadTool
+
+            file_read_tool = self._vector_store_tool(input_data, FileReadTool)
             
             vector_store_ids = input_data.get("vector_store_ids", [])
             if not vector_store_ids:
@@ -313,7 +466,7 @@ class ToolRegistry:
         try:
             from tools.openai_vs.create_vector_store import CreateVectorStoreTool
             
-            create_tool = CreateVectorStoreTool()
+            create_tool = self._vector_store_tool(input_data, CreateVectorStoreTool)
             name = input_data.get("name", "")
             
             if not name:
@@ -337,6 +490,8 @@ class ToolRegistry:
     def write_markdown_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handler for the Write Markdown File tool."""
         try:
+            from tools.write_markdown_tool import WriteMarkdownTool
+
             write_tool = WriteMarkdownTool()
             
             file_path = input_data.get("file_path", "")
@@ -363,7 +518,7 @@ class ToolRegistry:
         try:
             from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
 
-            upload_tool = UploadFileToVectorStoreTool()
+            upload_tool = self._vector_store_tool(input_data, UploadFileToVectorStoreTool)
             
             vector_store_id = input_data.get("vector_store_id", "")
             if not vector_store_id:
@@ -396,8 +551,10 @@ class ToolRegistry:
                     }
                 )
 
+            # "wait": False returns as soon as the file is added, with status "submitted"
+            options = {"wait": input_data["wait"]} if "wait" in input_data else {}
             result = upload_tool.upload_and_add_file_to_vector_store(
-                vector_store_id, file_path, purpose=purpose
+                vector_store_id, file_path, purpose=purpose, **options
             )
             return format_tool_response(result)
         except Exception as e:
@@ -410,9 +567,9 @@ class ToolRegistry:
     def save_to_ltm_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handler for the Save to LTM tool."""
         try:
-            from tools.openai_vs.save_to_ltm import SaveToLTMTool
+            from tools.openai_vs.save_text_to_vector_store import SaveTextToVectorStoreTool
 
-            save_tool = SaveToLTMTool()
+            save_tool = self._vector_store_tool(input_data, SaveTextToVectorStoreTool)
             
             vector_store_id = input_data.get("vector_store_id", "")
             if not vector_store_id:
@@ -422,7 +579,7 @@ class ToolRegistry:
                     details={"field_name": "vector_store_id"}
                 )
                 
-            text = input_data.get("text", "")
+            text = input_data.get("text_content") or input_data.get("text", "")
             if not text:
                 return create_error_response(
                     message="Missing 'text' for saving to LTM",
@@ -441,7 +598,9 @@ class ToolRegistry:
                     }
                 )
 
-            result = save_tool.save_text_to_vector_store(vector_store_id, text)
+            # Buffered writes are journaled locally and uploaded in batches
+            options = {"buffered": input_data["buffered"]} if "buffered" in input_data else {}
+            result = save_tool.save_text_to_vector_store(vector_store_id, text, **options)
             return format_tool_response(result)
         except Exception as e:
             return create_error_response(
@@ -450,12 +609,55 @@ class ToolRegistry:
                 details={"error_type": type(e).__name__}
             )
 
+    def bulk_ingest_vector_store_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Handler for the Bulk Ingest Vector Store tool."""
+        try:
+            from tools.openai_vs.bulk_ingest import bulk_ingest
+
+            vector_store_id = input_data.get("vector_store_id", "")
+            if not vector_store_id:
+                return create_error_response(
+                    message="Missing 'vector_store_id' for bulk ingestion",
+                    error_code=ErrorCode.VALIDATION_MISSING_FIELD,
+                    details={"field_name": "vector_store_id"}
+                )
+
+            paths = input_data.get("paths") or input_data.get("path")
+            if not paths:
+                return create_error_response(
+                    message="Missing 'paths' for bulk ingestion",
+                    error_code=ErrorCode.VALIDATION_MISSING_FIELD,
+                    details={"field_name": "paths"}
+                )
+            if isinstance(paths, str):
+                paths = [paths]
+
+            options = {
+                key: input_data[key]
+                for key in ("purpose", "max_concurrency", "batch_size", "extensions")
+                if key in input_data
+            }
+            result = bulk_ingest(
+                vector_store_id,
+                paths,
+                index_path=input_data.get("index_path"),
+                wait=input_data.get("wait", False),
+                **options
+            )
+            return format_tool_response(result)
+        except Exception as e:
+            return create_error_response(
+                message=f"Bulk ingestion failed: {str(e)}",
+                error_code=ErrorCode.EXECUTION_TOOL_FAILED,
+                details={"error_type": type(e).__name__}
+            )
+
     def list_vector_stores_tool_handler(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handler for the List Vector Stores tool."""
         try:
             from tools.openai_vs.list_vector_stores import ListVectorStoresTool
 
-            list_tool = ListVectorStoresTool()
+            list_tool = self._vector_store_tool(input_data, ListVectorStoresTool)
             result = list_tool.list_vector_stores()
             return format_tool_response(result)
         except Exception as e:
@@ -470,7 +672,7 @@ class ToolRegistry:
         try:
             from tools.openai_vs.delete_vector_store import DeleteVectorStoreTool
 
-            delete_tool = DeleteVectorStoreTool()
+            delete_tool = self._vector_store_tool(input_data, DeleteVectorStoreTool)
             
             vector_store_id = input_data.get("vector_store_id", "")
             if not vector_store_id:
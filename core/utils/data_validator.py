@@ -5,9 +5,10 @@ This module provides functionality for validating task inputs and outputs,
 including type checking and schema validation.
 """
 
-from typing import Any, Dict, List, Optional, Union, get_type_hints, get_origin, get_args
+from typing import Any, Callable, Dict, List, Optional, Union, get_type_hints, get_origin, get_args
 import inspect
 import json
+import weakref
 
 
 class ValidationError(Exception):
@@ -62,137 +63,384 @@ def create_schema_from_type_hints(func) -> Dict[str, Any]:
     return schema
 
 
-def validate_type(value: Any, expected_type: Any, field_path: str = "") -> None:
-    """
-    Validate that a value matches the expected type.
-    
-    Args:
-        value: The value to validate
-        expected_type: The expected type (can be a Union, List, Dict, etc.)
-        field_path: Path to the field for error reporting
-        
-    Raises:
-        ValidationError: If validation fails
-    """
-    # Handle Any type - always valid
-    if expected_type is Any:
-        return
-    
-    # Handle None
-    if value is None:
-        if expected_type is None or expected_type is type(None):
-            return
-        # Optional types are represented as Union[Type, None]
-        if hasattr(expected_type, "__origin__") and expected_type.__origin__ is Union:
-            if type(None) in expected_type.__args__:
+# Validator signature: validator(value, field_path) raises ValidationError on mismatch
+Validator = Callable[[Any, str], None]
+
+_validator_cache: Dict[Any, Validator] = {}
+_VALIDATOR_CACHE_MAX_SIZE = 1024
+
+
+def _is_plain_class(tp: Any) -> bool:
+    """Whether a type can be checked with a plain isinstance/issubclass call."""
+    return isinstance(tp, type) and get_origin(tp) is None
+
+
+def _sample_indices(length: int, sample_size: Optional[int]) -> range:
+    """Indices of the elements to validate, evenly spaced when sampling a large sequence."""
+    if not sample_size or length <= sample_size:
+        return range(length)
+    return range(0, length, -(-length // sample_size))
+
+
+def _compile_none(expected_type: Any) -> Validator:
+    def validate_none(value, field_path=""):
+        if value is not None:
+            raise ValidationError(f"Expected None, got {type(value).__name__}", field_path)
+    return validate_none
+
+
+def _compile_class(expected_type: type) -> Validator:
+    def validate_instance(value, field_path=""):
+        if not isinstance(value, expected_type):
+            if value is None:
+                raise ValidationError(f"Expected {expected_type}, got None", field_path)
+            raise ValidationError(
+                f"Expected {expected_type.__name__}, got {type(value).__name__}",
+                field_path
+            )
+    return validate_instance
+
+
+def _compile_union(expected_type: Any, sample_size: Optional[int]) -> Validator:
+    args = get_args(expected_type)
+    allows_none = type(None) in args
+    description = ', '.join(str(t) for t in args)
+
+    # Unions of plain classes are a single isinstance check
+    if all(_is_plain_class(arg) for arg in args):
+        classes = tuple(args)
+
+        def validate_simple_union(value, field_path=""):
+            if isinstance(value, classes):
                 return
-        raise ValidationError(f"Expected {expected_type}, got None", field_path)
-    
-    # Handle Union types
-    if hasattr(expected_type, "__origin__") and expected_type.__origin__ is Union:
-        # Try each type in the union
+            if value is None:
+                raise ValidationError(f"Expected {expected_type}, got None", field_path)
+            raise ValidationError(
+                f"Value didn't match any expected types: {description}",
+                field_path,
+                {"attempted_validations": [
+                    f"{field_path}: Expected {t.__name__}, got {type(value).__name__}" if field_path
+                    else f"Expected {t.__name__}, got {type(value).__name__}"
+                    for t in classes
+                ]}
+            )
+        return validate_simple_union
+
+    alternatives = [compile_validator(arg, sample_size) for arg in args]
+
+    def validate_union(value, field_path=""):
+        if value is None and not allows_none:
+            raise ValidationError(f"Expected {expected_type}, got None", field_path)
         errors = []
-        for arg_type in expected_type.__args__:
+        for validator in alternatives:
             try:
-                validate_type(value, arg_type, field_path)
+                validator(value, field_path)
                 return  # If any type validates, we're good
             except ValidationError as e:
                 errors.append(str(e))
         raise ValidationError(
-            f"Value didn't match any expected types: {', '.join(str(t) for t in expected_type.__args__)}",
+            f"Value didn't match any expected types: {description}",
             field_path,
             {"attempted_validations": errors}
         )
-    
-    # Handle List type
-    if hasattr(expected_type, "__origin__") and expected_type.__origin__ in (list, List):
+    return validate_union
+
+
+def _compile_list(expected_type: Any, sample_size: Optional[int]) -> Validator:
+    args = get_args(expected_type)
+    item_type = args[0] if args else Any
+
+    def check_container(value, field_path):
         if not isinstance(value, list):
+            if value is None:
+                raise ValidationError(f"Expected {expected_type}, got None", field_path)
             raise ValidationError(f"Expected list, got {type(value).__name__}", field_path)
-        
-        # If a type is specified for list items
-        if hasattr(expected_type, "__args__") and expected_type.__args__:
-            item_type = expected_type.__args__[0]
-            for i, item in enumerate(value):
-                validate_type(item, item_type, f"{field_path}[{i}]")
-        return
-    
-    # Handle Dict type
-    if hasattr(expected_type, "__origin__") and expected_type.__origin__ in (dict, Dict):
+
+    if item_type is Any:
+        def validate_list(value, field_path=""):
+            check_container(value, field_path)
+        return validate_list
+
+    item_validator = compile_validator(item_type, sample_size)
+
+    if _is_plain_class(item_type):
+        # Fast path: collect the distinct element types in C and check each once
+        def validate_primitive_list(value, field_path=""):
+            check_container(value, field_path)
+            if sample_size and len(value) > sample_size:
+                items = value[::-(-len(value) // sample_size)]
+            else:
+                items = value
+            if all(issubclass(t, item_type) for t in set(map(type, items))):
+                return
+            for i in _sample_indices(len(value), sample_size):
+                item_validator(value[i], f"{field_path}[{i}]")
+        return validate_primitive_list
+
+    def validate_list(value, field_path=""):
+        check_container(value, field_path)
+        for i in _sample_indices(len(value), sample_size):
+            try:
+                item_validator(value[i], "")
+            except ValidationError:
+                # Field paths are only built once an element is known to be invalid
+                item_validator(value[i], f"{field_path}[{i}]")
+                raise
+    return validate_list
+
+
+def _compile_dict(expected_type: Any, sample_size: Optional[int]) -> Validator:
+    args = get_args(expected_type)
+
+    def check_container(value, field_path):
         if not isinstance(value, dict):
+            if value is None:
+                raise ValidationError(f"Expected {expected_type}, got None", field_path)
             raise ValidationError(f"Expected dict, got {type(value).__name__}", field_path)
-        
-        # If key and value types are specified
-        if hasattr(expected_type, "__args__") and len(expected_type.__args__) == 2:
-            key_type, val_type = expected_type.__args__
-            for k, v in value.items():
+
+    if len(args) != 2 or args == (Any, Any):
+        def validate_dict(value, field_path=""):
+            check_container(value, field_path)
+        return validate_dict
+
+    key_type, val_type = args
+    key_validator = compile_validator(key_type, sample_size)
+    val_validator = compile_validator(val_type, sample_size)
+    # Fast path: plain classes are checked inline, without calling nested validators
+    fast = (key_type is Any or _is_plain_class(key_type)) and (val_type is Any or _is_plain_class(val_type))
+    key_class = object if key_type is Any else key_type
+    val_class = object if val_type is Any else val_type
+
+    def validate_dict(value, field_path=""):
+        check_container(value, field_path)
+        if sample_size and len(value) > sample_size:
+            all_items = list(value.items())
+            items = [all_items[i] for i in _sample_indices(len(all_items), sample_size)]
+        else:
+            items = value.items()
+        if fast:
+            for k, v in items:
+                if not (isinstance(k, key_class) and isinstance(v, val_class)):
+                    break
+            else:
+                return
+        for k, v in items:
+            try:
+                key_validator(k, "")
+                val_validator(v, "")
+            except ValidationError:
                 # Validate key type
-                validate_type(k, key_type, f"{field_path} (key: {k})")
+                key_validator(k, f"{field_path} (key: {k})")
                 # Validate value type
-                validate_type(v, val_type, f"{field_path}.{k}")
-        return
-    
-    # Handle basic types
-    if not isinstance(value, expected_type):
-        raise ValidationError(
-            f"Expected {expected_type.__name__}, got {type(value).__name__}",
-            field_path
-        )
+                val_validator(v, f"{field_path}.{k}")
+                raise
+    return validate_dict
+
+
+def _compile(expected_type: Any, sample_size: Optional[int]) -> Validator:
+    # Handle Any type - always valid
+    if expected_type is Any:
+        return lambda value, field_path="": None
+
+    if expected_type is None or expected_type is type(None):
+        return _compile_none(expected_type)
+
+    origin = get_origin(expected_type)
+    if origin is Union:
+        return _compile_union(expected_type, sample_size)
+    if origin in (list, List):
+        return _compile_list(expected_type, sample_size)
+    if origin in (dict, Dict):
+        return _compile_dict(expected_type, sample_size)
+
+    if isinstance(expected_type, type):
+        return _compile_class(expected_type)
 
+    # Other typing constructs keep the plain isinstance semantics
+    def validate_other(value, field_path=""):
+        if value is None:
+            raise ValidationError(f"Expected {expected_type}, got None", field_path)
+        if not isinstance(value, expected_type):
+            raise ValidationError(
+                f"Expected {getattr(expected_type, '__name__', expected_type)}, got {type(value).__name__}",
+                field_path
+            )
+    return validate_other
 
-def validate_data(data: Dict[str, Any], schema: Dict[str, Dict[str, Any]], base_path: str = "") -> List[ValidationError]:
+
+def compile_validator(expected_type: Any, sample_size: Optional[int] = None) -> Validator:
     """
-    Validate data against a schema.
+    Compile a type into a reusable validator function.
+    
+    The type is inspected once; the returned closure only performs the checks
+    the type requires. Lists and dicts of plain classes are checked by their
+    distinct element types rather than element by element. Validators are
+    cached per (type, sample_size).
     
     Args:
-        data: The data to validate
-        schema: Dictionary mapping field names to type information
-        base_path: Base path for error reporting
+        expected_type: The expected type (can be a Union, List, Dict, etc.)
+        sample_size: If set, lists and dicts with more elements than this only
+                     have an evenly spaced sample of about this many elements checked
         
     Returns:
-        List of ValidationError objects, empty if validation passed
+        A function validator(value, field_path="") that raises ValidationError
     """
-    errors = []
+    try:
+        key = (expected_type, sample_size)
+        validator = _validator_cache.get(key)
+    except TypeError:
+        # Unhashable type annotations cannot be cached
+        return _compile(expected_type, sample_size)
+
+    if validator is None:
+        validator = _compile(expected_type, sample_size)
+        if len(_validator_cache) >= _VALIDATOR_CACHE_MAX_SIZE:
+            _validator_cache.clear()
+        _validator_cache[key] = validator
+    return validator
+
+
+def validate_type(value: Any, expected_type: Any, field_path: str = "", sample_size: Optional[int] = None) -> None:
+    """
+    Validate that a value matches the expected type.
     
-    # Check required fields
-    for field_name, field_info in schema.items():
-        if field_info.get("required", False) and field_name not in data:
-            errors.append(ValidationError(
-                f"Missing required field",
-                f"{base_path}.{field_name}" if base_path else field_name
-            ))
+    Args:
+        value: The value to validate
+        expected_type: The expected type (can be a Union, List, Dict, etc.)
+        field_path: Path to the field for error reporting
+        sample_size: If set, only sample the elements of larger lists and dicts
+        
+    Raises:
+        ValidationError: If validation fails
+    """
+    compile_validator(expected_type, sample_size)(value, field_path)
+
+
+def compile_schema(
+    schema: Dict[str, Dict[str, Any]], sample_size: Optional[int] = None
+) -> Callable[..., List[ValidationError]]:
+    """
+    Compile a schema into a reusable data validator.
     
-    # Check field types
-    for field_name, field_value in data.items():
-        if field_name in schema:
-            field_info = schema[field_name]
-            expected_type = field_info.get("type", Any)
-            
+    Args:
+        schema: Dictionary mapping field names to type information
+        sample_size: If set, only sample the elements of larger lists and dicts
+        
+    Returns:
+        A function validator(data, base_path="") returning a list of ValidationError objects
+    """
+    required = [name for name, info in schema.items() if info.get("required", False)]
+    field_validators = {
+        name: compile_validator(info.get("type", Any), sample_size)
+        for name, info in schema.items()
+        if info.get("type", Any) is not Any
+    }
+
+    def validate(data: Dict[str, Any], base_path: str = "") -> List[ValidationError]:
+        errors = []
+        
+        # Check required fields
+        for field_name in required:
+            if field_name not in data:
+                errors.append(ValidationError(
+                    f"Missing required field",
+                    f"{base_path}.{field_name}" if base_path else field_name
+                ))
+        
+        # Check field types
+        for field_name, field_value in data.items():
+            validator = field_validators.get(field_name)
+            if validator is None:
+                continue
             field_path = f"{base_path}.{field_name}" if base_path else field_name
-            
             try:
-                validate_type(field_value, expected_type, field_path)
+                validator(field_value, field_path)
             except ValidationError as e:
                 errors.append(e)
+        
+        return errors
     
-    return errors
+    return validate
 
 
-def validate_task_input(task_handler, input_data: Dict[str, Any]) -> List[ValidationError]:
+def validate_data(data: Dict[str, Any], schema: Dict[str, Dict[str, Any]], base_path: str = "",
+                  sample_size: Optional[int] = None) -> List[ValidationError]:
+    """
+    Validate data against a schema.
+    
+    Args:
+        data: The data to validate
+        schema: Dictionary mapping field names to type information
+        base_path: Base path for error reporting
+        sample_size: If set, only sample the elements of larger lists and dicts
+        
+    Returns:
+        List of ValidationError objects, empty if validation passed
+    """
+    return compile_schema(schema, sample_size)(data, base_path)
+
+
+# Compiled validators per handler and sample size; entries go away with their handler
+_handler_validators: "weakref.WeakKeyDictionary[Callable, Dict[Optional[int], Callable]]" = weakref.WeakKeyDictionary()
+
+
+def _compile_handler_validator(task_handler, sample_size: Optional[int]) -> Callable[..., List[ValidationError]]:
+    validators = _handler_validators.setdefault(task_handler, {})
+    if sample_size not in validators:
+        validators[sample_size] = compile_schema(create_schema_from_type_hints(task_handler), sample_size)
+    return validators[sample_size]
+
+
+def validate_task_input(task_handler, input_data: Dict[str, Any],
+                        sample_size: Optional[int] = None) -> List[ValidationError]:
     """
     Validate task input data against the handler's expected parameters.
     
+    The handler's type hints are compiled into a validator once and reused.
+    
     Args:
         task_handler: The function that will handle the task
         input_data: The input data to validate
+        sample_size: If set, only sample the elements of larger lists and dicts
         
     Returns:
         List of ValidationError objects, empty if validation passed
     """
-    # Create schema from handler function
-    schema = create_schema_from_type_hints(task_handler)
+    try:
+        validator = _compile_handler_validator(task_handler, sample_size)
+    except TypeError:
+        # Callables that cannot be weakly referenced are compiled on every call
+        validator = compile_schema(create_schema_from_type_hints(task_handler), sample_size)
     
     # Validate the data
-    return validate_data(input_data, schema)
+    return validator(input_data)
+
+
+# Standard task output schema
+_OUTPUT_SCHEMA = {
+    "success": {
+        "type": bool,
+        "required": True
+    },
+    "result": {
+        "type": Any,
+        "required": False  # Not required if error is present
+    },
+    "response": {
+        "type": Any,
+        "required": False  # Not required if result or error is present
+    },
+    "error": {
+        "type": str,
+        "required": False  # Required if success is False
+    },
+    "error_type": {
+        "type": str,
+        "required": False  # Optional
+    }
+}
+
+_validate_output_schema = compile_schema(_OUTPUT_SCHEMA)
 
 
 def validate_task_output(output_data: Dict[str, Any]) -> List[ValidationError]:
@@ -205,31 +453,7 @@ def validate_task_output(output_data: Dict[str, Any]) -> List[ValidationError]:
     Returns:
         List of ValidationError objects, empty if validation passed
     """
-    # Define standard output schema
-    schema = {
-        "success": {
-            "type": bool,
-            "required": True
-        },
-        "result": {
-            "type": Any,
-            "required": False  # Not required if error is present
-        },
-        "response": {
-            "type": Any,
-            "required": False  # Not required if result or error is present
-        },
-        "error": {
-            "type": str,
-            "required": False  # Required if success is False
-        },
-        "error_type": {
-            "type": str,
-            "required": False  # Optional
-        }
-    }
-    
-    errors = validate_data(output_data, schema)
+    errors = _validate_output_schema(output_data)
     
     # Check logical constraints
     if output_data.get("success") is False and "error" not in output_data:
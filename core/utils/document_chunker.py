@@ -0,0 +1,229 @@
+"""
+Token-bounded chunking of long documents.
+
+Documents are read through a memory map, one paragraph at a time, so a
+500-page file is never loaded as a single string. Paragraphs are split into
+sentences and packed into chunks of at most ``max_tokens`` tokens. Each chunk
+repeats the last ``overlap_tokens`` tokens' worth of sentences of the previous
+chunk, so text cut at a chunk boundary is seen whole by one of the two chunks.
+
+Tokens are counted with tiktoken when it is installed, and estimated at four
+characters per token otherwise.
+"""
+
+import mmap
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_BREAK = b"\n\n"
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+_encoders: Dict[str, Any] = {}
+
+
+def _get_encoder(model: Optional[str]) -> Any:
+    """Return a tiktoken encoder for the model, or None if tiktoken is not installed."""
+    key = model or ""
+    if key not in _encoders:
+        try:
+            import tiktoken
+        except ImportError:
+            _encoders[key] = None
+        else:
+            try:
+                _encoders[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+            except KeyError:
+                _encoders[key] = tiktoken.get_encoding("cl100k_base")
+    return _encoders[key]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text: The text to measure.
+        model: Model whose tokenizer is used, if tiktoken knows it.
+
+    Returns:
+        int: The number of tokens, estimated if tiktoken is not installed.
+    """
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: Optional[str] = None, from_end: bool = False) -> str:
+    """
+    Cut a text to at most max_tokens tokens.
+
+    Args:
+        text: The text to cut.
+        max_tokens: Tokens to keep.
+        model: Model whose tokenizer counts the tokens.
+        from_end: Keep the end of the text instead of its beginning.
+
+    Returns:
+        str: The kept part of the text.
+    """
+    if max_tokens <= 0:
+        return ""
+    encoder = _get_encoder(model)
+    if encoder is None:
+        chars = max_tokens * CHARS_PER_TOKEN
+        return text[-chars:] if from_end else text[:chars]
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[-max_tokens:] if from_end else tokens[:max_tokens])
+
+
+def _mmap_paragraphs(data: Any, max_bytes: int) -> Iterator[Tuple[int, int]]:
+    """Yield the byte ranges of the paragraphs of a buffer, cutting runs longer than max_bytes at whitespace."""
+    size = len(data)
+    start = 0
+    while start < size:
+        end = data.find(_PARAGRAPH_BREAK, start, start + max_bytes)
+        if end == -1:
+            end = min(size, start + max_bytes)
+            if end < size:
+                # Cut at the last whitespace, or at least at a UTF-8 character boundary
+                cut = max(data.rfind(b" ", start, end), data.rfind(b"\n", start, end))
+                if cut > start:
+                    end = cut
+                else:
+                    while end > start and data[end] & 0xC0 == 0x80:
+                        end -= 1
+            yield start, end
+            start = end
+        else:
+            yield start, end
+            start = end + len(_PARAGRAPH_BREAK)
+
+
+def _split_oversized(text: str, max_tokens: int, model: Optional[str]) -> Iterator[str]:
+    """Split a sentence longer than max_tokens at word boundaries, and words longer than that anywhere."""
+    if count_tokens(text, model) <= max_tokens:
+        yield text
+        return
+    piece = ""
+    for word in text.split(" "):
+        if count_tokens(word, model) > max_tokens:
+            if piece:
+                yield piece
+                piece = ""
+            step = max(1, max_tokens * CHARS_PER_TOKEN // 2)
+            yield from (word[i:i + step] for i in range(0, len(word), step))
+            continue
+        candidate = f"{piece} {word}" if piece else word
+        if piece and count_tokens(candidate, model) > max_tokens:
+            yield piece
+            piece = word
+        else:
+            piece = candidate
+    if piece:
+        yield piece
+
+
+def _units(data: Any, max_tokens: int, model: Optional[str]) -> Iterator[Tuple[str, str, int, int]]:
+    """Yield (separator, sentence, start offset, end offset) for each sentence of a buffer."""
+    max_bytes = max(1024, max_tokens * CHARS_PER_TOKEN * 4)
+    for start, end in _mmap_paragraphs(data, max_bytes):
+        paragraph = bytes(data[start:end]).decode("utf-8", errors="replace").strip()
+        if not paragraph:
+            continue
+        separator = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            for piece in _split_oversized(sentence, max_tokens, model):
+                yield separator, piece, start, end
+                separator = " "
+
+
+def _chunks(data: Any, max_tokens: int, overlap_tokens: int, model: Optional[str]) -> Iterator[Dict[str, Any]]:
+    if overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens must be smaller than max_tokens")
+
+    index = 0
+    current: deque = deque()  # (separator, text, tokens, start, end)
+    tokens = 0
+    fresh = False  # Whether the current chunk has text not already emitted
+
+    def emit() -> Dict[str, Any]:
+        text = current[0][1] + "".join(separator + text for separator, text, _, _, _ in list(current)[1:])
+        # The first sentence's separator is not part of the chunk
+        return {"index": index, "text": text, "tokens": tokens - 1, "start": current[0][3], "end": current[-1][4]}
+
+    for separator, text, start, end in _units(data, max_tokens, model):
+        unit_tokens = count_tokens(text, model) + 1  # Counting its separator
+        if current and tokens + unit_tokens > max_tokens + 1:
+            yield emit()
+            index += 1
+            fresh = False
+            # Keep the trailing sentences that fit in the overlap
+            kept, kept_tokens = deque(), 0
+            for unit in reversed(current):
+                if kept_tokens + unit[2] > overlap_tokens:
+                    break
+                kept.appendleft(unit)
+                kept_tokens += unit[2]
+            current, tokens = kept, kept_tokens
+            while current and tokens + unit_tokens > max_tokens + 1:
+                tokens -= current.popleft()[2]
+        current.append((separator, text, unit_tokens, start, end))
+        tokens += unit_tokens
+        fresh = True
+
+    if current and fresh:
+        yield emit()
+
+
+def chunk_text(text: str, max_tokens: int = 2000, overlap_tokens: int = 200,
+               model: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Split a text into token-bounded, overlapping chunks.
+
+    Args:
+        text: The text to split.
+        max_tokens: Maximum tokens of a chunk.
+        overlap_tokens: Tokens of the previous chunk repeated at the start of the next.
+        model: Model whose tokenizer counts the tokens.
+
+    Returns:
+        Iterator of chunk dictionaries with "index", "text", "tokens", and the
+        "start" and "end" byte offsets of the paragraphs the chunk spans.
+    """
+    return _chunks(text.encode("utf-8"), max_tokens, overlap_tokens, model)
+
+
+def chunk_file(path: str, max_tokens: int = 2000, overlap_tokens: int = 200,
+               model: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read a UTF-8 text file through a memory map and split it into chunks.
+
+    Only the paragraphs of the chunk being built are held in memory.
+
+    Args:
+        path: Path of the file.
+        max_tokens: Maximum tokens of a chunk.
+        overlap_tokens: Tokens of the previous chunk repeated at the start of the next.
+        model: Model whose tokenizer counts the tokens.
+
+    Returns:
+        Iterator of chunk dictionaries, as returned by chunk_text.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty files cannot be mapped
+        try:
+            yield from _chunks(data, max_tokens, overlap_tokens, model)
+        finally:
+            data.close()
@@ -0,0 +1,101 @@
+"""
+Incremental parsing of JSON arrays.
+
+Used to act on the elements of a JSON array, such as the steps of an LLM
+generated plan, while the rest of the text is still arriving.
+"""
+
+import json
+import re
+from typing import Any, List
+
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class IncrementalJSONArrayParser:
+    """
+    Emits the elements of a top-level JSON array as soon as each one is complete.
+
+    Text before the opening bracket (such as a Markdown code fence) and after the
+    closing bracket is ignored. Elements that are not valid JSON, even after
+    removing trailing commas, are reported in ``errors`` and skipped.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.errors: List[str] = []
+        self._element: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._chunks: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: The next piece of the JSON text.
+
+        Returns:
+            List: The array elements completed by this chunk, in order.
+        """
+        self._chunks.append(chunk)
+        elements: List[Any] = []
+        for char in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                self.started = char == "["
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the top-level array
+                    self.finished = True
+                    self._complete(elements)
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    self._element.append(char)
+                    self._complete(elements)
+                    continue
+            elif char == "," and self._depth == 0:
+                self._complete(elements)
+                continue
+            self._element.append(char)
+        return elements
+
+    def _complete(self, elements: List[Any]) -> None:
+        """Parse the buffered element, if any, and append it to elements."""
+        text = "".join(self._element).strip()
+        self._element = []
+        if not text:
+            return
+        try:
+            elements.append(json.loads(text))
+        except json.JSONDecodeError:
+            try:
+                elements.append(json.loads(_TRAILING_COMMA_RE.sub(r"\1", text)))
+            except json.JSONDecodeError as e:
+                self.errors.append(f"Invalid array element {text[:80]!r}: {e}")
@@ -0,0 +1,115 @@
+"""
+Lazy import utilities for the Dawn framework.
+
+This module lets registries declare tools and handlers as import strings that
+are only resolved the first time they are used, so importing the framework
+does not pay for every tool module and SDK up front.
+"""
+
+import importlib
+import importlib.util
+import inspect
+from typing import Any, Callable
+
+
+def import_string(import_path: str) -> Any:
+    """
+    Import an object given a "package.module:attribute" path.
+
+    Dotted attribute paths (e.g. "package.module:Class.method") are supported.
+
+    Args:
+        import_path: The path of the object to import
+
+    Returns:
+        The imported object
+
+    Raises:
+        ImportError: If the path is malformed, or the module or attribute cannot be found
+    """
+    module_name, sep, attr_path = import_path.partition(":")
+    if not sep or not module_name or not attr_path:
+        raise ImportError(f"Invalid import path '{import_path}'. Expected 'package.module:attribute'.")
+
+    obj = importlib.import_module(module_name)
+    for attr in attr_path.split("."):
+        try:
+            obj = getattr(obj, attr)
+        except AttributeError as e:
+            raise ImportError(f"Module '{module_name}' has no attribute '{attr_path}'") from e
+    return obj
+
+
+def module_available(import_path: str) -> bool:
+    """
+    Check whether the module of an import path can be found without importing it.
+
+    Args:
+        import_path: A "package.module:attribute" path or a plain module name
+
+    Returns:
+        True if the module can be located, False otherwise
+    """
+    module_name = import_path.partition(":")[0]
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyCallable:
+    """
+    Callable proxy for a function declared as an import string.
+
+    The target is imported on first call or on first signature inspection.
+    Registries replace the proxy with the resolved callable once it is loaded,
+    so the proxy only costs anything on first use.
+    """  # noqa: D202
+
+    def __init__(self, import_path: str):
+        """
+        Initialize a new LazyCallable.
+
+        Args:
+            import_path: The "package.module:attribute" path of the callable
+        """
+        self.import_path = import_path
+        self._target = None
+        self.__doc__ = f"Lazily loaded callable '{import_path}'."
+
+    @property
+    def is_resolved(self) -> bool:
+        """Whether the target has already been imported."""
+        return self._target is not None
+
+    def resolve(self) -> Callable:
+        """
+        Import and return the target callable.
+
+        Returns:
+            The resolved callable
+
+        Raises:
+            ImportError: If the target cannot be imported
+            TypeError: If the imported object is not callable
+        """
+        if self._target is None:
+            target = import_string(self.import_path)
+            if not callable(target):
+                raise TypeError(f"Object at '{self.import_path}' is not callable")
+            self._target = target
+        return self._target
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        """Expose the target's signature so calling conventions are detected correctly."""
+        return inspect.signature(self.resolve())
+
+    def __call__(self, *args, **kwargs):
+        """Call the target, importing it first if needed."""
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        """Provides a concise string representation of the proxy."""
+        state = "resolved" if self.is_resolved else "unresolved"
+        return f"LazyCallable('{self.import_path}', {state})"
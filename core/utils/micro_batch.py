@@ -0,0 +1,98 @@
+"""
+Micro-batching of concurrent calls.
+
+Parallel tasks of a fan-out workflow often call the same tool at the same
+moment, each paying its own per-call overhead. A MicroBatcher collects the
+calls made within a short window and runs them as one call of a batch entry
+point, then hands each caller its own result.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from core.utils.logger import log_info
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent calls into invocations of a batch function.
+
+    A batch is started when max_batch_size calls are waiting, or max_wait
+    seconds after the first call of the batch. The batch function runs in a
+    worker thread and must return one result per input, in order. An exception
+    it raises is raised to every caller of the batch.
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        name: str = "batch",
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_func: Function from a list of inputs to the list of their results.
+            max_batch_size: Maximum number of calls in one batch.
+            max_wait: Seconds a call may wait for others to join its batch.
+            name: Name used in log messages.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self.batch_sizes: List[int] = []
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Add a call to the current batch and wait for its result.
+
+        Args:
+            item: The input of the call.
+
+        Returns:
+            The result the batch function returned for item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Start a batch with the waiting calls."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        self.batch_sizes.append(len(items))
+        log_info(f"Micro-batching {len(items)} calls to '{self.name}'")
+        try:
+            results = await asyncio.to_thread(self.batch_func, items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch of '{self.name}' returned {len(results)} results for {len(items)} inputs")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -13,63 +13,58 @@ from typing import Dict, List, Optional, Any, Callable, Tuple
 
 from core.services import get_services
 from core.tools.registry_access import register_tool, tool_exists
-from core.handlers.registry_access import register_handler, handler_exists, get_handler_registry
+from core.handlers.registry_access import handler_exists, get_handler_registry
+from core.utils.lazy_import import LazyCallable, module_available
 
 logger = logging.getLogger(__name__)
 
-# Core tools that should always be registered
-CORE_TOOLS = [
+# Core tools that should always be registered, declared as import strings so
+# their modules are only imported when the tool is first used
+CORE_TOOLS = {
     # Framework tools
-    "get_available_capabilities",
+    "get_available_capabilities": "core.tools.framework_tools:get_available_capabilities",
     # Add other core tools as needed
-]
+}
 
-# Core handlers that should always be registered
-CORE_HANDLERS = [
+# Core handlers that should always be registered, declared as import strings
+CORE_HANDLERS = {
     # Chat planner handlers
-    "plan_user_request_handler",
-    "validate_plan_handler",
-    "plan_to_tasks_handler", 
-    "execute_dynamic_tasks_handler",
-    "summarize_results_handler",
-    "process_clarification_handler",
+    "plan_user_request_handler": "examples.chat_planner_workflow:plan_user_request_handler",
+    "validate_plan_handler": "examples.chat_planner_workflow:validate_plan_handler",
+    "plan_to_tasks_handler": "examples.chat_planner_workflow:plan_to_tasks_handler",
+    "execute_dynamic_tasks_handler": "examples.chat_planner_workflow:execute_dynamic_tasks_handler",
+    "summarize_results_handler": "examples.chat_planner_workflow:summarize_results_handler",
+    "process_clarification_handler": "examples.chat_planner_workflow:process_clarification_handler",
     # Add other core handlers as needed
-]
+}
 
 def ensure_core_tools_registered() -> Dict[str, bool]:
     """
     Ensures all core tools are registered with the tool registry.
     
-    This function attempts to import and register any core tools
-    that aren't already registered.
+    Tools that aren't already registered are registered lazily: the tool
+    module is located but not imported until the tool is first used.
     
     Returns:
         Dict[str, bool]: Mapping of tool names to registration status
     """
     results = {}
     
-    # First check: get_available_capabilities (directly imported)
-    try:
-        from core.tools.framework_tools import get_available_capabilities
-        if not tool_exists("get_available_capabilities"):
-            success = register_tool("get_available_capabilities", get_available_capabilities)
-            results["get_available_capabilities"] = success
-            if success:
-                logger.info("Registered 'get_available_capabilities' tool.")
-            else:
-                logger.warning("Failed to register 'get_available_capabilities' tool.")
+    for name, import_path in CORE_TOOLS.items():
+        if tool_exists(name):
+            logger.debug(f"Tool '{name}' already registered.")
+            results[name] = True
+            continue
+        if not module_available(import_path):
+            logger.error(f"Could not locate module for core tool '{name}' ({import_path}).")
+            results[name] = False
+            continue
+        success = register_tool(name, LazyCallable(import_path))
+        results[name] = success
+        if success:
+            logger.info(f"Registered '{name}' tool.")
         else:
-            logger.debug("Tool 'get_available_capabilities' already registered.")
-            results["get_available_capabilities"] = True
-    except ImportError:
-        logger.error("Could not import get_available_capabilities from framework_tools.")
-        results["get_available_capabilities"] = False
-    except Exception as e:
-        logger.error(f"Error registering 'get_available_capabilities' tool: {e}")
-        results["get_available_capabilities"] = False
-        
-    # Dynamically check for other tools in appropriate modules
-    # This demonstrates how you might set up automatic discovery in the future
+            logger.warning(f"Failed to register '{name}' tool.")
     
     return results
 
@@ -77,63 +72,31 @@ def ensure_chat_planner_handlers_registered() -> Dict[str, bool]:
     """
     Ensures all handlers required for the chat planner workflow are registered.
     
+    Handlers are registered lazily, so the chat planner module (and its
+    dependencies) is only imported when a handler is first executed.
+    
     Returns:
         Dict[str, bool]: Mapping of handler names to registration status
     """
     results = {}
+    handler_registry = get_handler_registry()
+    registered_handlers = handler_registry.list_handlers()
     
-    # Import chat planner handlers
-    try:
-        # Attempt to import from the examples module 
-        from examples.chat_planner_workflow import (
-            plan_user_request_handler,
-            validate_plan_handler,
-            plan_to_tasks_handler,
-            execute_dynamic_tasks_handler, 
-            summarize_results_handler,
-            process_clarification_handler
-        )
-        
-        # Dictionary mapping handler names to functions
-        handlers = {
-            "plan_user_request_handler": plan_user_request_handler,
-            "validate_plan_handler": validate_plan_handler,
-            "plan_to_tasks_handler": plan_to_tasks_handler,
-            "execute_dynamic_tasks_handler": execute_dynamic_tasks_handler,
-            "summarize_results_handler": summarize_results_handler,
-            "process_clarification_handler": process_clarification_handler,
-        }
-        
-        # Get the handler registry
-        handler_registry = get_handler_registry()
-        registered_handlers = handler_registry.list_handlers()
-        
-        # Register each handler if it doesn't already exist
-        for name, handler_func in handlers.items():
-            if name not in registered_handlers:
-                success = register_handler(name, handler_func)
-                results[name] = success
-                if success:
-                    logger.info(f"Registered '{name}' handler.")
-                else:
-                    logger.warning(f"Failed to register '{name}' handler.")
-            else:
-                logger.debug(f"Handler '{name}' already registered.")
-                results[name] = True
-                
-    except ImportError as e:
-        logger.error(f"Could not import chat planner handlers: {e}")
-        # Mark all as failed if import fails
-        for name in ["plan_user_request_handler", "validate_plan_handler", 
-                    "plan_to_tasks_handler", "execute_dynamic_tasks_handler",
-                    "summarize_results_handler", "process_clarification_handler"]:
+    for name, import_path in CORE_HANDLERS.items():
+        if name in registered_handlers:
+            logger.debug(f"Handler '{name}' already registered.")
+            results[name] = True
+            continue
+        if not module_available(import_path):
+            logger.error(f"Could not locate chat planner handler module for '{name}' ({import_path}).")
             results[name] = False
-    except Exception as e:
-        logger.error(f"Error registering chat planner handlers: {e}")
-        # Mark all as failed if general exception occurs
-        for name in ["plan_user_request_handler", "validate_plan_handler", 
-                    "plan_to_tasks_handler", "execute_dynamic_tasks_handler",
-                    "summarize_results_handler", "process_clarification_handler"]:
+            continue
+        try:
+            handler_registry.register_lazy_handler(name, import_path)
+            results[name] = True
+            logger.info(f"Registered '{name}' handler.")
+        except Exception as e:
+            logger.error(f"Error registering '{name}' handler: {e}")
             results[name] = False
             
     return results
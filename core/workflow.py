@@ -110,12 +110,12 @@ class Workflow:
         Update the status of the workflow.
         
         Args:
-            status: New status for the workflow (pending, running, completed, failed)
+            status: New status for the workflow (pending, running, completed, failed, suspended)
             
         Raises:
             ValueError: If an invalid status is provided
         """
-        valid_statuses = ["pending", "running", "completed", "failed"]
+        valid_statuses = ["pending", "running", "completed", "failed", "suspended"]
         if status not in valid_statuses:
             raise ValueError(f"Invalid status: {status}. Must be one of {valid_statuses}")
         self.status = status
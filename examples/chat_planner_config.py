@@ -276,6 +276,16 @@ class ChatPlannerConfig:
         """Get the strictness level for plan validation."""
         return ChatPlannerConfig.get("validation_strictness", "medium")
     
+    @staticmethod
+    def is_incremental_execution_enabled() -> bool:
+        """Check if plan steps are executed while the plan is still streaming."""
+        return ChatPlannerConfig.get("incremental_execution", False)
+    
+    @staticmethod
+    def get_incremental_max_workers() -> int:
+        """Get the maximum number of plan steps executed concurrently in incremental mode."""
+        return ChatPlannerConfig.get("incremental_max_workers", 4)
+    
     @staticmethod
     def get_planning_system_message() -> str:
         """Get the system message for the planning LLM."""
@@ -14,7 +14,10 @@ import logging
 import json # Added for potential parsing
 import re # Needed for JSON cleaning
 import jsonschema # <-- Add import for JSON schema validation
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -33,6 +36,8 @@ from core.handlers.registry import HandlerRegistry
 from core.tools.framework_tools import get_available_capabilities
 from core.utils.visualizer import visualize_workflow
 from core.utils.registration_manager import ensure_all_registrations
+from core.utils.incremental_json import IncrementalJSONArrayParser
+from core.llm.streaming import ResponseStream
 # from core.utils.task_utils import get_output_value # Not strictly needed if using Task.get_output_value
 
 # Example-specific imports
@@ -236,6 +241,24 @@ def plan_user_request_handler(task: DirectHandlerTask, input_data: dict) -> dict
         llm_interface = services.get_llm_interface()
         if not llm_interface: raise ValueError("LLMInterface not found")
 
+        execute_incrementally = input_data.get("execute_incrementally")
+        if not isinstance(execute_incrementally, bool):
+            execute_incrementally = ChatPlannerConfig.is_incremental_execution_enabled()
+        if execute_incrementally:
+            logger.info("Streaming the plan and executing steps as they arrive...")
+            incremental_result = _stream_and_execute_plan(llm_interface, planning_prompt, input_data, task.id)
+            error_msg = incremental_result.pop("error")
+            result = {
+                **incremental_result,
+                "needs_clarification": False,
+                "clarification_count": clarification_count,
+                "clarification_history": clarification_history,
+                "incremental": True
+            }
+            if error_msg:
+                return {"success": False, "error": error_msg, "status": "failed", "result": result}
+            return {"success": True, "result": result}
+
         plan_response = llm_interface.execute_llm_call(
             prompt=planning_prompt,
             system_message=ChatPlannerConfig.get_planning_system_message(),
@@ -508,6 +531,41 @@ def validate_plan_handler(task: DirectHandlerTask, input_data: dict) -> dict:
             }
         }
 
+def step_to_task_definition(step: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """Converts one plan step into a dynamic task definition. Returns (definition or None, warnings)."""
+    warnings = []
+    if not isinstance(step, dict):
+        return None, [f"Skipping invalid step (not a dict): {step}"]
+
+    task_id = step.get("step_id")
+    step_type = step.get("type")
+    capability_name = step.get("name")
+    inputs = step.get("inputs", {})
+    description = step.get("description", f"Execute {step_type} {capability_name}")
+    depends_on = step.get("depends_on", [])
+
+    if not all([task_id, step_type, capability_name]):
+        return None, [f"Skipping step due to missing required fields (step_id, type, name): {step}"]
+    if not isinstance(inputs, dict):
+        warnings.append(f"Step '{task_id}': Inputs field is not a dictionary, defaulting to empty.")
+        inputs = {}
+
+    task_def = {
+        "task_id": task_id,
+        "name": description,
+        "input_data": inputs,
+        "depends_on": depends_on if isinstance(depends_on, list) else [],
+        "is_llm_task": False,
+    }
+    if step_type == "tool": task_def["tool_name"] = capability_name
+    elif step_type == "handler":
+         task_def["handler_name"] = capability_name
+         task_def["task_class"] = "DirectHandlerTask"
+    else:
+        warnings.append(f"Step '{task_id}': Unknown step type '{step_type}'. Skipping.")
+        return None, warnings
+    return task_def, warnings
+
 # --- plan_to_tasks_handler (Keep as is) ---
 def plan_to_tasks_handler(task: DirectHandlerTask, input_data: dict) -> dict:
     logger.info(f"Executing plan-to-tasks handler for task: {task.id}")
@@ -525,39 +583,10 @@ def plan_to_tasks_handler(task: DirectHandlerTask, input_data: dict) -> dict:
     conversion_warnings = []
 
     for step in validated_plan:
-        if not isinstance(step, dict):
-            conversion_warnings.append(f"Skipping invalid step (not a dict): {step}")
-            continue
-
-        task_id = step.get("step_id")
-        step_type = step.get("type")
-        capability_name = step.get("name")
-        inputs = step.get("inputs", {})
-        description = step.get("description", f"Execute {step_type} {capability_name}")
-        depends_on = step.get("depends_on", [])
-
-        if not all([task_id, step_type, capability_name]):
-            conversion_warnings.append(f"Skipping step due to missing required fields (step_id, type, name): {step}")
-            continue
-        if not isinstance(inputs, dict):
-            conversion_warnings.append(f"Step '{task_id}': Inputs field is not a dictionary, defaulting to empty.")
-            inputs = {}
-
-        task_def = {
-            "task_id": task_id,
-            "name": description,
-            "input_data": inputs,
-            "depends_on": depends_on if isinstance(depends_on, list) else [],
-            "is_llm_task": False,
-        }
-        if step_type == "tool": task_def["tool_name"] = capability_name
-        elif step_type == "handler":
-             task_def["handler_name"] = capability_name
-             task_def["task_class"] = "DirectHandlerTask"
-        else:
-            conversion_warnings.append(f"Step '{task_id}': Unknown step type '{step_type}'. Skipping.")
-            continue
-        task_definitions.append(task_def)
+        task_def, step_warnings = step_to_task_definition(step)
+        conversion_warnings.extend(step_warnings)
+        if task_def is not None:
+            task_definitions.append(task_def)
     # -----------------------------------------------------------------------
 
     logger.info(f"Converted plan into {len(task_definitions)} task definitions.")
@@ -574,6 +603,120 @@ def plan_to_tasks_handler(task: DirectHandlerTask, input_data: dict) -> dict:
         }
     }
 
+def _resolve_dynamic_inputs(task_id: str, input_template: Any, resolution_context: Dict[str, Any],
+                            resolve_path_func: Callable, parent_task_id: str) -> Dict[str, Any]:
+    """Resolves the ${...} references of a dynamic task's input template against previous outputs."""
+    processed_inputs = {}
+    logger.debug(f"[DynamicExec:{parent_task_id}] Resolving inputs for '{task_id}'...")
+    if isinstance(input_template, dict):
+        for k, v in input_template.items():
+            if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
+                 ref_path = v[2:-1]
+                 try:
+                     # --- USA LA FUNCIÓN IMPORTADA (ya verificada) ---
+                     resolved_value = resolve_path_func(resolution_context, ref_path)
+                     processed_inputs[k] = resolved_value
+                     logger.debug(f"[DynamicExec:{parent_task_id}] Resolved '{k}':'{v}' to type {type(resolved_value)}")
+                 except Exception as res_err:
+                     logger.warning(f"[DynamicExec:{parent_task_id}] Failed to resolve input '{k}':'{v}': {res_err}. Using None.")
+                     processed_inputs[k] = None
+            else: processed_inputs[k] = v
+    logger.debug(f"[DynamicExec:{parent_task_id}] Final inputs for '{task_id}': {processed_inputs}")
+    return processed_inputs
+
+
+def _execute_dynamic_capability(task_id: str, task_name: str, task_def: Dict[str, Any], processed_inputs: Dict[str, Any],
+                                tool_registry: Any, handler_registry: Any, parent_task_id: str) -> Dict[str, Any]:
+    """Runs the tool or handler of a dynamic task and returns its standardized output."""
+    capability_name = task_def.get("tool_name") or task_def.get("handler_name")
+    is_tool = "tool_name" in task_def
+    output = {"task_id": task_id, "success": False, "status": "failed"} # Default
+    logger.info(f"[DynamicExec:{parent_task_id}] Executing capability '{capability_name}' for task '{task_id}'...")
+    try:
+        if is_tool:
+            available_tools = list(tool_registry.tools.keys()) if hasattr(tool_registry, 'tools') else []
+            if hasattr(tool_registry, 'tools') and capability_name in tool_registry.tools:
+                logger.info(f"[DynamicExec:{parent_task_id}] Found tool '{capability_name}', executing...")
+
+                # Execute with direct dictionary access for robustness
+                tool_func = tool_registry.tools.get(capability_name)
+                if callable(tool_func):
+                    output = tool_func(processed_inputs)
+                    # Convert output to dict if not already
+                    if not isinstance(output, dict):
+                        output = {"success": True, "result": output}
+                else:
+                    # Fallback to regular execution method
+                    output = tool_registry.execute_tool(capability_name, processed_inputs)
+            else: 
+                logger.error(f"[DynamicExec:{parent_task_id}] Tool '{capability_name}' not found. Available: {available_tools}")
+
+                # Handle the specific case of mock_search
+                if capability_name == "mock_search":
+                    logger.warning(f"[DynamicExec:{parent_task_id}] Attempting to register mock_search tool directly for task: {task_id}")
+                    try:
+                        # Directly register the mock_search tool
+                        tool_registry.register_tool("mock_search", mock_search_tool)
+                        logger.info(f"[DynamicExec:{parent_task_id}] Registered mock_search tool, now executing...")
+                        # Execute the tool function directly for simplicity
+                        output = mock_search_tool(processed_inputs)
+                        if not isinstance(output, dict):
+                            output = {"success": True, "result": output}
+                    except Exception as reg_err:
+                        logger.error(f"[DynamicExec:{parent_task_id}] Failed to register mock_search: {reg_err}")
+                        output = {"task_id": task_id, "success": False, "status": "failed", 
+                                 "error": f"Failed to register and execute mock_search: {str(reg_err)}"}
+                else:
+                    output = {"task_id": task_id, "success": False, "status": "failed", 
+                             "error": f"Tool '{capability_name}' not found. Available: {available_tools}"}
+        else: # Assume handler
+            available_handlers = handler_registry.list_handlers() if hasattr(handler_registry, 'list_handlers') else []
+            if handler_registry.handler_exists(capability_name):
+                logger.info(f"[DynamicExec:{parent_task_id}] Found handler '{capability_name}', executing...")
+                handler_func = handler_registry.get_handler(capability_name)
+                mock_task_obj = type('obj', (object,), {'id': task_id, 'name': task_name})()
+                output = handler_func(mock_task_obj, processed_inputs)
+            else: 
+                logger.error(f"[DynamicExec:{parent_task_id}] Handler '{capability_name}' not found. Available: {available_handlers}")
+
+                # Handle the specific case of mock_summarize_handler
+                if capability_name == "mock_summarize_handler":
+                    logger.warning(f"[DynamicExec:{parent_task_id}] Attempting to register mock_summarize_handler directly for task: {task_id}")
+                    try:
+                        # Directly register the handler
+                        handler_registry.register_handler("mock_summarize_handler", mock_summarize_handler, replace=True)
+                        logger.info(f"[DynamicExec:{parent_task_id}] Registered mock_summarize_handler, now executing...")
+                        # Execute the handler function directly
+                        mock_task_obj = type('obj', (object,), {'id': task_id, 'name': task_name})()
+                        output = mock_summarize_handler(mock_task_obj, processed_inputs)
+                        if not isinstance(output, dict):
+                            output = {"success": True, "result": output}
+                    except Exception as reg_err:
+                        logger.error(f"[DynamicExec:{parent_task_id}] Failed to register mock_summarize_handler: {reg_err}")
+                        output = {"task_id": task_id, "success": False, "status": "failed", 
+                                 "error": f"Failed to register and execute mock_summarize_handler: {str(reg_err)}"}
+                else:
+                    output = {"task_id": task_id, "success": False, "status": "failed", 
+                             "error": f"Handler '{capability_name}' not found. Available: {available_handlers}"}
+
+        # Standardize output
+        if not isinstance(output, dict): output = {"result": output}
+        output["task_id"] = task_id
+        if "success" not in output: output["success"] = "error" not in output
+        output["status"] = "completed" if output["success"] else "failed"
+        if "result" in output and "response" not in output: output["response"] = output["result"]
+        elif "response" in output and "result" not in output: output["result"] = output["response"]
+        elif "result" not in output and "response" not in output and output.get("success"): output["result"] = None; output["response"] = None
+
+        # Detailed log of output
+        logger.info(f"[DynamicExec:{parent_task_id}] Task '{task_id}' output: {output}")
+
+    except Exception as e:
+        import traceback
+        logger.error(f"[DynamicExec:{parent_task_id}] Exception during execution of '{task_id}': {e}", exc_info=True)
+        output = {"task_id": task_id, "success": False, "status": "failed", "error": f"Execution error: {str(e)}", "error_type": type(e).__name__, "error_details": {"traceback": traceback.format_exc()}}
+    return output
+
 def execute_dynamic_tasks_handler(task: DirectHandlerTask, input_data: dict) -> dict:
     """
     Executes dynamically generated tasks defined in the input.
@@ -669,8 +812,6 @@ def execute_dynamic_tasks_handler(task: DirectHandlerTask, input_data: dict) ->
                 logger.info(f"[DynamicExec:{parent_task_id}] Dependencies met for '{task_id}'.")
                 task_def = task_info["definition"]
                 input_template = task_info["input_data_template"]
-                capability_name = task_def.get("tool_name") or task_def.get("handler_name")
-                is_tool = "tool_name" in task_def
                 output = {"task_id": task_id, "success": False, "status": "failed"} # Default
 
                 # Check dependency failure
@@ -684,113 +825,16 @@ def execute_dynamic_tasks_handler(task: DirectHandlerTask, input_data: dict) ->
                 processed_inputs = {}
                 resolution_failed = False
                 if not dependency_failed:
-                    logger.debug(f"[DynamicExec:{parent_task_id}] Resolving inputs for '{task_id}'...")
                     try:
                         resolution_context = {**original_workflow_vars, **task_outputs_dict}
-                        if isinstance(input_template, dict):
-                            for k, v in input_template.items():
-                                if isinstance(v, str) and v.startswith("${") and v.endswith("}"):
-                                     ref_path = v[2:-1]
-                                     try:
-                                         # --- USA LA FUNCIÓN IMPORTADA (ya verificada) ---
-                                         resolved_value = resolve_path_func(resolution_context, ref_path)
-                                         processed_inputs[k] = resolved_value
-                                         logger.debug(f"[DynamicExec:{parent_task_id}] Resolved '{k}':'{v}' to type {type(resolved_value)}")
-                                     except Exception as res_err:
-                                         logger.warning(f"[DynamicExec:{parent_task_id}] Failed to resolve input '{k}':'{v}': {res_err}. Using None.")
-                                         processed_inputs[k] = None
-                                else: processed_inputs[k] = v
-                        logger.debug(f"[DynamicExec:{parent_task_id}] Final inputs for '{task_id}': {processed_inputs}")
+                        processed_inputs = _resolve_dynamic_inputs(task_id, input_template, resolution_context, resolve_path_func, parent_task_id)
                     except Exception as e:
                         logger.error(f"[DynamicExec:{parent_task_id}] Input resolution process failed for '{task_id}': {e}", exc_info=True)
                         resolution_failed = True; output["error"] = f"Input resolution failed: {str(e)}"
 
                 # Execute Task
                 if not dependency_failed and not resolution_failed:
-                    logger.info(f"[DynamicExec:{parent_task_id}] Executing capability '{capability_name}' for task '{task_id}'...")
-                    try:
-                        if is_tool:
-                            available_tools = list(tool_registry.tools.keys()) if hasattr(tool_registry, 'tools') else []
-                            if hasattr(tool_registry, 'tools') and capability_name in tool_registry.tools:
-                                logger.info(f"[DynamicExec:{parent_task_id}] Found tool '{capability_name}', executing...")
-                                
-                                # Execute with direct dictionary access for robustness
-                                tool_func = tool_registry.tools.get(capability_name)
-                                if callable(tool_func):
-                                    output = tool_func(processed_inputs)
-                                    # Convert output to dict if not already
-                                    if not isinstance(output, dict):
-                                        output = {"success": True, "result": output}
-                                else:
-                                    # Fallback to regular execution method
-                                    output = tool_registry.execute_tool(capability_name, processed_inputs)
-                            else: 
-                                logger.error(f"[DynamicExec:{parent_task_id}] Tool '{capability_name}' not found. Available: {available_tools}")
-                                
-                                # Handle the specific case of mock_search
-                                if capability_name == "mock_search":
-                                    logger.warning(f"[DynamicExec:{parent_task_id}] Attempting to register mock_search tool directly for task: {task_id}")
-                                    try:
-                                        # Directly register the mock_search tool
-                                        tool_registry.register_tool("mock_search", mock_search_tool)
-                                        logger.info(f"[DynamicExec:{parent_task_id}] Registered mock_search tool, now executing...")
-                                        # Execute the tool function directly for simplicity
-                                        output = mock_search_tool(processed_inputs)
-                                        if not isinstance(output, dict):
-                                            output = {"success": True, "result": output}
-                                    except Exception as reg_err:
-                                        logger.error(f"[DynamicExec:{parent_task_id}] Failed to register mock_search: {reg_err}")
-                                        output = {"task_id": task_id, "success": False, "status": "failed", 
-                                                 "error": f"Failed to register and execute mock_search: {str(reg_err)}"}
-                                else:
-                                    output = {"task_id": task_id, "success": False, "status": "failed", 
-                                             "error": f"Tool '{capability_name}' not found. Available: {available_tools}"}
-                        else: # Assume handler
-                            available_handlers = handler_registry.list_handlers() if hasattr(handler_registry, 'list_handlers') else []
-                            if handler_registry.handler_exists(capability_name):
-                                logger.info(f"[DynamicExec:{parent_task_id}] Found handler '{capability_name}', executing...")
-                                handler_func = handler_registry.get_handler(capability_name)
-                                mock_task_obj = type('obj', (object,), {'id': task_id, 'name': task_info['name']})()
-                                output = handler_func(mock_task_obj, processed_inputs)
-                            else: 
-                                logger.error(f"[DynamicExec:{parent_task_id}] Handler '{capability_name}' not found. Available: {available_handlers}")
-                                
-                                # Handle the specific case of mock_summarize_handler
-                                if capability_name == "mock_summarize_handler":
-                                    logger.warning(f"[DynamicExec:{parent_task_id}] Attempting to register mock_summarize_handler directly for task: {task_id}")
-                                    try:
-                                        # Directly register the handler
-                                        handler_registry.register_handler("mock_summarize_handler", mock_summarize_handler, replace=True)
-                                        logger.info(f"[DynamicExec:{parent_task_id}] Registered mock_summarize_handler, now executing...")
-                                        # Execute the handler function directly
-                                        mock_task_obj = type('obj', (object,), {'id': task_id, 'name': task_info['name']})()
-                                        output = mock_summarize_handler(mock_task_obj, processed_inputs)
-                                        if not isinstance(output, dict):
-                                            output = {"success": True, "result": output}
-                                    except Exception as reg_err:
-                                        logger.error(f"[DynamicExec:{parent_task_id}] Failed to register mock_summarize_handler: {reg_err}")
-                                        output = {"task_id": task_id, "success": False, "status": "failed", 
-                                                 "error": f"Failed to register and execute mock_summarize_handler: {str(reg_err)}"}
-                                else:
-                                    output = {"task_id": task_id, "success": False, "status": "failed", 
-                                             "error": f"Handler '{capability_name}' not found. Available: {available_handlers}"}
-
-                        # Standardize output
-                        if not isinstance(output, dict): output = {"result": output}
-                        output["task_id"] = task_id
-                        if "success" not in output: output["success"] = "error" not in output
-                        output["status"] = "completed" if output["success"] else "failed"
-                        if "result" in output and "response" not in output: output["response"] = output["result"]
-                        elif "response" in output and "result" not in output: output["result"] = output["response"]
-                        elif "result" not in output and "response" not in output and output.get("success"): output["result"] = None; output["response"] = None
-
-                        # Detailed log of output
-                        logger.info(f"[DynamicExec:{parent_task_id}] Task '{task_id}' output: {output}")
-
-                    except Exception as e:
-                        import traceback
-                        logger.error(f"[DynamicExec:{parent_task_id}] Exception during execution of '{task_id}': {e}", exc_info=True)
-                        output = {"task_id": task_id, "success": False, "status": "failed", "error": f"Execution error: {str(e)}", "error_type": type(e).__name__, "error_details": {"traceback": traceback.format_exc()}}
+                    output = _execute_dynamic_capability(task_id, task_info["name"], task_def, processed_inputs, tool_registry, handler_registry, parent_task_id)
 
                 # Store Result & Update State
                 task_info["output_data"] = output
@@ -829,6 +873,225 @@ def execute_dynamic_tasks_handler(task: DirectHandlerTask, input_data: dict) ->
         }
     }
 
+def validate_plan_step(step: Any, index: int, seen_step_ids: set,
+                       available_tool_names: Optional[set] = None,
+                       available_handler_names: Optional[set] = None) -> Tuple[List[str], List[str]]:
+    """
+    Validates a single plan step on its own, as validate_plan_handler does for each step of a full plan.
+
+    Dependencies are not checked here: a step may depend on steps that have not arrived yet.
+
+    Returns:
+        (errors, warnings) for the step.
+    """
+    errors, warnings = [], []
+    try:
+        jsonschema.validate(instance=step, schema=PLAN_SCHEMA["items"])
+    except jsonschema.ValidationError as e:
+        return [f"Step {index}: Schema validation failed: {e.message}"], warnings
+
+    step_id = step["step_id"]
+    if step_id in seen_step_ids:
+        errors.append(f"Step {index}: Duplicate step_id '{step_id}'.")
+    if step["type"] == "tool" and available_tool_names is not None and step["name"] not in available_tool_names:
+        warnings.append(f"Step {index} ('{step_id}'): Tool '{step['name']}' is not available.")
+    if step["type"] == "handler" and available_handler_names is not None and step["name"] not in available_handler_names:
+        warnings.append(f"Step {index} ('{step_id}'): Handler '{step['name']}' is not available.")
+    return errors, warnings
+
+
+class IncrementalPlanExecutor:
+    """
+    Validates and executes plan steps one at a time, as they are parsed from a streaming plan.
+
+    Each step is validated, converted to a dynamic task definition and submitted to a
+    thread pool as soon as every step in its depends_on has finished, while later steps
+    are still being generated. Steps run with the same input resolution and capability
+    execution as execute_dynamic_tasks_handler; a step whose dependency failed is skipped.
+    """
+
+    def __init__(self, tool_registry: Any, handler_registry: Any, workflow_vars: Optional[Dict[str, Any]] = None,
+                 tool_details: Optional[List[Dict]] = None, handler_details: Optional[List[Dict]] = None,
+                 max_workers: int = 4, parent_task_id: str = "incremental_plan"):
+        from core.utils.variable_resolver import resolve_path
+
+        self.tool_registry = tool_registry
+        self.handler_registry = handler_registry
+        self.workflow_vars = workflow_vars if isinstance(workflow_vars, dict) else {}
+        self.parent_task_id = parent_task_id
+        self._resolve_path = resolve_path
+        self._tool_names = {t.get("name") for t in tool_details if isinstance(t, dict)} if tool_details else None
+        self._handler_names = {h.get("name") for h in handler_details if isinstance(h, dict)} if handler_details else None
+
+        self.steps: List[Dict] = [] # Accepted steps in arrival order
+        self.validation_errors: List[str] = []
+        self.validation_warnings: List[str] = []
+        self.outputs: List[Dict] = [] # Step outputs in completion order
+        self.first_step_started_at: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plan-step")
+        self._step_ids: set = set()
+        self._finished: Dict[str, Dict] = {} # step_id -> output
+        self._waiting: Dict[str, Dict] = {} # step_id -> task definition with unfinished dependencies
+        self._running = 0
+        self._received = 0
+
+    def has_step(self, step_id: Any) -> bool:
+        """Returns True if a step with this step_id was already received."""
+        with self._lock:
+            return step_id in self._step_ids
+
+    def add_step(self, step: Any) -> bool:
+        """
+        Validates a step and schedules it. Returns True if the step was accepted.
+        """
+        with self._lock:
+            self._received += 1
+            index = self._received
+            errors, warnings = validate_plan_step(step, index, self._step_ids, self._tool_names, self._handler_names)
+            task_def, conversion_warnings = (None, []) if errors else step_to_task_definition(step)
+            self.validation_warnings.extend(warnings + conversion_warnings)
+            step_id = step.get("step_id") if isinstance(step, dict) else None
+            if errors or task_def is None:
+                self.validation_errors.extend(errors)
+                logger.error(f"[IncrementalPlan:{self.parent_task_id}] Rejected plan step {index}: {errors or conversion_warnings}")
+                if isinstance(step_id, str) and step_id not in self._step_ids:
+                    # Dependents of a rejected step are skipped like those of a failed step
+                    self._step_ids.add(step_id)
+                    self._record({"task_id": step_id, "success": False, "status": "failed",
+                                  "error": f"Invalid plan step: {'; '.join(errors or conversion_warnings)}"})
+                return False
+
+            self._step_ids.add(step_id)
+            self.steps.append(step)
+            self._waiting[step_id] = task_def
+            logger.info(f"[IncrementalPlan:{self.parent_task_id}] Accepted step '{step_id}' while the plan is still streaming.")
+            self._schedule_ready()
+            return True
+
+    def _schedule_ready(self) -> None:
+        """Submits the waiting steps whose dependencies have all finished. Caller holds the lock."""
+        for step_id, task_def in list(self._waiting.items()):
+            if all(dep_id in self._finished for dep_id in task_def["depends_on"]):
+                del self._waiting[step_id]
+                self._running += 1
+                if self.first_step_started_at is None:
+                    self.first_step_started_at = time.monotonic()
+                self._pool.submit(self._run_step, task_def)
+
+    def _record(self, output: Dict) -> None:
+        """Stores a step output and releases its dependents. Caller holds the lock."""
+        self._finished[output["task_id"]] = output
+        self.outputs.append(output)
+        self._schedule_ready()
+
+    def _run_step(self, task_def: Dict) -> None:
+        task_id = task_def["task_id"]
+        try:
+            with self._lock:
+                failed_dep = next((d for d in task_def["depends_on"] if not self._finished[d].get("success", False)), None)
+                resolution_context = {**self.workflow_vars, **self._finished}
+            if failed_dep is not None:
+                output = {"task_id": task_id, "success": False, "status": "skipped", "error": f"Dependency '{failed_dep}' failed"}
+            else:
+                try:
+                    processed_inputs = _resolve_dynamic_inputs(task_id, task_def.get("input_data", {}), resolution_context,
+                                                               self._resolve_path, self.parent_task_id)
+                except Exception as e:
+                    logger.error(f"[IncrementalPlan:{self.parent_task_id}] Input resolution failed for '{task_id}': {e}", exc_info=True)
+                    output = {"task_id": task_id, "success": False, "status": "failed", "error": f"Input resolution failed: {str(e)}"}
+                else:
+                    output = _execute_dynamic_capability(task_id, task_def.get("name", task_id), task_def, processed_inputs,
+                                                         self.tool_registry, self.handler_registry, self.parent_task_id)
+        except Exception as e:
+            output = {"task_id": task_id, "success": False, "status": "failed", "error": f"Execution error: {str(e)}"}
+        with self._lock:
+            self._record(output)
+            self._running -= 1
+            self._idle.notify_all()
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Waits for every scheduled step once the plan is complete.
+
+        Steps whose dependencies never appeared in the plan are skipped.
+
+        Returns:
+            Dict: The execution result, in the format of execute_dynamic_tasks_handler.
+        """
+        with self._lock:
+            self._idle.wait_for(lambda: self._running == 0)
+            for step_id in list(self._waiting):
+                del self._waiting[step_id]
+                self._finished[step_id] = {"task_id": step_id, "success": False, "status": "skipped", "error": "Unmet dependencies or cycle."}
+                self.outputs.append(self._finished[step_id])
+        self._pool.shutdown(wait=True)
+        return {
+            "message": f"Executed {len(self.outputs)} dynamic tasks.",
+            "outputs": list(self.outputs)
+        }
+
+
+def _stream_and_execute_plan(llm_interface: Any, planning_prompt: str, input_data: dict, parent_task_id: str) -> Dict[str, Any]:
+    """
+    Streams the plan from the LLM and executes each step as soon as it is complete.
+
+    Returns:
+        Dict: The raw plan, the accepted steps, validation messages and the execution results.
+    """
+    services = get_services()
+    executor = IncrementalPlanExecutor(
+        tool_registry=getattr(services, 'tool_registry', None),
+        handler_registry=getattr(services, 'handler_registry', None),
+        workflow_vars=input_data.get("original_input", {}),
+        tool_details=input_data.get("tool_details") if isinstance(input_data.get("tool_details"), list) else None,
+        handler_details=input_data.get("handler_details") if isinstance(input_data.get("handler_details"), list) else None,
+        max_workers=ChatPlannerConfig.get_incremental_max_workers(),
+        parent_task_id=parent_task_id,
+    )
+    parser = IncrementalJSONArrayParser()
+    started_at = time.monotonic()
+    stream_error = None
+    try:
+        stream = llm_interface.stream_llm_call(
+            prompt=planning_prompt,
+            system_message=ChatPlannerConfig.get_planning_system_message(),
+        )
+        for chunk in stream:
+            for step in parser.feed(chunk):
+                executor.add_step(step)
+    except Exception as e:
+        logger.error(f"[IncrementalPlan:{parent_task_id}] Plan stream failed: {e}", exc_info=True)
+        stream_error = e
+
+    if stream_error is None and not parser.finished:
+        # The plan did not stream as a well-formed array; recover what the full text allows
+        recovered = attempt_json_recovery(re.sub(r"^```(?:json)?\s*|\s*```$", "", parser.text.strip(), flags=re.IGNORECASE))
+        if isinstance(recovered, list):
+            for step in recovered:
+                if not (isinstance(step, dict) and executor.has_step(step.get("step_id"))):
+                    executor.add_step(step)
+        else:
+            executor.validation_errors.append("Plan is not a complete JSON array.")
+    executor.validation_errors.extend(parser.errors)
+
+    execution_results = executor.finish()
+    time_to_first_step = None
+    if executor.first_step_started_at is not None:
+        time_to_first_step = round(executor.first_step_started_at - started_at, 3)
+    logger.info(f"[IncrementalPlan:{parent_task_id}] Executed {len(execution_results['outputs'])} steps; first step started after {time_to_first_step}s.")
+    return {
+        "raw_llm_output": parser.text,
+        "validated_plan": executor.steps,
+        "validation_errors": executor.validation_errors,
+        "validation_warnings": executor.validation_warnings,
+        "execution_results": execution_results,
+        "time_to_first_step": time_to_first_step,
+        "error": f"Plan generation failed: {stream_error}" if stream_error is not None else None,
+    }
+
 # --- summarize_results_handler (Keep as is) ---
 def summarize_results_handler(task: DirectHandlerTask, input_data: dict) -> dict:
     logger.info(f"Executing summarize results handler for task: {task.id}")
@@ -967,9 +1230,12 @@ def check_clarification_needed_default_handler(task: DirectHandlerTask, input_da
 
 # --- Workflow Definition ---
 # Apply corrections from Step 1 of previous answer: remove output_key, use standard refs
-def build_chat_planner_workflow() -> Workflow:
+def build_chat_planner_workflow(incremental_execution: bool = False) -> Workflow:
     """
     Builds the chat-driven workflow with corrected variable references.
+
+    With incremental_execution, the planning task streams the plan and executes each
+    step as soon as it is complete, replacing the validate/convert/execute phases.
     """
     workflow = Workflow(
         workflow_id="chat_planner_workflow",
@@ -997,7 +1263,11 @@ def build_chat_planner_workflow() -> Workflow:
             "available_handlers_context": "${get_capabilities.result.handlers_context}", # Use standard ref
             "clarification_history": "${clarification_history:[]}", # Use default syntax
             "clarification_count": "${clarification_count:0}", # Use default syntax
-            "skip_ambiguity_check": "${skip_ambiguity_check:False}" # Use default syntax
+            "skip_ambiguity_check": "${skip_ambiguity_check:False}", # Use default syntax
+            "execute_incrementally": incremental_execution,
+            "tool_details": "${get_capabilities.result.tool_details}",
+            "handler_details": "${get_capabilities.result.handler_details}",
+            "original_input": workflow.variables # Pass workflow vars for step inputs
         },
         # REMOVED output_key
         next_task_id_on_success="check_for_clarification_needed",
@@ -1016,7 +1286,8 @@ def build_chat_planner_workflow() -> Workflow:
         # REMOVED output_key
         condition="'${result.needs_clarification}' == 'True'", # Condition uses THIS task's result
         next_task_id_on_success="await_clarification",
-        next_task_id_on_failure="validate_plan",
+        # Incremental plans are already executed by the planning task
+        next_task_id_on_failure="summarize_results" if incremental_execution else "validate_plan",
         description="Checks planning outcome for clarification need."
     )
     workflow.add_task(check_clarification_task)
@@ -1082,6 +1353,21 @@ def build_chat_planner_workflow() -> Workflow:
     workflow.add_task(restart_planning_task)
 
     # Main Execution Branch
+    if incremental_execution:
+        workflow.add_task(DirectHandlerTask(
+            task_id="summarize_results",
+            name="Summarize Execution Results",
+            handler_name="summarize_results_handler",
+            input_data={
+                "execution_results": "${think_analyze_plan.result.execution_results}",
+                "original_plan": "${think_analyze_plan.result.validated_plan}",
+                "original_input": "${user_prompt}"
+            },
+            next_task_id_on_success=None, # End of workflow
+            description="Generates final summary."
+        ))
+        return workflow
+
     validate_plan_task = DirectHandlerTask(
         task_id="validate_plan",
         name="Validate Plan Structure and Content",
@@ -1236,6 +1522,16 @@ class MockLLMInterface(LLMInterface):
             logger.warning(f"MOCK LLM: Unmatched prompt type: {prompt[:100]}...")
             return {"success": True, "response": self.plan_response}
 
+    def stream_llm_call(self, prompt: str, **kwargs) -> ResponseStream:
+        """
+        Streams the plan in small chunks, as only the planning step streams.
+        Steps are split across chunk boundaries, so the incremental parser is exercised.
+        """
+        logger.info("MOCK LLM: Streaming Plan Response")
+        chunk_size = 40
+        chunks = [self.plan_response[i:i + chunk_size] for i in range(0, len(self.plan_response), chunk_size)]
+        return ResponseStream.from_iterable(chunks)
+
 # --- Main execution block (Keep as is, but ensure handlers are registered) ---
 def main():
     """Entry point for running the chat planner workflow example."""
@@ -1344,7 +1640,7 @@ def main():
     logger.info(f"All registered tools after ensure_all_registrations: {list(tool_registry.tools.keys())}")
 
     # Build workflow
-    workflow = build_chat_planner_workflow()
+    workflow = build_chat_planner_workflow(ChatPlannerConfig.is_incremental_execution_enabled())
     logger.info(f"Workflow '{workflow.name}' built.")
 
     # Setup Mock LLM
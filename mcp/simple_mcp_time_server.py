@@ -4,6 +4,11 @@ Servidor web simple que implementa la API MCP para el Protocolo de Tiempo.
 
 Este servidor recibe solicitudes HTTP y devuelve la hora obtenida del
 servidor de tiempo que implementa el Protocolo de Tiempo (RFC 868).
+
+Por defecto atiende cada solicitud en su propio hilo. Las consultas al
+servidor de tiempo pasan por un UpstreamTimeClient compartido que limita las
+conexiones simultáneas por servidor, agrupa las consultas concurrentes en una
+sola conexión y guarda durante un TTL corto el desfase del reloj remoto.
 """  # noqa: D202
 
 import argparse
@@ -13,8 +18,9 @@ import logging
 import socket
 import struct
 import sys
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import HTTPServer, BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
 # Configurar logging
@@ -49,7 +55,12 @@ def get_time_from_server(host, port=37, timeout=5):
         client_socket.connect((host, port))
         
         # Recibir 4 bytes (32 bits) con el tiempo
-        data = client_socket.recv(4)
+        data = b""
+        while len(data) < 4:
+            chunk = client_socket.recv(4 - len(data))
+            if not chunk:
+                break
+            data += chunk
         if len(data) != 4:
             raise ValueError(f"Se esperaban 4 bytes de datos, pero se recibieron {len(data)}")
         
@@ -68,13 +79,105 @@ def get_time_from_server(host, port=37, timeout=5):
         # Cerrar el socket
         client_socket.close()
 
+class UpstreamTimeClient:
+    """
+    Cliente compartido para los servidores de tiempo.
+    
+    El protocolo RFC 868 cierra la conexión tras enviar la hora, por lo que las
+    conexiones no se pueden reutilizar. En su lugar, el cliente limita las
+    conexiones simultáneas a cada servidor, hace que las consultas concurrentes
+    a un mismo servidor compartan una única conexión y guarda durante cache_ttl
+    segundos el desfase entre el reloj remoto y el local.
+    """  # noqa: D202
+    
+    def __init__(self, cache_ttl=1.0, max_connections=4):
+        """
+        Inicializa el cliente.
+        
+        Args:
+            cache_ttl: Segundos durante los que se reutiliza una hora obtenida (0 desactiva la caché)
+            max_connections: Conexiones simultáneas máximas por servidor
+        """
+        self.cache_ttl = cache_ttl
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._connections = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get_time(self, host, port=37, timeout=5):
+        """
+        Obtiene la hora de un servidor de tiempo, usando la caché si es posible.
+        
+        Args:
+            host: Nombre o dirección IP del servidor
+            port: Puerto del servidor
+            timeout: Tiempo de espera para la conexión en segundos
+            
+        Returns:
+            Tupla (datetime con la hora del servidor, True si procede de la caché)
+        """
+        key = (host, port)
+        with self._lock:
+            entry = self._entries.setdefault(key, {"lock": threading.Lock(), "offset": None, "fetched_at": 0.0})
+            connections = self._connections.setdefault(key, threading.BoundedSemaphore(self.max_connections))
+        
+        if self.cache_ttl <= 0:
+            return self._fetch(host, port, timeout, connections), False
+        
+        cached = self._cached_time(entry)
+        if cached is not None:
+            return cached, True
+        
+        # Solo una consulta por servidor a la vez; el resto espera y usa su resultado
+        with entry["lock"]:
+            cached = self._cached_time(entry)
+            if cached is not None:
+                return cached, True
+            
+            time_obj = self._fetch(host, port, timeout, connections)
+            # La hora del protocolo tiene resolución de un segundo; se guarda como desfase
+            entry["offset"] = time_obj.timestamp() - time.time()
+            entry["fetched_at"] = time.monotonic()
+            return time_obj, False
+    
+    def _fetch(self, host, port, timeout, connections):
+        if not connections.acquire(timeout=timeout):
+            raise TimeoutError(f"No hay conexiones disponibles para {host}:{port}")
+        try:
+            time_obj = get_time_from_server(host, port, timeout)
+        finally:
+            connections.release()
+        with self._lock:
+            self.misses += 1
+        return time_obj
+    
+    def _cached_time(self, entry):
+        if entry["offset"] is None or time.monotonic() - entry["fetched_at"] >= self.cache_ttl:
+            return None
+        with self._lock:
+            self.hits += 1
+        return datetime.datetime.fromtimestamp(time.time() + entry["offset"])
+    
+    def stats(self):
+        """
+        Devuelve las estadísticas de la caché.
+        
+        Returns:
+            Diccionario con aciertos y fallos de la caché
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cache_ttl": self.cache_ttl}
+
 class MCPRequestHandler(BaseHTTPRequestHandler):
     """Manejador de solicitudes HTTP para la API MCP."""  # noqa: D202
     
-    def __init__(self, *args, time_host="localhost", time_port=3737, api_key=None, **kwargs):
+    def __init__(self, *args, time_host="localhost", time_port=3737, api_key=None, upstream=None, **kwargs):
         self.time_host = time_host
         self.time_port = time_port
         self.api_key = api_key
+        self.upstream = upstream or UpstreamTimeClient(cache_ttl=0)
         super().__init__(*args, **kwargs)
     
     def do_GET(self):
@@ -91,7 +194,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
             response = {
                 "status": "ok",
                 "server": "MCP Time Server",
-                "timestamp": datetime.datetime.now().isoformat()
+                "timestamp": datetime.datetime.now().isoformat(),
+                "cache": self.upstream.stats()
             }
             
             self.wfile.write(json.dumps(response).encode())
@@ -180,7 +284,7 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                     
                     try:
                         # Obtener la hora del servidor
-                        time_obj = get_time_from_server(host, port, timeout)
+                        time_obj, cached = self.upstream.get_time(host, port, timeout)
                         
                         # Formatear la respuesta
                         result = {
@@ -188,7 +292,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                             "result": {
                                 "time": time_obj.isoformat(),
                                 "timestamp": time_obj.timestamp(),
-                                "local_time": datetime.datetime.now().isoformat()
+                                "local_time": datetime.datetime.now().isoformat(),
+                                "cached": cached
                             }
                         }
                         
@@ -197,7 +302,7 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                         self.end_headers()
                         self.wfile.write(json.dumps(result).encode())
                         
-                        logger.info(f"Tiempo enviado: {time_obj.isoformat()}")
+                        logger.debug(f"Tiempo enviado: {time_obj.isoformat()}")
                         
                     except Exception as e:
                         logger.error(f"Error al obtener la hora: {str(e)}")
@@ -310,9 +415,17 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
             
         return True
         
-def run_server(host="0.0.0.0", port=8080, time_host="localhost", time_port=3737, api_key=None):
+class ThreadedMCPServer(ThreadingHTTPServer):
+    """Servidor HTTP que atiende cada solicitud en un hilo."""  # noqa: D202
+    
+    daemon_threads = True
+    # Cola de conexiones pendientes mayor que la predeterminada (5) para ráfagas de clientes
+    request_queue_size = 128
+
+def create_server(host="0.0.0.0", port=8080, time_host="localhost", time_port=3737, api_key=None,
+                  threaded=True, cache_ttl=1.0, max_upstream_connections=4):
     """
-    Ejecuta el servidor HTTP.
+    Crea el servidor HTTP sin iniciarlo.
     
     Args:
         host: Dirección IP del servidor HTTP
@@ -320,14 +433,44 @@ def run_server(host="0.0.0.0", port=8080, time_host="localhost", time_port=3737,
         time_host: Host del servidor de tiempo
         time_port: Puerto del servidor de tiempo
         api_key: Clave API para autenticación (opcional)
+        threaded: Atender cada solicitud en su propio hilo
+        cache_ttl: Segundos durante los que se reutiliza la hora obtenida
+        max_upstream_connections: Conexiones simultáneas máximas a cada servidor de tiempo
+        
+    Returns:
+        Servidor HTTP configurado
     """
+    upstream = UpstreamTimeClient(cache_ttl=cache_ttl, max_connections=max_upstream_connections)
+    
     # Crear una clase de manejador con los parámetros configurados
-    handler = lambda *args, **kwargs: MCPRequestHandler(*args, time_host=time_host, time_port=time_port, api_key=api_key, **kwargs)
+    handler = lambda *args, **kwargs: MCPRequestHandler(
+        *args, time_host=time_host, time_port=time_port, api_key=api_key, upstream=upstream, **kwargs
+    )
     
+    server_class = ThreadedMCPServer if threaded else HTTPServer
+    server = server_class((host, port), handler)
+    server.upstream = upstream
+    return server
+
+def run_server(host="0.0.0.0", port=8080, time_host="localhost", time_port=3737, api_key=None,
+               threaded=True, cache_ttl=1.0, max_upstream_connections=4):
+    """
+    Ejecuta el servidor HTTP.
+    
+    Args:
+        host: Dirección IP del servidor HTTP
+        port: Puerto del servidor HTTP
+        time_host: Host del servidor de tiempo
+        time_port: Puerto del servidor de tiempo
+        api_key: Clave API para autenticación (opcional)
+        threaded: Atender cada solicitud en su propio hilo
+        cache_ttl: Segundos durante los que se reutiliza la hora obtenida
+        max_upstream_connections: Conexiones simultáneas máximas a cada servidor de tiempo
+    """
     # Crear y configurar el servidor
-    server = HTTPServer((host, port), handler)
+    server = create_server(host, port, time_host, time_port, api_key, threaded, cache_ttl, max_upstream_connections)
     
-    logger.info(f"Servidor MCP iniciado en {host}:{port}")
+    logger.info(f"Servidor MCP iniciado en {host}:{port} ({'multihilo' if threaded else 'un solo hilo'})")
     logger.info(f"Configurado para usar servidor de tiempo en {time_host}:{time_port}")
     
     try:
@@ -348,11 +491,21 @@ def main():
     parser.add_argument("--time-host", default="localhost", help="Host del servidor de tiempo")
     parser.add_argument("--time-port", type=int, default=3737, help="Puerto del servidor de tiempo")
     parser.add_argument("--api-key", default="dawn-mcp-demo-key", help="Clave API para autenticación")
+    parser.add_argument("--single-threaded", action="store_true", help="Atender las solicitudes de una en una")
+    parser.add_argument("--cache-ttl", type=float, default=1.0,
+                        help="Segundos durante los que se reutiliza la hora obtenida (0 desactiva la caché)")
+    parser.add_argument("--max-upstream-connections", type=int, default=4,
+                        help="Conexiones simultáneas máximas al servidor de tiempo")
     
     args = parser.parse_args()
     
     # Ejecutar el servidor
-    run_server(args.host, args.port, args.time_host, args.time_port, args.api_key)
+    run_server(
+        args.host, args.port, args.time_host, args.time_port, args.api_key,
+        threaded=not args.single_threaded,
+        cache_ttl=args.cache_ttl,
+        max_upstream_connections=args.max_upstream_connections
+    )
     
     return 0
 
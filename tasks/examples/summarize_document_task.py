@@ -16,6 +16,10 @@ class SummarizeDocumentTask(Task):
     1. Takes a document content as input
     2. Uses an LLM to generate a summary
     3. Returns the summary
+
+    The whole document goes into one prompt. For documents longer than the
+    model's context, use core.task.DocumentTask, which summarizes them chunk
+    by chunk.
     """  # noqa: D202
     
     def __init__(self):
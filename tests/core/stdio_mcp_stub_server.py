@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Stub MCP server speaking newline-delimited MCP messages over stdio.
+
+Used by the stdio transport tests. Each call_tool request is answered from
+its own thread, so responses can arrive out of order. Tools:
+
+- "sleep": waits arguments["seconds"] and returns arguments["value"].
+- "stats": returns the process ID and the most calls seen running at once.
+- "fail": answers with success=False.
+- "crash": exits the process without answering.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+write_lock = threading.Lock()
+state_lock = threading.Lock()
+state = {"running": 0, "max_running": 0}
+
+
+def send(request_id, message_type, success=True, content=None, error=None):
+    """Write one response line."""
+    message = {"type": message_type, "message_id": uuid.uuid4().hex, "request_id": request_id,
+               "success": success, "content": content, "error": error}
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def call_tool(request_id, name, arguments):
+    """Run a tool and answer its request."""
+    with state_lock:
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+    if name == "crash":
+        os._exit(1)
+    time.sleep(arguments.get("seconds", 0))
+    with state_lock:
+        # No longer running once answered, or the next call could overlap it
+        state["running"] -= 1
+    if name == "fail":
+        send(request_id, "call_tool_response", success=False, error="tool failed")
+    elif name == "stats":
+        send(request_id, "call_tool_response", content={"pid": os.getpid(), "max_running": state["max_running"]})
+    else:
+        send(request_id, "call_tool_response", content={"pid": os.getpid(), "value": arguments.get("value")})
+
+
+def main():
+    """Answer requests read from stdin until it is closed."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if message["type"] == "initialize":
+            send(message["message_id"], "initialize_response", content={})
+        elif message["type"] == "list_tools":
+            tools = [{"name": name, "description": "", "input_schema": {}} for name in ("sleep", "stats", "fail")]
+            send(message["message_id"], "list_tools_response", content=tools)
+        elif message["type"] == "call_tool":
+            content = message["content"]
+            threading.Thread(target=call_tool, args=(message["message_id"], content["name"], content["arguments"]),
+                             daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Tests for the immutable configuration snapshot and file-watch hot reload.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core import config
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    """Test flattened snapshots, subscribers and the file watcher."""  # noqa: D202
+
+    def setUp(self):
+        """Write a temporary config file and configure from it."""
+        self.root = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.root, "app.json")
+        self._write_config({"custom": {"retries": 5, "nested": {"value": 1}}})
+        self.original_overrides = dict(config._runtime_overrides)
+        config._runtime_overrides.clear()
+        config.configure(config_paths=[self.config_path])
+
+    def tearDown(self):
+        """Stop watching and restore the default configuration."""
+        config.stop_watching()
+        config._runtime_overrides.clear()
+        config._runtime_overrides.update(self.original_overrides)
+        config.configure()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write_config(self, data):
+        with open(self.config_path, "w") as f:
+            json.dump(data, f)
+        # Ensure a distinct signature even on coarse-grained filesystems
+        stamp = time.time() + len(json.dumps(data))
+        os.utime(self.config_path, (stamp, stamp))
+
+    def test_dotted_keys_are_precomputed(self):
+        """Nested values are reachable by dotted key from the flat snapshot."""
+        snapshot = config.snapshot()
+        self.assertEqual(snapshot["custom.nested.value"], 1)
+        self.assertEqual(config.get("custom.retries"), 5)
+        self.assertEqual(config.get("custom.nested.missing", "fallback"), "fallback")
+        self.assertEqual(config.get("custom")["nested"]["value"], 1)
+
+    def test_snapshot_is_immutable(self):
+        """Snapshots and the containers they hold cannot be mutated."""
+        snapshot = config.snapshot()
+        with self.assertRaises(TypeError):
+            snapshot["custom.nested.value"] = 2
+        with self.assertRaises(TypeError):
+            config.get("custom.nested")["value"] = 2
+        self.assertIsInstance(config.get("http_server.cors_origins"), tuple)
+
+    def test_as_dict_returns_a_detached_copy(self):
+        """Mutating the result of as_dict() changes neither the configuration nor the snapshot."""
+        copied = config.as_dict()
+        copied["custom"]["nested"]["value"] = 2
+        copied["custom"]["retries"] = 0
+
+        self.assertEqual(config.get("custom.nested.value"), 1)
+        self.assertEqual(config.as_dict()["custom"]["retries"], 5)
+
+    def test_set_swaps_snapshot_and_notifies(self):
+        """set() publishes a new snapshot and reports the changed keys."""
+        before = config.snapshot()
+        notifications = []
+        callback = lambda changed, snapshot: notifications.append(changed)  # noqa: E731
+        config.subscribe(callback)
+        self.addCleanup(config.unsubscribe, callback)
+
+        config.set("custom.nested.value", 2)
+
+        self.assertEqual(before["custom.nested.value"], 1)
+        self.assertEqual(config.get("custom.nested.value"), 2)
+        self.assertEqual(len(notifications), 1)
+        self.assertIn("custom.nested.value", notifications[0])
+        self.assertNotIn("custom.retries", notifications[0])
+
+    def test_reload_keeps_explicit_paths_and_reuses_unchanged_files(self):
+        """reload() re-reads the configured files, parsing only changed ones."""
+        cached = config._file_cache[os.path.abspath(self.config_path)]
+        config.reload()
+        self.assertIs(config._file_cache[os.path.abspath(self.config_path)], cached)
+        self.assertEqual(config.get("custom.nested.value"), 1)
+
+        self._write_config({"custom": {"nested": {"value": 3}}})
+        config.reload()
+        self.assertEqual(config.get("custom.nested.value"), 3)
+
+    def test_watcher_hot_reloads_changed_file(self):
+        """The watcher reloads a changed config file and notifies subscribers."""
+        reloaded = threading.Event()
+        callback = lambda changed, snapshot: reloaded.set()  # noqa: E731
+        config.subscribe(callback)
+        self.addCleanup(config.unsubscribe, callback)
+
+        config.watch(interval=0.05, directories=[self.root])
+        self._write_config({"custom": {"nested": {"value": 4}}})
+
+        self.assertTrue(reloaded.wait(timeout=5))
+        self.assertEqual(config.get("custom.nested.value"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
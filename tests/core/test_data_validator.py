@@ -5,16 +5,20 @@ This module contains tests for data validation functions,
 including type checking, schema validation, and error handling.
 """
 
+import gc
 import os
 import sys
 import unittest
+import weakref
 from typing import Any, Dict, List, Optional, Union
+from unittest.mock import patch
 
 # Add parent directory to path to import framework modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from core.utils.data_validator import (
     ValidationError, 
+    compile_validator,
     create_schema_from_type_hints, 
     validate_type, 
     validate_data,
@@ -200,6 +204,67 @@ class TestDataValidator(unittest.TestCase):
         errors = validate_task_output(invalid_type_output)
         self.assertEqual(len(errors), 1)
     
+    def test_compiled_validators_are_cached(self):
+        """Validators are compiled once per type and report element paths."""
+        validator = compile_validator(List[Dict[str, int]])
+        self.assertIs(compile_validator(List[Dict[str, int]]), validator)
+        
+        validator([{"a": 1}, {"b": 2}], "items")
+        with self.assertRaises(ValidationError) as context:
+            validator([{"a": 1}, {"b": "2"}], "items")
+        self.assertEqual(context.exception.field_path, "items[1].b")
+    
+    def test_primitive_list_fast_path(self):
+        """Lists of plain classes are validated by distinct element type."""
+        validate_type([1, 2, True], List[int])  # bool is a subclass of int
+        with self.assertRaises(ValidationError) as context:
+            validate_type([1] * 1000 + ["x"], List[int], "numbers")
+        self.assertEqual(context.exception.field_path, "numbers[1000]")
+        self.assertEqual(context.exception.message, "Expected int, got str")
+    
+    def test_sampled_validation(self):
+        """Sampling checks an evenly spaced subset of large lists and dicts."""
+        values = list(range(1000))
+        values[501] = "x"
+        validate_type(values, List[int], sample_size=10)  # Element 501 is not sampled
+        with self.assertRaises(ValidationError):
+            validate_type(values, List[int])
+        
+        values[500] = "x"
+        with self.assertRaises(ValidationError):
+            validate_type(values, List[int], sample_size=10)
+        
+        mapping = {str(i): i for i in range(1000)}
+        mapping["0"] = "x"
+        with self.assertRaises(ValidationError):
+            validate_type(mapping, Dict[str, int], sample_size=10)
+    
+    def test_task_input_schema_compiled_once(self):
+        """A handler's type hints are only inspected on first validation."""
+        def handler(message: str, values: List[int]) -> Dict[str, Any]:
+            return {"success": True, "result": message}
+        
+        with patch("core.utils.data_validator.create_schema_from_type_hints",
+                   wraps=create_schema_from_type_hints) as create_schema:
+            for _ in range(3):
+                self.assertEqual(validate_task_input(handler, {"message": "hi", "values": [1, 2]}), [])
+            errors = validate_task_input(handler, {"message": "hi", "values": [1, "2"]})
+        
+        self.assertEqual(create_schema.call_count, 1)
+        self.assertEqual(errors[0].field_path, "values[1]")
+    
+    def test_task_input_cache_does_not_keep_handlers_alive(self):
+        """Cached validators are dropped once their handler is garbage collected."""
+        def handler(message: str) -> Dict[str, Any]:
+            return {"success": True, "result": message}
+        
+        self.assertEqual(validate_task_input(handler, {"message": "hi"}), [])
+        handler_ref = weakref.ref(handler)
+        del handler
+        gc.collect()
+        
+        self.assertIsNone(handler_ref())
+    
     def test_format_validation_errors(self):
         """Test formatting validation errors to a string."""
         errors = [
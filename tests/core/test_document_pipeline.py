@@ -0,0 +1,170 @@
+"""
+Tests for chunked map-reduce processing of long documents.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.config import get as config_get, set as config_set
+from core.llm.interface import LLMInterface
+from core.task import DocumentTask
+from core.task_execution_strategy import DocumentTaskExecutionStrategy
+from core.utils.document_chunker import chunk_file, chunk_text, count_tokens
+from core.workflow import Workflow
+
+
+def make_contract(clauses=40):
+    """Build a contract-like text of numbered clauses, one paragraph each."""
+    return "\n\n".join(
+        f"Clause {i}. The supplier shall deliver batch {i} on time. Late delivery of batch {i} incurs a penalty."
+        for i in range(clauses)
+    )
+
+
+class TestDocumentChunker(unittest.TestCase):
+    """Test token-bounded, overlapping chunking of texts and memory-mapped files."""  # noqa: D202
+
+    def setUp(self):
+        """Write the contract to a temporary file."""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "contract.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(make_contract())
+
+    def test_chunks_are_bounded_and_overlap(self):
+        """Every chunk fits the token budget and starts with the end of the previous one."""
+        chunks = list(chunk_file(self.path, max_tokens=60, overlap_tokens=20))
+
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(count_tokens(chunk["text"]) <= 60 for chunk in chunks))
+        for previous, chunk in zip(chunks, chunks[1:]):
+            first_sentence = chunk["text"].split(". ")[0]
+            self.assertIn(first_sentence, previous["text"])
+        self.assertIn("Clause 39.", chunks[-1]["text"])
+
+    def test_file_and_text_chunks_match(self):
+        """Memory-mapped files are chunked exactly like the same text in memory."""
+        from_file = [chunk["text"] for chunk in chunk_file(self.path, max_tokens=60, overlap_tokens=20)]
+        from_text = [chunk["text"] for chunk in chunk_text(make_contract(), max_tokens=60, overlap_tokens=20)]
+
+        self.assertEqual(from_file, from_text)
+
+    def test_text_without_breaks_is_still_bounded(self):
+        """Runs without paragraph breaks or spaces are cut to fit the budget."""
+        chunks = list(chunk_text("x" * 5000, max_tokens=100, overlap_tokens=0))
+
+        self.assertEqual("".join(chunk["text"] for chunk in chunks), "x" * 5000)
+        self.assertTrue(all(chunk["tokens"] <= 100 for chunk in chunks))
+
+
+class TestDocumentTask(unittest.TestCase):
+    """Test DocumentTask execution through the asynchronous engine."""  # noqa: D202
+
+    def setUp(self):
+        """Use a temporary response cache and an instrumented mock LLM."""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        original = config_get("document_pipeline.cache_directory", "")
+        self.addCleanup(config_set, "document_pipeline.cache_directory", original)
+        config_set("document_pipeline.cache_directory", os.path.join(self.directory, "cache"))
+
+        self.path = os.path.join(self.directory, "contract.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(make_contract())
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.prompts = []
+
+        def execute_llm_call(prompt, **kwargs):
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                self.prompts.append(prompt)
+            time.sleep(0.01)
+            with self.lock:
+                self.in_flight -= 1
+            if prompt.startswith("COMBINE "):
+                return {"success": True, "response": "(" + ",".join(prompt[len("COMBINE "):].split("\n\n")) + ")"}
+            return {"success": True, "response": prompt.split("Clause ")[1].split(".")[0]}
+
+        self.llm = MagicMock(spec=LLMInterface)
+        self.llm.model = "test-model"
+        self.llm.execute_llm_call.side_effect = execute_llm_call
+
+    def _run(self, **kwargs):
+        task = DocumentTask(
+            task_id="summary", name="Summary", input_data={"path": self.path},
+            chunk_prompt="CHUNK ${index}: ${chunk}", combine_prompt="COMBINE ${summaries}",
+            chunk_tokens=60, overlap_tokens=20, combine_fan_in=3, max_concurrency=2, **kwargs
+        )
+        workflow = Workflow(workflow_id="document", name="Document")
+        workflow.add_task(task)
+        engine = AsyncWorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=MagicMock())
+        return asyncio.run(engine.async_run()), workflow.tasks["summary"].output_data
+
+    def test_chunks_are_mapped_in_parallel_and_combined_hierarchically(self):
+        """Chunk calls respect max_concurrency and the results combine level by level into one."""
+        result, output = self._run()
+
+        metadata = output["metadata"]
+        chunk_prompts = [prompt for prompt in self.prompts if prompt.startswith("CHUNK")]
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(len(chunk_prompts), metadata["chunks"])
+        self.assertEqual(self.peak, 2)
+        self.assertGreaterEqual(metadata["combine_levels"], 2)
+        self.assertEqual(len(metadata["chunk_results"]), metadata["chunks"])
+        # Each result is the first clause of its chunk; combinations nest them in order
+        self.assertRegex(output["result"], r"^\(\(")
+        self.assertEqual(output["result"].replace("(", "").replace(")", "").split(","), metadata["chunk_results"])
+
+    def test_unchanged_chunks_are_not_processed_again(self):
+        """A re-run of an edited document only calls the model for the chunks and combinations that changed."""
+        _, first = self._run()
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(make_contract().replace("deliver batch 39", "deliver batch 39 by air"))
+        self.prompts = []
+
+        _, second = self._run()
+
+        self.assertEqual(second["metadata"]["chunks"], first["metadata"]["chunks"])
+        self.assertLessEqual(second["metadata"]["llm_calls"], 1 + second["metadata"]["combine_levels"])
+        self.assertTrue(all("39" in prompt or prompt.startswith("COMBINE") for prompt in self.prompts))
+
+    def test_missing_file_fails_the_task(self):
+        """A document that cannot be read fails the task with the read error."""
+        os.remove(self.path)
+
+        result, output = self._run()
+
+        self.assertEqual(result["status"], "failed")
+        self.assertIn("Could not read document", output["error"])
+        self.llm.execute_llm_call.assert_not_called()
+
+    def test_response_cache_defaults_to_the_data_directory(self):
+        """Without a cache_directory, chunk responses are cached under data_directory."""
+        original = config_get("data_directory", "./data")
+        self.addCleanup(config_set, "data_directory", original)
+        config_set("data_directory", os.path.join(self.directory, "data"))
+        config_set("document_pipeline.cache_directory", "")
+
+        store = DocumentTaskExecutionStrategy._response_store()
+
+        self.assertEqual(store.directory, os.path.join(self.directory, "data", "document_chunks"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental execution of streamed chat planner plans.
+
+Plan steps are parsed from the streaming LLM output and executed as soon as
+they are complete and their dependencies have finished.
+"""  # noqa: D202
+
+import sys
+import os
+import threading
+import unittest
+import json
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from examples.chat_planner_workflow import plan_user_request_handler
+from core.task import DirectHandlerTask
+from core.services import get_services, reset_services
+from core.tools.registry import ToolRegistry
+from core.handlers.registry import HandlerRegistry
+from core.llm.interface import LLMInterface
+from core.llm.streaming import ResponseStream
+from core.utils.incremental_json import IncrementalJSONArrayParser
+
+SEARCH_STEP = {
+    "step_id": "search_step",
+    "description": "Search for the topic",
+    "type": "tool",
+    "name": "mock_search",
+    "inputs": {"query": "project Dawn"},
+    "depends_on": []
+}
+SUMMARIZE_STEP = {
+    "step_id": "summarize_step",
+    "description": "Summarize the search results",
+    "type": "handler",
+    "name": "mock_summarize",
+    "inputs": {"content": "${search_step.result}"},
+    "depends_on": ["search_step"]
+}
+
+
+class TestIncrementalJSONArrayParser(unittest.TestCase):
+    """Test that array elements are emitted as soon as they are complete."""  # noqa: D202
+
+    def test_elements_emitted_as_they_complete(self):
+        """Each step is returned by the chunk that closes it, ignoring code fences."""
+        text = "```json\n" + json.dumps([SEARCH_STEP, SUMMARIZE_STEP], indent=2) + "\n```"
+        split = text.index("}") + 1  # Inside the first step ("inputs" closes first)
+        closing_first = text.index('"depends_on": []') + len('"depends_on": []') + 5
+
+        parser = IncrementalJSONArrayParser()
+        self.assertEqual(parser.feed(text[:split]), [])
+        self.assertEqual(parser.feed(text[split:closing_first]), [SEARCH_STEP])
+        self.assertEqual(parser.feed(text[closing_first:]), [SUMMARIZE_STEP])
+        self.assertTrue(parser.finished)
+        self.assertEqual(parser.errors, [])
+
+    def test_brackets_in_strings_and_trailing_commas(self):
+        """Brackets inside strings do not end elements; trailing commas are recovered."""
+        parser = IncrementalJSONArrayParser()
+        elements = []
+        for char in '[{"q": "a ] } [ \\" b", "l": [1, 2,],}, {"broken": }]':
+            elements.extend(parser.feed(char))
+
+        self.assertEqual(elements, [{"q": 'a ] } [ " b', "l": [1, 2]}])
+        self.assertEqual(len(parser.errors), 1)
+
+
+class TestIncrementalPlanExecution(unittest.TestCase):
+    """Test plan_user_request_handler in incremental execution mode."""  # noqa: D202
+
+    def setUp(self):
+        """Register tools, handlers and a streaming LLM interface."""
+        reset_services()
+        services = get_services()
+        self.tool_registry = ToolRegistry()
+        services.register_tool_registry(self.tool_registry)
+        self.handler_registry = HandlerRegistry()
+        services.register_handler_registry(self.handler_registry)
+        self.llm = MagicMock(spec=LLMInterface)
+        services.register_llm_interface(self.llm)
+
+        self.search_ran = threading.Event()
+
+        def search(input_data):
+            self.search_ran.set()
+            return {"success": True, "result": f"results for {input_data['query']}"}
+
+        self.tool_registry.register_tool("mock_search", search)
+        self.handler_registry.register_handler(
+            "mock_summarize", lambda task, data: {"success": True, "result": f"summary of {data['content']}"}
+        )
+        self.task = MagicMock(spec=DirectHandlerTask)
+        self.task.id = "think_analyze_plan"
+
+    def tearDown(self):
+        """Reset the services container."""
+        reset_services()
+
+    def _stream_plan(self, chunks):
+        self.llm.stream_llm_call.side_effect = lambda **kwargs: ResponseStream.from_iterable(chunks())
+
+    def _run(self):
+        return plan_user_request_handler(self.task, {
+            "user_request": "Research project Dawn",
+            "skip_ambiguity_check": True,
+            "execute_incrementally": True,
+        })
+
+    def test_first_step_runs_while_plan_streams(self):
+        """The first step executes before the second is generated; dependents get its output."""
+        search_ran_early = []
+
+        def chunks():
+            yield "[" + json.dumps(SEARCH_STEP) + ","
+            # The rest of the plan only streams once the first step has executed
+            search_ran_early.append(self.search_ran.wait(5))
+            yield json.dumps(SUMMARIZE_STEP) + "]"
+
+        self._stream_plan(chunks)
+        result = self._run()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(search_ran_early, [True])
+        self.llm.execute_llm_call.assert_not_called()
+        outputs = {o["task_id"]: o for o in result["result"]["execution_results"]["outputs"]}
+        self.assertEqual(outputs["summarize_step"]["result"], "summary of results for project Dawn")
+        self.assertEqual([s["step_id"] for s in result["result"]["validated_plan"]], ["search_step", "summarize_step"])
+        self.assertIsNotNone(result["result"]["time_to_first_step"])
+
+    def test_invalid_step_skips_dependents(self):
+        """A step failing validation is not run and the steps depending on it are skipped."""
+        invalid = dict(SEARCH_STEP, type="script")
+        self._stream_plan(lambda: iter([json.dumps([invalid, SUMMARIZE_STEP])]))
+
+        result = self._run()["result"]
+
+        self.assertFalse(self.search_ran.is_set())
+        self.assertEqual(len(result["validation_errors"]), 1)
+        outputs = {o["task_id"]: o for o in result["execution_results"]["outputs"]}
+        self.assertEqual(outputs["summarize_step"]["status"], "skipped")
+
+    def test_missing_dependency_is_skipped(self):
+        """Steps whose dependencies never appear in the plan are skipped at the end."""
+        orphan = dict(SUMMARIZE_STEP, depends_on=["never_generated"])
+        self._stream_plan(lambda: iter([json.dumps([orphan])]))
+
+        outputs = self._run()["result"]["execution_results"]["outputs"]
+
+        self.assertEqual(outputs, [{"task_id": "summarize_step", "success": False, "status": "skipped",
+                                    "error": "Unmet dependencies or cycle."}])
+
+
+if __name__ == "__main__":
+    unittest.main()
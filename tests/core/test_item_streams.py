@@ -0,0 +1,190 @@
+"""
+Tests for streaming generator tasks in the asynchronous engine.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.item_stream import ItemStream
+from core.llm.interface import LLMInterface
+from core.task import DirectHandlerTask, Task
+from core.tools.registry import ToolRegistry
+from core.workflow import Workflow
+
+DOCUMENTS = [f"document {i}" for i in range(6)]
+
+
+class TestItemStream(unittest.TestCase):
+    """Test backpressure and error propagation of item streams."""  # noqa: D202
+
+    def test_producer_waits_for_consumer(self):
+        """A producer never runs more than its buffer ahead of the consumer."""
+        produced = []
+
+        async def run():
+            async def numbers():
+                for i in range(10):
+                    produced.append(i)
+                    yield i
+
+            stream = ItemStream(numbers(), maxsize=2, name="numbers").start()
+            stream.claim()
+            leads = []
+            async for item in stream:
+                await asyncio.sleep(0)
+                leads.append(len(produced) - (item + 1))
+            return leads, await stream.finish()
+
+        leads, result = asyncio.run(run())
+
+        self.assertLessEqual(max(leads), 3)  # Buffered items plus the one being put
+        self.assertEqual(result, list(range(10)))
+
+    def test_producer_error_reaches_consumer(self):
+        """An error raised by the generator ends the consumer's iteration with that error."""
+        def failing():
+            yield "first"
+            raise IOError("disk read failed")
+
+        async def run():
+            stream = ItemStream(failing(), name="failing").start()
+            return [item async for item in stream]
+
+        with self.assertRaises(IOError):
+            asyncio.run(run())
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    """Test read -> chunk -> summarize -> write pipelines in AsyncWorkflowEngine."""  # noqa: D202
+
+    def setUp(self):
+        """Create a tool registry with a summarize tool consuming a stream from a worker thread."""
+        self.events = []
+        self.tool_registry = ToolRegistry()
+
+        def summarize(data):
+            for chunk in data["chunks"]:  # Synchronous iteration in a worker thread
+                yield chunk.upper()
+
+        self.tool_registry.register_tool("summarize", summarize)
+
+    def _run(self, *tasks):
+        workflow = Workflow(workflow_id="pipeline", name="Pipeline")
+        for task in tasks:
+            workflow.add_task(task)
+        engine = AsyncWorkflowEngine(
+            workflow=workflow, llm_interface=MagicMock(spec=LLMInterface), tool_registry=self.tool_registry
+        )
+        return asyncio.run(engine.async_run()), workflow
+
+    def _reader(self, documents=DOCUMENTS, **kwargs):
+        async def read(task, data):
+            for document in documents:
+                self.events.append(("read", document))
+                await asyncio.sleep(0)
+                yield document
+
+        return DirectHandlerTask(task_id="read", name="Read", handler=read, input_data={}, **kwargs)
+
+    def test_stages_overlap_and_outputs_are_aggregated(self):
+        """The writer starts before reading finishes; each producer's items end up in its output."""
+        async def chunk(task, data):
+            async for document in data["documents"]:
+                for part in ("head", "tail"):
+                    yield f"{document} {part}"
+
+        async def write(task, data):
+            written = 0
+            async for summary in data["summaries"]:
+                self.events.append(("write", summary))
+                written += 1
+            return {"success": True, "result": written}
+
+        result, workflow = self._run(
+            self._reader(stream_buffer=1, stream_aggregate="list", next_task_id_on_success="chunk"),
+            DirectHandlerTask(task_id="chunk", name="Chunk", handler=chunk, accepts_stream=True, stream_buffer=1,
+                              stream_aggregate="count", input_data={"documents": "${read.output_data.item_stream}"},
+                              next_task_id_on_success="summarize"),
+            Task(task_id="summarize", name="Summarize", tool_name="summarize", accepts_stream=True, stream_buffer=1,
+                 stream_aggregate="list", input_data={"chunks": "${chunk.output_data.item_stream}"},
+                 next_task_id_on_success="write"),
+            DirectHandlerTask(task_id="write", name="Write", handler=write, accepts_stream=True,
+                              input_data={"summaries": "${summarize.output_data.item_stream}"}),
+        )
+
+        self.assertEqual(result["status"], "completed")
+        first_write = self.events.index(("write", "DOCUMENT 0 HEAD"))
+        last_read = self.events.index(("read", DOCUMENTS[-1]))
+        self.assertLess(first_write, last_read)
+        self.assertEqual(workflow.tasks["read"].output_data["result"], DOCUMENTS)
+        self.assertEqual(workflow.tasks["chunk"].output_data["result"], 12)
+        self.assertEqual(workflow.tasks["summarize"].output_data["result"][-1], "DOCUMENT 5 TAIL")
+        self.assertEqual(workflow.tasks["write"].output_data["result"], 12)
+        self.assertNotIn("item_stream", workflow.tasks["read"].output_data)
+
+    def test_non_stream_consumer_waits_for_aggregated_items(self):
+        """A task reading a producer's result waits for it; later stream consumers get a replay."""
+        async def count_later(task, data):
+            return {"success": True, "result": len([item async for item in data["documents"]])}
+
+        result, workflow = self._run(
+            self._reader(stream_aggregate="list", next_task_id_on_success="total"),
+            DirectHandlerTask(task_id="total", name="Total", handler=lambda task, data: len(data["documents"]),
+                              input_data={"documents": "${read.output_data.result}"}, next_task_id_on_success="later"),
+            DirectHandlerTask(task_id="later", name="Later", handler=count_later, accepts_stream=True,
+                              input_data={"documents": "${read.output_data.item_stream}"}),
+        )
+
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(workflow.tasks["total"].output_data["result"], len(DOCUMENTS))
+        self.assertEqual(workflow.tasks["later"].output_data["result"], len(DOCUMENTS))
+
+    def test_items_are_counted_unless_listing_is_requested(self):
+        """By default a producer keeps only the number of its items; invalid modes fail at definition."""
+        result, workflow = self._run(self._reader())
+
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(workflow.tasks["read"].output_data["result"], len(DOCUMENTS))
+        with self.assertRaises(ValueError):
+            self._reader(stream_aggregate="all")
+
+    def test_consumer_failure_cancels_producer(self):
+        """When a consumer fails, the workflow fails and the producer's generator is closed."""
+        closed = []
+
+        async def endless(task, data):
+            try:
+                i = 0
+                while True:
+                    i += 1
+                    yield i
+            finally:
+                closed.append(True)
+
+        async def fail_on_third(task, data):
+            async for item in data["numbers"]:
+                if item == 3:
+                    raise ValueError("bad record")
+            return {"success": True}
+
+        result, workflow = self._run(
+            DirectHandlerTask(task_id="numbers", name="Numbers", handler=endless, input_data={},
+                              stream_buffer=2, next_task_id_on_success="consume"),
+            DirectHandlerTask(task_id="consume", name="Consume", handler=fail_on_third, accepts_stream=True,
+                              input_data={"numbers": "${numbers.output_data.item_stream}"}),
+        )
+
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(workflow.tasks["consume"].status, "failed")
+        self.assertEqual(closed, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for lazy imports, deferred tool registration and the core import-time budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.handlers.registry import HandlerRegistry
+from core.services import ServicesContainer
+from core.tools.registry import ToolRegistry
+from core.utils.lazy_import import LazyCallable, import_string, module_available
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# Importing the engines and building the core services must stay below this
+# budget (seconds). The measured cost is well under a tenth of it.
+IMPORT_TIME_BUDGET = 0.5
+
+# Modules that should only be imported once a tool or LLM call needs them
+HEAVY_MODULES = ["openai", "dotenv", "httpx", "jsonschema", "tools.file_read_tool", "tools.web_search_tool"]
+
+_COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import core.engine
+import core.async_workflow_engine
+from core.services import get_services
+services = get_services()
+services.initialize()
+_ = services.handler_registry
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test lazy import helpers and deferred registration."""  # noqa: D202
+
+    def test_import_string(self):
+        """Import strings resolve modules and dotted attributes."""
+        self.assertIs(import_string("os.path:join"), os.path.join)
+        self.assertIs(import_string("core.tools.registry:ToolRegistry.get_tool"), ToolRegistry.get_tool)
+        with self.assertRaises(ImportError):
+            import_string("os.path.join")
+        with self.assertRaises(ImportError):
+            import_string("os.path:does_not_exist")
+
+    def test_module_available(self):
+        """Module availability is checked without failing on missing modules."""
+        self.assertTrue(module_available("os.path:join"))
+        self.assertFalse(module_available("no_such_package.module:func"))
+
+    def test_lazy_tool_resolved_on_first_use(self):
+        """Lazily declared tools are imported on first retrieval and executed normally."""
+        registry = ToolRegistry()
+        registry.register_lazy_tool("json_dump", "json:dumps")
+        self.assertIsInstance(registry.tools["json_dump"], LazyCallable)
+
+        self.assertIs(registry.get_tool("json_dump"), json.dumps)
+        self.assertIs(registry.tools["json_dump"], json.dumps)
+
+    def test_lazy_tool_signature_drives_execution(self):
+        """execute_tool sees the real signature of a lazy tool."""
+        registry = ToolRegistry()
+        registry.tools["echo"] = LazyCallable("tests.core.test_lazy_imports:_echo_tool")
+        result = registry.execute_tool("echo", {"value": 3})
+        self.assertTrue(result["success"])
+        self.assertEqual(result["result"], {"value": 3})
+
+    def test_lazy_handler_resolved_on_first_use(self):
+        """Lazily declared handlers are imported on first retrieval."""
+        registry = HandlerRegistry()
+        registry.register_lazy_handler("echo", "tests.core.test_lazy_imports:_echo_tool")
+        self.assertTrue(registry.handler_exists("echo"))
+        self.assertEqual(registry.execute_handler("echo", {"a": 1}), {"a": 1})
+        self.assertIs(registry.get_handler("echo"), _echo_tool)
+
+    def test_lazy_handler_signature_checked_on_first_use(self):
+        """The signature check of register_handler runs when a lazy handler is first resolved."""
+        registry = HandlerRegistry()
+        with self.assertNoLogs("core.handlers.registry", level="WARNING"):
+            registry.register_lazy_handler("copy", "shutil:copyfile")
+        with self.assertLogs("core.handlers.registry", level="WARNING") as logs:
+            registry.get_handler("copy")
+        self.assertIn("has 3 parameters", logs.output[0])
+
+    def test_tool_registry_is_deferred(self):
+        """The services container only builds the tool registry when requested."""
+        container = ServicesContainer()
+        container.initialize()
+        entry = container._services["tool_registry"]
+        self.assertIsNone(entry._instance)
+        self.assertIsInstance(container.get_service("tool_registry"), ToolRegistry)
+        self.assertIsNotNone(entry._instance)
+
+    def test_cold_start_budget(self):
+        """Importing the core stays within budget and loads no tool SDKs."""
+        output = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT % (HEAVY_MODULES,)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+
+        self.assertEqual(report["loaded"], [])
+        self.assertLess(report["elapsed"], IMPORT_TIME_BUDGET)
+
+
+def _echo_tool(input_data):
+    return input_data
+
+
+if __name__ == "__main__":
+    unittest.main()
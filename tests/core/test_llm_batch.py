@@ -0,0 +1,197 @@
+"""
+Tests for the offline batch mode of LLM calls.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.engine import WorkflowEngine
+from core.llm.batch import BatchSpool, LocalBatchService, request_id
+from core.llm.interface import LLMInterface
+from core.task import DirectHandlerTask, Task
+from core.tools.registry import ToolRegistry
+from core.workflow import Workflow
+
+
+def chat_body(prompt):
+    """Build a chat completion request body."""
+    return {"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}]}
+
+
+class TestBatchSpool(unittest.TestCase):
+    """Test spooling, submission and result collection against the local service."""  # noqa: D202
+
+    def setUp(self):
+        """Create a spool directory and a local batch service."""
+        self.spool_dir = tempfile.mkdtemp()
+        self.service = LocalBatchService()
+        self.spool = BatchSpool(self.spool_dir, client=self.service, fsync=False)
+
+    def tearDown(self):
+        """Remove the spool directory."""
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def test_requests_are_deduplicated_and_answered(self):
+        """Identical requests are submitted once; every caller receives the batch result."""
+        first = self.spool.request(chat_body("Summarize Q1"))
+        self.assertTrue(first["suspended"])
+        self.assertEqual(first["batch_status"], "pending")
+        self.spool.request(chat_body("Summarize Q1"))
+        self.spool.request(chat_body("Summarize Q2"))
+        self.assertEqual(self.spool.pending_count(), 2)
+
+        self.assertEqual(len(self.spool.submit()), 1)
+        self.assertEqual(self.spool.request(chat_body("Summarize Q1"))["batch_status"], "submitted")
+        self.assertEqual(self.spool.poll()["in_progress"], 1)
+
+        self.service.process()
+        self.assertEqual(self.spool.poll()["completed"], 2)
+        self.assertEqual(self.spool.outstanding_count(), 0)
+        result = self.spool.request(chat_body("Summarize Q1"))
+        self.assertEqual(result, {"success": True, "response": "Batch reply to: Summarize Q1", "annotations": [],
+                                  "batch_request_id": request_id(chat_body("Summarize Q1"))})
+
+    def test_state_survives_a_new_process(self):
+        """A spool reopened on the same directory knows pending, submitted and answered requests."""
+        self.spool.request(chat_body("Answered"))
+        self.spool.submit()
+        self.spool.request(chat_body("Still pending"))
+
+        reopened = BatchSpool(self.spool_dir, client=self.service, fsync=False)
+        self.assertEqual(reopened.pending_count(), 1)
+        self.assertEqual(reopened.outstanding_count(), 1)
+
+        self.service.process()
+        reopened.poll()
+        self.assertTrue(BatchSpool(self.spool_dir, fsync=False).request(chat_body("Answered"))["success"])
+
+    def test_failed_requests_report_their_error(self):
+        """Errors of individual requests are returned as failed results."""
+        def responder(body):
+            raise ValueError("context length exceeded")
+
+        spool = BatchSpool(self.spool_dir, client=LocalBatchService(responder), fsync=False)
+        spool.request(chat_body("Too long"))
+        spool.submit()
+        spool.client.process()
+        self.assertEqual(spool.poll()["failed"], 1)
+
+        result = spool.request(chat_body("Too long"))
+        self.assertFalse(result["success"])
+        self.assertIn("context length exceeded", result["error"])
+
+    def test_interface_spools_instead_of_calling_the_model(self):
+        """In batch mode execute_llm_call suspends and never calls the API."""
+        llm = LLMInterface(api_key="test-key", model="gpt-4o", batch_spool=self.spool)
+        llm.client = MagicMock()
+
+        result = llm.execute_llm_call("Write the report")
+
+        self.assertTrue(result["suspended"])
+        llm.client.chat.completions.create.assert_not_called()
+        self.assertEqual(self.spool.pending_count(), 1)
+
+
+class TestBatchWorkflow(unittest.TestCase):
+    """Test that both engines suspend LLM tasks and resume them once results arrive."""  # noqa: D202
+
+    def setUp(self):
+        """Create a spool and an LLM interface in batch mode."""
+        self.spool_dir = tempfile.mkdtemp()
+        self.service = LocalBatchService(lambda body: "Sales grew 12%.")
+        self.spool = BatchSpool(self.spool_dir, client=self.service, fsync=False)
+        self.llm = LLMInterface(api_key="test-key", model="gpt-4o", batch_spool=self.spool)
+        self.prepare_calls = 0
+
+    def tearDown(self):
+        """Remove the spool directory."""
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def _build_workflow(self, reference_prefix, stream=False):
+        def prepare(task, data):
+            self.prepare_calls += 1
+            return {"success": True, "result": "Q1 sales figures"}
+
+        def count_words(task, data):
+            return {"success": True, "result": len(data["text"].split())}
+
+        workflow = Workflow(workflow_id="batch", name="Batch Workflow")
+        workflow.add_task(DirectHandlerTask(
+            task_id="prepare", name="Prepare", handler=prepare, input_data={}, next_task_id_on_success="generate",
+        ))
+        workflow.add_task(Task(
+            task_id="generate", name="Generate", is_llm_task=True,
+            input_data={"prompt": f"Summarize ${{prepare.{reference_prefix}result}}"}, next_task_id_on_success="count",
+            stream=stream,
+        ))
+        workflow.add_task(DirectHandlerTask(
+            task_id="count", name="Count", handler=count_words,
+            input_data={"text": f"${{generate.{reference_prefix}response}}"},
+        ))
+        return workflow
+
+    def _complete_batch(self):
+        self.spool.submit()
+        self.service.process()
+        self.spool.poll()
+
+    def _assert_resumed(self, result, workflow):
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["suspended_tasks"], [])
+        self.assertEqual(workflow.tasks["generate"].output_data["response"], "Sales grew 12%.")
+        self.assertEqual(workflow.tasks["count"].output_data["result"], 3)
+        self.assertEqual(self.prepare_calls, 1)
+
+    def test_sync_engine_suspends_and_resumes(self):
+        """The run stops at the LLM task and continues from it after the batch completes."""
+        workflow = self._build_workflow("")
+        engine = WorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+
+        result = engine.run()
+
+        self.assertEqual(result["status"], "suspended")
+        self.assertEqual(result["suspended_tasks"], ["generate"])
+        self.assertEqual(workflow.tasks["count"].status, "pending")
+        self.assertEqual(engine.resume()["status"], "suspended")  # Not submitted yet
+
+        self._complete_batch()
+        self._assert_resumed(engine.resume(), workflow)
+
+    def test_streamed_tasks_are_spooled_too(self):
+        """In batch mode both engines spool streamed LLM tasks instead of calling the API live."""
+        self.llm.client = MagicMock()
+        workflow = self._build_workflow("", stream=True)
+        sync_result = WorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry()).run()
+        workflow = self._build_workflow("output_data.", stream=True)
+        engine = AsyncWorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+        async_result = asyncio.run(engine.async_run())
+
+        self.assertEqual(sync_result["suspended_tasks"], ["generate"])
+        self.assertEqual(async_result["suspended_tasks"], ["generate"])
+        self.llm.client.chat.completions.create.assert_not_called()
+
+    def test_async_engine_suspends_and_resumes(self):
+        """The asynchronous engine suspends the same way and reuses completed tasks on resume."""
+        workflow = self._build_workflow("output_data.")
+        engine = AsyncWorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+
+        result = asyncio.run(engine.async_run())
+
+        self.assertEqual(result["status"], "suspended")
+        self.assertEqual(result["suspended_tasks"], ["generate"])
+
+        self._complete_batch()
+        self._assert_resumed(asyncio.run(engine.async_resume()), workflow)
+
+
+if __name__ == "__main__":
+    unittest.main()
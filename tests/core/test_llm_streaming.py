@@ -0,0 +1,190 @@
+"""
+Tests for streaming LLM responses to downstream tasks.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.engine import WorkflowEngine
+from core.llm.interface import LLMInterface
+from core.llm.streaming import ResponseStream
+from core.task import DirectHandlerTask, Task
+from core.tools.registry import ToolRegistry
+from core.workflow import Workflow
+
+CHUNKS = ["# Report\n", "Sales grew ", "12%."]
+
+
+def gated_chunks(gate, error=None):
+    """Yield the first chunk, then wait for gate before yielding the rest."""
+    yield CHUNKS[0]
+    gate.wait(5)
+    yield from CHUNKS[1:]
+    if error is not None:
+        raise error
+
+
+def chunk_event(content):
+    """Build a chat completion chunk carrying content."""
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+class TestResponseStream(unittest.TestCase):
+    """Test replay, blocking and error propagation of response streams."""  # noqa: D202
+
+    def test_consumers_replay_every_chunk(self):
+        """Sync and async consumers both see the full stream, before and after it ends."""
+        gate = threading.Event()
+        stream = ResponseStream.from_iterable(gated_chunks(gate))
+        chunks = iter(stream)
+
+        self.assertEqual(next(chunks), CHUNKS[0])
+        self.assertFalse(stream.done)
+        gate.set()
+        self.assertEqual(list(chunks), CHUNKS[1:])
+
+        async def collect():
+            return [chunk async for chunk in stream]
+
+        self.assertEqual(asyncio.run(collect()), CHUNKS)
+        self.assertEqual(stream.result(), "".join(CHUNKS))
+        self.assertIsNotNone(stream.time_to_first_chunk)
+
+    def test_producer_error_reaches_consumers(self):
+        """An error raised by the producer ends iteration and result() with that error."""
+        gate = threading.Event()
+        gate.set()
+        stream = ResponseStream.from_iterable(gated_chunks(gate, ConnectionError("stream reset")))
+
+        with self.assertRaises(ConnectionError):
+            list(stream)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(stream.text())
+
+
+class TestStreamLLMCall(unittest.TestCase):
+    """Test that LLMInterface streams completion deltas."""  # noqa: D202
+
+    def test_deltas_are_streamed(self):
+        """Each non-empty delta becomes a chunk of the stream."""
+        llm = LLMInterface(api_key="test-key", model="gpt-4o")
+        llm.client = MagicMock()
+        llm.client.chat.completions.create.return_value = iter(
+            [chunk_event(CHUNKS[0]), chunk_event(None), chunk_event(CHUNKS[1]), chunk_event(CHUNKS[2])]
+        )
+
+        stream = llm.stream_llm_call("Write the report")
+
+        self.assertEqual(list(stream), CHUNKS)
+        self.assertTrue(llm.client.chat.completions.create.call_args.kwargs["stream"])
+
+
+class TestStreamingWorkflow(unittest.TestCase):
+    """Test streamed responses flowing through both engines."""  # noqa: D202
+
+    def setUp(self):
+        """Create an output directory and an LLM interface returning a gated stream."""
+        self.output_dir = tempfile.mkdtemp()
+        self.report_path = os.path.join(self.output_dir, "report.md")
+        self.gate = threading.Event()
+        self.llm = MagicMock(spec=LLMInterface)
+        self.llm.stream_llm_call.side_effect = lambda prompt, **kwargs: ResponseStream.from_iterable(
+            gated_chunks(self.gate)
+        )
+        self.written_before_end = None
+
+    def tearDown(self):
+        """Remove the output directory."""
+        self.gate.set()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _build_workflow(self, reference_prefix):
+        def count_words(task, data):
+            return {"success": True, "result": len(data["text"].split())}
+
+        def watch_report():
+            # Record what the writer has flushed while the model is still blocked
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and not self.gate.is_set():
+                if os.path.exists(self.report_path):
+                    with open(self.report_path, encoding="utf-8") as f:
+                        content = f.read()
+                    if content:
+                        self.written_before_end = content
+                        break
+                time.sleep(0.005)
+            self.gate.set()
+
+        workflow = Workflow(workflow_id="streaming", name="Streaming Workflow")
+        workflow.add_task(Task(
+            task_id="generate", name="Generate", is_llm_task=True, stream=True,
+            input_data={"prompt": "Write the sales report"}, next_task_id_on_success="write",
+        ))
+        workflow.add_task(Task(
+            task_id="write", name="Write", tool_name="write_markdown", accepts_stream=True,
+            input_data={"file_path": self.report_path, "content": f"${{generate.{reference_prefix}response_stream}}"},
+            next_task_id_on_success="count",
+        ))
+        workflow.add_task(DirectHandlerTask(
+            task_id="count", name="Count", handler=count_words,
+            input_data={"text": f"${{generate.{reference_prefix}response}}"},
+        ))
+        threading.Thread(target=watch_report, daemon=True).start()
+        return workflow
+
+    def _assert_streamed(self, result, workflow):
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(self.written_before_end, CHUNKS[0])
+        with open(self.report_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "".join(CHUNKS))
+        generate = workflow.tasks["generate"].output_data
+        self.assertEqual(generate["response"], "".join(CHUNKS))
+        self.assertNotIn("response_stream", generate)
+        self.assertEqual(workflow.tasks["count"].output_data["result"], 5)
+
+    def test_sync_engine_streams_to_writer(self):
+        """The writer receives chunks before the model finishes; other tasks get the full response."""
+        workflow = self._build_workflow("")
+        engine = WorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+
+        self._assert_streamed(engine.run(), workflow)
+
+    def test_async_engine_streams_to_writer(self):
+        """The asynchronous engine resolves output_data references to the same stream."""
+        workflow = self._build_workflow("output_data.")
+        engine = AsyncWorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+
+        self._assert_streamed(asyncio.run(engine.async_run()), workflow)
+
+    def test_stream_error_fails_workflow(self):
+        """A stream that breaks marks its task and the workflow failed."""
+        self.gate.set()
+        self.llm.stream_llm_call.side_effect = lambda prompt, **kwargs: ResponseStream.from_iterable(
+            gated_chunks(self.gate, ConnectionError("stream reset"))
+        )
+        workflow = Workflow(workflow_id="streaming", name="Streaming Workflow")
+        workflow.add_task(Task(
+            task_id="generate", name="Generate", is_llm_task=True, stream=True,
+            input_data={"prompt": "Write the sales report"},
+        ))
+        engine = WorkflowEngine(workflow=workflow, llm_interface=self.llm, tool_registry=ToolRegistry())
+
+        result = engine.run()
+
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(workflow.tasks["generate"].status, "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Tests for MapTask: bounded-concurrency mapping of tools, handlers and prompts over lists.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.handlers.registry import HandlerRegistry
+from core.llm.interface import LLMInterface
+from core.task import DirectHandlerTask, MapTask
+from core.tools.registry import ToolRegistry
+from core.workflow import Workflow
+
+COUNTRIES = ["Canada", "Mexico", "Japan", "Brazil", "India", "Kenya", "Chile"]
+
+
+class TestMapTask(unittest.TestCase):
+    """Test MapTask execution through the asynchronous engine."""  # noqa: D202
+
+    def setUp(self):
+        """Register an instrumented tool and handler."""
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+        def tariff_lookup(data):
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                self.calls.append(data["country"])
+            time.sleep(0.02)
+            with self.lock:
+                self.in_flight -= 1
+            if data["country"] in data.get("unsupported", []):
+                raise ValueError(f"No tariff data for {data['country']}")
+            return {"success": True, "result": f"{data['country']}: {len(data['country'])}%"}
+
+        self.tool_registry = ToolRegistry()
+        self.tool_registry.register_tool("tariff_lookup", tariff_lookup)
+        self.handler_registry = HandlerRegistry()
+        self.llm = MagicMock(spec=LLMInterface)
+
+    def _run(self, *tasks):
+        workflow = Workflow(workflow_id="map", name="Map Workflow")
+        for task in tasks:
+            workflow.add_task(task)
+        engine = AsyncWorkflowEngine(
+            workflow=workflow,
+            llm_interface=self.llm,
+            tool_registry=self.tool_registry,
+            handler_registry=self.handler_registry,
+        )
+        result = asyncio.run(engine.async_run())
+        return result, workflow
+
+    def test_tool_is_mapped_with_bounded_concurrency(self):
+        """Items from an upstream task run at most max_concurrency at a time; results keep item order."""
+        countries = DirectHandlerTask(
+            task_id="countries", name="Countries", handler=lambda data: {"success": True, "result": COUNTRIES},
+            input_data={}, next_task_id_on_success="tariffs",
+        )
+        tariffs = MapTask(
+            task_id="tariffs", name="Tariffs", item_tool="tariff_lookup", item_key="country", max_concurrency=3,
+            input_data={"items": "${countries.output_data.result}"},
+        )
+
+        result, workflow = self._run(countries, tariffs)
+
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(workflow.tasks["tariffs"].output_data["result"], [f"{c}: {len(c)}%" for c in COUNTRIES])
+        self.assertEqual(self.peak, 3)
+
+    def test_chunks_use_the_batch_entry_point(self):
+        """With chunk_size, consecutive items are sent to the tool's batch entry point together."""
+        batches = []
+
+        def lookup_batch(inputs):
+            batches.append([data["country"] for data in inputs])
+            return [{"success": True, "result": data["country"].upper()} for data in inputs]
+
+        self.tool_registry.register_batch_tool("tariff_lookup", lookup_batch)
+        task = MapTask(
+            task_id="tariffs", name="Tariffs", item_tool="tariff_lookup", item_key="country", chunk_size=3,
+            input_data={"items": COUNTRIES},
+        )
+
+        _, workflow = self._run(task)
+
+        self.assertEqual(batches, [COUNTRIES[0:3], COUNTRIES[3:6], COUNTRIES[6:]])
+        self.assertEqual(workflow.tasks["tariffs"].output_data["result"], [c.upper() for c in COUNTRIES])
+
+    def test_failed_items_are_retried(self):
+        """A handler failing once for an item succeeds on its retry."""
+        attempts = {}
+
+        def analyze_clause(data):
+            clause = data["clause"]
+            attempts[clause] = attempts.get(clause, 0) + 1
+            if clause == "termination" and attempts[clause] == 1:
+                raise TimeoutError("model timed out")
+            return {"success": True, "result": f"{clause}: ok"}
+
+        self.handler_registry.register_handler("analyze_clause", analyze_clause)
+        task = MapTask(
+            task_id="clauses", name="Clauses", item_handler="analyze_clause", item_key="clause", item_retries=1,
+            input_data={"items": ["payment", "termination", "liability"]},
+        )
+
+        result, workflow = self._run(task)
+
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(attempts, {"payment": 1, "termination": 2, "liability": 1})
+        self.assertEqual(workflow.tasks["clauses"].output_data["result"][1], "termination: ok")
+
+    def test_failure_policies(self):
+        """continue keeps going and succeeds; fail_at_end fails after every item; fail_fast stops early."""
+        inputs = {"items": COUNTRIES, "unsupported": ["Mexico"]}
+
+        _, workflow = self._run(MapTask(task_id="m", name="m", item_tool="tariff_lookup", item_key="country",
+                                        failure_policy="continue", input_data=inputs))
+        output = workflow.tasks["m"].output_data
+        self.assertEqual(workflow.status, "completed")
+        self.assertIsNone(output["result"][1])
+        self.assertEqual(output["metadata"]["item_errors"][0]["index"], 1)
+        self.assertIn("No tariff data for Mexico", output["metadata"]["item_errors"][0]["error"])
+
+        result, workflow = self._run(MapTask(task_id="m", name="m", item_tool="tariff_lookup", item_key="country",
+                                             input_data=inputs))
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(workflow.tasks["m"].output_data["result"][0], "Canada: 6%")
+        self.assertIn("1 of 7 items failed", workflow.tasks["m"].output_data["error"])
+
+        self.calls = []
+        _, workflow = self._run(MapTask(task_id="m", name="m", item_tool="tariff_lookup", item_key="country",
+                                        max_concurrency=1, failure_policy="fail_fast", input_data=inputs))
+        self.assertEqual(self.calls, ["Canada", "Mexico"])
+        self.assertEqual(workflow.tasks["m"].output_data["metadata"]["failed_items"], len(COUNTRIES) - 1)
+
+    def test_prompt_template_is_rendered_per_item(self):
+        """LLM items render ${item.field} and ${index} and return responses in order."""
+        self.llm.execute_llm_call.side_effect = lambda prompt, **kwargs: {"success": True, "response": prompt.upper()}
+        task = MapTask(
+            task_id="summaries", name="Summaries", item_prompt="#${index} Summarize tariffs for ${item.country}",
+            input_data={"items": [{"country": "Chile"}, {"country": "Kenya"}]},
+        )
+
+        _, workflow = self._run(task)
+
+        self.assertEqual(workflow.tasks["summaries"].output_data["response"],
+                         ["#0 SUMMARIZE TARIFFS FOR CHILE", "#1 SUMMARIZE TARIFFS FOR KENYA"])
+
+    def test_item_suspended_on_retry_suspends_the_task(self):
+        """An item that fails and is then queued for an LLM batch suspends the task without counting as failed."""
+        attempts = []
+
+        def execute_llm_call(prompt, **kwargs):
+            attempts.append(prompt)
+            if prompt == "Summarize Chile" and len(attempts) <= 2:
+                return {"success": False, "error": "rate limited"}
+            if prompt == "Summarize Chile":
+                return {"success": False, "suspended": True}
+            return {"success": True, "response": prompt}
+
+        self.llm.execute_llm_call.side_effect = execute_llm_call
+        task = MapTask(
+            task_id="summaries", name="Summaries", item_prompt="Summarize ${item}", item_retries=3,
+            max_concurrency=1, input_data={"items": ["Kenya", "Chile"]},
+        )
+
+        _, workflow = self._run(task)
+
+        output = workflow.tasks["summaries"].output_data
+        self.assertEqual(workflow.status, "suspended")
+        self.assertEqual(attempts.count("Summarize Chile"), 2)
+        self.assertEqual(output["metadata"]["failed_items"], 0)
+
+    def test_requires_a_single_target(self):
+        """A MapTask must name exactly one of a tool, a handler or a prompt."""
+        with self.assertRaises(ValueError):
+            MapTask(task_id="m", name="m", item_tool="tariff_lookup", item_handler="analyze_clause")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for hedged requests and concurrent connections of the MCP client.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+import unittest
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.mcp.client import HEDGE_MIN_SAMPLES, MCPClient, MCPService
+
+
+class StubServer:
+    """MCP server on localhost whose /health and /execute responses are delayed as configured."""  # noqa: D202
+
+    def __init__(self, health_delay=0.0, execute_delays=None):
+        self.health_delay = health_delay
+        self.health_status = 200
+        self.execute_delays = list(execute_delays or [])
+        self.executed = 0
+        self.runner = None
+        self.url = None
+
+    async def _health(self, request):
+        await asyncio.sleep(self.health_delay)
+        return web.json_response({"status": "ok"}, status=self.health_status)
+
+    async def _execute(self, request):
+        self.executed += 1
+        await asyncio.sleep(self.execute_delays.pop(0) if self.execute_delays else 0.0)
+        return web.json_response({"result": self.executed, "status": "success"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_post("/execute", self._execute)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def unused_url():
+    """Return the URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+class TestHedgedRequests(unittest.TestCase):
+    """Test the hedge delay and the hedged execution path of MCPClient."""  # noqa: D202
+
+    def test_hedge_delay_needs_samples_and_respects_the_minimum(self):
+        """No hedging before enough samples; then the quantile latency, never below hedge_min_delay."""
+        client = MCPClient("http://mcp", hedge_tools=["search"], hedge_quantile=0.9, hedge_min_delay=0.05)
+        for latency in range(1, HEDGE_MIN_SAMPLES):
+            client._record_latency("search", latency / 100)
+        self.assertIsNone(client.hedge_delay("search"))
+
+        client._record_latency("search", 0.2)
+        self.assertAlmostEqual(client.hedge_delay("search"), 0.18)
+
+        client._latencies["search"].clear()
+        for _ in range(HEDGE_MIN_SAMPLES):
+            client._record_latency("search", 0.001)
+        self.assertEqual(client.hedge_delay("search"), 0.05)
+
+    def _call(self, execute_delays, calls=1):
+        """Call a hedged tool on a stub server after priming its latency at 20 ms."""
+        async def run():
+            server = await StubServer(execute_delays=execute_delays).start()
+            client = MCPClient(server.url, hedge_tools=["search"], hedge_min_delay=0.01)
+            for _ in range(HEDGE_MIN_SAMPLES):
+                client._record_latency("search", 0.02)
+            try:
+                await client.connect()
+                started = time.monotonic()
+                results = [await client.call_tool("search", {"q": "x"}) for _ in range(calls)]
+                elapsed = time.monotonic() - started
+                return client, server, results, elapsed
+            finally:
+                await client.disconnect()
+                await server.stop()
+
+        return asyncio.run(run())
+
+    def test_slow_attempt_is_hedged(self):
+        """A second attempt is sent after the hedge delay and the first response wins."""
+        client, server, results, elapsed = self._call([1.0, 0.0])
+
+        self.assertEqual(results[0]["result"], 2)
+        self.assertEqual(server.executed, 2)
+        self.assertLess(elapsed, 0.5)
+        self.assertGreaterEqual(client._latencies["search"][-1], 0.02)
+
+    def test_fast_attempt_is_not_hedged(self):
+        """Attempts faster than the hedge delay are sent once."""
+        client, server, _, _ = self._call([0.0])
+
+        self.assertEqual(server.executed, 1)
+
+    def test_hedged_calls_keep_the_quantile_from_drifting_down(self):
+        """Attempts that lose to their hedge still count, so the hedge delay does not shrink."""
+        client, server, _, _ = self._call([0.3, 0.0] * 10, calls=10)
+
+        self.assertEqual(server.executed, 20)
+        self.assertGreaterEqual(client.hedge_delay("search"), 0.02)
+        self.assertTrue(all(latency >= 0.02 for latency in list(client._latencies["search"])[-10:]))
+
+
+class TestMCPServiceConnections(unittest.TestCase):
+    """Test concurrent connection and health checks across servers."""  # noqa: D202
+
+    def test_connect_all_and_health_check_all_run_concurrently(self):
+        """Slow servers are contacted in parallel over one connector; failures only affect their server."""
+        async def run():
+            slow = [await StubServer(health_delay=0.2).start() for _ in range(2)]
+            service = MCPService({"servers": {
+                "first": {"url": slow[0].url},
+                "second": {"url": slow[1].url},
+                "down": {"url": unused_url()},
+            }})
+            try:
+                started = time.monotonic()
+                connected = await service.connect_all()
+                connect_time = time.monotonic() - started
+                connectors = {id(client.connector) for client in service.clients.values()}
+
+                slow[1].health_status = 500
+                started = time.monotonic()
+                healthy = await service.health_check_all()
+                health_time = time.monotonic() - started
+            finally:
+                await service.disconnect_all()
+                for server in slow:
+                    await server.stop()
+            return connected, connect_time, connectors, healthy, health_time, service
+
+        connected, connect_time, connectors, healthy, health_time, service = asyncio.run(run())
+
+        self.assertEqual(connected, {"first": True, "second": True, "down": False})
+        self.assertLess(connect_time, 0.35)
+        self.assertEqual(len(connectors), 1)
+        self.assertEqual(healthy, {"first": True, "second": False, "down": False})
+        self.assertLess(health_time, 0.35)
+        self.assertIsNone(service.connector)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for running registry tools through the MCP gateway.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.handlers.registry import HandlerRegistry
+from core.mcp.executor import AdmissionError, ToolExecutor, ToolTimeoutError
+from core.mcp.service import MCPService, MCPServiceConfig, create_app
+from core.tools.registry import ToolRegistry
+
+API_KEY = "secret"
+AUTH = {"Authorization": f"Bearer {API_KEY}"}
+
+
+class RegistryTestCase(unittest.TestCase):
+    """Provide registries with an echo tool and a tool that blocks until released."""  # noqa: D202
+
+    def setUp(self):
+        """Register the tools; blocked calls are released on cleanup."""
+        self.gate = threading.Event()
+        self.addCleanup(self.gate.set)
+        self.tool_registry = ToolRegistry()
+        self.tool_registry.register_tool("echo", lambda data: {"success": True, "result": data["text"]})
+        self.tool_registry.register_tool("block", lambda data: {"success": self.gate.wait(5), "result": "done"})
+        self.tool_registry.register_tool("block_other", lambda data: {"success": self.gate.wait(5)})
+        self.handler_registry = HandlerRegistry()
+
+
+class TestRegistryExposure(RegistryTestCase):
+    """Test that registry tools are only served when enabled, authenticated and allowed."""  # noqa: D202
+
+    def _client(self, **options):
+        service = MCPService(MCPServiceConfig(**options), tool_registry=self.tool_registry,
+                             handler_registry=self.handler_registry)
+        self.addCleanup(service.executor.shutdown)
+        return TestClient(service.app)
+
+    def test_registry_tools_are_hidden_by_default(self):
+        """Without expose_registry_tools, registry tools are neither listed nor executed."""
+        client = self._client()
+
+        self.assertNotIn("write_markdown", [tool["name"] for tool in client.get("/tools").json()])
+        self.assertEqual(client.post("/execute", json={"tool": "echo", "parameters": {"text": "hi"}}).status_code, 404)
+
+    def test_exposing_registry_tools_requires_an_api_key(self):
+        """The service refuses to expose registry tools to unauthenticated callers."""
+        with self.assertRaises(ValueError):
+            MCPService(MCPServiceConfig(expose_registry_tools=True), tool_registry=self.tool_registry,
+                       handler_registry=self.handler_registry)
+
+    def test_allowlisted_tools_are_served_to_authenticated_callers(self):
+        """Only allowlisted tools are listed and run, and only with the API key."""
+        client = self._client(expose_registry_tools=True, api_key=API_KEY, registry_tools_allowlist=["echo"])
+        request = {"tool": "echo", "parameters": {"text": "hi"}}
+
+        self.assertEqual(client.post("/execute", json=request).status_code, 401)
+        response = client.post("/execute", json=request, headers=AUTH)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], "hi")
+        self.assertEqual([tool["name"] for tool in client.get("/tools", headers=AUTH).json()], ["echo"])
+        self.assertEqual(client.post("/execute", json={"tool": "write_markdown"}, headers=AUTH).status_code, 404)
+
+    def test_worker_processes_receive_the_api_key(self):
+        """create_app() applies the API key and log level that main.py passes to each worker."""
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config_file:
+            json.dump({"expose_registry_tools": True, "registry_tools_allowlist": []}, config_file)
+        self.addCleanup(os.remove, config_file.name)
+
+        with patch.dict(os.environ, {"MCP_CONFIG_PATH": config_file.name}):
+            with self.assertRaises(ValueError):
+                create_app()
+        with patch.dict(os.environ, {"MCP_CONFIG_PATH": config_file.name, "MCP_API_KEY": API_KEY,
+                                     "MCP_LOG_LEVEL": "WARNING"}):
+            app = create_app()
+
+        with TestClient(app) as client:  # Also runs the shutdown handler
+            self.assertEqual(client.get("/tools").status_code, 401)
+            self.assertEqual(client.get("/tools", headers=AUTH).status_code, 200)
+
+
+class TestToolExecutorAdmission(RegistryTestCase):
+    """Test concurrency limits, admission control and timeouts of ToolExecutor."""  # noqa: D202
+
+    def _executor(self, **options):
+        executor = ToolExecutor(tool_registry=self.tool_registry, handler_registry=self.handler_registry, **options)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def _run_while_blocked(self, executor, blocked, call):
+        """Start the blocked calls, make one more call, then release them all."""
+        async def run():
+            tasks = [asyncio.ensure_future(executor.execute(name, {})) for name in blocked]
+            await asyncio.sleep(0.05)
+            try:
+                return await executor.execute(call, {})
+            finally:
+                self.gate.set()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return asyncio.run(run())
+
+    def test_busy_tool_rejects_with_429(self):
+        """Calls beyond a tool's concurrency plus its queue are rejected with 429."""
+        executor = self._executor(tool_concurrency=1, max_tool_queue_depth=1)
+
+        with self.assertRaises(AdmissionError) as ctx:
+            self._run_while_blocked(executor, ["block", "block"], "block")
+
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(executor.rejected, 1)
+
+    def test_saturated_gateway_rejects_with_503(self):
+        """Calls beyond the workers plus the global queue are rejected with 503, whatever the tool."""
+        executor = self._executor(workers=1, max_queue_depth=1)
+
+        with self.assertRaises(AdmissionError) as ctx:
+            self._run_while_blocked(executor, ["block", "block_other"], "echo")
+
+        self.assertEqual(ctx.exception.status_code, 503)
+
+    def test_timed_out_call_keeps_its_slot_until_the_worker_finishes(self):
+        """A request that times out fails, but its tool still counts as running."""
+        executor = self._executor(timeout=0.05)
+
+        async def run():
+            with self.assertRaises(ToolTimeoutError):
+                await executor.execute("block", {})
+            running = executor.stats()["tools"]
+            self.gate.set()
+            while executor.stats()["admitted"]:
+                await asyncio.sleep(0.01)
+            return running
+
+        self.assertEqual(asyncio.run(run()), {"block": 1})
+
+    def test_admission_and_timeouts_map_to_http_statuses(self):
+        """The gateway answers 429 with Retry-After when a tool is busy, and 504 on timeouts."""
+        service = MCPService(
+            MCPServiceConfig(expose_registry_tools=True, api_key=API_KEY, tool_concurrency=1,
+                             max_tool_queue_depth=0, tool_timeout=0.2),
+            tool_registry=self.tool_registry, handler_registry=self.handler_registry,
+        )
+        self.addCleanup(service.executor.shutdown)
+
+        async def run():
+            transport = httpx.ASGITransport(app=service.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway", headers=AUTH) as client:
+                first = asyncio.ensure_future(client.post("/execute", json={"tool": "block"}))
+                await asyncio.sleep(0.05)
+                second = await client.post("/execute", json={"tool": "block"})
+                return await first, second
+
+        started = time.monotonic()
+        timed_out, rejected = asyncio.run(run())
+
+        self.assertEqual(rejected.status_code, 429)
+        self.assertIn("Retry-After", rejected.headers)
+        self.assertEqual(timed_out.status_code, 504)
+        self.assertLess(time.monotonic() - started, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
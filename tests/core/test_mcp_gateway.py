@@ -0,0 +1,291 @@
+"""
+Tests for the MCP gateway's handling of external servers.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+import unittest
+
+import httpx
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.mcp.service import MCPService, MCPServiceConfig, ServerConfig
+
+
+class UpstreamServer:
+    """External MCP server on localhost with a configurable catalog and tools."""  # noqa: D202
+
+    def __init__(self, tools=("search",), tools_delay=0.0, batch_status=200):
+        self.tools = list(tools)
+        self.tools_delay = tools_delay
+        self.tools_status = 200
+        self.batch_status = batch_status
+        self.catalog_requests = 0
+        self.batches = []
+        self.executed = []
+        self.runner = None
+        self.url = None
+
+    async def _tools(self, request):
+        self.catalog_requests += 1
+        await asyncio.sleep(self.tools_delay)
+        if self.tools_status != 200:
+            return web.Response(status=self.tools_status, text="catalog unavailable")
+        return web.json_response([{"name": name, "description": "", "parameters": []} for name in self.tools])
+
+    @staticmethod
+    def _result(request):
+        """Run a tool: "fail" fails, any other returns its name and its "value" parameter."""
+        if request["tool"] == "fail":
+            return {"status": "error", "message": "tool failed"}
+        return {"status": "success", "result": {"tool": request["tool"], "value": request["parameters"].get("value")}}
+
+    async def _execute(self, request):
+        data = await request.json()
+        self.executed.append(data["tool"])
+        result = self._result(data)
+        if result["status"] != "success":
+            return web.Response(status=500, text=result["message"])
+        return web.json_response(result)
+
+    async def _execute_batch(self, request):
+        data = await request.json()
+        self.batches.append([item["tool"] for item in data["requests"]])
+        if self.batch_status != 200:
+            return web.Response(status=self.batch_status)
+        return web.json_response({"results": [self._result(item) for item in data["requests"]]})
+
+    def routes(self, app):
+        """Add the server's routes to its application."""
+        app.router.add_get("/tools", self._tools)
+        app.router.add_post("/execute", self._execute)
+        app.router.add_post("/execute_batch", self._execute_batch)
+
+    async def start(self):
+        app = web.Application()
+        self.routes(app)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def unused_url():
+    """Return the URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def run_gateway(scenario, upstreams, **options):
+    """Run a scenario with an HTTP client for a gateway in front of the upstream servers."""
+    async def run():
+        servers = {name: await server.start() if server is not None else None for name, server in upstreams.items()}
+        config = MCPServiceConfig(
+            external_servers={
+                name: ServerConfig(name=name, url=server.url if server is not None else unused_url())
+                for name, server in servers.items()
+            },
+            **options,
+        )
+        service = MCPService(config)
+        transport = httpx.ASGITransport(app=service.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+                return await scenario(client, service)
+        finally:
+            await service.stop()
+            for server in servers.values():
+                if server is not None:
+                    await server.stop()
+
+    return asyncio.run(run())
+
+
+async def list_tools(client, **params):
+    """Fetch /tools with its server status."""
+    response = await client.get("/tools", params={"include_status": "true", **params})
+    return response.json()
+
+
+class TestToolCatalogCache(unittest.TestCase):
+    """Test the concurrent, TTL and stale-while-revalidate cache of external catalogs."""  # noqa: D202
+
+    def test_catalogs_are_cached_within_their_ttl(self):
+        """A second listing is served from the cache; include_status reports its state."""
+        upstream = UpstreamServer()
+
+        async def scenario(client, service):
+            first = await list_tools(client)
+            second = await list_tools(client)
+            plain = (await client.get("/tools")).json()
+            return first, second, plain
+
+        first, second, plain = run_gateway(scenario, {"docs": upstream})
+
+        self.assertEqual([tool["name"] for tool in first["tools"]], ["docs:search"])
+        self.assertEqual(first["servers"]["docs"]["status"], "ok")
+        self.assertEqual(second["servers"]["docs"]["status"], "cached")
+        self.assertEqual(plain, first["tools"])
+        self.assertEqual(upstream.catalog_requests, 1)
+
+    def test_expired_catalog_is_served_while_it_is_refreshed(self):
+        """Past its TTL a catalog is served stale at once and updated in the background."""
+        upstream = UpstreamServer()
+
+        async def scenario(client, service):
+            await list_tools(client)
+            upstream.tools = ["search", "fetch"]
+            service.catalog_cache["docs"].fetched_at -= 61
+            stale = await list_tools(client)
+            await asyncio.gather(*service.catalog_refreshes.values())
+            return stale, await list_tools(client)
+
+        stale, refreshed = run_gateway(scenario, {"docs": upstream}, tools_cache_ttl=60)
+
+        self.assertEqual(stale["servers"]["docs"]["status"], "stale")
+        self.assertEqual([tool["name"] for tool in stale["tools"]], ["docs:search"])
+        self.assertEqual(refreshed["servers"]["docs"]["status"], "cached")
+        self.assertEqual([tool["name"] for tool in refreshed["tools"]], ["docs:search", "docs:fetch"])
+        self.assertEqual(upstream.catalog_requests, 2)
+
+    def test_refresh_bypasses_the_cache(self):
+        """refresh=true waits for a new catalog even when the cached one is fresh."""
+        upstream = UpstreamServer()
+
+        async def scenario(client, service):
+            await list_tools(client)
+            upstream.tools = ["fetch"]
+            return await list_tools(client, refresh="true")
+
+        refreshed = run_gateway(scenario, {"docs": upstream})
+
+        self.assertEqual(refreshed["servers"]["docs"]["status"], "ok")
+        self.assertEqual([tool["name"] for tool in refreshed["tools"]], ["docs:fetch"])
+        self.assertEqual(upstream.catalog_requests, 2)
+
+    def test_failing_and_slow_servers_do_not_block_the_others(self):
+        """Servers are queried concurrently; errors and timeouts are reported per server."""
+        healthy, slow = UpstreamServer(), UpstreamServer(tools=["report"], tools_delay=0.5)
+
+        async def scenario(client, service):
+            started = time.monotonic()
+            listing = await list_tools(client)
+            elapsed = time.monotonic() - started
+            await asyncio.gather(*service.catalog_refreshes.values())
+            return listing, elapsed, await list_tools(client)
+
+        listing, elapsed, later = run_gateway(
+            scenario, {"docs": healthy, "reports": slow, "down": None}, tools_timeout=0.2
+        )
+
+        self.assertEqual([tool["name"] for tool in listing["tools"]], ["docs:search"])
+        self.assertEqual(listing["servers"]["down"]["status"], "error")
+        self.assertEqual(listing["servers"]["reports"]["status"], "error")
+        self.assertIn("Tiempo de espera agotado", listing["servers"]["reports"]["error"])
+        self.assertLess(elapsed, 0.45)
+        # The timed-out fetch kept running and filled the cache
+        self.assertEqual(later["servers"]["reports"]["status"], "cached")
+        self.assertIn("reports:report", [tool["name"] for tool in later["tools"]])
+
+    def test_last_catalog_is_used_when_the_server_fails(self):
+        """A catalog past its stale TTL is still served, with the error, if the server fails."""
+        upstream = UpstreamServer()
+
+        async def scenario(client, service):
+            await list_tools(client)
+            upstream.tools_status = 503
+            service.catalog_cache["docs"].fetched_at -= 700
+            return await list_tools(client)
+
+        listing = run_gateway(scenario, {"docs": upstream}, tools_stale_ttl=600)
+
+        self.assertEqual([tool["name"] for tool in listing["tools"]], ["docs:search"])
+        self.assertEqual(listing["servers"]["docs"]["status"], "stale")
+        self.assertIn("catalog unavailable", listing["servers"]["docs"]["error"])
+
+
+def batch(*tools):
+    """/execute_batch request body numbering each tool call in its "value" parameter."""
+    return {"requests": [{"tool": tool, "parameters": {"value": index}} for index, tool in enumerate(tools)]}
+
+
+class TestExecuteBatch(unittest.TestCase):
+    """Test grouping of /execute_batch per external server and its fallback to single calls."""  # noqa: D202
+
+    def test_tools_of_one_server_are_sent_as_one_batch(self):
+        """Several calls to a server share one batch; lone calls and local tools run on their own."""
+        docs, reports = UpstreamServer(), UpstreamServer()
+
+        async def scenario(client, service):
+            response = await client.post(
+                "/execute_batch", json=batch("docs:search", "reports:summary", "missing", "docs:fetch", "docs:fail")
+            )
+            return response.json()
+
+        body = run_gateway(scenario, {"docs": docs, "reports": reports})
+
+        self.assertEqual(docs.batches, [["search", "fetch", "fail"]])
+        self.assertEqual(docs.executed, [])
+        self.assertEqual(reports.batches, [])
+        self.assertEqual(reports.executed, ["summary"])
+        self.assertEqual(body["status"], "partial")
+        results = body["results"]
+        self.assertEqual([item["index"] for item in results], [0, 1, 2, 3, 4])
+        self.assertEqual([item["tool"] for item in results],
+                         ["docs:search", "reports:summary", "missing", "docs:fetch", "docs:fail"])
+        self.assertEqual([item["status"] for item in results], ["success", "success", "error", "success", "error"])
+        self.assertEqual(results[2]["status_code"], 404)
+        self.assertEqual(results[3]["result"], {"tool": "fetch", "value": 3})
+
+    def test_servers_without_batches_fall_back_to_single_calls(self):
+        """A 404 on /execute_batch is remembered and each item is sent to /execute instead."""
+        upstream = UpstreamServer(batch_status=404)
+
+        async def scenario(client, service):
+            first = (await client.post("/execute_batch", json=batch("docs:search", "docs:fail", "docs:fetch"))).json()
+            second = (await client.post("/execute_batch", json=batch("docs:search", "docs:fetch"))).json()
+            return first, second, set(service.batch_unsupported)
+
+        first, second, unsupported = run_gateway(scenario, {"docs": upstream})
+
+        self.assertEqual(unsupported, {"docs"})
+        self.assertEqual(len(upstream.batches), 1)
+        self.assertEqual(sorted(upstream.executed), ["fail", "fetch", "fetch", "search", "search"])
+        self.assertEqual(first["status"], "partial")
+        self.assertEqual([item["status"] for item in first["results"]], ["success", "error", "success"])
+        self.assertEqual(first["results"][1]["status_code"], 500)
+        self.assertEqual(first["results"][2]["result"], {"tool": "fetch", "value": 2})
+        self.assertEqual(second["status"], "success")
+        self.assertEqual([item["tool"] for item in second["results"]], ["docs:search", "docs:fetch"])
+
+    def test_failed_batches_are_retried_as_single_calls(self):
+        """Other batch errors fall back for that request only; the server is not marked unsupported."""
+        upstream = UpstreamServer(batch_status=500)
+
+        async def scenario(client, service):
+            for _ in range(2):
+                body = (await client.post("/execute_batch", json=batch("docs:search", "docs:fetch"))).json()
+            return body, set(service.batch_unsupported)
+
+        body, unsupported = run_gateway(scenario, {"docs": upstream})
+
+        self.assertEqual(unsupported, set())
+        self.assertEqual(len(upstream.batches), 2)
+        self.assertEqual(body["status"], "success")
+        self.assertEqual(sorted(upstream.executed), ["fetch", "fetch", "search", "search"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for the persistent stdio MCP transport, against a stub server process.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.mcp.client import ConnectionError as MCPConnectionError, MCPService, ToolExecutionError
+from core.mcp.config import MCPStdioConfig
+from core.mcp.stdio_transport import StdioMCPClient, StdioMCPConnection
+
+STUB_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stdio_mcp_stub_server.py")
+
+
+def stub_config(**options):
+    """Configuration running the stub server with the current interpreter."""
+    return MCPStdioConfig(command=sys.executable, args=[STUB_SERVER], **options)
+
+
+class TestStdioMCPConnection(unittest.TestCase):
+    """Test multiplexing, limits, timeouts and restarts of a single server process."""  # noqa: D202
+
+    def _run(self, scenario, **options):
+        """Run a scenario with a connection to a stub server, closing it afterwards."""
+        async def run():
+            connection = StdioMCPConnection(stub_config(**options), name="stub", restart_backoff=0.05)
+            try:
+                return await scenario(connection)
+            finally:
+                await connection.close()
+
+        return asyncio.run(run())
+
+    def test_concurrent_calls_are_matched_to_their_responses(self):
+        """Calls share one process, run concurrently, and get their own results when answered out of order."""
+        async def scenario(connection):
+            await connection.start()
+            started = time.monotonic()
+            results = await asyncio.gather(*(
+                connection.call_tool("sleep", {"seconds": (10 - i) * 0.03, "value": i}) for i in range(10)
+            ))
+            return results, time.monotonic() - started
+
+        results, elapsed = self._run(scenario)
+
+        self.assertEqual([result["value"] for result in results], list(range(10)))
+        self.assertEqual(len({result["pid"] for result in results}), 1)
+        self.assertLess(elapsed, 1.0)  # Run one after another, the calls would take 1.65s
+
+    def test_in_flight_requests_are_bounded(self):
+        """Requests beyond max_in_flight wait for a slot instead of reaching the server."""
+        async def scenario(connection):
+            calls = [asyncio.ensure_future(connection.call_tool("sleep", {"seconds": 0.1, "value": i}))
+                     for i in range(6)]
+            await asyncio.sleep(0.05)
+            in_flight = connection.in_flight
+            results = await asyncio.gather(*calls)
+            return in_flight, results, await connection.call_tool("stats", {})
+
+        in_flight, results, stats = self._run(scenario, max_in_flight=2)
+
+        self.assertLessEqual(in_flight, 2)
+        self.assertEqual([result["value"] for result in results], list(range(6)))
+        self.assertEqual(stats["max_running"], 2)
+
+    def test_request_timeout_fails_only_the_slow_call(self):
+        """A call without a response within request_timeout fails; the process keeps serving others."""
+        async def scenario(connection):
+            first = await connection.call_tool("stats", {})
+            with self.assertRaisesRegex(MCPConnectionError, "Tiempo de espera agotado"):
+                await connection.call_tool("sleep", {"seconds": 1.0})
+            return first, await connection.call_tool("stats", {}), connection.in_flight
+
+        first, second, in_flight = self._run(scenario, request_timeout=0.2)
+
+        self.assertEqual(first["pid"], second["pid"])
+        self.assertEqual(in_flight, 0)
+
+    def test_crashed_process_fails_pending_calls_and_restarts(self):
+        """A crash fails every pending call; the next call starts a new process."""
+        async def scenario(connection):
+            before = await connection.call_tool("stats", {})
+            pending = asyncio.ensure_future(connection.call_tool("sleep", {"seconds": 5}))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(MCPConnectionError):
+                await connection.call_tool("crash", {})
+            with self.assertRaises(MCPConnectionError):
+                await pending
+            return before, await connection.call_tool("stats", {}), connection.restarts
+
+        before, after, restarts = self._run(scenario)
+
+        self.assertNotEqual(before["pid"], after["pid"])
+        self.assertEqual(restarts, 1)
+
+    def test_failing_starts_back_off_and_give_up(self):
+        """A server that never completes its handshake is retried with growing delays, then reported."""
+        async def run():
+            config = MCPStdioConfig(command=sys.executable, args=["-c", "import sys; sys.exit(1)"], max_restarts=2)
+            connection = StdioMCPConnection(config, name="broken", restart_backoff=0.05)
+            started = time.monotonic()
+            with self.assertRaises(MCPConnectionError):
+                await connection.start()
+            return time.monotonic() - started, connection.restarts
+
+        elapsed, restarts = asyncio.run(run())
+
+        self.assertGreaterEqual(elapsed, 0.05 + 0.1)
+        self.assertEqual(restarts, 2)
+
+    def test_server_errors_raise_tool_errors(self):
+        """An unsuccessful response raises ToolExecutionError without affecting the process."""
+        async def scenario(connection):
+            with self.assertRaisesRegex(ToolExecutionError, "tool failed"):
+                await connection.call_tool("fail", {})
+            return await connection.list_tools()
+
+        tools = self._run(scenario)
+
+        self.assertEqual([tool["name"] for tool in tools], ["sleep", "stats", "fail"])
+
+
+class TestStdioMCPClient(unittest.TestCase):
+    """Test the pooled stdio client."""  # noqa: D202
+
+    def test_calls_are_spread_over_the_pool(self):
+        """Concurrent calls go to the least loaded processes; call_tools reports each result in order."""
+        async def run():
+            client = StdioMCPClient(stub_config(), name="stub", pool_size=2)
+            await client.connect()
+            try:
+                responses = await asyncio.gather(*(
+                    client.call_tool("sleep", {"seconds": 0.1, "value": i}) for i in range(4)
+                ))
+                batch = await client.call_tools([
+                    {"tool": "sleep", "parameters": {"value": "a"}},
+                    {"tool": "fail"},
+                    {"tool": "sleep", "parameters": {"value": "b"}},
+                ])
+            finally:
+                await client.disconnect()
+            return responses, batch, client
+
+        responses, batch, client = asyncio.run(run())
+
+        pids = [response["result"]["pid"] for response in responses]
+        self.assertEqual(len(set(pids)), 2)
+        self.assertEqual(sorted(pids.count(pid) for pid in set(pids)), [2, 2])
+        self.assertEqual([item["status"] for item in batch], ["success", "error", "success"])
+        self.assertEqual([item["index"] for item in batch], [0, 1, 2])
+        self.assertEqual(batch[2]["result"]["value"], "b")
+        self.assertFalse(any(connection.running for connection in client.pool.connections))
+
+    def test_service_creates_stdio_clients_from_its_config(self):
+        """Servers of type stdio in an MCPService configuration get a StdioMCPClient."""
+        config = {
+            "servers": {
+                "local": {"type": "stdio", "stdio_config": {"command": sys.executable, "args": [STUB_SERVER]}},
+            },
+            "default_server": "local",
+        }
+
+        async def run():
+            service = MCPService(config)
+            connected = await service.connect_all()
+            try:
+                healthy = await service.health_check_all()
+                tools = await service.list_all_tools()
+                response = await service.get_client().call_tool("sleep", {"value": 7})
+            finally:
+                await service.disconnect_all()
+            return service.get_client(), connected, healthy, tools, response
+
+        client, connected, healthy, tools, response = asyncio.run(run())
+
+        self.assertIsInstance(client, StdioMCPClient)
+        self.assertEqual(connected, {"local": True})
+        self.assertEqual(healthy, {"local": True})
+        self.assertIn("sleep", [tool["name"] for tool in tools["local"]])
+        self.assertEqual(response["result"]["value"], 7)
+        self.assertFalse(client.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
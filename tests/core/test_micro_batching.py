@@ -0,0 +1,174 @@
+"""
+Tests for micro-batching of concurrent tool and handler calls.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.handlers.registry import HandlerRegistry
+from core.llm.interface import LLMInterface
+from core.task import DirectHandlerTask, Task
+from core.tools.plugin import ToolPlugin
+from core.tools.registry import ToolRegistry
+from core.utils.micro_batch import MicroBatcher
+from core.workflow import Workflow
+
+TEXTS = ["great product", "terrible service", "okay", "love it", "broken on arrival", "fine"]
+AMBIGUOUS = "meh"
+
+
+class ClassifyPlugin(ToolPlugin):
+    """Plugin tool classifying a batch of texts at once."""  # noqa: D202
+
+    tool_name = "classify_plugin"
+    description = "Label texts as positive or negative"
+    required_parameters = ["text"]
+
+    def __init__(self):
+        self.batches = []
+
+    def execute(self, **kwargs):
+        return classify(kwargs["text"])
+
+    def execute_batch(self, inputs):
+        self.batches.append([data["text"] for data in inputs])
+        return [classify(data["text"]) for data in inputs]
+
+
+def classify(text):
+    """Label a text as positive or negative."""
+    if text == AMBIGUOUS:
+        raise ValueError("ambiguous text")
+    return "negative" if any(word in text for word in ("terrible", "broken")) else "positive"
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test that concurrent calls are grouped and results scattered back."""  # noqa: D202
+
+    def test_calls_are_grouped_up_to_max_batch_size(self):
+        """Five concurrent calls with batches of two run as three batches, in order."""
+        batcher = MicroBatcher(lambda items: [item * 10 for item in items], max_batch_size=2, max_wait=0.01)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [0, 10, 20, 30, 40])
+        self.assertEqual(batcher.batch_sizes, [2, 2, 1])
+
+    def test_batch_error_reaches_every_caller(self):
+        """A failing batch function raises its error to each call of the batch."""
+        def fail(items):
+            raise ConnectionError("service unavailable")
+
+        batcher = MicroBatcher(fail, max_wait=0.01)
+
+        async def run():
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in asyncio.run(run())))
+
+
+class TestMicroBatchedWorkflow(unittest.TestCase):
+    """Test that parallel tasks calling the same tool or handler are batched by the async engine."""  # noqa: D202
+
+    def setUp(self):
+        """Register a tool and a handler with batch entry points."""
+        self.tool_batches = []
+        self.handler_batches = []
+
+        def classify_batch(inputs):
+            self.tool_batches.append(len(inputs))
+            results = []
+            for data in inputs:
+                try:
+                    results.append({"success": True, "result": classify(data["text"])})
+                except ValueError as e:
+                    results.append(e)
+            return results
+
+        def word_count_batch(inputs):
+            self.handler_batches.append(len(inputs))
+            return [{"success": True, "result": len(data["text"].split())} for data in inputs]
+
+        self.tool_registry = ToolRegistry()
+        self.tool_registry.register_tool("classify", lambda data: {"success": True, "result": classify(data["text"])})
+        self.tool_registry.register_batch_tool("classify", classify_batch)
+        self.handler_registry = HandlerRegistry()
+        self.handler_registry.register_handler("word_count", lambda data: len(data["text"].split()))
+        self.handler_registry.register_batch_handler("word_count", word_count_batch)
+
+    def _run(self, make_task):
+        workflow = Workflow(workflow_id="fan_out", name="Fan Out")
+        for i, text in enumerate(TEXTS):
+            workflow.add_task(make_task(f"item_{i}", text))
+        engine = AsyncWorkflowEngine(
+            workflow=workflow,
+            llm_interface=MagicMock(spec=LLMInterface),
+            tool_registry=self.tool_registry,
+            handler_registry=self.handler_registry,
+        )
+        asyncio.run(engine.async_run())
+        return workflow
+
+    def test_parallel_tool_calls_run_as_one_batch(self):
+        """Each task receives its own result from a single batch invocation."""
+        workflow = self._run(lambda task_id, text: Task(
+            task_id=task_id, name=task_id, tool_name="classify", input_data={"text": text}, parallel=True,
+        ))
+
+        self.assertEqual(self.tool_batches, [len(TEXTS)])
+        self.assertEqual(workflow.status, "completed")
+        self.assertEqual(workflow.tasks["item_1"].output_data["result"], "negative")
+        self.assertEqual(workflow.tasks["item_3"].output_data["result"], "positive")
+
+    def test_failed_input_only_fails_its_own_result(self):
+        """An exception returned for one input becomes an error response for that input only."""
+        results = self.tool_registry.execute_tool_batch("classify", [{"text": "love it"}, {"text": AMBIGUOUS}])
+
+        self.assertEqual(results[0]["result"], "positive")
+        self.assertFalse(results[1]["success"])
+        self.assertIn("ambiguous text", results[1]["error"])
+
+    def test_invalid_plugin_input_only_fails_its_own_result(self):
+        """A plugin input failing validation gets an error; the valid inputs still run as one batch."""
+        plugin = ClassifyPlugin()
+        self.tool_registry.plugin_manager.plugins[plugin.tool_name] = plugin
+        self.tool_registry.register_tool(plugin.tool_name, lambda data: plugin.execute(**data))
+
+        results = self.tool_registry.execute_tool_batch(
+            plugin.tool_name, [{"text": "love it"}, {"body": "no text"}, {"text": "broken on arrival"}]
+        )
+
+        self.assertEqual(plugin.batches, [["love it", "broken on arrival"]])
+        self.assertEqual(results[0]["result"], "positive")
+        self.assertFalse(results[1]["success"])
+        self.assertIn("Missing required parameter: 'text'", results[1]["error"])
+        self.assertEqual(results[2]["result"], "negative")
+
+    def test_parallel_handler_calls_run_as_one_batch(self):
+        """Registered handlers with a batch entry point are batched the same way."""
+        workflow = self._run(lambda task_id, text: DirectHandlerTask(
+            task_id=task_id, name=task_id, handler_name="word_count", input_data={"text": text}, parallel=True,
+        ))
+
+        self.assertEqual(self.handler_batches, [len(TEXTS)])
+        self.assertEqual([workflow.tasks[f"item_{i}"].output_data["result"] for i in range(len(TEXTS))],
+                         [2, 2, 1, 2, 3, 1])
+
+    def test_tool_without_batch_entry_point_is_called_per_input(self):
+        """execute_tool_batch falls back to one call per input."""
+        results = self.tool_registry.execute_tool_batch("file_read", [{}, {}])
+
+        self.assertIsNone(self.tool_registry.get_batch_tool("file_read"))
+        self.assertEqual(len(results), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the shared OpenAI client provider.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.llm.clients import OpenAIClientProvider, get_openai_client
+from core.services import get_services, reset_services
+
+
+class TestOpenAIClientProvider(unittest.TestCase):
+    """Test client sharing, pool configuration and services registration."""  # noqa: D202
+
+    def setUp(self):
+        """Create a provider with a fixed API key."""
+        self.provider = OpenAIClientProvider(api_key="test-key", max_connections=7, timeout=12.0)
+
+    def tearDown(self):
+        """Close the provider's pools."""
+        self.provider.close()
+
+    def test_sync_client_is_shared_and_uses_pool(self):
+        """Every request returns the same client, built on the shared httpx pool."""
+        client = self.provider.sync_client()
+        self.assertIs(self.provider.sync_client(), client)
+        self.assertIs(client._client, self.provider.http_client())
+        self.assertEqual(client.api_key, "test-key")
+        self.assertEqual(self.provider.http_client().timeout.read, 12.0)
+
+    def test_clients_are_cached_per_class(self):
+        """A different client class gets its own shared instance with the pool injected."""
+        factory = MagicMock()
+        client = self.provider.sync_client(factory)
+        self.assertIs(self.provider.sync_client(factory), client)
+        factory.assert_called_once()
+        self.assertIs(factory.call_args.kwargs["http_client"], self.provider.http_client())
+
+    def test_async_client_is_shared_within_a_loop(self):
+        """Async clients are shared within an event loop and not across loops."""
+        async def get_client():
+            client = self.provider.async_client()
+            self.assertIs(self.provider.async_client(), client)
+            return client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        self.assertIsNot(first, second)
+
+    def test_services_container_provides_provider(self):
+        """The container builds one provider and reset() closes its pool."""
+        reset_services()
+        self.addCleanup(reset_services)
+        factory = MagicMock()
+
+        provider = get_services().openai_clients
+        self.assertIs(get_services().get_service(OpenAIClientProvider), provider)
+        self.assertIs(get_openai_client(factory), provider.sync_client(factory))
+
+        http_client = provider.http_client()
+        reset_services()
+        self.assertTrue(http_client.is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
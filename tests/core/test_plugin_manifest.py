@@ -0,0 +1,152 @@
+"""
+Tests for manifest-backed plugin discovery.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.tools.plugin_manager import PluginManager
+from core.tools.registry import ToolRegistry
+
+PLUGIN_SOURCE = '''
+from core.tools.plugin import ToolPlugin
+
+
+class GreetPlugin(ToolPlugin):
+    @property
+    def tool_name(self):
+        return "greet"
+
+    @property
+    def tool_aliases(self):
+        return ["hello"]
+
+    @property
+    def description(self):
+        return "Greets someone"
+
+    @property
+    def required_parameters(self):
+        return ["name"]
+
+    def execute(self, **kwargs):
+        return "{greeting}, " + kwargs["name"]
+'''
+
+
+class TestPluginManifest(unittest.TestCase):
+    """Test persisted plugin discovery and lazy plugin loading."""  # noqa: D202
+
+    def setUp(self):
+        """Create a temporary plugin package on sys.path."""
+        self.root = tempfile.mkdtemp()
+        self.package = f"manifest_plugins_{id(self)}"
+        self.package_dir = os.path.join(self.root, self.package)
+        os.makedirs(self.package_dir)
+        open(os.path.join(self.package_dir, "__init__.py"), "w").close()
+        self.module_name = f"{self.package}.greet_plugin"
+        self._write_plugin("Hello")
+        self.manifest_path = os.path.join(self.root, "cache", "plugin_manifest.json")
+        sys.path.insert(0, self.root)
+
+    def tearDown(self):
+        """Remove the temporary package."""
+        sys.path.remove(self.root)
+        for name in [m for m in sys.modules if m.startswith(self.package)]:
+            del sys.modules[name]
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write_plugin(self, greeting):
+        path = os.path.join(self.package_dir, "greet_plugin.py")
+        with open(path, "w") as f:
+            f.write(PLUGIN_SOURCE.replace("{greeting}", greeting))
+        # Ensure a distinct mtime even on coarse-grained filesystems
+        stamp = time.time() + len(greeting)
+        os.utime(path, (stamp, stamp))
+
+    def _new_manager(self):
+        manager = PluginManager(manifest_path=self.manifest_path)
+        manager.register_plugin_namespace(self.package)
+        return manager
+
+    def test_manifest_written_on_first_scan(self):
+        """The first load writes a manifest listing plugins, names and aliases."""
+        self._new_manager().load_plugins()
+
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        modules = manifest["namespaces"][self.package]["modules"]
+        plugin = modules[self.module_name]["plugins"][0]
+        self.assertEqual(plugin["class"], "GreetPlugin")
+        self.assertEqual(plugin["tool_name"], "greet")
+        self.assertEqual(plugin["aliases"], ["hello"])
+
+    def test_second_load_does_not_import_plugins(self):
+        """With an up-to-date manifest, discovery imports nothing until first use."""
+        self._new_manager().load_plugins()
+        del sys.modules[self.module_name]
+
+        manager = self._new_manager()
+        manager.load_plugins()
+        self.assertNotIn(self.module_name, sys.modules)
+        self.assertEqual(sorted(manager.get_plugin_names()), ["greet", "hello"])
+        self.assertEqual(manager.get_plugin_metadata()[0]["name"], "greet")
+
+        plugin = manager.get_plugin("hello")
+        self.assertIn(self.module_name, sys.modules)
+        self.assertIs(plugin, manager.get_plugin("greet"))
+
+    def test_registry_executes_lazy_plugin(self):
+        """Registry wrappers resolve manifest plugins on first execution."""
+        registry = ToolRegistry(plugin_manifest_path=self.manifest_path)
+        registry.register_plugin_namespace(self.package)
+        registry.load_plugins()
+
+        result = registry.execute_tool("greet", {"name": "Ada"})
+        self.assertTrue(result["success"])
+        self.assertEqual(result["result"], "Hello, Ada")
+
+    def test_reload_rescans_only_changed_modules(self):
+        """reload=True re-imports modules whose files changed."""
+        manager = self._new_manager()
+        manager.load_plugins()
+        self.assertEqual(manager.get_plugin("greet").execute(name="Ada"), "Hello, Ada")
+
+        unchanged = manager.get_plugin("greet")
+        manager.load_plugins(reload=True)
+        self.assertIs(manager.get_plugin("greet"), unchanged)
+
+        self._write_plugin("Howdy")
+        manager.load_plugins(reload=True)
+        self.assertEqual(manager.get_plugin("greet").execute(name="Ada"), "Howdy, Ada")
+
+    def test_removed_module_is_dropped_on_reload(self):
+        """Plugins whose module was deleted are reported as not found instead of failing to import."""
+        manager = self._new_manager()
+        manager.load_plugins()
+        del sys.modules[self.module_name]
+        manager = self._new_manager()
+        manager.load_plugins()
+        self.assertIn("greet", manager.get_plugin_names())
+
+        os.remove(os.path.join(self.package_dir, "greet_plugin.py"))
+        manager.load_plugins(reload=True)
+
+        self.assertEqual(manager.get_plugin_names(), [])
+        self.assertEqual(manager.get_plugin_metadata(), [])
+        self.assertIsNone(manager.get_plugin("greet"))
+        with open(self.manifest_path) as f:
+            self.assertEqual(json.load(f)["namespaces"][self.package]["modules"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Tests for token-aware compaction of LLM prompts.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.config import get as config_get, set as config_set
+from core.engine import WorkflowEngine
+from core.llm.compaction import CachedSummarizer, compact_prompt, split_template
+from core.llm.interface import LLMInterface
+from core.task import DirectHandlerTask, Task
+from core.tools.registry import ToolRegistry
+from core.utils.document_chunker import count_tokens
+from core.workflow import Workflow
+
+TEMPLATE = (
+    "Question: which tariffs apply to steel?\n\nSearch results:\n${search.output_data.response}\n\nAnswer briefly."
+)
+FILLER = " ".join(f"Result {i} describes the weather in region {i}." for i in range(200))
+RELEVANT = "The tariff on imported steel is 25 percent."
+SEARCH_RESULTS = f"{FILLER} {RELEVANT} {FILLER}"
+PLACEHOLDER = "${search.output_data.response}"
+
+# The context repeats the template text that follows its placeholder
+TWO_VALUE_TEMPLATE = "Context:\n${context}\nQuestion: ${question}\nAnswer in one word."
+CONTEXT = f"{SEARCH_RESULTS}\nQuestion: {SEARCH_RESULTS}"
+QUESTION = "Which tariff applies to steel?"
+INTACT_ENDING = f"\nQuestion: {QUESTION}\nAnswer in one word."
+
+
+def render(value):
+    """Resolve the template's placeholder with a value."""
+    return TEMPLATE.replace(PLACEHOLDER, value)
+
+
+class TestCompactPrompt(unittest.TestCase):
+    """Test measuring and shrinking of resolved prompts."""  # noqa: D202
+
+    def test_split_template_separates_inserted_values(self):
+        """The template splits into its own text and the values of its resolved placeholders."""
+        literals, values = split_template(TEMPLATE + " ${missing}", {PLACEHOLDER: "a\nb"})
+
+        self.assertEqual(values, ["a\nb"])
+        self.assertEqual(literals[0], "Question: which tariffs apply to steel?\n\nSearch results:\n")
+        self.assertEqual(literals[1], "\n\nAnswer briefly. ${missing}")
+
+    def test_values_containing_template_text_leave_the_template_intact(self):
+        """A value that repeats the text after its placeholder is compacted on its own."""
+        values = {"${context}": CONTEXT, "${question}": QUESTION}
+        prompt, report = compact_prompt(TWO_VALUE_TEMPLATE, values, budget=200)
+
+        self.assertLessEqual(count_tokens(prompt), 200)
+        self.assertTrue(prompt.startswith("Context:\n"))
+        self.assertTrue(prompt.endswith(INTACT_ENDING))
+        self.assertEqual(report["compacted_values"], 1)
+
+    def test_prompt_under_budget_is_unchanged(self):
+        """A prompt within its budget is sent as is."""
+        prompt, report = compact_prompt(TEMPLATE, {PLACEHOLDER: "short"}, budget=1000)
+
+        self.assertEqual(prompt, render("short"))
+        self.assertEqual(report["tokens_saved"], 0)
+
+    def test_truncation_fits_the_budget_and_keeps_the_template(self):
+        """Truncation keeps both ends of the value and the instructions around it."""
+        prompt, report = compact_prompt(TEMPLATE, {PLACEHOLDER: SEARCH_RESULTS}, budget=300)
+
+        self.assertLessEqual(count_tokens(prompt), 300)
+        self.assertTrue(prompt.startswith("Question: which tariffs apply to steel?"))
+        self.assertTrue(prompt.endswith("Answer briefly."))
+        self.assertIn("tokens omitted", prompt)
+        self.assertEqual(report["compacted_values"], 1)
+        self.assertEqual(report["tokens_saved"], report["original_tokens"] - report["compacted_tokens"])
+
+    def test_extraction_keeps_sentences_relevant_to_the_instructions(self):
+        """Extractive selection keeps the sentence sharing words with the question."""
+        prompt, _ = compact_prompt(TEMPLATE, {PLACEHOLDER: SEARCH_RESULTS}, budget=100, method="extract")
+
+        self.assertLessEqual(count_tokens(prompt), 100)
+        self.assertIn(RELEVANT, prompt)
+
+    def test_summaries_are_cached(self):
+        """A value is summarized by the LLM once; the summary is reused by later prompts."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        llm = MagicMock(spec=LLMInterface)
+        llm.model = "test-model"
+        llm.execute_llm_call.return_value = {"success": True, "response": RELEVANT}
+        summarizer = CachedSummarizer(llm, directory=directory)
+
+        for _ in range(2):
+            prompt, _ = compact_prompt(TEMPLATE, {PLACEHOLDER: SEARCH_RESULTS}, budget=200, method="summarize",
+                                       summarize=summarizer)
+
+        self.assertEqual(prompt, render(RELEVANT))
+        self.assertEqual(llm.execute_llm_call.call_count, 1)
+
+    def test_summary_cache_defaults_to_the_data_directory(self):
+        """Without a summary_cache_directory, summaries are cached under data_directory."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        original = config_get("data_directory", "./data")
+        self.addCleanup(config_set, "data_directory", original)
+        config_set("data_directory", directory)
+
+        summarizer = CachedSummarizer(MagicMock(spec=LLMInterface))
+
+        self.assertEqual(summarizer.store.directory, os.path.join(directory, "prompt_summaries"))
+
+
+class TestCompactionInWorkflows(unittest.TestCase):
+    """Test that LLM tasks with a token budget send compacted prompts and report the savings."""  # noqa: D202
+
+    def _run(self, **llm_task_options):
+        llm = MagicMock(spec=LLMInterface)
+        llm.model = "test-model"
+        llm.execute_llm_call.return_value = {"success": True, "response": "25 percent"}
+        workflow = Workflow(workflow_id="answer", name="Answer")
+        workflow.add_task(DirectHandlerTask(
+            task_id="search", name="Search", handler=lambda data: {"success": True, "response": SEARCH_RESULTS},
+            input_data={}, next_task_id_on_success="answer",
+        ))
+        workflow.add_task(Task(task_id="answer", name="Answer", is_llm_task=True, input_data={"prompt": TEMPLATE},
+                               **llm_task_options))
+        engine = AsyncWorkflowEngine(workflow=workflow, llm_interface=llm, tool_registry=MagicMock())
+        asyncio.run(engine.async_run())
+        return llm.execute_llm_call.call_args[0][0], workflow.tasks["answer"].output_data
+
+    def test_budgeted_task_sends_a_compacted_prompt(self):
+        """The LLM receives a prompt within the budget, and the output reports the tokens saved."""
+        prompt, output = self._run(prompt_token_budget=250, prompt_compaction="extract")
+
+        self.assertLessEqual(count_tokens(prompt), 250)
+        self.assertIn(RELEVANT, prompt)
+        self.assertGreater(output["metadata"]["prompt_compaction"]["tokens_saved"], 0)
+
+    def test_values_repeating_template_text_are_compacted_on_their_own(self):
+        """Both engines keep the template text after a value that repeats it."""
+        def llm_interface():
+            llm = MagicMock(spec=LLMInterface)
+            llm.model = "test-model"
+            llm.execute_llm_call.return_value = {"success": True, "response": "25 percent"}
+            return llm
+
+        def answer_task():
+            return Task(task_id="answer", name="Answer", is_llm_task=True, input_data={"prompt": TWO_VALUE_TEMPLATE},
+                        prompt_token_budget=200)
+
+        # Synchronous engine, resolving workflow variables
+        sync_llm = llm_interface()
+        workflow = Workflow(workflow_id="answer", name="Answer")
+        workflow.add_task(answer_task())
+        WorkflowEngine(workflow=workflow, llm_interface=sync_llm, tool_registry=ToolRegistry()).run(
+            {"context": CONTEXT, "question": QUESTION})
+
+        # Asynchronous engine, resolving upstream task outputs
+        async_llm = llm_interface()
+        workflow = Workflow(workflow_id="answer", name="Answer")
+        def respond(value):
+            return lambda data: {"success": True, "response": value}
+
+        for task_id, value in (("context", CONTEXT), ("question", QUESTION)):
+            workflow.add_task(DirectHandlerTask(task_id=task_id, name=task_id, handler=respond(value), input_data={}))
+        task = answer_task()
+        task.input_data = {"prompt": TWO_VALUE_TEMPLATE.replace("${context}", "${context.output_data.response}")
+                           .replace("${question}", "${question.output_data.response}")}
+        task.depends_on = ["context", "question"]
+        workflow.add_task(task)
+        asyncio.run(AsyncWorkflowEngine(workflow=workflow, llm_interface=async_llm, tool_registry=MagicMock())
+                    .async_run())
+
+        for llm in (sync_llm, async_llm):
+            prompt = llm.execute_llm_call.call_args[1].get("prompt") or llm.execute_llm_call.call_args[0][0]
+            self.assertLessEqual(count_tokens(prompt), 200)
+            self.assertTrue(prompt.endswith(INTACT_ENDING))
+
+    def test_task_without_budget_sends_the_full_prompt(self):
+        """Compaction only applies to tasks that declare a budget."""
+        prompt, output = self._run()
+
+        self.assertEqual(prompt, render(SEARCH_RESULTS))
+        self.assertNotIn("prompt_compaction", output["metadata"])
+
+
+if __name__ == "__main__":
+    unittest.main()
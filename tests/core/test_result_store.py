@@ -0,0 +1,180 @@
+"""
+Tests for incremental re-execution backed by the ResultStore.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core.async_workflow_engine import AsyncWorkflowEngine
+from core.engine import WorkflowEngine
+from core.llm.interface import LLMInterface
+from core.result_store import IncrementalExecutionContext, ResultStore, callable_fingerprint, find_upstream_task_ids
+from core.task import DirectHandlerTask, Task
+from core.tools.registry import ToolRegistry
+from core.workflow import Workflow
+
+
+class TestResultStore(unittest.TestCase):
+    """Test fingerprinting and the file-backed result store."""  # noqa: D202
+
+    def setUp(self):
+        """Create a temporary store directory."""
+        self.store_dir = tempfile.mkdtemp()
+        self.store = ResultStore(self.store_dir)
+
+    def tearDown(self):
+        """Remove the temporary store directory."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_put_and_get(self):
+        """Stored outputs are returned by fingerprint."""
+        self.assertIsNone(self.store.get("abc"))
+        self.assertTrue(self.store.put("abc", "task_1", {"success": True, "result": [1, 2]}))
+        self.assertEqual(self.store.get("abc"), {"success": True, "result": [1, 2]})
+        self.assertEqual((self.store.hits, self.store.misses), (1, 1))
+
+    def test_unserializable_output_is_not_stored(self):
+        """Outputs that cannot be serialized are skipped rather than raising."""
+        self.assertFalse(self.store.put("abc", "task_1", {"success": True, "result": object()}))
+        self.assertIsNone(self.store.get("abc"))
+
+    def test_callable_fingerprint_tracks_code(self):
+        """Different implementations produce different fingerprints."""
+        def first(data):
+            return {"success": True, "result": 1}
+
+        def second(data):
+            return {"success": True, "result": 2}
+
+        self.assertEqual(callable_fingerprint(first), callable_fingerprint(first))
+        self.assertNotEqual(callable_fingerprint(first), callable_fingerprint(second))
+
+    def test_find_upstream_task_ids(self):
+        """Upstream tasks come from depends_on and input placeholders."""
+        task = DirectHandlerTask(
+            task_id="c",
+            name="C",
+            handler=lambda data: data,
+            input_data={"x": "${a.output_data.result}", "y": "prefix ${b.result} suffix", "z": "${unknown}"},
+            depends_on=["d"],
+        )
+        self.assertEqual(find_upstream_task_ids(task, ["a", "b", "c", "d"]), ["a", "b", "d"])
+
+    def test_llm_identity_includes_system_message_and_sampling(self):
+        """An LLM task's fingerprint changes with its system message and the sampling parameters."""
+        task = Task(task_id="answer", name="Answer", is_llm_task=True, input_data={"prompt": "Hi"})
+        llm = MagicMock(spec=LLMInterface)
+        llm.model = "gpt-4o"
+        llm.sampling_params = {"max_tokens": 1500, "temperature": 0.7}
+        context = IncrementalExecutionContext(self.store, llm_interface=llm)
+
+        def fingerprint(system_message):
+            return context.fingerprint(task, {"prompt": "Hi", "system_message": system_message}, ["answer"])
+
+        baseline = fingerprint("Be brief.")
+        self.assertEqual(context.describe_executor(task, {"system_message": "Be brief."})["system_message"],
+                         "Be brief.")
+        self.assertNotEqual(fingerprint("Be thorough."), baseline)
+        llm.sampling_params = {"max_tokens": 1500, "temperature": 0.2}
+        self.assertNotEqual(fingerprint("Be brief."), baseline)
+
+
+class TestIncrementalExecution(unittest.TestCase):
+    """Test that engines skip tasks whose fingerprint is unchanged."""  # noqa: D202
+
+    def setUp(self):
+        """Set up a store and call counters."""
+        self.store_dir = tempfile.mkdtemp()
+        self.calls = {"load": 0, "summarize": 0}
+
+    def tearDown(self):
+        """Remove the temporary store directory."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def _build_workflow(self, prompt_suffix="v1", summarize_cacheable=True):
+        calls = self.calls
+
+        def load(task, data):
+            calls["load"] += 1
+            return {"success": True, "result": f"document:{data['path']}"}
+
+        def summarize(task, data):
+            calls["summarize"] += 1
+            return {"success": True, "result": f"{data['text']}|{data['style']}"}
+
+        workflow = Workflow(workflow_id="incremental", name="Incremental Workflow")
+        workflow.add_task(DirectHandlerTask(
+            task_id="load", name="Load", handler=load, input_data={"path": "contract.txt"},
+            next_task_id_on_success="summarize",
+        ))
+        workflow.add_task(DirectHandlerTask(
+            task_id="summarize", name="Summarize", handler=summarize,
+            input_data={"text": "${load.result}", "style": prompt_suffix},
+            cacheable=summarize_cacheable,
+        ))
+        return workflow
+
+    def _run_sync(self, workflow):
+        engine = WorkflowEngine(
+            workflow=workflow,
+            llm_interface=MagicMock(spec=LLMInterface),
+            tool_registry=ToolRegistry(),
+            result_store=ResultStore(self.store_dir),
+        )
+        return engine.run()
+
+    def test_second_run_is_satisfied_from_store(self):
+        """An unchanged workflow executes nothing on the second run."""
+        first = self._run_sync(self._build_workflow())
+        second = self._run_sync(self._build_workflow())
+
+        self.assertEqual(self.calls, {"load": 1, "summarize": 1})
+        self.assertEqual(first["final_output"]["result"], second["final_output"]["result"])
+        self.assertTrue(second["final_output"]["metadata"]["cache_hit"])
+
+    def test_only_invalidated_subgraph_reruns(self):
+        """Changing a downstream input re-runs only the downstream task."""
+        self._run_sync(self._build_workflow("v1"))
+        result = self._run_sync(self._build_workflow("v2"))
+
+        self.assertEqual(self.calls, {"load": 1, "summarize": 2})
+        self.assertEqual(result["final_output"]["result"], "document:contract.txt|v2")
+
+    def test_non_cacheable_task_always_runs(self):
+        """Tasks marked cacheable=False are never restored."""
+        self._run_sync(self._build_workflow(summarize_cacheable=False))
+        self._run_sync(self._build_workflow(summarize_cacheable=False))
+
+        self.assertEqual(self.calls, {"load": 1, "summarize": 2})
+
+    def test_async_engine_uses_store(self):
+        """The asynchronous engine shares the same incremental behaviour."""
+        def run_async():
+            workflow = self._build_workflow()
+            engine = AsyncWorkflowEngine(
+                workflow=workflow,
+                llm_interface=MagicMock(spec=LLMInterface),
+                tool_registry=ToolRegistry(),
+                result_store=ResultStore(self.store_dir),
+            )
+            return asyncio.run(engine.async_run()), workflow
+
+        first, first_workflow = run_async()
+        second, second_workflow = run_async()
+        self.assertEqual(first["status"], "completed")
+        self.assertEqual(second["status"], "completed")
+        self.assertEqual(self.calls["load"], 1)
+        self.assertNotIn("cache_hit", first_workflow.tasks["load"].output_data["metadata"])
+        self.assertTrue(second_workflow.tasks["load"].output_data["metadata"]["cache_hit"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the semantic LLM response cache.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.llm.interface import LLMInterface
+
+if np is not None:
+    from core.llm.semantic_cache import SemanticCache
+    from tools.local_vs.embedders import HashingEmbedder
+
+SYSTEM = "You are a helpful assistant."
+PROMPT = "Summarize the quarterly sales report for the board."
+PARAPHRASE = "Please summarize the quarterly sales report for the board"
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSemanticCache(unittest.TestCase):
+    """Test similarity lookups, scoping, eviction and metrics."""  # noqa: D202
+
+    def setUp(self):
+        """Create a cache with the hashing embedder."""
+        self.cache = SemanticCache(HashingEmbedder(), threshold=0.9, max_entries=3)
+        self.cache.store(PROMPT, SYSTEM, "gpt-4o", {"success": True, "response": "Sales grew 12%."})
+
+    def test_similar_prompt_hits_within_scope(self):
+        """A paraphrase hits; another model, system message or stricter threshold misses."""
+        hit = self.cache.lookup(PARAPHRASE, SYSTEM, "gpt-4o")
+
+        self.assertEqual(hit["response"], "Sales grew 12%.")
+        self.assertTrue(hit["cached"])
+        self.assertGreater(hit["cache_similarity"], 0.9)
+        self.assertIsNone(self.cache.lookup(PARAPHRASE, SYSTEM, "gpt-4o-mini"))
+        self.assertIsNone(self.cache.lookup(PARAPHRASE, "You are a poet.", "gpt-4o"))
+        self.assertIsNone(self.cache.lookup(PARAPHRASE, SYSTEM, "gpt-4o", threshold=0.99))
+        self.assertIsNone(self.cache.lookup("Translate the employee handbook into Spanish", SYSTEM, "gpt-4o"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """When full, the entry used least recently is dropped first."""
+        for topic in ("marketing budget", "hiring plan"):
+            self.cache.store(f"Explain the {topic}", SYSTEM, "gpt-4o", {"success": True, "response": topic})
+        self.assertIsNotNone(self.cache.lookup(PROMPT, SYSTEM, "gpt-4o"))
+
+        self.cache.store("Explain the travel policy", SYSTEM, "gpt-4o", {"success": True, "response": "travel"})
+
+        self.assertIsNotNone(self.cache.lookup(PROMPT, SYSTEM, "gpt-4o"))
+        self.assertIsNone(self.cache.lookup("Explain the marketing budget", SYSTEM, "gpt-4o"))
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["entries"], 3)
+        self.assertEqual(metrics["evictions"], 1)
+
+    def test_prompts_differing_in_symbols_are_not_exact_hits(self):
+        """Operators and punctuation take part in exact keys; a threshold of 1.0 only serves exact matches."""
+        self.cache.store("Is x > 5?", SYSTEM, "gpt-4o", {"success": True, "response": "greater"})
+        self.cache.store("2+2", SYSTEM, "gpt-4o", {"success": True, "response": "4"})
+
+        self.assertIsNone(self.cache.lookup("Is x < 5?", SYSTEM, "gpt-4o", threshold=1.0))
+        self.assertIsNone(self.cache.lookup("2-2", SYSTEM, "gpt-4o", threshold=1.0))
+        self.assertIsNone(self.cache.lookup("Is x > 5", SYSTEM, "gpt-4o", threshold=1.0))
+        self.assertEqual(self.cache.lookup(" Is  x > 5?", SYSTEM, "gpt-4o", threshold=1.0)["response"], "greater")
+        self.assertEqual(self.cache.metrics()["exact_hits"], 1)
+
+    def test_metrics_report_hit_quality(self):
+        """Metrics separate exact and semantic hits and track their similarity."""
+        self.cache.lookup(f"  {PROMPT.replace(' ', '  ')}\n", SYSTEM, "gpt-4o")
+        self.cache.lookup(PARAPHRASE, SYSTEM, "gpt-4o")
+        self.cache.lookup("Summarize the annual sales report for the board", SYSTEM, "gpt-4o", threshold=0.99)
+
+        metrics = self.cache.metrics()
+        self.assertEqual((metrics["exact_hits"], metrics["semantic_hits"], metrics["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(metrics["hit_rate"], 2 / 3)
+        self.assertLess(metrics["min_hit_similarity"], 1.0)
+        self.assertGreater(metrics["mean_hit_similarity"], metrics["min_hit_similarity"])
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestLLMInterfaceSemanticCache(unittest.TestCase):
+    """Test that LLMInterface consults the cache before calling the model."""  # noqa: D202
+
+    def setUp(self):
+        """Create an interface whose client returns a fixed completion."""
+        self.cache = SemanticCache(HashingEmbedder(), threshold=0.9)
+        self.llm = LLMInterface(api_key="test-key", model="gpt-4o", semantic_cache=self.cache)
+        message = MagicMock(content="Sales grew 12%.", annotations=[])
+        self.llm.client = MagicMock()
+        self.llm.client.chat.completions.create.return_value = MagicMock(choices=[MagicMock(message=message)])
+
+    def test_similar_prompt_is_served_from_cache(self):
+        """The second, reworded call does not reach the model."""
+        first = self.llm.execute_llm_call(PROMPT)
+        second = self.llm.execute_llm_call(PARAPHRASE)
+
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["response"], first["response"])
+        self.assertEqual(self.llm.client.chat.completions.create.call_count, 1)
+
+    def test_cache_can_be_bypassed(self):
+        """use_cache=False and file search calls always reach the model."""
+        self.llm.execute_llm_call(PROMPT)
+        self.llm.execute_llm_call(PROMPT, use_cache=False)
+        self.llm.execute_llm_call(PROMPT, use_file_search=True, file_search_vector_store_ids=["vs_test123"])
+
+        self.assertEqual(self.llm.client.chat.completions.create.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
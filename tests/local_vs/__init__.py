@@ -0,0 +1,3 @@
+"""
+Tests for the embedded local vector store backend.
+"""
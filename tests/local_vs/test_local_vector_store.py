@@ -0,0 +1,127 @@
+"""
+Unit tests for the embedded local vector store backend.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.services import get_services, reset_services
+from core.tools.registry import ToolRegistry
+
+if np is not None:
+    from tools.local_vs import (
+        HashingEmbedder, LocalVectorStore, LocalVectorStoreBackend, chunk_text, get_local_vector_store
+    )
+    from tools.local_vs.embedders import normalize
+
+DOCUMENTS = {
+    "nda.txt": ("The non-disclosure agreement binds both parties to keep confidential information "
+                "secret for five years."),
+    "lease.txt": "The tenant pays monthly rent to the landlord and the lease renews automatically every year.",
+    "gdpr.txt": "Personal data must be processed lawfully, and data subjects may request erasure of their data.",
+}
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestLocalVectorStore(unittest.TestCase):
+    """Test chunking, indexing, search and persistence of local stores."""
+
+    def setUp(self):
+        """Create a backend over a temporary directory with the test documents."""
+        self.root = tempfile.mkdtemp()
+        self.backend = LocalVectorStoreBackend(os.path.join(self.root, "stores"), HashingEmbedder(256),
+                                               chunk_size=200, chunk_overlap=40)
+        self.vs_id = self.backend.create_vector_store("Contracts")
+        for name, text in DOCUMENTS.items():
+            path = os.path.join(self.root, name)
+            with open(path, "w") as f:
+                f.write(text)
+            result = self.backend.upload_and_add_file_to_vector_store(self.vs_id, path)
+            self.assertEqual(result["status"], "completed")
+
+    def tearDown(self):
+        """Remove the stores."""
+        reset_services()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_chunks_respect_size_and_overlap(self):
+        """Chunks stay within the size limit and consecutive chunks overlap."""
+        text = " ".join(f"word{i}" for i in range(400))
+        chunks = chunk_text(text, chunk_size=200, overlap=50)
+
+        self.assertTrue(all(len(chunk) <= 200 for chunk in chunks))
+        self.assertIn(chunks[0].split()[-1], chunks[1])
+        self.assertEqual(chunks[-1].split()[-1], "word399")
+
+    def test_search_ranks_relevant_file_first(self):
+        """The file sharing the query's terms is the top result."""
+        results = self.backend.search([self.vs_id], "request erasure of personal data", max_num_results=2)
+
+        self.assertEqual(results[0]["filename"], "gdpr.txt")
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        answer = self.backend.perform_file_read([self.vs_id], "monthly rent", 1, include_search_results=True)
+        self.assertTrue(answer.startswith("[1] lease.txt (score:"))
+
+    def test_store_survives_reopen_and_interrupted_write(self):
+        """A reopened store keeps its rows and drops chunk lines that were never committed."""
+        with open(os.path.join(self.root, "stores", self.vs_id, "chunks.jsonl"), "a") as f:
+            f.write('{"file_id": "file-x", "chunk": 0, "text": "uncommitted"}\n')
+
+        backend = LocalVectorStoreBackend(os.path.join(self.root, "stores"), HashingEmbedder(256))
+        backend.save_text_to_vector_store(self.vs_id, "Meeting notes: the supplier contract expires in March.")
+
+        results = backend.search([self.vs_id], "supplier contract expires", max_num_results=1)
+        self.assertTrue(results[0]["filename"].startswith("ltm_"))
+        self.assertEqual(backend.list_vector_stores(), [{"id": self.vs_id, "name": "Contracts"}])
+        texts = [result["text"] for result in backend.search([self.vs_id], "uncommitted", 10)]
+        self.assertEqual(len(texts), 4)
+        self.assertNotIn("uncommitted", texts)
+
+    def test_approximate_index_matches_exact_search(self):
+        """Queries answered through the IVF index find the exact nearest neighbours."""
+        rng = np.random.default_rng(7)
+        centers = normalize(rng.normal(size=(20, 32)).astype(np.float32))
+        vectors = normalize(centers[rng.integers(0, 20, 3000)] + 0.1 * rng.normal(size=(3000, 32)).astype(np.float32))
+
+        store = LocalVectorStore.create(os.path.join(self.root, "ann"), "vs_ann", "ann", "test", 32,
+                                        ann_min_vectors=1000)
+        store.add("file-a", "a.txt", [f"row {i}" for i in range(3000)], vectors)
+        self.assertIsNotNone(store._index)
+
+        hits = 0
+        for query in vectors[:50]:
+            exact = [row for _, row in store.search(query, 5, exact=True)]
+            approximate = [row for _, row in store.search(query, 5)]
+            hits += len(set(exact) & set(approximate))
+        self.assertGreaterEqual(hits / 250, 0.9)
+
+    def test_registry_routes_to_local_backend(self):
+        """The vector store tools use the local backend when the provider is "local"."""
+        reset_services()
+        get_local_vector_store(root=os.path.join(self.root, "registry"), embedder=HashingEmbedder(256))
+        registry = ToolRegistry()
+
+        created = registry.execute_tool("create_vector_store", {"name": "Notes", "provider": "local"})
+        self.assertTrue(created["success"], created)
+        vs_id = created["result"]
+        saved = registry.execute_tool("save_to_ltm", {"vector_store_id": vs_id, "text": "Renewal terms were agreed.",
+                                                      "provider": "local"})
+        self.assertTrue(saved["success"], saved)
+        read = registry.execute_tool("file_read", {"vector_store_ids": [vs_id], "query": "renewal terms",
+                                                   "provider": "local"})
+        self.assertIn("Renewal terms were agreed.", read["result"])
+        self.assertTrue(get_services().has_service("local_vector_store"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for bulk vector store ingestion.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tools.openai_vs.bulk_ingest import BulkIngestor, IngestionIndex
+from tools.openai_vs.ingestion_tracker import IngestionTracker
+
+
+class FakeAsyncClient:
+    """Records uploads and batch attachments; can fail a given upload once."""
+
+    def __init__(self, fail_names=()):
+        self.fail_names = set(fail_names)
+        self.uploads = []
+        self.batches = []
+        self.files = SimpleNamespace(create=self._create_file)
+        self.vector_stores = SimpleNamespace(
+            file_batches=SimpleNamespace(create=self._create_batch),
+            files=SimpleNamespace(list=self._list_files),
+        )
+
+    async def _create_file(self, file, purpose):
+        await asyncio.sleep(0)
+        if file.name in self.fail_names:
+            self.fail_names.discard(file.name)
+            raise RuntimeError("connection reset")
+        self.uploads.append(file.name)
+        return SimpleNamespace(id=f"file-{len(self.uploads):03d}")
+
+    async def _create_batch(self, vector_store_id, file_ids):
+        self.batches.append(list(file_ids))
+        return SimpleNamespace(id="vsfb_1", status="in_progress")
+
+    async def _list_files(self, vector_store_id, limit, order, after=None):
+        ids = [file_id for batch in self.batches for file_id in batch]
+        data = [SimpleNamespace(id=file_id, status="completed", last_error=None) for file_id in ids]
+        return SimpleNamespace(data=data, has_more=False)
+
+
+class TestBulkIngest(unittest.TestCase):
+    """Test deduplication, batching and resumption of bulk ingestion."""
+
+    def setUp(self):
+        """Create a small corpus with one duplicate file."""
+        self.root = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.root, "corpus")
+        os.makedirs(os.path.join(self.corpus, "sub"))
+        os.makedirs(os.path.join(self.corpus, ".hidden"))
+        for i in range(5):
+            self._write(f"doc{i}.txt", f"document {i}")
+        self._write("sub/copy.txt", "document 0")
+        self._write(".hidden/secret.txt", "hidden")
+        self.index_path = os.path.join(self.root, "index", "ingestion.jsonl")
+
+    def tearDown(self):
+        """Remove the corpus."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.corpus, name), "w") as f:
+            f.write(content)
+
+    def _ingest(self, client, wait=False, **kwargs):
+        tracker = IngestionTracker(client=client, min_interval=0.001)
+        ingestor = BulkIngestor("vs_test123", self.index_path, client=client, tracker=tracker, **kwargs)
+        return asyncio.run(ingestor.ingest([self.corpus], wait=wait))
+
+    def test_uploads_unique_content_in_batches(self):
+        """Duplicates and hidden files are skipped and attachment is batched."""
+        client = FakeAsyncClient()
+        report = self._ingest(client, batch_size=2)
+
+        self.assertEqual(report["scanned"], 6)
+        self.assertEqual(report["duplicates"], 1)
+        self.assertEqual(report["uploaded"], 5)
+        self.assertEqual(report["attached"], 5)
+        self.assertEqual([len(batch) for batch in client.batches], [2, 2, 1])
+
+    def test_rerun_skips_ingested_files(self):
+        """A second run uploads only new content."""
+        self._ingest(FakeAsyncClient(), wait=True)
+        self._write("doc9.txt", "document 9")
+
+        client = FakeAsyncClient()
+        report = self._ingest(client, wait=True)
+
+        self.assertEqual(client.uploads, ["doc9.txt"])
+        self.assertEqual(report["skipped"], 5)
+        self.assertEqual(report["statuses"], {"file-001": "completed"})
+
+    def test_resumes_after_failed_upload(self):
+        """Files that failed to upload are retried without re-uploading the others."""
+        first = self._ingest(FakeAsyncClient(fail_names=["doc3.txt"]))
+        self.assertEqual(first["uploaded"], 4)
+        self.assertEqual(len(first["errors"]), 1)
+
+        client = FakeAsyncClient()
+        report = self._ingest(client)
+        self.assertEqual(client.uploads, ["doc3.txt"])
+        self.assertEqual(report["attached"], 1)
+
+    def test_index_survives_truncated_journal(self):
+        """An incomplete last journal line is discarded and later events still load."""
+        index = IngestionIndex(self.index_path)
+        index.record_upload("abc", "file-abc", "/tmp/a.txt", 3)
+        with open(self.index_path, "a") as f:
+            f.write('{"op": "upload", "sha256": "de')
+
+        index = IngestionIndex(self.index_path)
+        index.record_attachments("vs_test123", ["file-abc"], "completed")
+
+        index = IngestionIndex(self.index_path)
+        self.assertEqual(index.file_id("abc"), "file-abc")
+        self.assertEqual(index.attachment_status("vs_test123", "file-abc"), "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for the vector store ingestion tracker.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tools.openai_vs.ingestion_tracker import FileIngestionError, IngestionTracker
+from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
+
+
+class FakeVectorStoreFiles:
+    """Serves file listings whose statuses advance one step per listing round."""
+
+    def __init__(self, timelines):
+        self.timelines = timelines
+        self.rounds = 0
+        self.calls = []
+
+    async def list(self, vector_store_id, limit, order, after=None):
+        self.calls.append((vector_store_id, after))
+        if after is None:
+            self.rounds += 1
+        ids = sorted(self.timelines)
+        start = ids.index(after) + 1 if after else 0
+        page_ids = ids[start:start + limit]
+        data = []
+        for file_id in page_ids:
+            timeline = self.timelines[file_id]
+            status = timeline[min(self.rounds - 1, len(timeline) - 1)]
+            last_error = SimpleNamespace(message="bad file") if status == "failed" else None
+            data.append(SimpleNamespace(id=file_id, status=status, last_error=last_error))
+        return SimpleNamespace(data=data, has_more=start + limit < len(ids))
+
+
+class TestIngestionTracker(unittest.TestCase):
+    """Test batched polling of file ingestion status."""
+
+    def _tracker(self, timelines, **kwargs):
+        files = FakeVectorStoreFiles(timelines)
+        client = SimpleNamespace(vector_stores=SimpleNamespace(files=files))
+        options = {"min_interval": 0.001, "max_interval": 0.002}
+        options.update(kwargs)
+        return IngestionTracker(client=client, **options), files
+
+    def test_many_files_share_one_listing_per_round(self):
+        """All files of a store are resolved by the same listing calls."""
+        timelines = {f"file-{i:03d}": ["in_progress"] * (i % 3) + ["completed"] for i in range(50)}
+        tracker, files = self._tracker(timelines)
+
+        async def run():
+            return await tracker.wait_all(("vs_test123", file_id) for file_id in timelines)
+
+        results = asyncio.run(run())
+        self.assertEqual([r["status"] for r in results], ["completed"] * 50)
+        self.assertEqual(files.rounds, 3)
+        self.assertEqual(len(files.calls), 3)
+        self.assertEqual(tracker.pending_count(), 0)
+
+    def test_failed_file_raises_and_is_reported(self):
+        """A failed file fails its future and is reported by wait_all."""
+        tracker, _ = self._tracker({"file-a": ["completed"], "file-b": ["in_progress", "failed"]})
+
+        async def run():
+            with self.assertRaises(FileIngestionError) as ctx:
+                await tracker.wait("vs_test123", "file-b")
+            self.assertEqual(ctx.exception.last_error, "bad file")
+            return await tracker.wait_all([("vs_test123", "file-a"), ("vs_test123", "file-b")])
+
+        results = asyncio.run(run())
+        self.assertEqual(results[0], {"file_id": "file-a", "status": "completed"})
+        self.assertEqual(results[1]["status"], "failed")
+
+    def test_listing_stops_once_all_files_seen(self):
+        """Pagination stops as soon as every pending file has been found."""
+        timelines = {f"file-{i:03d}": ["completed"] for i in range(250)}
+        tracker, files = self._tracker(timelines)
+
+        result = asyncio.run(tracker.wait("vs_test123", "file-120"))
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(len(files.calls), 2)
+
+    def test_timeout_reports_in_progress(self):
+        """Files still processing after the timeout resolve as in progress."""
+        tracker, _ = self._tracker({"file-a": ["in_progress"]}, timeout=0.01)
+
+        result = asyncio.run(tracker.wait("vs_test123", "file-a"))
+        self.assertEqual(result["status"], "in_progress")
+
+
+class TestUploadSubmittedMode(unittest.TestCase):
+    """Test that the upload tool can return before processing finishes."""
+
+    def test_submitted_mode_skips_polling(self):
+        """wait=False returns after adding the file without polling."""
+        client = MagicMock()
+        client.api_key = "test-api-key"
+        client.files.create.return_value = MagicMock(id="file-test123")
+        http_client = MagicMock()
+        http_client.post.return_value = MagicMock(status_code=200)
+        tool = UploadFileToVectorStoreTool(client=client, http_client=http_client)
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as temp_file:
+            temp_file.write("content")
+        self.addCleanup(os.remove, temp_file.name)
+
+        result = tool.upload_and_add_file_to_vector_store("vs_test123", temp_file.name, wait=False)
+
+        self.assertEqual(result["status"], "submitted")
+        self.assertEqual(result["file_id"], "file-test123")
+        http_client.get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the LTM write-behind buffer.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tools.openai_vs.ltm_buffer import LTMWriteBuffer
+
+
+class FakeUploadTool:
+    """Records the content of uploaded files; can fail the next uploads."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.uploads = []
+
+    def upload_and_add_file_to_vector_store(self, vector_store_id, file_path, purpose="assistants", wait=True):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection reset")
+        with open(file_path, "r", encoding="utf-8") as f:
+            self.uploads.append((vector_store_id, f.read()))
+        return {"file_id": f"file-{len(self.uploads):03d}", "vector_store_id": vector_store_id, "status": "completed"}
+
+
+class TestLTMWriteBuffer(unittest.TestCase):
+    """Test batching, flushing and recovery of buffered LTM writes."""
+
+    def setUp(self):
+        """Create an empty journal directory."""
+        self.journal_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the journal directory."""
+        shutil.rmtree(self.journal_dir, ignore_errors=True)
+
+    def _buffer(self, upload_tool, **kwargs):
+        options = {"max_delay": 60, "fsync": False}
+        options.update(kwargs)
+        buffer = LTMWriteBuffer(self.journal_dir, upload_tool=upload_tool, **options)
+        self.addCleanup(buffer.close)
+        return buffer
+
+    def test_flush_consolidates_entries_per_store(self):
+        """An explicit flush uploads one file per vector store."""
+        tool = FakeUploadTool()
+        buffer = self._buffer(tool)
+        buffer.append("vs_a", "first note")
+        buffer.append("vs_a", "second note", {"source": "chat"})
+        result = buffer.append("vs_b", "other note")
+        self.assertEqual(result["status"], "buffered")
+
+        results = buffer.flush()
+
+        self.assertEqual(sorted(r["entry_count"] for r in results), [1, 2])
+        self.assertEqual(len(tool.uploads), 2)
+        content = dict(tool.uploads)["vs_a"]
+        self.assertIn("first note", content)
+        self.assertIn('metadata: {"source": "chat"}', content)
+        self.assertEqual(buffer.pending_count(), 0)
+        self.assertEqual(os.listdir(self.journal_dir), [])
+
+    def test_entry_threshold_triggers_background_flush(self):
+        """Reaching max_entries flushes without an explicit call."""
+        tool = FakeUploadTool()
+        buffer = self._buffer(tool, max_entries=3)
+        for i in range(3):
+            buffer.append("vs_a", f"note {i}")
+
+        deadline = time.monotonic() + 5
+        while not tool.uploads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(tool.uploads), 1)
+        self.assertEqual(buffer.pending_count("vs_a"), 0)
+
+    def test_recovers_journaled_entries_after_restart(self):
+        """Entries left in the journal by a previous process are uploaded once."""
+        buffer = LTMWriteBuffer(self.journal_dir, upload_tool=FakeUploadTool(), max_delay=60, fsync=False)
+        buffer.append("vs_a", "survives a crash")
+        with open(os.path.join(self.journal_dir, "vs_a.jsonl"), "a") as f:
+            f.write('{"id": "partial", "te')
+
+        tool = FakeUploadTool()
+        restarted = self._buffer(tool)
+        restarted.append("vs_a", "written after restart")
+        restarted.flush()
+
+        self.assertEqual(restarted.pending_count("vs_a"), 0)
+        content = "".join(upload[1] for upload in tool.uploads)
+        self.assertIn("survives a crash", content)
+        self.assertIn("written after restart", content)
+
+    def test_failed_flush_keeps_entries(self):
+        """A failed upload re-queues its entries ahead of newer ones."""
+        tool = FakeUploadTool(failures=1)
+        buffer = self._buffer(tool)
+        buffer.append("vs_a", "older note")
+
+        with self.assertRaises(RuntimeError):
+            buffer.flush()
+        buffer.append("vs_a", "newer note")
+        self.assertEqual(buffer.pending_count("vs_a"), 2)
+
+        buffer.flush()
+        content = tool.uploads[0][1]
+        self.assertLess(content.index("older note"), content.index("newer note"))
+        self.assertEqual(os.listdir(self.journal_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,8 +23,9 @@ class TestMinimalUploadFile(unittest.TestCase):
         self.mock_client = MagicMock()
         self.mock_client.api_key = "test-api-key"
 
-        # Create the tool with the mock client
-        self.tool = UploadFileToVectorStoreTool(client=self.mock_client)
+        # Create the tool with mock OpenAI and HTTP clients
+        self.mock_http = MagicMock()
+        self.tool = UploadFileToVectorStoreTool(client=self.mock_client, http_client=self.mock_http)
 
         # Create a test file
         with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
@@ -70,28 +71,20 @@ class TestMinimalUploadFile(unittest.TestCase):
                 with patch.object(self.mock_client.files, "create") as mock_create:
                     mock_create.return_value = MagicMock(id="file-123")
 
-                    # Mock the HTTPX client
-                    with patch("httpx.Client") as mock_client:
-                        mock_http = MagicMock()
-                        mock_client.return_value.__enter__.return_value = mock_http
-
-                        # Mock the response
-                        mock_response = MagicMock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = {"id": "batch-123"}
-                        mock_http.post.return_value = mock_response
-
-                        # Mock the get response for status
-                        mock_get_response = MagicMock()
-                        mock_get_response.status_code = 200
-                        mock_get_response.json.return_value = {"status": "completed"}
-                        mock_http.get.return_value = mock_get_response
-
-                        # Skip sleep to speed up tests
-                        with patch("time.sleep"):
-                            self.tool.upload_and_add_file_to_vector_store(
-                                self.test_vector_store_id, self.test_file_path, purpose=purpose
-                            )
+                    # Mock the response
+                    mock_response = MagicMock()
+                    mock_response.status_code = 200
+                    mock_response.json.return_value = {"id": "batch-123"}
+                    self.mock_http.post.return_value = mock_response
+
+                    # Report the file as processed without polling
+                    with patch(
+                        "tools.openai_vs.upload_file_to_vector_store.wait_for_file",
+                        return_value={"file_id": "file-123", "status": "completed"},
+                    ):
+                        self.tool.upload_and_add_file_to_vector_store(
+                            self.test_vector_store_id, self.test_file_path, purpose=purpose
+                        )
             except ValueError:
                 self.fail(f"Purpose {purpose} should be valid but raised ValueError")
 
@@ -0,0 +1,217 @@
+"""
+Tests for the threaded MCP time server and its shared upstream client.
+"""
+
+import datetime
+import http.client
+import json
+import os
+import socketserver
+import struct
+import sys
+import threading
+import time
+import unittest
+
+# Add parent directory to path to import framework modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp.simple_mcp_time_server import (
+    TIME_1900_EPOCH,
+    ThreadedMCPServer,
+    UpstreamTimeClient,
+    create_server,
+)
+
+API_KEY = "secret"
+# The fake time server runs an hour ahead of the local clock
+OFFSET = 3600
+
+
+class FakeTimeServer:
+    """RFC 868 time server on localhost that answers after a delay and counts its connections."""  # noqa: D202
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.connections = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                with fake.lock:
+                    fake.connections += 1
+                    fake.running += 1
+                    fake.max_running = max(fake.max_running, fake.running)
+                time.sleep(fake.delay)
+                with fake.lock:
+                    fake.running -= 1
+                self.request.sendall(struct.pack("!I", int(time.time()) + OFFSET + TIME_1900_EPOCH))
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_threads(target, count):
+    """Run target(i) in count threads at once and return the results or exceptions in order."""
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class TestUpstreamTimeClient(unittest.TestCase):
+    """Test coalescing, caching and connection limits of UpstreamTimeClient."""  # noqa: D202
+
+    def test_concurrent_queries_share_one_connection(self):
+        """Simultaneous queries to a server wait for a single connection and reuse its time."""
+        client = UpstreamTimeClient(cache_ttl=5)
+        with FakeTimeServer(delay=0.2) as server:
+            results = run_threads(lambda _: client.get_time("127.0.0.1", server.port), 8)
+
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(sorted(cached for _, cached in results), [False] + [True] * 7)
+        self.assertEqual(client.stats(), {"hits": 7, "misses": 1, "cache_ttl": 5})
+        for time_obj, _ in results:
+            self.assertAlmostEqual(time_obj.timestamp() - time.time(), OFFSET, delta=2)
+
+    def test_cached_time_expires_after_its_ttl(self):
+        """The remote time is reused within cache_ttl and fetched again afterwards."""
+        client = UpstreamTimeClient(cache_ttl=0.1)
+        with FakeTimeServer() as server:
+            first = client.get_time("127.0.0.1", server.port)
+            second = client.get_time("127.0.0.1", server.port)
+            time.sleep(0.15)
+            third = client.get_time("127.0.0.1", server.port)
+
+        self.assertEqual([first[1], second[1], third[1]], [False, True, False])
+        self.assertEqual(server.connections, 2)
+        self.assertIsInstance(second[0], datetime.datetime)
+
+    def test_connections_per_server_are_bounded(self):
+        """Without a cache every query connects, but never more than max_connections at once."""
+        client = UpstreamTimeClient(cache_ttl=0, max_connections=2)
+        with FakeTimeServer(delay=0.1) as server:
+            results = run_threads(lambda _: client.get_time("127.0.0.1", server.port), 6)
+
+        self.assertEqual([cached for _, cached in results], [False] * 6)
+        self.assertEqual(server.connections, 6)
+        self.assertEqual(server.max_running, 2)
+
+    def test_waiting_for_a_connection_times_out(self):
+        """A query that cannot get a connection within its timeout raises TimeoutError."""
+        client = UpstreamTimeClient(cache_ttl=0, max_connections=1)
+        with FakeTimeServer(delay=0.3) as server:
+            holder = threading.Thread(target=client.get_time, args=("127.0.0.1", server.port, 2))
+            holder.start()
+            time.sleep(0.05)
+            with self.assertRaisesRegex(TimeoutError, "No hay conexiones disponibles"):
+                client.get_time("127.0.0.1", server.port, timeout=0.1)
+            holder.join()
+
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(client.stats()["misses"], 1)
+
+
+class TestThreadedMCPServer(unittest.TestCase):
+    """Test the HTTP server built by create_server."""  # noqa: D202
+
+    def _serve(self, time_port, **options):
+        """Start an HTTP server on a free port, stopped on cleanup."""
+        server = create_server(host="127.0.0.1", port=0, time_host="127.0.0.1", time_port=time_port,
+                               api_key=API_KEY, **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    @staticmethod
+    def _request(server, method, path, body=None, auth=True):
+        """Send a request and return its status and decoded JSON body."""
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        headers = {"Authorization": f"Bearer {API_KEY}"} if auth else {}
+        try:
+            connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_requests_are_served_concurrently(self):
+        """Slow tool calls run in parallel and do not hold up health checks."""
+        with FakeTimeServer(delay=0.3) as time_server:
+            server = self._serve(time_server.port, cache_ttl=0)
+            started = time.monotonic()
+            calls = run_threads(lambda _: self._request(server, "POST", "/execute", {"tool": "get_time"}), 4)
+            elapsed = time.monotonic() - started
+
+            slow = threading.Thread(target=self._request, args=(server, "POST", "/execute", {"tool": "get_time"}))
+            slow.start()
+            time.sleep(0.05)
+            started = time.monotonic()
+            health_status, health = self._request(server, "GET", "/health", auth=False)
+            health_time = time.monotonic() - started
+            slow.join()
+
+        self.assertIsInstance(server, ThreadedMCPServer)
+        self.assertEqual([status for status, _ in calls], [200] * 4)
+        self.assertLess(elapsed, 0.9)  # One after another, the calls would take 1.2s
+        self.assertEqual(health_status, 200)
+        self.assertLess(health_time, 0.2)
+        self.assertEqual(health["cache"]["misses"], 4)
+
+    def test_handlers_share_the_upstream_cache(self):
+        """Requests handled by different threads reuse one cached time and report it."""
+        with FakeTimeServer() as time_server:
+            server = self._serve(time_server.port, cache_ttl=5)
+            responses = [self._request(server, "POST", "/execute", {"tool": "get_time"}) for _ in range(3)]
+            _, health = self._request(server, "GET", "/health", auth=False)
+
+        self.assertEqual([body["result"]["cached"] for _, body in responses], [False, True, True])
+        self.assertEqual(time_server.connections, 1)
+        self.assertEqual(health["cache"], {"hits": 2, "misses": 1, "cache_ttl": 5})
+
+    def test_upstream_and_auth_errors(self):
+        """Unauthenticated calls get 401; an unreachable time server gets 500."""
+        with FakeTimeServer() as time_server:
+            port = time_server.port
+        server = self._serve(port)
+
+        self.assertEqual(self._request(server, "POST", "/execute", {"tool": "get_time"}, auth=False)[0], 401)
+        status, body = self._request(server, "POST", "/execute", {"tool": "get_time", "parameters": {"timeout": 1}})
+        self.assertEqual(status, 500)
+        self.assertEqual(body["status"], "error")
+
+    def test_single_threaded_server(self):
+        """threaded=False keeps the plain HTTPServer."""
+        server = create_server(host="127.0.0.1", port=0, threaded=False)
+        server.server_close()
+
+        self.assertNotIsInstance(server, ThreadedMCPServer)
+        self.assertEqual(ThreadedMCPServer.request_queue_size, 128)
+        self.assertTrue(ThreadedMCPServer.daemon_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,11 +6,13 @@ import os
 import sys
 import tempfile
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.tools.registry import ToolRegistry
+from tools.openai_vs.ingestion_tracker import IngestionTracker
 from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
 from core.tools.registry_access import get_registry, reset_registry
 
@@ -29,7 +31,8 @@ class TestUploadFileToVectorStoreTool(unittest.TestCase):
         self.patcher = patch("openai.OpenAI", return_value=self.mock_client)
         self.mock_openai = self.patcher.start()
 
-        self.tool = UploadFileToVectorStoreTool(client=self.mock_client)
+        self.mock_http_client = MagicMock()
+        self.tool = UploadFileToVectorStoreTool(client=self.mock_client, http_client=self.mock_http_client)
 
         with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
             self.test_file_path = temp_file.name
@@ -57,30 +60,36 @@ class TestUploadFileToVectorStoreTool(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             self.tool.upload_and_add_file_to_vector_store(self.test_vector_store_id, "/non/existent/file.txt")
 
-    @patch("time.sleep", return_value=None)  # Skip sleeping during tests
-    @patch("httpx.Client")
-    def test_upload_and_add_file_success(self, mock_httpx_client, mock_sleep):
-        """Test successful file upload and addition to vector store."""
-        # Mock file upload via OpenAI client
+    def _use_tracker(self, statuses, **options):
+        """Make the tool wait on a tracker whose listings report the given statuses in turn."""
+        calls = []
+
+        async def list_files(vector_store_id, limit, order, after=None):
+            calls.append(vector_store_id)
+            status = statuses[min(len(calls), len(statuses)) - 1]
+            last_error = SimpleNamespace(message="Test error message") if status == "failed" else None
+            vs_file = SimpleNamespace(id=self.test_file_id, status=status, last_error=last_error)
+            return SimpleNamespace(data=[vs_file], has_more=False)
+
+        client = SimpleNamespace(vector_stores=SimpleNamespace(files=SimpleNamespace(list=list_files)))
+        self.tool.tracker = IngestionTracker(client=client, min_interval=0.001, max_interval=0.002, **options)
+        return calls
+
+    def _mock_upload(self):
+        """Mock the file upload and its addition to the vector store."""
         mock_file_upload = MagicMock()
         mock_file_upload.id = self.test_file_id
         self.mock_client.files.create.return_value = mock_file_upload
 
-        # Mock HTTPX client for direct API calls
-        mock_client_instance = MagicMock()
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
-
-        # Mock successful response for adding file to vector store
         mock_post_response = MagicMock()
         mock_post_response.status_code = 200
         mock_post_response.json.return_value = {"id": self.test_batch_id}
-        mock_client_instance.post.return_value = mock_post_response
+        self.mock_http_client.post.return_value = mock_post_response
 
-        # Mock successful status check response
-        mock_get_response = MagicMock()
-        mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"status": "completed"}
-        mock_client_instance.get.return_value = mock_get_response
+    def test_upload_and_add_file_success(self):
+        """Test successful file upload and addition to vector store."""
+        self._mock_upload()
+        calls = self._use_tracker(["in_progress", "completed"])
 
         # Run the test
         result = self.tool.upload_and_add_file_to_vector_store(self.test_vector_store_id, self.test_file_path)
@@ -93,89 +102,40 @@ class TestUploadFileToVectorStoreTool(unittest.TestCase):
         self.mock_client.files.create.assert_called_once()
 
         # Verify HTTPX was used for direct API calls
-        mock_client_instance.post.assert_called_once()
+        self.mock_http_client.post.assert_called_once()
         expected_url = f"https://api.openai.com/v1/vector_stores/{self.test_vector_store_id}/files"
-        mock_client_instance.post.assert_called_with(
+        self.mock_http_client.post.assert_called_with(
             expected_url,
             json={"file_id": self.test_file_id},
             headers={"Authorization": "Bearer test-api-key", "Content-Type": "application/json"},
         )
 
-        # Verify polling was done
-        mock_client_instance.get.assert_called_once()
+        # Verify the store's tracker did the polling, not a per-file loop
+        self.assertEqual(calls, [self.test_vector_store_id] * 2)
+        self.mock_http_client.get.assert_not_called()
 
-    @patch("time.sleep", return_value=None)  # Skip sleeping during tests
-    @patch("httpx.Client")
-    def test_upload_and_add_file_failure(self, mock_httpx_client, mock_sleep):
+    def test_upload_and_add_file_failure(self):
         """Test file upload failure handling."""
-        # Mock file upload via OpenAI client
-        mock_file_upload = MagicMock()
-        mock_file_upload.id = self.test_file_id
-        self.mock_client.files.create.return_value = mock_file_upload
-
-        # Mock HTTPX client for direct API calls
-        mock_client_instance = MagicMock()
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
-
-        # Mock successful response for adding file to vector store
-        mock_post_response = MagicMock()
-        mock_post_response.status_code = 200
-        mock_post_response.json.return_value = {"id": self.test_batch_id}
-        mock_client_instance.post.return_value = mock_post_response
-
-        # Mock failed status check response
-        mock_get_response = MagicMock()
-        mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"status": "failed", "last_error": "Test error message"}
-        mock_client_instance.get.return_value = mock_get_response
+        self._mock_upload()
+        self._use_tracker(["failed"])
 
         # Run the test expecting an error
-        with self.assertRaises(RuntimeError):
+        with self.assertRaises(RuntimeError) as ctx:
             self.tool.upload_and_add_file_to_vector_store(self.test_vector_store_id, self.test_file_path)
+        self.assertIn("Test error message", str(ctx.exception))
 
-    @patch("time.sleep", return_value=None)  # Skip sleeping during tests
-    @patch("httpx.Client")
-    def test_upload_and_add_file_timeout(self, mock_httpx_client, mock_sleep):
+    def test_upload_and_add_file_timeout(self):
         """Test file upload timeout handling."""
-        # Mock file upload via OpenAI client
-        mock_file_upload = MagicMock()
-        mock_file_upload.id = self.test_file_id
-        self.mock_client.files.create.return_value = mock_file_upload
-
-        # Mock HTTPX client for direct API calls
-        mock_client_instance = MagicMock()
-        mock_httpx_client.return_value.__enter__.return_value = mock_client_instance
-
-        # Mock successful response for adding file to vector store
-        mock_post_response = MagicMock()
-        mock_post_response.status_code = 200
-        mock_post_response.json.return_value = {"id": self.test_batch_id}
-        mock_client_instance.post.return_value = mock_post_response
+        self._mock_upload()
+        self._use_tracker(["in_progress"], timeout=0.01)
 
-        # Mock in-progress status check response
-        mock_get_response = MagicMock()
-        mock_get_response.status_code = 200
-        mock_get_response.json.return_value = {"status": "in_progress"}
-        mock_client_instance.get.return_value = mock_get_response
-
-        # Limit polling attempts for test
-        original_max_attempts = self.tool.upload_and_add_file_to_vector_store.__globals__.get(
-            "max_polling_attempts", 30
-        )
-        try:
-            self.tool.upload_and_add_file_to_vector_store.__globals__["max_polling_attempts"] = 2
-
-            # Run the test - should return in_progress status instead of raising error
-            result = self.tool.upload_and_add_file_to_vector_store(self.test_vector_store_id, self.test_file_path)
-
-            # Verify results
-            self.assertEqual(result["file_id"], self.test_file_id)
-            self.assertEqual(result["status"], "in_progress")
-            self.assertIn("message", result)
+        # Run the test - should return in_progress status instead of raising error
+        result = self.tool.upload_and_add_file_to_vector_store(self.test_vector_store_id, self.test_file_path)
 
-        finally:
-            # Restore original value
-            self.tool.upload_and_add_file_to_vector_store.__globals__["max_polling_attempts"] = original_max_attempts
+        # Verify results
+        self.assertEqual(result["file_id"], self.test_file_id)
+        self.assertEqual(result["status"], "in_progress")
+        self.assertIn("message", result)
 
     @patch(
         "tools.openai_vs.upload_file_to_vector_store.UploadFileToVectorStoreTool.upload_and_add_file_to_vector_store"
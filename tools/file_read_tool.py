@@ -1,16 +1,17 @@
 import json
-import os
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 # Load environment variables from .env file
 load_dotenv()
 
 
 class FileReadTool:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client(OpenAI)
 
     def perform_file_read(self, vector_store_ids, query, max_num_results=5, include_search_results=False):
         """
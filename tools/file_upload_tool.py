@@ -1,15 +1,15 @@
-import os
-
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 # Load environment variables from .env file
 load_dotenv()
 
 
 class FileUploadTool:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client(OpenAI)
 
     def upload_file(self, file_path, purpose="assistants"):
         """
@@ -0,0 +1,25 @@
+"""
+Embedded local vector store backend for the Dawn AI Agent Framework.
+
+Requires numpy. Select it with vector_store.provider set to "local".
+"""
+
+from tools.local_vs.embedders import HashingEmbedder, SentenceTransformerEmbedder, create_embedder
+from tools.local_vs.vector_store import (
+    IVFIndex,
+    LocalVectorStore,
+    LocalVectorStoreBackend,
+    chunk_text,
+    get_local_vector_store,
+)
+
+__all__ = [
+    "HashingEmbedder",
+    "IVFIndex",
+    "LocalVectorStore",
+    "LocalVectorStoreBackend",
+    "SentenceTransformerEmbedder",
+    "chunk_text",
+    "create_embedder",
+    "get_local_vector_store",
+]
@@ -0,0 +1,130 @@
+"""
+Local text embedders for the embedded vector store backend.
+
+An embedder is any object with a ``name`` and a ``dimension`` attribute and an
+``embed(texts)`` method returning a float32 array of shape (len(texts), dimension).
+"""
+
+import hashlib
+import re
+from typing import Any, List, Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder based on feature hashing.
+
+    Word unigrams and bigrams are hashed into a fixed number of signed buckets
+    and the result is L2-normalized. It captures lexical overlap only, which is
+    enough for keyword-heavy retrieval and for running retrieval workflows
+    offline in tests and CI.
+    """
+
+    def __init__(self, dimension: int = 512):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimension: Number of hash buckets (size of the vectors).
+        """
+        if dimension < 8:
+            raise ValueError("Embedding dimension must be at least 8")
+        self.dimension = dimension
+        self.name = f"hashing-{dimension}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            np.ndarray: L2-normalized float32 vectors, one row per text.
+        """
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dimension] += sign
+        return normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """
+    Embedder backed by a local sentence-transformers model.
+
+    Requires the optional ``sentence-transformers`` package. The model is loaded
+    on first use and runs on the local machine.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        """
+        Initialize the embedder.
+
+        Args:
+            model_name: Name or path of the sentence-transformers model.
+            batch_size: Number of texts encoded per model call.
+
+        Raises:
+            ImportError: If sentence-transformers is not installed.
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                f"Embedding model '{model_name}' requires the 'sentence-transformers' package. "
+                "Install it or set vector_store.embedding_model to 'hashing'."
+            ) from e
+
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            np.ndarray: L2-normalized float32 vectors, one row per text.
+        """
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True)
+        return normalize(vectors.astype(np.float32, copy=False))
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving zero rows unchanged."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def create_embedder(name: str) -> Any:
+    """
+    Create an embedder from its configured name.
+
+    Args:
+        name: "hashing" or "hashing-<dimension>" for the HashingEmbedder; any other
+              value is loaded as a sentence-transformers model.
+
+    Returns:
+        The embedder.
+    """
+    if name == "hashing":
+        return HashingEmbedder()
+    if name.startswith("hashing-"):
+        return HashingEmbedder(int(name.split("-", 1)[1]))
+    return SentenceTransformerEmbedder(name)
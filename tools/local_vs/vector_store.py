@@ -0,0 +1,599 @@
+"""
+Embedded vector store backend that keeps vectors in memory-mapped NumPy arrays.
+
+Each store is a directory holding:
+
+- ``meta.json``: name, embedder, dimension, committed row count and files.
+- ``vectors.f32``: float32 matrix of unit vectors, memory-mapped and grown by doubling.
+- ``chunks.jsonl``: one line per vector row with the chunk text and its file.
+- ``ivf.npz``: optional inverted-file index used for approximate search.
+
+Rows are appended to chunks.jsonl and vectors.f32 before meta.json is rewritten
+with the new count, so an interrupted upload leaves the store at its previous
+committed state.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tools.local_vs.embedders import create_embedder, normalize
+from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
+
+logger = logging.getLogger(__name__)
+
+_backend_lock = threading.Lock()
+
+EMBED_BATCH_SIZE = 256
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """
+    Split text into overlapping chunks, preferring paragraph, line, sentence and word breaks.
+
+    Args:
+        text: The text to split.
+        chunk_size: Maximum characters per chunk.
+        overlap: Characters shared by consecutive chunks.
+
+    Returns:
+        List[str]: The non-empty chunks, in order.
+    """
+    if overlap >= chunk_size:
+        raise ValueError("Chunk overlap must be smaller than the chunk size")
+
+    chunks = []
+    start, length = 0, len(text)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            for separator in ("\n\n", "\n", ". ", " "):
+                cut = text.rfind(separator, start + chunk_size // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+        # Start the next chunk on a word boundary inside the overlap
+        next_start = max(end - overlap, start + 1)
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return chunks
+
+
+class IVFIndex:
+    """
+    Inverted-file index for approximate nearest-neighbour search.
+
+    Vectors are clustered with spherical k-means; a query scores only the rows
+    of the nprobe clusters whose centroids are closest to it.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray, indexed_count: int):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.indexed_count = indexed_count
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        """
+        Cluster vectors into nlist inverted lists.
+
+        Args:
+            vectors: Unit vectors to index.
+            nlist: Number of clusters; defaults to about 2 * sqrt(len(vectors)).
+            iterations: k-means iterations, run on a sample of the vectors.
+            seed: Seed of the sampling.
+
+        Returns:
+            IVFIndex: The index of all rows of vectors.
+        """
+        count = len(vectors)
+        nlist = min(nlist or max(1, int(2 * np.sqrt(count))), count)
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(count, min(count, nlist * 32), replace=False))])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            members = np.bincount(assignments, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(members)[:-1]))
+            sums = centroids.copy()
+            # Clusters that lost all their members keep their previous centroid
+            filled = members > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            centroids = normalize(sums)
+
+        assignments = np.empty(count, dtype=np.int32)
+        for start in range(0, count, 65536):
+            block = np.asarray(vectors[start:start + 65536])
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        order = np.argsort(assignments, kind="stable").astype(np.int64)
+        offsets = np.searchsorted(assignments[order], np.arange(nlist + 1)).astype(np.int64)
+        return cls(centroids.astype(np.float32), order, offsets, count)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Return the rows in the nprobe clusters closest to the query."""
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in probes])
+
+    def save(self, path: str) -> None:
+        """Write the index to an .npz file."""
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                 indexed_count=np.array(self.indexed_count))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """Read an index written by save()."""
+        with np.load(path) as data:
+            return cls(data["centroids"], data["order"], data["offsets"], int(data["indexed_count"]))
+
+
+class LocalVectorStore:
+    """
+    One embedded vector store.
+
+    Top-k queries score every committed row with one matrix-vector product over
+    the memory-mapped vectors. Once the store holds ann_min_vectors rows, an IVF
+    index is built and queries only score the probed clusters plus the rows
+    added since the index was built.
+    """
+
+    def __init__(self, path: str, ann_min_vectors: int = 50000, nprobe: int = 8):
+        """
+        Open an existing store.
+
+        Args:
+            path: Directory of the store.
+            ann_min_vectors: Row count from which the approximate index is used.
+            nprobe: Clusters scored per approximate query.
+        """
+        self.path = path
+        self.ann_min_vectors = ann_min_vectors
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+
+        with open(self._file("meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.id = self.meta["id"]
+        self.dimension = self.meta["dimension"]
+
+        self._vectors: Optional[np.memmap] = None
+        self._capacity = 0
+        vectors_path = self._file("vectors.f32")
+        if os.path.exists(vectors_path) and os.path.getsize(vectors_path):
+            self._map_vectors(os.path.getsize(vectors_path) // (4 * self.dimension))
+
+        self._offsets = self._load_offsets()
+        self._index = IVFIndex.load(self._file("ivf.npz")) if os.path.exists(self._file("ivf.npz")) else None
+        if self._index is not None and self._index.indexed_count > self.count:
+            self._index = None
+
+    @classmethod
+    def create(cls, path: str, vector_store_id: str, name: str, embedder_name: str, dimension: int,
+               **options: Any) -> "LocalVectorStore":
+        """Create an empty store directory and open it."""
+        os.makedirs(path)
+        meta = {
+            "id": vector_store_id,
+            "name": name,
+            "created_at": int(time.time()),
+            "embedder": embedder_name,
+            "dimension": dimension,
+            "count": 0,
+            "files": {},
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return cls(path, **options)
+
+    @property
+    def count(self) -> int:
+        """Number of committed vector rows."""
+        return self.meta["count"]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _map_vectors(self, capacity: int) -> None:
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+",
+                                  shape=(capacity, self.dimension))
+        self._capacity = capacity
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2, 1024)
+        with open(self._file("vectors.f32"), "ab") as f:
+            f.truncate(capacity * self.dimension * 4)
+        self._map_vectors(capacity)
+
+    def _load_offsets(self) -> List[int]:
+        """Index the byte offsets of committed chunk lines and drop uncommitted ones."""
+        offsets: List[int] = []
+        chunks_path = self._file("chunks.jsonl")
+        if not os.path.exists(chunks_path):
+            return offsets
+        with open(chunks_path, "r+b") as f:
+            position = 0
+            for line in iter(f.readline, b""):
+                if len(offsets) == self.count or not line.endswith(b"\n"):
+                    break
+                offsets.append(position)
+                position += len(line)
+            f.truncate(position)
+        if len(offsets) < self.count:
+            raise RuntimeError(f"Vector store {self.id} is missing chunk records; the store is corrupted")
+        return offsets
+
+    def _write_meta(self) -> None:
+        temp_path = self._file("meta.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(temp_path, self._file("meta.json"))
+
+    def add(self, file_id: str, filename: str, chunks: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Append the chunks of one file and their vectors.
+
+        Args:
+            file_id: ID of the file the chunks belong to.
+            filename: Name of the file, returned with search results.
+            chunks: The chunk texts.
+            vectors: Unit vectors of the chunks, one row per chunk.
+        """
+        with self._lock:
+            start = self.count
+            end = start + len(chunks)
+            self._ensure_capacity(end)
+
+            offsets = []
+            with open(self._file("chunks.jsonl"), "ab") as f:
+                position = f.tell()
+                for number, text in enumerate(chunks):
+                    line = (json.dumps({"file_id": file_id, "chunk": number, "text": text}) + "\n").encode("utf-8")
+                    f.write(line)
+                    offsets.append(position)
+                    position += len(line)
+            self._vectors[start:end] = vectors
+            self._vectors.flush()
+
+            self.meta["files"][file_id] = {"filename": filename, "chunks": len(chunks), "created_at": int(time.time())}
+            self.meta["count"] = end
+            self._write_meta()
+            self._offsets.extend(offsets)
+
+            self._maybe_build_index()
+
+    def _maybe_build_index(self) -> None:
+        if self.count < self.ann_min_vectors:
+            return
+        # Rows added after the index was built are scanned exactly; rebuild once they are many
+        if self._index is None or self.count - self._index.indexed_count > self._index.indexed_count // 4:
+            self.build_index()
+
+    def build_index(self, nlist: Optional[int] = None) -> None:
+        """
+        Build or rebuild the approximate index over all committed rows.
+
+        Args:
+            nlist: Number of clusters; see IVFIndex.build.
+        """
+        with self._lock:
+            if not self.count:
+                return
+            started = time.monotonic()
+            self._index = IVFIndex.build(self._vectors[:self.count], nlist)
+            self._index.save(self._file("ivf.npz"))
+            logger.info(
+                f"Built IVF index of {self.id} over {self.count} vectors "
+                f"({len(self._index.centroids)} lists) in {time.monotonic() - started:.2f}s"
+            )
+
+    def search(self, query: np.ndarray, k: int, exact: bool = False) -> List[Tuple[float, int]]:
+        """
+        Find the rows most similar to a query vector.
+
+        Args:
+            query: Unit query vector.
+            k: Number of results.
+            exact: If True, score every row even when an approximate index exists.
+
+        Returns:
+            List[Tuple[float, int]]: (cosine similarity, row) pairs, best first.
+        """
+        with self._lock:
+            count = self.count
+            if not count or k <= 0:
+                return []
+            vectors = self._vectors[:count]
+            index = self._index if not exact and count >= self.ann_min_vectors else None
+
+        if index is None:
+            rows = None
+            scores = vectors @ query
+        else:
+            rows = index.candidates(query, self.nprobe)
+            if index.indexed_count < count:
+                rows = np.concatenate([rows, np.arange(index.indexed_count, count)])
+            rows.sort()
+            scores = vectors[rows] @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(rows[i] if rows is not None else i)) for i in top]
+
+    def chunk(self, row: int) -> Dict[str, Any]:
+        """Read the chunk record of a row."""
+        with open(self._file("chunks.jsonl"), "rb") as f:
+            f.seek(self._offsets[row])
+            record = json.loads(f.readline())
+        record["filename"] = self.meta["files"].get(record["file_id"], {}).get("filename")
+        return record
+
+    def close(self) -> None:
+        """Flush and release the memory map."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+                self._capacity = 0
+
+
+class LocalVectorStoreBackend:
+    """
+    Embedded replacement for the OpenAI vector store tools.
+
+    It exposes the methods of CreateVectorStoreTool, ListVectorStoresTool,
+    DeleteVectorStoreTool, UploadFileToVectorStoreTool, SaveTextToVectorStoreTool
+    and FileReadTool with the same arguments and result shapes, so the registry
+    can route those tools here when vector_store.provider is "local".
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        embedder: Any = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        ann_min_vectors: Optional[int] = None,
+        nprobe: int = 8,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            root: Directory holding one subdirectory per store. Defaults to "local"
+                  under the configured vector_store.path.
+            embedder: Embedder instance. Defaults to the configured
+                      vector_store.embedding_model; see create_embedder.
+            chunk_size: Maximum characters per chunk (vector_store.chunk_size).
+            chunk_overlap: Characters shared by consecutive chunks (vector_store.chunk_overlap).
+            ann_min_vectors: Row count from which a store uses its approximate index
+                             (vector_store.ann_min_vectors).
+            nprobe: Clusters scored per approximate query.
+        """
+        from core.config import get
+
+        self.root = root or os.path.join(get("vector_store.path", "./data/vectors"), "local")
+        self._embedder = embedder
+        self.chunk_size = chunk_size or get("vector_store.chunk_size", 1000)
+        self.chunk_overlap = chunk_overlap if chunk_overlap is not None else get("vector_store.chunk_overlap", 200)
+        self.ann_min_vectors = ann_min_vectors or get("vector_store.ann_min_vectors", 50000)
+        self.nprobe = nprobe
+        self._stores: Dict[str, LocalVectorStore] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def embedder(self) -> Any:
+        """The embedder, created from the configuration on first use."""
+        if self._embedder is None:
+            from core.config import get
+
+            self._embedder = create_embedder(get("vector_store.embedding_model", "hashing"))
+        return self._embedder
+
+    def _store(self, vector_store_id: str) -> LocalVectorStore:
+        assert_valid_vector_store_id(vector_store_id)
+        with self._lock:
+            store = self._stores.get(vector_store_id)
+            if store is None:
+                path = os.path.join(self.root, vector_store_id)
+                if not os.path.isdir(path):
+                    raise ValueError(f"Vector store not found: {vector_store_id}")
+                store = LocalVectorStore(path, self.ann_min_vectors, self.nprobe)
+                if store.meta["embedder"] != self.embedder.name:
+                    raise ValueError(
+                        f"Vector store {vector_store_id} was built with embedder '{store.meta['embedder']}', "
+                        f"not '{self.embedder.name}'"
+                    )
+                self._stores[vector_store_id] = store
+            return store
+
+    def create_vector_store(self, name: str, file_ids: Optional[List[str]] = None) -> str:
+        """
+        Create an empty store.
+
+        Args:
+            name: Name of the store.
+            file_ids: Not supported; add files with upload_and_add_file_to_vector_store.
+
+        Returns:
+            str: The ID of the new store.
+        """
+        if not name or not isinstance(name, str):
+            raise ValueError("Vector Store name must be a non-empty string")
+        if file_ids:
+            raise ValueError("Local vector stores cannot attach uploaded file IDs; upload the files to the store")
+
+        vector_store_id = f"vs_{uuid.uuid4().hex[:24]}"
+        store = LocalVectorStore.create(
+            os.path.join(self.root, vector_store_id), vector_store_id, name,
+            self.embedder.name, self.embedder.dimension,
+            ann_min_vectors=self.ann_min_vectors, nprobe=self.nprobe,
+        )
+        with self._lock:
+            self._stores[vector_store_id] = store
+        return vector_store_id
+
+    def list_vector_stores(self) -> List[Dict]:
+        """List the stores as dicts with id and name."""
+        stores = []
+        for entry in sorted(os.listdir(self.root)):
+            meta_path = os.path.join(self.root, entry, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                stores.append({"id": meta["id"], "name": meta["name"]})
+        return stores
+
+    def delete_vector_store(self, vector_store_id: str) -> Dict:
+        """Delete a store and its files."""
+        store = self._store(vector_store_id)
+        with self._lock:
+            self._stores.pop(vector_store_id, None)
+        store.close()
+        shutil.rmtree(store.path)
+        return {"deleted": True, "id": vector_store_id}
+
+    def _add_text(self, vector_store_id: str, text: str, filename: str) -> Dict:
+        store = self._store(vector_store_id)
+        chunks = chunk_text(text, self.chunk_size, self.chunk_overlap)
+        if not chunks:
+            raise ValueError(f"No text content to index in {filename}")
+        vectors = np.concatenate([
+            self.embedder.embed(chunks[start:start + EMBED_BATCH_SIZE])
+            for start in range(0, len(chunks), EMBED_BATCH_SIZE)
+        ])
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        store.add(file_id, filename, chunks, vectors)
+        return {"file_id": file_id, "vector_store_id": vector_store_id, "status": "completed", "chunks": len(chunks)}
+
+    def upload_and_add_file_to_vector_store(self, vector_store_id: str, file_path: str,
+                                            purpose: str = "assistants", wait: bool = True) -> Dict:
+        """
+        Chunk, embed and index a text file.
+
+        Indexing is synchronous, so the result is always "completed"; purpose and
+        wait are accepted for compatibility with UploadFileToVectorStoreTool.
+
+        Returns:
+            Dict: The file_id, vector_store_id, status and number of chunks.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found at path: {file_path}")
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        return self._add_text(vector_store_id, text, os.path.basename(file_path))
+
+    def save_text_to_vector_store(self, vector_store_id: str, text_content: str, buffered: bool = False) -> Dict:
+        """
+        Index text content as a new file of the store.
+
+        Local writes are cheap, so buffered is accepted and ignored.
+
+        Returns:
+            Dict: The file_id, vector_store_id, status and number of chunks.
+        """
+        if not text_content or not isinstance(text_content, str):
+            raise ValueError("Text content must be a non-empty string")
+        return self._add_text(vector_store_id, text_content, f"ltm_{int(time.time())}.txt")
+
+    def search(self, vector_store_ids: List[str], query: str, max_num_results: int = 5,
+               exact: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find the chunks most similar to a query across stores.
+
+        Args:
+            vector_store_ids: IDs of the stores to search.
+            query: The query text.
+            max_num_results: Number of results.
+            exact: If True, bypass the approximate indexes.
+
+        Returns:
+            List[Dict]: Results with score, text, file_id, filename and vector_store_id, best first.
+        """
+        query_vector = self.embedder.embed([query])[0]
+        hits = []
+        for vector_store_id in vector_store_ids:
+            store = self._store(vector_store_id)
+            hits.extend((score, row, store) for score, row in store.search(query_vector, max_num_results, exact))
+        hits.sort(key=lambda hit: -hit[0])
+
+        results = []
+        for score, row, store in hits[:max_num_results]:
+            record = store.chunk(row)
+            results.append({
+                "score": round(score, 4),
+                "text": record["text"],
+                "file_id": record["file_id"],
+                "filename": record["filename"],
+                "vector_store_id": store.id,
+            })
+        return results
+
+    def perform_file_read(self, vector_store_ids: List[str], query: str, max_num_results: int = 5,
+                          include_search_results: bool = False) -> str:
+        """
+        Answer a file_read query with the most relevant passages.
+
+        Unlike FileReadTool, no model summarizes the passages; they are returned
+        as text, each headed by its source file and, with include_search_results,
+        its similarity score.
+
+        Returns:
+            str: The passages, best first.
+        """
+        results = self.search(vector_store_ids, query, max_num_results)
+        if not results:
+            return f"No results found in vector stores {', '.join(vector_store_ids)} for query: '{query}'"
+
+        passages = []
+        for number, result in enumerate(results, 1):
+            header = f"[{number}] {result['filename']}"
+            if include_search_results:
+                header += f" (score: {result['score']})"
+            passages.append(f"{header}\n{result['text']}")
+        return "\n\n".join(passages)
+
+
+def get_local_vector_store(**options: Any) -> LocalVectorStoreBackend:
+    """
+    Get the shared local backend, creating and registering it on first use.
+
+    The backend is registered in the services container as "local_vector_store".
+
+    Args:
+        **options: LocalVectorStoreBackend options, used only when the backend is created.
+
+    Returns:
+        LocalVectorStoreBackend: The shared backend.
+    """
+    from core.services import get_services
+
+    services = get_services()
+    with _backend_lock:
+        if not services.has_service("local_vector_store"):
+            services.register_service(LocalVectorStoreBackend(**options), LocalVectorStoreBackend, "local_vector_store")
+        return services.get_service("local_vector_store")
@@ -2,16 +2,28 @@
 OpenAI Vector Store tools for the Dawn AI Agent Framework.
 """
 
+from tools.openai_vs.bulk_ingest import BulkIngestor, IngestionIndex, bulk_ingest
 from tools.openai_vs.create_vector_store import CreateVectorStoreTool
 from tools.openai_vs.delete_vector_store import DeleteVectorStoreTool
+from tools.openai_vs.ingestion_tracker import FileIngestionError, IngestionTracker, wait_for_file
 from tools.openai_vs.list_vector_stores import ListVectorStoresTool
+from tools.openai_vs.ltm_buffer import LTMWriteBuffer, flush_ltm_buffer, get_ltm_buffer
 from tools.openai_vs.save_text_to_vector_store import SaveTextToVectorStoreTool
 from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
 
 __all__ = [
+    "BulkIngestor",
     "CreateVectorStoreTool",
     "DeleteVectorStoreTool",
+    "FileIngestionError",
+    "IngestionIndex",
+    "IngestionTracker",
+    "LTMWriteBuffer",
     "ListVectorStoresTool",
     "SaveTextToVectorStoreTool",
     "UploadFileToVectorStoreTool",
+    "bulk_ingest",
+    "flush_ltm_buffer",
+    "get_ltm_buffer",
+    "wait_for_file",
 ]
@@ -0,0 +1,424 @@
+"""
+Module for bulk ingestion of documents into OpenAI Vector Stores.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from openai import AsyncOpenAI
+
+from core.llm.clients import get_async_openai_client
+from tools.openai_vs.ingestion_tracker import IngestionTracker
+from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Maximum number of file IDs accepted by a single file batch request
+MAX_BATCH_SIZE = 500
+
+
+def default_index_path() -> str:
+    """
+    Get the default ingestion index path, next to the configured vector data.
+
+    Returns:
+        str: The path of the ingestion index journal.
+    """
+    from core.config import get
+
+    return os.path.join(get("vector_store.path", "./data/vectors"), "ingestion_index.jsonl")
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 of a file without loading it into memory.
+
+    Args:
+        file_path: The path to the file.
+
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionIndex:
+    """
+    Local record of uploaded files and their vector store attachments.
+
+    The index is an append-only JSON-lines journal, so every upload and
+    attachment is persisted as soon as it happens and an interrupted run can
+    resume without uploading anything twice. Files are keyed by content hash;
+    the path, size and mtime of each hashed file are also recorded so unchanged
+    files are not hashed again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the index, creating its directory if needed.
+
+        Args:
+            path: Path of the journal file.
+        """
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.attachments: Dict[str, Dict[str, str]] = {}
+        self._stats: Dict[str, Tuple[int, int, str]] = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # Drop a last line cut short by an interruption so new events start on a fresh line
+            if data and not data.endswith(b"\n"):
+                data = data[:data.rfind(b"\n") + 1]
+                f.truncate(len(data))
+                logger.warning(f"Discarded incomplete last line of ingestion index {self.path}")
+
+        for line in data.decode("utf-8").splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError):
+                logger.warning(f"Ignoring malformed line in ingestion index {self.path}")
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        op = event["op"]
+        if op == "hash":
+            self._stats[event["path"]] = (event["size"], event["mtime_ns"], event["sha256"])
+        elif op == "upload":
+            self.files[event["sha256"]] = {
+                "file_id": event["file_id"],
+                "path": event["path"],
+                "size": event["size"],
+            }
+        elif op == "attach":
+            store = self.attachments.setdefault(event["vector_store_id"], {})
+            for file_id in event["file_ids"]:
+                store[file_id] = event["status"]
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        self._apply(event)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def cached_hash(self, file_path: str, stat: os.stat_result) -> Optional[str]:
+        """
+        Get the recorded hash of a file if it has not changed since it was hashed.
+
+        Args:
+            file_path: The path to the file.
+            stat: The file's current os.stat result.
+
+        Returns:
+            Optional[str]: The recorded hash, or None if unknown or changed.
+        """
+        recorded = self._stats.get(file_path)
+        if recorded and recorded[0] == stat.st_size and recorded[1] == stat.st_mtime_ns:
+            return recorded[2]
+        return None
+
+    def record_hash(self, file_path: str, stat: os.stat_result, sha256: str) -> None:
+        """Record the hash of a file along with its size and mtime."""
+        if self.cached_hash(file_path, stat) != sha256:
+            self._append({"op": "hash", "path": file_path, "size": stat.st_size,
+                          "mtime_ns": stat.st_mtime_ns, "sha256": sha256})
+
+    def file_id(self, sha256: str) -> Optional[str]:
+        """Get the ID of the uploaded file with this content hash, if any."""
+        entry = self.files.get(sha256)
+        return entry["file_id"] if entry else None
+
+    def record_upload(self, sha256: str, file_id: str, file_path: str, size: int) -> None:
+        """Record an uploaded file."""
+        self._append({"op": "upload", "sha256": sha256, "file_id": file_id, "path": file_path,
+                      "size": size, "uploaded_at": time.time()})
+
+    def attachment_status(self, vector_store_id: str, file_id: str) -> Optional[str]:
+        """Get the recorded attachment status of a file in a vector store, if any."""
+        return self.attachments.get(vector_store_id, {}).get(file_id)
+
+    def record_attachments(self, vector_store_id: str, file_ids: Sequence[str], status: str) -> None:
+        """Record the attachment status of files in a vector store."""
+        if file_ids:
+            self._append({"op": "attach", "vector_store_id": vector_store_id,
+                          "file_ids": list(file_ids), "status": status})
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per current fact."""
+        events = [{"op": "hash", "path": path, "size": size, "mtime_ns": mtime_ns, "sha256": sha256}
+                  for path, (size, mtime_ns, sha256) in self._stats.items()]
+        events += [{"op": "upload", "sha256": sha256, **entry} for sha256, entry in self.files.items()]
+        for vector_store_id, store in self.attachments.items():
+            by_status: Dict[str, List[str]] = {}
+            for file_id, status in store.items():
+                by_status.setdefault(status, []).append(file_id)
+            events += [{"op": "attach", "vector_store_id": vector_store_id, "file_ids": file_ids, "status": status}
+                       for status, file_ids in by_status.items()]
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+        os.replace(temp_path, self.path)
+
+
+class BulkIngestor:
+    """
+    Loads directories of documents into a Vector Store.
+
+    Files are hashed in a streaming fashion and deduplicated by content against
+    the local IngestionIndex; only new content is uploaded, with bounded
+    concurrency. Uploaded files are attached with one file batch request per
+    batch_size files while the next batch is still uploading.
+    """
+
+    def __init__(
+        self,
+        vector_store_id: str,
+        index_path: Optional[str] = None,
+        client: Optional[AsyncOpenAI] = None,
+        purpose: str = "assistants",
+        max_concurrency: int = 8,
+        hash_concurrency: int = 4,
+        batch_size: int = 100,
+        extensions: Optional[Iterable[str]] = None,
+        tracker: Optional[IngestionTracker] = None,
+    ):
+        """
+        Initialize the BulkIngestor.
+
+        Args:
+            vector_store_id: The ID of the Vector Store to load files into.
+            index_path: Path of the local ingestion index journal. Defaults to
+                        default_index_path().
+            client: Optional AsyncOpenAI client. If not provided, the shared async client is used.
+            purpose: The purpose of the file uploads.
+            max_concurrency: Maximum concurrent uploads.
+            hash_concurrency: Maximum files hashed concurrently.
+            batch_size: Files attached per file batch request (at most 500).
+            extensions: Optional file extensions to include (e.g. [".pdf", ".txt"]).
+            tracker: Optional IngestionTracker used to wait for processing.
+        """
+        assert_valid_vector_store_id(vector_store_id)
+        self.vector_store_id = vector_store_id
+        self.index = IngestionIndex(index_path or default_index_path())
+        self._client = client
+        self.purpose = purpose
+        self.max_concurrency = max_concurrency
+        self.hash_concurrency = hash_concurrency
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.extensions = {e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions or []}
+        self._tracker = tracker
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client, taken from the shared provider if none was given."""
+        if self._client is None:
+            self._client = get_async_openai_client(AsyncOpenAI)
+        return self._client
+
+    def collect_files(self, paths: Iterable[str]) -> List[str]:
+        """
+        Expand files and directories into the sorted list of files to ingest.
+
+        Hidden files and directories are skipped.
+
+        Args:
+            paths: Files or directories to walk.
+
+        Returns:
+            List[str]: Absolute paths of the files to ingest.
+        """
+        found = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isfile(path):
+                found.add(path)
+                continue
+            if not os.path.isdir(path):
+                raise FileNotFoundError(f"Path not found: {path}")
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for name in names:
+                    if name.startswith("."):
+                        continue
+                    if self.extensions and os.path.splitext(name)[1].lower() not in self.extensions:
+                        continue
+                    found.add(os.path.join(root, name))
+        return sorted(found)
+
+    async def ingest(self, paths: Iterable[str], wait: bool = False) -> Dict[str, Any]:
+        """
+        Ingest files and directories into the vector store.
+
+        Safe to re-run after an interruption: content already uploaded is not
+        uploaded again and files already attached are not attached again.
+
+        Args:
+            paths: Files or directories to ingest.
+            wait: If True, wait until the vector store has processed the attached files.
+
+        Returns:
+            Dict: Counts of scanned, duplicate, skipped, uploaded and attached files,
+            the status of each file_id when waiting, and per-file errors.
+        """
+        file_paths = self.collect_files(paths)
+        report: Dict[str, Any] = {
+            "vector_store_id": self.vector_store_id,
+            "scanned": len(file_paths),
+            "duplicates": 0,
+            "skipped": 0,
+            "uploaded": 0,
+            "attached": 0,
+            "errors": [],
+        }
+
+        # Hash every file, reusing recorded hashes of unchanged files
+        by_hash: Dict[str, str] = {}
+        for file_path, sha256 in zip(file_paths, await self._hash_files(file_paths, report)):
+            if sha256 is None:
+                continue
+            if sha256 in by_hash:
+                report["duplicates"] += 1
+            else:
+                by_hash[sha256] = file_path
+
+        # Decide what each unique file still needs
+        to_upload: List[Tuple[str, str]] = []
+        to_attach: List[str] = []
+        to_track: List[str] = []
+        for sha256, file_path in by_hash.items():
+            file_id = self.index.file_id(sha256)
+            if file_id is None:
+                to_upload.append((sha256, file_path))
+                continue
+            status = self.index.attachment_status(self.vector_store_id, file_id)
+            if status == "completed":
+                report["skipped"] += 1
+            elif status == "submitted":
+                to_track.append(file_id)
+            else:
+                # Never attached, or processing failed last time
+                to_attach.append(file_id)
+
+        attach_tasks = []
+        for start in range(0, len(to_attach), self.batch_size):
+            attach_tasks.append(asyncio.create_task(
+                self._attach(to_attach[start:start + self.batch_size], report)
+            ))
+
+        # Upload in batches; each batch is attached while the next one uploads
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        for start in range(0, len(to_upload), self.batch_size):
+            batch = to_upload[start:start + self.batch_size]
+            file_ids = await asyncio.gather(*(self._upload(sha256, path, semaphore, report)
+                                              for sha256, path in batch))
+            attach_tasks.append(asyncio.create_task(
+                self._attach([file_id for file_id in file_ids if file_id], report)
+            ))
+
+        for submitted in await asyncio.gather(*attach_tasks):
+            to_track.extend(submitted)
+
+        if wait and to_track:
+            report["statuses"] = await self._wait(to_track)
+        return report
+
+    async def _hash_files(self, file_paths: List[str], report: Dict[str, Any]) -> List[Optional[str]]:
+        semaphore = asyncio.Semaphore(self.hash_concurrency)
+
+        async def hash_one(file_path: str) -> Optional[str]:
+            try:
+                stat = os.stat(file_path)
+                sha256 = self.index.cached_hash(file_path, stat)
+                if sha256 is None:
+                    async with semaphore:
+                        sha256 = await asyncio.to_thread(hash_file, file_path)
+                    self.index.record_hash(file_path, stat, sha256)
+                return sha256
+            except OSError as e:
+                report["errors"].append({"path": file_path, "error": str(e)})
+                return None
+
+        return await asyncio.gather(*(hash_one(file_path) for file_path in file_paths))
+
+    async def _upload(self, sha256: str, file_path: str, semaphore: asyncio.Semaphore,
+                      report: Dict[str, Any]) -> Optional[str]:
+        async with semaphore:
+            try:
+                uploaded = await self.client.files.create(file=pathlib.Path(file_path), purpose=self.purpose)
+            except Exception as e:
+                logger.warning(f"Uploading {file_path} failed: {str(e)}")
+                report["errors"].append({"path": file_path, "error": str(e)})
+                return None
+
+        self.index.record_upload(sha256, uploaded.id, file_path, os.path.getsize(file_path))
+        report["uploaded"] += 1
+        return uploaded.id
+
+    async def _attach(self, file_ids: List[str], report: Dict[str, Any]) -> List[str]:
+        if not file_ids:
+            return []
+        try:
+            await self.client.vector_stores.file_batches.create(
+                vector_store_id=self.vector_store_id, file_ids=file_ids
+            )
+        except Exception as e:
+            logger.warning(f"Attaching {len(file_ids)} files to {self.vector_store_id} failed: {str(e)}")
+            report["errors"].extend({"file_id": file_id, "error": str(e)} for file_id in file_ids)
+            return []
+
+        self.index.record_attachments(self.vector_store_id, file_ids, "submitted")
+        report["attached"] += len(file_ids)
+        return file_ids
+
+    async def _wait(self, file_ids: List[str]) -> Dict[str, str]:
+        tracker = self._tracker or IngestionTracker(client=self.client)
+        results = await tracker.wait_all((self.vector_store_id, file_id) for file_id in file_ids)
+
+        statuses: Dict[str, str] = {}
+        by_status: Dict[str, List[str]] = {}
+        for result in results:
+            statuses[result["file_id"]] = result["status"]
+            if result["status"] != "in_progress":
+                by_status.setdefault(result["status"], []).append(result["file_id"])
+        for status, ids in by_status.items():
+            self.index.record_attachments(self.vector_store_id, ids, status)
+        return statuses
+
+
+def bulk_ingest(vector_store_id: str, paths: Iterable[str], index_path: Optional[str] = None,
+                wait: bool = False, **options: Any) -> Dict[str, Any]:
+    """
+    Ingest files and directories into a vector store from synchronous code.
+
+    Args:
+        vector_store_id: The ID of the Vector Store to load files into.
+        paths: Files or directories to ingest.
+        index_path: Path of the local ingestion index journal. Defaults to default_index_path().
+        wait: If True, wait until the vector store has processed the attached files.
+        **options: Further BulkIngestor options.
+
+    Returns:
+        Dict: The ingestion report.
+    """
+    async def run() -> Dict[str, Any]:
+        ingestor = BulkIngestor(vector_store_id, index_path, **options)
+        return await ingestor.ingest(paths, wait=wait)
+
+    return asyncio.run(run())
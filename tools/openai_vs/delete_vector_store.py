@@ -6,6 +6,8 @@ from typing import Dict, Optional
 
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
 
 
@@ -19,9 +21,9 @@ class DeleteVectorStoreTool:
         Initialize the DeleteVectorStoreTool.
 
         Args:
-            client: Optional OpenAI client instance. If not provided, a new one will be created.
+            client: Optional OpenAI client instance. If not provided, the shared client is used.
         """
-        self.client = client or OpenAI()
+        self.client = client or get_openai_client(OpenAI)
 
     def delete_vector_store(self, vector_store_id: str) -> Dict:
         """
@@ -0,0 +1,284 @@
+"""
+Module for tracking file ingestion into OpenAI Vector Stores.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from openai import AsyncOpenAI
+
+from core.llm.clients import get_async_openai_client
+from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+_background_lock = threading.Lock()
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_tracker: Optional["IngestionTracker"] = None
+
+
+class FileIngestionError(RuntimeError):
+    """
+    Raised when a file fails or is cancelled during vector store ingestion.
+    """
+
+    def __init__(self, file_id: str, status: str, last_error: Optional[str] = None):
+        self.file_id = file_id
+        self.status = status
+        self.last_error = last_error
+        super().__init__(f"File processing failed: {last_error or status}")
+
+
+class IngestionTracker:
+    """
+    Tracks the processing status of many files added to Vector Stores.
+
+    Instead of one blocking polling loop per file, the tracker runs a single
+    poller per vector store. Each poll lists the store's files (newest first,
+    stopping once every pending file has been seen) and resolves the futures of
+    files that reached a terminal status. The poll interval starts at
+    min_interval, backs off while nothing changes and resets when a file finishes.
+
+    The tracker must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+        timeout: float = 300.0,
+        page_size: int = 100,
+    ):
+        """
+        Initialize the IngestionTracker.
+
+        Args:
+            client: Optional AsyncOpenAI client. If not provided, the shared async client is used.
+            min_interval: Initial seconds between polls of a vector store.
+            max_interval: Maximum seconds between polls of a vector store.
+            backoff: Factor applied to the interval after a poll with no progress.
+            timeout: Seconds after which a file still processing is reported as in progress.
+            page_size: Files requested per listing call (at most 100).
+        """
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.page_size = min(page_size, 100)
+
+        # vector_store_id -> file_id -> (future, deadline)
+        self._pending: Dict[str, Dict[str, Tuple[asyncio.Future, float]]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client, taken from the shared provider if none was given."""
+        if self._client is None:
+            self._client = get_async_openai_client(AsyncOpenAI)
+        return self._client
+
+    def track(self, vector_store_id: str, file_id: str) -> asyncio.Future:
+        """
+        Start tracking a file added to a vector store.
+
+        Args:
+            vector_store_id: The ID of the Vector Store the file was added to.
+            file_id: The ID of the file.
+
+        Returns:
+            asyncio.Future: Resolves to {"file_id", "status"} when the file is processed,
+            or fails with FileIngestionError if processing failed. Tracking the same
+            file twice returns the same future.
+        """
+        assert_valid_vector_store_id(vector_store_id)
+        files = self._pending.setdefault(vector_store_id, {})
+        if file_id in files:
+            return files[file_id][0]
+
+        future = asyncio.get_running_loop().create_future()
+        files[file_id] = (future, time.monotonic() + self.timeout)
+
+        poller = self._pollers.get(vector_store_id)
+        if poller is None or poller.done():
+            self._pollers[vector_store_id] = asyncio.create_task(self._poll_store(vector_store_id))
+        return future
+
+    async def wait(self, vector_store_id: str, file_id: str) -> Dict[str, Any]:
+        """
+        Track a file and wait until it is processed.
+
+        Args:
+            vector_store_id: The ID of the Vector Store the file was added to.
+            file_id: The ID of the file.
+
+        Returns:
+            Dict: A dictionary containing the file_id and status information.
+
+        Raises:
+            FileIngestionError: If processing failed or was cancelled.
+        """
+        return await self.track(vector_store_id, file_id)
+
+    async def wait_all(self, files: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Track many files and wait until all of them are processed.
+
+        Args:
+            files: (vector_store_id, file_id) pairs.
+
+        Returns:
+            List[Dict]: One result per pair, in order. Failed files are reported with
+            their status and error instead of raising.
+        """
+        pairs = list(files)
+        results = await asyncio.gather(*(self.track(vs_id, file_id) for vs_id, file_id in pairs),
+                                       return_exceptions=True)
+        for i, result in enumerate(results):
+            if isinstance(result, FileIngestionError):
+                results[i] = {"file_id": result.file_id, "status": result.status, "error": result.last_error}
+            elif isinstance(result, BaseException):
+                results[i] = {"file_id": pairs[i][1], "status": "error", "error": str(result)}
+        return results
+
+    def pending_count(self) -> int:
+        """
+        Count the files still being tracked.
+
+        Returns:
+            int: The number of files not yet resolved.
+        """
+        return sum(len(files) for files in self._pending.values())
+
+    async def close(self) -> None:
+        """Stop all pollers and cancel the futures of files still being tracked."""
+        pollers = list(self._pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        for files in self._pending.values():
+            for future, _ in files.values():
+                future.cancel()
+        self._pending.clear()
+        self._pollers.clear()
+
+    async def _poll_store(self, vector_store_id: str) -> None:
+        files = self._pending[vector_store_id]
+        interval = self.min_interval
+
+        while files:
+            await asyncio.sleep(interval)
+            progressed = False
+
+            try:
+                statuses = await self._list_statuses(vector_store_id, set(files))
+            except Exception as e:
+                logger.warning(f"Error listing files of vector store {vector_store_id}: {str(e)}")
+                statuses = {}
+
+            for file_id, (status, last_error) in statuses.items():
+                if status in TERMINAL_STATUSES:
+                    future, _ = files.pop(file_id)
+                    progressed = True
+                    if future.done():
+                        continue
+                    if status == "completed":
+                        future.set_result({"file_id": file_id, "status": "completed"})
+                    else:
+                        future.set_exception(FileIngestionError(file_id, status, last_error))
+
+            now = time.monotonic()
+            for file_id in [f for f, (_, deadline) in files.items() if deadline <= now]:
+                future, _ = files.pop(file_id)
+                if not future.done():
+                    future.set_result({
+                        "file_id": file_id,
+                        "status": "in_progress",
+                        "message": "Polling timed out but file is being processed",
+                    })
+
+            # Drop files whose callers are no longer waiting
+            for file_id in [f for f, (future, _) in files.items() if future.done()]:
+                del files[file_id]
+
+            interval = self.min_interval if progressed else min(interval * self.backoff, self.max_interval)
+
+        self._pending.pop(vector_store_id, None)
+        self._pollers.pop(vector_store_id, None)
+
+    async def _list_statuses(self, vector_store_id: str, wanted: Set[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """List the store's files newest first until every wanted file has been seen."""
+        statuses: Dict[str, Tuple[str, Optional[str]]] = {}
+        after = None
+
+        while True:
+            params = {"vector_store_id": vector_store_id, "limit": self.page_size, "order": "desc"}
+            if after:
+                params["after"] = after
+            page = await self.client.vector_stores.files.list(**params)
+
+            for vs_file in page.data:
+                if vs_file.id in wanted:
+                    last_error = getattr(vs_file, "last_error", None)
+                    statuses[vs_file.id] = (vs_file.status, getattr(last_error, "message", last_error))
+
+            if len(statuses) == len(wanted) or not page.data or not getattr(page, "has_more", False):
+                return statuses
+            after = page.data[-1].id
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop that runs trackers for synchronous callers, starting it if needed."""
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="ingestion-tracker", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+def get_shared_tracker() -> IngestionTracker:
+    """
+    Get the IngestionTracker shared by synchronous callers.
+
+    Returns:
+        IngestionTracker: The tracker driven by wait_for_file when no other is given.
+    """
+    global _shared_tracker
+    with _background_lock:
+        if _shared_tracker is None:
+            _shared_tracker = IngestionTracker()
+        return _shared_tracker
+
+
+def wait_for_file(vector_store_id: str, file_id: str, tracker: Optional[IngestionTracker] = None) -> Dict[str, Any]:
+    """
+    Block until a file added to a vector store is processed.
+
+    The wait runs on a background event loop shared by all synchronous callers,
+    so files added to the same store from several threads are resolved by one
+    poller instead of one polling loop each.
+
+    Args:
+        vector_store_id: The ID of the Vector Store the file was added to.
+        file_id: The ID of the file.
+        tracker: Tracker to wait on; defaults to the shared tracker. It is driven by the background
+                 event loop, so it must not be used from another loop.
+
+    Returns:
+        Dict: A dictionary containing the file_id and status information.
+
+    Raises:
+        FileIngestionError: If processing failed or was cancelled.
+    """
+    tracker = tracker or get_shared_tracker()
+    future = asyncio.run_coroutine_threadsafe(tracker.wait(vector_store_id, file_id), _get_background_loop())
+    return future.result()
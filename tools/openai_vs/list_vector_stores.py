@@ -6,6 +6,8 @@ from typing import Dict, List, Optional
 
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 
 class ListVectorStoresTool:
     """
@@ -17,9 +19,9 @@ class ListVectorStoresTool:
         Initialize the ListVectorStoresTool.
 
         Args:
-            client: Optional OpenAI client instance. If not provided, a new one will be created.
+            client: Optional OpenAI client instance. If not provided, the shared client is used.
         """
-        self.client = client or OpenAI()
+        self.client = client or get_openai_client(OpenAI)
 
     def list_vector_stores(self) -> List[Dict]:
         """
@@ -0,0 +1,379 @@
+"""
+Module for write-behind buffering of Long-Term Memory writes to OpenAI Vector Stores.
+"""
+
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
+
+logger = logging.getLogger(__name__)
+
+_buffer_lock = threading.Lock()
+
+
+class _PendingStore:
+    """Entries buffered for one vector store and the journal files holding them."""
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self.size = 0
+        self.first_at: Optional[float] = None
+        self.retry_at = 0.0
+        # Rotated journals whose entries are in self.entries (from failed or interrupted flushes)
+        self.journals: List[str] = []
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        self.size += len(entry["text"])
+        if self.first_at is None:
+            self.first_at = time.monotonic()
+
+
+class LTMWriteBuffer:
+    """
+    Buffers text saved to Long-Term Memory and uploads it in consolidated files.
+
+    Every entry is appended to a per-vector-store journal before append()
+    returns, so buffered writes survive a crash: a new buffer replays the
+    journals it finds and flushes their entries. Entries of a vector store are
+    flushed together as one text file when max_entries or max_bytes is reached,
+    when the oldest entry is older than max_delay seconds, or on an explicit
+    flush(). Delivery is at-least-once: a crash between the upload and the
+    removal of its journal uploads those entries again.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Optional[str] = None,
+        max_entries: int = 50,
+        max_bytes: int = 512 * 1024,
+        max_delay: float = 30.0,
+        upload_tool: Any = None,
+        wait_for_processing: bool = False,
+        fsync: bool = True,
+    ):
+        """
+        Initialize the buffer and recover entries left in existing journals.
+
+        Args:
+            journal_dir: Directory of the journal files. Defaults to "ltm_journal"
+                         under the configured vector_store.path.
+            max_entries: Entries of one vector store that trigger a flush.
+            max_bytes: Buffered characters of one vector store that trigger a flush.
+            max_delay: Seconds an entry may wait before its vector store is flushed.
+            upload_tool: Optional UploadFileToVectorStoreTool. If not provided, one is
+                         created on the first flush.
+            wait_for_processing: If True, a flush waits until the vector store has
+                                 processed the uploaded file.
+            fsync: If True, journal appends are synced to disk before append() returns.
+        """
+        if journal_dir is None:
+            from core.config import get
+
+            journal_dir = os.path.join(get("vector_store.path", "./data/vectors"), "ltm_journal")
+        self.journal_dir = journal_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._upload_tool = upload_tool
+        self.wait_for_processing = wait_for_processing
+        self.fsync = fsync
+
+        self._stores: Dict[str, _PendingStore] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_locks: Dict[str, threading.Lock] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._recover()
+
+    @property
+    def upload_tool(self) -> Any:
+        """The upload tool, created with the shared clients if none was given."""
+        if self._upload_tool is None:
+            from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
+
+            self._upload_tool = UploadFileToVectorStoreTool()
+        return self._upload_tool
+
+    def _journal_path(self, vector_store_id: str) -> str:
+        return os.path.join(self.journal_dir, f"{vector_store_id}.jsonl")
+
+    def _recover(self) -> None:
+        """Load entries from journals left by a previous process."""
+        paths = glob.glob(os.path.join(self.journal_dir, "*.jsonl")) + \
+            glob.glob(os.path.join(self.journal_dir, "*.jsonl.*.flushing"))
+        for path in sorted(paths):
+            vector_store_id = os.path.basename(path).split(".jsonl", 1)[0]
+            store = self._stores.setdefault(vector_store_id, _PendingStore())
+            seen = {entry["id"] for entry in store.entries}
+            with open(path, "r+", encoding="utf-8") as f:
+                complete = 0
+                for line in iter(f.readline, ""):
+                    if not line.endswith("\n"):
+                        # A line cut short by a crash was never acknowledged;
+                        # drop it so later appends start on a fresh line
+                        f.truncate(complete)
+                        break
+                    complete = f.tell()
+                    entry = json.loads(line)
+                    if entry["id"] not in seen:
+                        seen.add(entry["id"])
+                        store.add(entry)
+            if path.endswith(".flushing"):
+                store.journals.append(path)
+            # Recovered entries are flushed by the time threshold
+            store.first_at = time.monotonic() - self.max_delay
+
+        recovered = sum(len(store.entries) for store in self._stores.values())
+        if recovered:
+            logger.info(f"Recovered {recovered} buffered LTM entries from {self.journal_dir}")
+            self._start_flusher()
+
+    def append(self, vector_store_id: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Buffer text to be saved to a vector store.
+
+        The entry is durable once this returns.
+
+        Args:
+            vector_store_id: The ID of the Vector Store to save the text to.
+            text: The text content to save.
+            metadata: Optional metadata written with the entry.
+
+        Returns:
+            Dict: The entry_id, vector_store_id, status "buffered" and the number of
+            entries pending for the vector store.
+
+        Raises:
+            ValueError: If vector_store_id is invalid or text is empty.
+        """
+        assert_valid_vector_store_id(vector_store_id)
+        if not text or not isinstance(text, str):
+            raise ValueError("Text content must be a non-empty string")
+
+        entry = {"id": uuid.uuid4().hex, "text": text, "metadata": metadata or {}, "created_at": time.time()}
+        line = json.dumps(entry) + "\n"
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LTM write buffer is closed")
+            with open(self._journal_path(vector_store_id), "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+            store = self._stores.setdefault(vector_store_id, _PendingStore())
+            store.add(entry)
+            pending = len(store.entries)
+            if self._is_due(store, time.monotonic()):
+                self._wakeup.notify()
+
+        self._start_flusher()
+        return {"entry_id": entry["id"], "vector_store_id": vector_store_id, "status": "buffered", "pending": pending}
+
+    def pending_count(self, vector_store_id: Optional[str] = None) -> int:
+        """
+        Count buffered entries.
+
+        Args:
+            vector_store_id: Optional vector store to count; all stores if omitted.
+
+        Returns:
+            int: The number of entries not yet flushed.
+        """
+        with self._lock:
+            if vector_store_id is not None:
+                store = self._stores.get(vector_store_id)
+                return len(store.entries) if store else 0
+            return sum(len(store.entries) for store in self._stores.values())
+
+    def flush(self, vector_store_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Upload buffered entries now.
+
+        Args:
+            vector_store_id: Optional vector store to flush; all stores if omitted.
+
+        Returns:
+            List[Dict]: One upload result per flushed vector store, with the number
+            of entries it contained.
+
+        Raises:
+            RuntimeError: If any upload failed. Entries of failed uploads stay buffered.
+        """
+        with self._lock:
+            store_ids = [vector_store_id] if vector_store_id else list(self._stores)
+
+        results, errors = [], []
+        for store_id in store_ids:
+            try:
+                result = self._flush_store(store_id)
+            except Exception as e:
+                errors.append(f"{store_id}: {str(e)}")
+                continue
+            if result is not None:
+                results.append(result)
+
+        if errors:
+            raise RuntimeError(f"Failed to flush LTM entries: {'; '.join(errors)}")
+        return results
+
+    def close(self) -> None:
+        """Flush every buffered entry and stop the background flusher."""
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._closed = True
+                self._wakeup.notify_all()
+            if self._flusher is not None:
+                self._flusher.join(timeout=5)
+
+    def _is_due(self, store: _PendingStore, now: float) -> bool:
+        if not store.entries or now < store.retry_at:
+            return False
+        return (
+            len(store.entries) >= self.max_entries
+            or store.size >= self.max_bytes
+            or now - store.first_at >= self.max_delay
+        )
+
+    def _flush_store(self, vector_store_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            flush_lock = self._flush_locks.setdefault(vector_store_id, threading.Lock())
+
+        with flush_lock:
+            # Take the buffered entries and rotate the journal, so appends made
+            # during the upload start a new journal and a new buffer
+            with self._lock:
+                store = self._stores.pop(vector_store_id, None)
+                if store is None or not store.entries:
+                    return None
+                journals = list(store.journals)
+                journal_path = self._journal_path(vector_store_id)
+                if os.path.exists(journal_path):
+                    rotated = f"{journal_path}.{time.time_ns()}.flushing"
+                    os.replace(journal_path, rotated)
+                    journals.append(rotated)
+
+            try:
+                result = self._upload(vector_store_id, store.entries)
+            except Exception as e:
+                logger.warning(f"Flushing {len(store.entries)} LTM entries to {vector_store_id} failed: {str(e)}")
+                with self._lock:
+                    # Put the entries back ahead of anything appended meanwhile
+                    current = self._stores.pop(vector_store_id, None)
+                    store.journals = journals
+                    store.retry_at = time.monotonic() + self.max_delay
+                    if current is not None:
+                        for entry in current.entries:
+                            store.add(entry)
+                    self._stores[vector_store_id] = store
+                raise
+
+            for path in journals:
+                os.remove(path)
+            result["entry_count"] = len(store.entries)
+            return result
+
+    def _upload(self, vector_store_id: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write the entries to one text file and upload it to the vector store."""
+        with tempfile.NamedTemporaryFile(
+            mode="w", encoding="utf-8", prefix="ltm_", suffix=".txt", delete=False
+        ) as temp_file:
+            temp_file_path = temp_file.name
+            for entry in entries:
+                created = datetime.fromtimestamp(entry["created_at"]).isoformat(timespec="seconds")
+                temp_file.write(f"--- LTM entry {entry['id']} ({created}) ---\n")
+                if entry.get("metadata"):
+                    temp_file.write(f"metadata: {json.dumps(entry['metadata'], sort_keys=True)}\n")
+                temp_file.write(entry["text"].rstrip("\n") + "\n\n")
+
+        try:
+            return self.upload_tool.upload_and_add_file_to_vector_store(
+                vector_store_id, temp_file_path, purpose="assistants", wait=self.wait_for_processing
+            )
+        finally:
+            os.remove(temp_file_path)
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._run_flusher, name="ltm-flusher", daemon=True)
+                self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = [store_id for store_id, store in self._stores.items() if self._is_due(store, now)]
+                if not due:
+                    self._wakeup.wait(timeout=self._next_deadline(now))
+                    continue
+
+            for store_id in due:
+                try:
+                    self._flush_store(store_id)
+                except Exception:
+                    # Logged by _flush_store; retried after max_delay
+                    pass
+
+    def _next_deadline(self, now: float) -> float:
+        deadlines = [
+            max(store.first_at + self.max_delay, store.retry_at) - now
+            for store in self._stores.values()
+            if store.entries
+        ]
+        return max(0.01, min(deadlines)) if deadlines else self.max_delay
+
+
+def get_ltm_buffer(**options: Any) -> LTMWriteBuffer:
+    """
+    Get the shared LTM write buffer, creating and registering it on first use.
+
+    The buffer is registered in the services container as "ltm_buffer", so the
+    workflow engines flush it when a workflow ends.
+
+    Args:
+        **options: LTMWriteBuffer options, used only when the buffer is created.
+
+    Returns:
+        LTMWriteBuffer: The shared buffer.
+    """
+    from core.services import get_services
+
+    services = get_services()
+    with _buffer_lock:
+        if not services.has_service("ltm_buffer"):
+            services.register_service(LTMWriteBuffer(**options), LTMWriteBuffer, "ltm_buffer")
+        return services.get_service("ltm_buffer")
+
+
+def flush_ltm_buffer() -> List[Dict[str, Any]]:
+    """
+    Flush the shared LTM write buffer if one has been created.
+
+    Returns:
+        List[Dict]: The upload results, empty if there was nothing to flush.
+    """
+    from core.services import get_services
+
+    services = get_services()
+    if not services.has_service("ltm_buffer"):
+        return []
+    return services.get_service("ltm_buffer").flush()
@@ -8,6 +8,8 @@ from typing import Dict, Optional
 
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 from tools.openai_vs.upload_file_to_vector_store import UploadFileToVectorStoreTool
 
 
@@ -21,21 +23,24 @@ class SaveTextToVectorStoreTool:
         Initialize the SaveTextToVectorStoreTool.
 
         Args:
-            client: Optional OpenAI client instance. If not provided, a new one will be created.
+            client: Optional OpenAI client instance. If not provided, the shared client is used.
         """
-        self.client = client or OpenAI()
+        self.client = client or get_openai_client(OpenAI)
         self.upload_tool = UploadFileToVectorStoreTool(self.client)
 
-    def save_text_to_vector_store(self, vector_store_id: str, text_content: str) -> Dict:
+    def save_text_to_vector_store(self, vector_store_id: str, text_content: str, buffered: bool = False) -> Dict:
         """
         Save text content to a Vector Store by creating a temporary file and uploading it.
 
         Args:
             vector_store_id: The ID of the Vector Store to add the text to.
             text_content: The text content to save.
+            buffered: If True, the text is journaled in the shared LTMWriteBuffer and
+                      uploaded later together with other buffered entries.
 
         Returns:
-            Dict: A dictionary containing the file_id and status information.
+            Dict: A dictionary containing the file_id and status information, or the
+            entry_id and status "buffered" for buffered writes.
 
         Raises:
             ValueError: If vector_store_id is invalid or text_content is empty.
@@ -46,6 +51,11 @@ class SaveTextToVectorStoreTool:
         if not text_content or not isinstance(text_content, str):
             raise ValueError("Text content must be a non-empty string")
 
+        if buffered:
+            from tools.openai_vs.ltm_buffer import get_ltm_buffer
+
+            return get_ltm_buffer(upload_tool=self.upload_tool).append(vector_store_id, text_content)
+
         temp_file_path = None
         try:
             # Create a temporary file with the text content
@@ -3,12 +3,13 @@ Module for uploading files to OpenAI Vector Stores.
 """
 
 import os
-import time
 from typing import Dict, Optional
 
 import httpx
 from openai import OpenAI
 
+from core.llm.clients import get_http_client, get_openai_client
+from tools.openai_vs.ingestion_tracker import IngestionTracker, wait_for_file
 from tools.openai_vs.utils.vs_id_validator import assert_valid_vector_store_id
 
 
@@ -17,17 +18,28 @@ class UploadFileToVectorStoreTool:
     Tool for uploading files to OpenAI Vector Stores.
     """
 
-    def __init__(self, client: Optional[OpenAI] = None):
+    def __init__(
+        self,
+        client: Optional[OpenAI] = None,
+        http_client: Optional[httpx.Client] = None,
+        tracker: Optional[IngestionTracker] = None,
+    ):
         """
         Initialize the UploadFileToVectorStoreTool.
 
         Args:
-            client: Optional OpenAI client instance. If not provided, a new one will be created.
+            client: Optional OpenAI client instance. If not provided, the shared client is used.
+            http_client: Optional httpx client for direct API calls. If not provided, the shared
+                         pooled client is used.
+            tracker: Optional IngestionTracker to wait on. If not provided, the tracker shared by
+                     synchronous callers is used.
         """
-        self.client = client or OpenAI()
+        self.client = client or get_openai_client(OpenAI)
+        self.http_client = http_client or get_http_client()
+        self.tracker = tracker
 
     def upload_and_add_file_to_vector_store(
-        self, vector_store_id: str, file_path: str, purpose: str = "assistants"
+        self, vector_store_id: str, file_path: str, purpose: str = "assistants", wait: bool = True
     ) -> Dict:
         """
         Upload a file to OpenAI and add it to a Vector Store.
@@ -37,6 +49,8 @@ class UploadFileToVectorStoreTool:
             file_path: The path to the file to upload.
             purpose: The purpose of the file upload. Must be one of: 'assistants', 'fine-tune',
                     'batch', 'user_data', 'vision', 'evals'. Defaults to 'assistants'.
+            wait: If True, wait on the vector store's IngestionTracker until the file is processed.
+                  If False, return as soon as the file is added with status "submitted".
 
         Returns:
             Dict: A dictionary containing the file_id and status information.
@@ -78,82 +92,36 @@ class UploadFileToVectorStoreTool:
                 if not api_key:
                     raise ValueError("API key not found in OpenAI client")
 
-                # Make direct API call using httpx
+                # Make direct API call using the shared httpx client
                 headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
                 url = f"https://api.openai.com/v1/vector_stores/{vector_store_id}/files"
                 payload = {"file_id": file_id}
 
-                with httpx.Client(timeout=60.0) as http_client:
-                    response = http_client.post(url, json=payload, headers=headers)
+                response = self.http_client.post(url, json=payload, headers=headers)
 
-                    if response.status_code == 200 or response.status_code == 201:
-                        pass
-                    else:
-                        # Try alternative payload format if first attempt failed
-                        if response.status_code == 400:
-                            payload = {"files": [file_id]}
-                            response = http_client.post(url, json=payload, headers=headers)
-
-                            if response.status_code == 200 or response.status_code == 201:
-                                pass
-                            else:
-                                raise RuntimeError(f"Failed to add file to vector store: {response.text}")
+                if response.status_code == 200 or response.status_code == 201:
+                    pass
+                else:
+                    # Try alternative payload format if first attempt failed
+                    if response.status_code == 400:
+                        payload = {"files": [file_id]}
+                        response = self.http_client.post(url, json=payload, headers=headers)
+
+                        if response.status_code == 200 or response.status_code == 201:
+                            pass
                         else:
                             raise RuntimeError(f"Failed to add file to vector store: {response.text}")
+                    else:
+                        raise RuntimeError(f"Failed to add file to vector store: {response.text}")
             except Exception as e:
                 raise RuntimeError(f"Error adding file to vector store: {str(e)}")
 
-            # Poll for completion using direct API calls
-            max_polling_attempts = 30
-            polling_interval = 2  # seconds
-
-            for attempt in range(max_polling_attempts):
-                time.sleep(polling_interval)
-
-                try:
-                    # Use direct HTTPX call for polling file status
-                    poll_url = f"https://api.openai.com/v1/vector_stores/{vector_store_id}/files/{file_id}"
-                    poll_headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-
-                    with httpx.Client(timeout=30.0) as poll_client:
-                        poll_response = poll_client.get(poll_url, headers=poll_headers)
-
-                        if poll_response.status_code == 200:
-                            poll_data = poll_response.json()
-                            status = poll_data.get("status", "unknown")
-
-                            if status == "completed" or status == "success":
-                                return {"file_id": file_id, "status": "completed"}
-                            elif status == "failed" or status == "error":
-                                error_msg = poll_data.get("last_error", "Unknown error")
-                                raise RuntimeError(f"File processing failed: {error_msg}")
-                            elif status == "in_progress" or status == "pending":
-                                # Continue polling
-                                pass
-                        else:
-                            # Handle non-200 status code
-                            raise RuntimeError(
-                                f"Failed to check file status: {poll_response.status_code} - {poll_response.text}"
-                            )
-                except Exception as poll_e:
-                    # Don't silently continue on all exceptions
-                    # If this is an error status, propagate it
-                    if isinstance(poll_e, RuntimeError) and "File processing failed" in str(poll_e):
-                        raise
-
-                    # Log other polling errors but continue polling
-                    print(f"Warning: Error during polling attempt {attempt}: {str(poll_e)}")
-
-                # Increase polling interval with backoff
-                polling_interval = min(polling_interval * 1.5, 10)
-
-            # If we get here, polling timed out but file might still be processing
-            return {
-                "file_id": file_id,
-                "status": "in_progress",
-                "message": "Polling timed out but file is being processed",
-            }
+            if not wait:
+                return {"file_id": file_id, "vector_store_id": vector_store_id, "status": "submitted"}
+
+            # Wait on the store's shared tracker rather than polling this file alone
+            return wait_for_file(vector_store_id, file_id, tracker=self.tracker)
 
         except Exception as e:
             error_type = type(e).__name__
@@ -3,13 +3,15 @@ import os
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 # Load environment variables from .env file
 load_dotenv()
 
 
 class VectorStoreTool:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client(OpenAI)
 
     def create_vector_store(self, name: str, file_ids: list = None) -> str:
         """
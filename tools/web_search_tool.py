@@ -1,15 +1,15 @@
-import os
-
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from core.llm.clients import get_openai_client
+
 # Load environment variables from .env file
 load_dotenv()
 
 
 class WebSearchTool:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client(OpenAI)
 
     def perform_search(self, query, context_size="medium", user_location=None):
         """Perform a web search using the OpenAI API."""
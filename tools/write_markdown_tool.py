@@ -1,4 +1,7 @@
 import os
+from typing import Union
+
+from core.llm.streaming import ResponseStream
 
 
 class WriteMarkdownTool:
@@ -6,14 +9,17 @@ class WriteMarkdownTool:
     Tool for writing markdown content to files.
     """
 
-    def write_markdown_file(self, file_path: str, content: str) -> str:
+    def write_markdown_file(self, file_path: str, content: Union[str, ResponseStream]) -> str:
         """
         Write content to a Markdown file at the specified file_path.
         If the parent directory doesn't exist, create it.
 
+        A ResponseStream is written chunk by chunk as it arrives, so the file
+        fills while the LLM is still generating.
+
         Args:
             file_path (str): The path where the Markdown file should be written.
-            content (str): The Markdown content to write.
+            content (Union[str, ResponseStream]): The Markdown content to write.
 
         Returns:
             str: The absolute file path of the written file.
@@ -21,13 +27,13 @@ class WriteMarkdownTool:
         Raises:
             ValueError: If file_path is empty or not a string.
             OSError: If there's an issue creating directories or writing the file.
-            TypeError: If content is not a string.
+            TypeError: If content is not a string or a ResponseStream.
         """
         # Input validation
         if not file_path or not isinstance(file_path, str):
             raise ValueError("File path must be a non-empty string")
 
-        if not isinstance(content, str):
+        if not isinstance(content, (str, ResponseStream)):
             raise TypeError("Content must be a string")
 
         # Create directory if it doesn't exist
@@ -37,7 +43,12 @@ class WriteMarkdownTool:
 
         # Write content to file
         with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                for chunk in content:
+                    f.write(chunk)
+                    f.flush()
 
         # Return absolute path for consistency
         return os.path.abspath(file_path)